@@ -1,14 +1,72 @@
 # /run.py
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from src.main_window import TelemetryApp
+import multiprocessing
+
+# Tempo máximo de espera pela inicialização adiada no modo --profile-startup
+PROFILE_TIMEOUT_MS = 60000
+
+
+def _budget_from_args(argv, default_ms):
+    """Orçamento em ms passado como ``--profile-startup [--budget-ms N]``."""
+    if "--budget-ms" in argv:
+        index = argv.index("--budget-ms")
+        try:
+            return float(argv[index + 1])
+        except (IndexError, ValueError):
+            print("AVISO: --budget-ms inválido; usando o orçamento da configuração.")
+    return float(default_ms)
+
 
 if __name__ == '__main__':
+    # Necessário para o pool de processos do relatório no executável (PyInstaller)
+    multiprocessing.freeze_support()
+
+    # Relatórios em lote sem interface: python run.py --batch-report <raiz> [opções]
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch-report":
+        from src.utils.batch_reports import main as batch_report_main
+        sys.exit(batch_report_main(sys.argv[2:]))
+
+    # Medição do tempo de abertura: python run.py --profile-startup [--budget-ms N]
+    profile_startup = "--profile-startup" in sys.argv
+    from src.utils import startup_profile
+    if profile_startup:
+        profiler = startup_profile.install()
+
+    # nvidia-smi roda numa thread enquanto a GUI é importada
+    from src.utils.config_manager import load_config
+    from src.utils.gpu_utils import start_gpu_probe
+    config = load_config()
+    start_gpu_probe(config.get("gpu", {}).get("preferred_index"))
+
+    # Importado aqui para que os processos filhos (spawn) não carreguem a GUI inteira
+    with startup_profile.section("imports da GUI (PyQt6 + main_window)"):
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtCore import QTimer
+        from src.main_window import TelemetryApp
+
     # Flag necessária para o QWebEngine em alguns sistemas
     #os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = '--single-process'
-    
-    app = QApplication(sys.argv)
-    window = TelemetryApp()
+
+    with startup_profile.section("QApplication"):
+        app = QApplication(sys.argv)
+    with startup_profile.section("TelemetryApp.__init__"):
+        window = TelemetryApp()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+
+    if profile_startup:
+        budget_ms = _budget_from_args(
+            sys.argv, config.get("startup", {}).get("budget_ms", startup_profile.DEFAULT_BUDGET_MS)
+        )
+
+        def _finish_profile():
+            profiler.uninstall()
+            print(profiler.report(budget_ms, startup_profile.FIRST_PAINT_MARK))
+            first_window = profiler.mark_time(startup_profile.FIRST_PAINT_MARK)
+            # Código de saída 1 fora do orçamento: permite usar o modo em scripts/CI
+            app.exit(0 if first_window is not None and first_window <= budget_ms else 1)
+
+        window.startup_finished.connect(_finish_profile)
+        QTimer.singleShot(PROFILE_TIMEOUT_MS, _finish_profile)
+
+    sys.exit(app.exec())
@@ -8,6 +8,15 @@ import numpy as np
 import json
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from src.utils.compressed_io import (
+    find_log_file,
+    materialized,
+    open_log_binary,
+    open_log_text,
+    read_binary_array,
+    strip_compression,
+)
+from src.utils.chunked_store import chunked_settings, load_chunked_log, should_chunk
 from src.utils.resource_paths import find_decoder_executable
 
 signal_name_map = {
@@ -202,27 +211,29 @@ def parse_spi_log_via_c(file_path):
     # --- Execução do Subprocesso ---
     stdout_data = ""
     stderr_data = ""
-    try:
-        #print(f"DEBUG: Executando decoder C: {decoder_exe_path} \"{file_path}\"")
-        process = subprocess.Popen(
-            [str(decoder_path), file_path],
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
-            encoding='utf-8', errors='ignore',
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-        )
-        stdout_data, stderr_data = process.communicate(timeout=60)
-        return_code = process.returncode
-
-        if stderr_data:
-            print(f"--- Mensagens do Decoder C ({os.path.basename(file_path)}) ---"); print(stderr_data.strip()); print("-"*(len(stderr_data.strip())+4))
-        if return_code != 0:
-            print(f"ERRO: Decoder C falhou (código: {return_code})"); return pd.DataFrame()
-        if not stdout_data:
-             print("AVISO: Decoder C não produziu saída JSON."); return pd.DataFrame()
-
-    except FileNotFoundError: print(f"ERRO: Comando '{decoder_exe_path}' não encontrado."); return pd.DataFrame()
-    except subprocess.TimeoutExpired: print(f"ERRO: Decoder C timeout (>60s) em {file_path}."); process.kill(); return pd.DataFrame()
-    except Exception as e: print(f"ERRO CRÍTICO ao executar decoder C: {e}"); import traceback; traceback.print_exc(); return pd.DataFrame()
+    # O decoder precisa de um arquivo comum: logs comprimidos são descomprimidos num temporário
+    with materialized(file_path) as decoder_input:
+        try:
+            #print(f"DEBUG: Executando decoder C: {decoder_exe_path} \"{file_path}\"")
+            process = subprocess.Popen(
+                [str(decoder_path), decoder_input],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                encoding='utf-8', errors='ignore',
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            )
+            stdout_data, stderr_data = process.communicate(timeout=60)
+            return_code = process.returncode
+
+            if stderr_data:
+                print(f"--- Mensagens do Decoder C ({os.path.basename(file_path)}) ---"); print(stderr_data.strip()); print("-"*(len(stderr_data.strip())+4))
+            if return_code != 0:
+                print(f"ERRO: Decoder C falhou (código: {return_code})"); return pd.DataFrame()
+            if not stdout_data:
+                 print("AVISO: Decoder C não produziu saída JSON."); return pd.DataFrame()
+
+        except FileNotFoundError: print(f"ERRO: Comando '{decoder_exe_path}' não encontrado."); return pd.DataFrame()
+        except subprocess.TimeoutExpired: print(f"ERRO: Decoder C timeout (>60s) em {file_path}."); process.kill(); return pd.DataFrame()
+        except Exception as e: print(f"ERRO CRÍTICO ao executar decoder C: {e}"); import traceback; traceback.print_exc(); return pd.DataFrame()
 
     # --- Processamento da Saída JSON ---
     parsed_data = []
@@ -306,22 +317,12 @@ def _infer_base_time_from_parent(file_path, fallback_str="2024-01-01-00-00-00"):
         return pd.to_datetime(fallback_str, format="%Y-%m-%d-%H-%M-%S", errors="coerce")
 
 
-def parse_afgs_monitoring_log(file_path):
+def _afgs_frame(log_data, first_sample, base_time):
     """
-    Lê e desempacota o log embarcado binário 'AFGS_Monitoring.log' (float64, 128 portas)
-    e retorna um DataFrame no MESMO formato esperado pelo app (compatível com parse_log_file):
-      - Timestamp (datetime)
-      - Timestamp_str (HH:MM:SS.mmm)
-      - Colunas: Roll, Pitch, Yaw, Latitude, Longitude, AltitudeAbs, ASI, AT, etc.
-    Sinais ausentes no log embarcado são criados com NaN para manter compatibilidade.
+    Desempacota ``log_data`` (amostras x 128 portas, float64) no DataFrame do app.
+    ``first_sample`` é o índice da primeira amostra no arquivo (define o tempo), então
+    o log pode ser convertido inteiro ou em blocos com o mesmo resultado.
     """
-    import numpy as np
-    import pandas as pd
-
-    if not os.path.exists(file_path):
-        print(f"ERRO: Arquivo '{file_path}' não encontrado.")
-        return pd.DataFrame()
-
     # --- Definições de portas/typecasting (igual às do seu script) ---
     port_definitions = {
         'single': list(range(1, 51)) + list(range(61, 113)),
@@ -338,237 +339,258 @@ def parse_afgs_monitoring_log(file_path):
         for port in ports:
             port_to_type_map[port] = dtype
 
-    try:
-        # Lê o arquivo binário como float64
-        file_bin = np.fromfile(file_path, dtype=np.float64)
-        if file_bin.size == 0:
-            print("AVISO: AFGS_Monitoring.log vazio ou ilegível.")
-            return pd.DataFrame()
+    num_logs = log_data.shape[0]
+    # Vetor de tempo (mesmo do seu script): 0.2 s por amostra (5 Hz)
+    time_vector = (np.arange(first_sample, first_sample + num_logs, dtype=np.float64) * 0.2)
 
-        # Cada amostra tem 128 "portas"
-        num_logs = file_bin.size // 128
-        if num_logs == 0:
-            print("AVISO: Tamanho do arquivo não múltiplo de 128 amostras.")
-            return pd.DataFrame()
+    # Desempacotamento
+    headers = ['Time']
+    columns = [time_vector]  # lista de vetores 1D
 
-        if file_bin.size % 128 != 0:
-            print(f"AVISO: {file_bin.size % 128} floats ignorados no final (não múltiplo de 128).")
+    for k_py in range(128):
+        k_matlab = k_py + 1
+        if k_matlab not in port_to_type_map:
+            continue
 
-        log_data = file_bin[:num_logs * 128].reshape((num_logs, 128))
+        port_type = port_to_type_map[k_matlab]
+        n_signals = n_signals_map[port_type]
+        col_data_f64 = log_data[:, k_py].copy()
 
-        # Vetor de tempo (mesmo do seu script): 0.2 s por amostra (5 Hz)
-        time_vector = (np.arange(num_logs, dtype=np.float64) * 0.2)
+        if port_type == 'boolean':
+            # 64 bits por amostra (8 bytes)
+            bytes8 = col_data_f64.view(np.uint8).reshape(-1, 8)
+            unpacked_bits = np.unpackbits(bytes8, axis=1, bitorder='big')  # (num_logs, 64)
+            for m in range(n_signals):
+                default_name = f'Monit_{k_matlab}_S{m+1}'
+                header_name = signal_name_map.get(default_name, default_name)
+                headers.append(header_name)
+                columns.append(unpacked_bits[:, m])
+        elif port_type == 'double':
+            default_name = f'Monit_{k_matlab}_S1'
+            header_name = signal_name_map.get(default_name, default_name)
+            headers.append(header_name)
+            columns.append(col_data_f64)  # já double
+        else:
+            dtype = dtype_map[port_type]
+            unpacked = col_data_f64.view(dtype).reshape(-1, n_signals)
+            for m in range(n_signals):
+                default_name = f'Monit_{k_matlab}_S{m+1}'
+                header_name = signal_name_map.get(default_name, default_name)
+                headers.append(header_name)
+                columns.append(unpacked[:, m])
 
-        # Desempacotamento
-        headers = ['Time']
-        columns = [time_vector]  # lista de vetores 1D
+    # Monta DF base com todos os sinais desempacotados
+    final_data_matrix = np.column_stack(columns)
+    df_raw = pd.DataFrame(final_data_matrix, columns=headers)
 
-        for k_py in range(128):
-            k_matlab = k_py + 1
-            if k_matlab not in port_to_type_map:
-                continue
+    # ==========================
+    # Adaptação ao formato do app
+    # ==========================
+    # Timestamp sintético: base = nome da pasta (ex.: 2025-10-31-10-08-56) + offset "Time"
+    df_raw['Timestamp'] = base_time + pd.to_timedelta(df_raw['Time'], unit='s')
+    df_raw['Timestamp_str'] = df_raw['Timestamp'].dt.strftime('%H:%M:%S.%f').str[:-3]
 
-            port_type = port_to_type_map[k_matlab]
-            n_signals = n_signals_map[port_type]
-            col_data_f64 = log_data[:, k_py].copy()
-
-            if port_type == 'boolean':
-                # 64 bits por amostra (8 bytes)
-                bytes8 = col_data_f64.view(np.uint8).reshape(-1, 8)
-                unpacked_bits = np.unpackbits(bytes8, axis=1, bitorder='big')  # (num_logs, 64)
-                for m in range(n_signals):
-                    default_name = f'Monit_{k_matlab}_S{m+1}'
-                    header_name = signal_name_map.get(default_name, default_name)
-                    headers.append(header_name)
-                    columns.append(unpacked_bits[:, m])
-            elif port_type == 'double':
-                default_name = f'Monit_{k_matlab}_S1'
-                header_name = signal_name_map.get(default_name, default_name)
-                headers.append(header_name)
-                columns.append(col_data_f64)  # já double
-            else:
-                dtype = dtype_map[port_type]
-                unpacked = col_data_f64.view(dtype).reshape(-1, n_signals)
-                for m in range(n_signals):
-                    default_name = f'Monit_{k_matlab}_S{m+1}'
-                    header_name = signal_name_map.get(default_name, default_name)
-                    headers.append(header_name)
-                    columns.append(unpacked[:, m])
-
-        # Monta DF base com todos os sinais desempacotados
-        final_data_matrix = np.column_stack(columns)
-        df_raw = pd.DataFrame(final_data_matrix, columns=headers)
-
-        # ==========================
-        # Adaptação ao formato do app
-        # ==========================
-        # Timestamp sintético: base = nome da pasta (ex.: 2025-10-31-10-08-56) + offset "Time"
-        base_time = _infer_base_time_from_parent(file_path)
-        df_raw['Timestamp'] = base_time + pd.to_timedelta(df_raw['Time'], unit='s')
-        df_raw['Timestamp_str'] = df_raw['Timestamp'].dt.strftime('%H:%M:%S.%f').str[:-3]
+    # Mapeia sinais do embarcado -> nomes esperados pelo app
+    def rad2deg(series):
+        return np.degrees(pd.to_numeric(series, errors='coerce'))
 
-        # Mapeia sinais do embarcado -> nomes esperados pelo app
-        def rad2deg(series):
-            return np.degrees(pd.to_numeric(series, errors='coerce'))
+    def yaw_normalize_deg(series_rad):
+        yaw_deg = rad2deg(series_rad)
+        return ((yaw_deg + 180.0) % 360.0) - 180.0
 
-        def yaw_normalize_deg(series_rad):
-            yaw_deg = rad2deg(series_rad)
-            return ((yaw_deg + 180.0) % 360.0) - 180.0
+    # Cria DataFrame de saída (compatível com parse_log_file)
+    df_out = pd.DataFrame(index=df_raw.index)
+    df_out['Timestamp'] = df_raw['Timestamp']
+    df_out['Timestamp_str'] = df_raw['Timestamp_str']
 
-        # Cria DataFrame de saída (compatível com parse_log_file)
-        df_out = pd.DataFrame(index=df_raw.index)
-        df_out['Timestamp'] = df_raw['Timestamp']
-        df_out['Timestamp_str'] = df_raw['Timestamp_str']
+    # Mapas específicos
+    # 1) Core já existente (mantido)
+    col_map = {
+        'AHRS_roll'       : ('Roll',        rad2deg),
+        'AHRS_pitch'      : ('Pitch',       rad2deg),
+        'AHRS_yaw'        : ('Yaw',         yaw_normalize_deg),
 
-        # Mapas específicos
-        # 1) Core já existente (mantido)
-        col_map = {
-            'AHRS_roll'       : ('Roll',        rad2deg),
-            'AHRS_pitch'      : ('Pitch',       rad2deg),
-            'AHRS_yaw'        : ('Yaw',         yaw_normalize_deg),
+        'Latitude_PA1'    : ('Latitude',    None),
+        'Longitude_PA1'   : ('Longitude',   None),
+        'Altitude_PA1'    : ('AltitudeAbs', None),
 
-            'Latitude_PA1'    : ('Latitude',    None),
-            'Longitude_PA1'   : ('Longitude',   None),
-            'Altitude_PA1'    : ('AltitudeAbs', None),
+        'ASI'             : ('ASI',         None),
+        'Wind_Speed'      : ('WSI',         None),
 
-            'ASI'             : ('ASI',         None),
-            'Wind_Speed'      : ('WSI',         None),
+        'Voltage'         : ('Voltage',     None),
+        'RPM'             : ('RPM',         None),
+        'CHT'             : ('CHT',         None),
 
-            'Voltage'         : ('Voltage',     None),
-            'RPM'             : ('RPM',         None),
-            'CHT'             : ('CHT',         None),
+        'FuelLevel_dig'   : ('FuelLevel_dig',   None),
+        'FuelLevel_anag'  : ('FuelLevel_anag',  None),
 
-            'FuelLevel_dig'   : ('FuelLevel_dig',   None),
-            'FuelLevel_anag'  : ('FuelLevel_anag',  None),
+        'Operation_Mode'  : ('ModoVoo',     None),
 
-            'Operation_Mode'  : ('ModoVoo',     None),
+        'GNSS_NoS'        : ('Satellites',    None),
+        'GNSS_LatError'   : ('GNSS_LatError', None),
+        'GNSS_LonError'   : ('GNSS_LonError', None),
+        'GNSS_AltError'   : ('GNSS_AltError', None),
 
-            'GNSS_NoS'        : ('Satellites',    None),
-            'GNSS_LatError'   : ('GNSS_LatError', None),
-            'GNSS_LonError'   : ('GNSS_LonError', None),
-            'GNSS_AltError'   : ('GNSS_AltError', None),
+        'SystemCounter'   : ('SystemCounter', None),
+        'GroundLevel'     : ('GroundLevel',   None),
+        'ADC_DynamicPressure': ('ADC_DynamicPressure', None),
+    }
 
-            'SystemCounter'   : ('SystemCounter', None),
-            'GroundLevel'     : ('GroundLevel',   None),
-            'ADC_DynamicPressure': ('ADC_DynamicPressure', None),
-        }
+    # 2) Sinais adicionais (floats) — AHRS/IMU, EKF, DCM, GNSS vel, referências VTOL, etc.
+    float_extras = [
+        # AHRS pos/vel em cm e taxas
+        'AHRS_pos_x_cm', 'AHRS_pos_y_cm', 'AHRS_pos_z_cm',
+        'AHRS_vel_x_cm', 'AHRS_vel_y_cm', 'AHRS_vel_z_cm',
+        'AHRS_q', 'AHRS_r',
+        # Magnetômetro e declinação
+        'Mag_X', 'Mag_Y', 'Mag_Z', 'Declination',
+        # EKF pos/vel e atitude (EKF_roll/pitch/yaw já em deg no slide)
+        'EKF_pos_x', 'EKF_pos_y', 'EKF_pos_z',
+        'EKF_vel_x', 'EKF_vel_y', 'EKF_vel_z',
+        'EKF_roll', 'EKF_pitch', 'EKF_yaw',
+        # DCM atitude
+        'DCM_roll', 'DCM_pitch', 'DCM_yaw',
+        # GNSS velocidades (N, E, U)
+        'VeIN_PA1', 'VeE_PA1', 'VeU_PA1',
+        # VTOL refs/targets
+        'VTOL_roll_reference', 'VTOL_pitch_reference', 'VTOL_yaw_reference',
+        'pos_target_z', 'vel_desired_xy',
+        # Outros do bloco FW/asa fixa
+        'FW_altitude', 'WindCorrectedCourse', 'FinalPitchRef',
+        'AileronR', 'AileronL'
+    ]
+
+    for src in float_extras:
+        if src in df_raw.columns and src not in col_map:
+            col_map[src] = (src, None)  # copia com o mesmo nome
+
+    # 3) Flags/estados discretos que queremos como inteiros (0/1 ou códigos)
+    #    (aplicamos round->Int64 com coerção segura)
+    int_flags = [
+        # Booleans do S128 e isUp
+        'GNSS1_PackageFail', 'GNSS2_PackageFail', 'NavSelected', 'GNSS_MSB_bundle',
+        'GNSS_Pos_isUp', 'IMU_Mag_isUp', 'MPDC_isUp', 'ADC_isUP', 'EDC_isUp',
+        # VTOL / estágios / modos auxiliares
+        'in_transition', 'hold_stabilize', 'hold_hover', 'PhaseOne_timer_finished',
+        'in_vtol_takeoff', 'in_vtol_land', 'assisted_flight', 'relax_auto',
+        'ForceActuationEnable', 'KillSwitch', 'ManualTransition_RPA',
+        'disarm_radio', 'FW_Manual', 'From_takeoff', 'CriticalLandStage',
+        # Failsafes / externos
+        'external_FS', 'internal_FS',
+        # Health/flags diversos
+        'GNSS_Health', 'EKF_FailSafe', 'EKF_HealthStatus',
+    ]
+
+    # 4) Contadores e códigos inteiros
+    int_counters = [
+        'Mag_ReadCounter', 'EDC_ReadCounter',
+        'GNSS2_Pos_ReadCounter', 'GNSS2_Vel_ReadCounter',
+        'GNSS1_Pos_ReadCounter', 'GNSS1_Vel_ReadCounter',
+        'RC_ReadCounter', 'RC_ReadCounter_2',
+        'GNSS_FailNumber', 'RPACheckSum', 'Fail_Number', 'Protection_Number',
+        'OpMode_PA1', 'OpMode_from_pilot',  # úteis para debug/telemetria
+        'poscontrol_state', 'transition_stage', 'EKF_flags'
+    ]
+
+    # ====== Aplicação do mapeamento ======
+    # 4.1 Core e floats
+    for src, (dst, fn) in col_map.items():
+        if src in df_raw.columns:
+            df_out[dst] = fn(df_raw[src]) if fn else pd.to_numeric(df_raw[src], errors='coerce')
+
+    # 4.2 Floats extras (identidade já criada acima quando necessário)
+    for src in float_extras:
+        if src in df_raw.columns and src not in df_out.columns:
+            df_out[src] = pd.to_numeric(df_raw[src], errors='coerce')
+
+    # 4.3 Flags/counters como Int64 com coerção segura
+    def _to_int64_safe(series):
+        s = pd.to_numeric(series, errors='coerce')
+        # arredonda valores válidos (caso venham como 0.0/1.0)
+        s = s.where(s.isna(), np.rint(s))
+        out = pd.Series(pd.NA, index=s.index, dtype='Int64')
+        out.loc[s.notna()] = s.loc[s.notna()].astype('int64').values
+        return out
+
+    for src in int_flags:
+        if src in df_raw.columns:
+            df_out[src] = _to_int64_safe(df_raw[src])
+
+    for src in int_counters:
+        if src in df_raw.columns:
+            df_out[src] = _to_int64_safe(df_raw[src])
+
+    # 5) Completa colunas esperadas pelo app
+    expected_cols = [
+        'ModoVoo',
+        'Roll', 'Pitch', 'Yaw',
+        'Latitude', 'Longitude', 'AltitudeAbs',
+        'Voltage', 'Satellites', 'QNE', 'ASI', 'AT',
+        'Porcent_bat', 'RPM', 'CHT',
+        'FuelLevel_dig', 'FuelLevel_anag', 'isVTOL',
+        'WSI',
+        # Extras úteis sempre presentes no embarcado
+        'SystemCounter', 'GroundLevel', 'ADC_DynamicPressure',
+        'GNSS_LatError', 'GNSS_LonError', 'GNSS_AltError',
+    ]
+    for col in expected_cols:
+        if col not in df_out.columns:
+            df_out[col] = np.nan
+
+    # 6) Tipos finais para o conjunto padrão do app
+    numeric_cols = [
+        'Roll', 'Pitch', 'Yaw', 'Latitude', 'Longitude', 'AltitudeAbs',
+        'Voltage', 'QNE', 'ASI', 'AT', 'RPM', 'CHT', 'WSI',
+        'SystemCounter', 'GroundLevel', 'ADC_DynamicPressure',
+        'GNSS_LatError', 'GNSS_LonError', 'GNSS_AltError',
+    ]
+    for col in numeric_cols:
+        if col in df_out.columns:
+            df_out[col] = pd.to_numeric(df_out[col], errors='coerce')
+
+    int_cols = ['Satellites', 'Porcent_bat', 'FuelLevel_dig', 'FuelLevel_anag', 'ModoVoo']
+    for col in int_cols:
+        if col in df_out.columns:
+            df_out[col] = _to_int64_safe(df_out[col])
 
-        # 2) Sinais adicionais (floats) — AHRS/IMU, EKF, DCM, GNSS vel, referências VTOL, etc.
-        float_extras = [
-            # AHRS pos/vel em cm e taxas
-            'AHRS_pos_x_cm', 'AHRS_pos_y_cm', 'AHRS_pos_z_cm',
-            'AHRS_vel_x_cm', 'AHRS_vel_y_cm', 'AHRS_vel_z_cm',
-            'AHRS_q', 'AHRS_r',
-            # Magnetômetro e declinação
-            'Mag_X', 'Mag_Y', 'Mag_Z', 'Declination',
-            # EKF pos/vel e atitude (EKF_roll/pitch/yaw já em deg no slide)
-            'EKF_pos_x', 'EKF_pos_y', 'EKF_pos_z',
-            'EKF_vel_x', 'EKF_vel_y', 'EKF_vel_z',
-            'EKF_roll', 'EKF_pitch', 'EKF_yaw',
-            # DCM atitude
-            'DCM_roll', 'DCM_pitch', 'DCM_yaw',
-            # GNSS velocidades (N, E, U)
-            'VeIN_PA1', 'VeE_PA1', 'VeU_PA1',
-            # VTOL refs/targets
-            'VTOL_roll_reference', 'VTOL_pitch_reference', 'VTOL_yaw_reference',
-            'pos_target_z', 'vel_desired_xy',
-            # Outros do bloco FW/asa fixa
-            'FW_altitude', 'WindCorrectedCourse', 'FinalPitchRef',
-            'AileronR', 'AileronL'
-        ]
-
-        for src in float_extras:
-            if src in df_raw.columns and src not in col_map:
-                col_map[src] = (src, None)  # copia com o mesmo nome
-
-        # 3) Flags/estados discretos que queremos como inteiros (0/1 ou códigos)
-        #    (aplicamos round->Int64 com coerção segura)
-        int_flags = [
-            # Booleans do S128 e isUp
-            'GNSS1_PackageFail', 'GNSS2_PackageFail', 'NavSelected', 'GNSS_MSB_bundle',
-            'GNSS_Pos_isUp', 'IMU_Mag_isUp', 'MPDC_isUp', 'ADC_isUP', 'EDC_isUp',
-            # VTOL / estágios / modos auxiliares
-            'in_transition', 'hold_stabilize', 'hold_hover', 'PhaseOne_timer_finished',
-            'in_vtol_takeoff', 'in_vtol_land', 'assisted_flight', 'relax_auto',
-            'ForceActuationEnable', 'KillSwitch', 'ManualTransition_RPA',
-            'disarm_radio', 'FW_Manual', 'From_takeoff', 'CriticalLandStage',
-            # Failsafes / externos
-            'external_FS', 'internal_FS',
-            # Health/flags diversos
-            'GNSS_Health', 'EKF_FailSafe', 'EKF_HealthStatus',
-        ]
-
-        # 4) Contadores e códigos inteiros
-        int_counters = [
-            'Mag_ReadCounter', 'EDC_ReadCounter',
-            'GNSS2_Pos_ReadCounter', 'GNSS2_Vel_ReadCounter',
-            'GNSS1_Pos_ReadCounter', 'GNSS1_Vel_ReadCounter',
-            'RC_ReadCounter', 'RC_ReadCounter_2',
-            'GNSS_FailNumber', 'RPACheckSum', 'Fail_Number', 'Protection_Number',
-            'OpMode_PA1', 'OpMode_from_pilot',  # úteis para debug/telemetria
-            'poscontrol_state', 'transition_stage', 'EKF_flags'
-        ]
-
-        # ====== Aplicação do mapeamento ======
-        # 4.1 Core e floats
-        for src, (dst, fn) in col_map.items():
-            if src in df_raw.columns:
-                df_out[dst] = fn(df_raw[src]) if fn else pd.to_numeric(df_raw[src], errors='coerce')
-
-        # 4.2 Floats extras (identidade já criada acima quando necessário)
-        for src in float_extras:
-            if src in df_raw.columns and src not in df_out.columns:
-                df_out[src] = pd.to_numeric(df_raw[src], errors='coerce')
-
-        # 4.3 Flags/counters como Int64 com coerção segura
-        def _to_int64_safe(series):
-            s = pd.to_numeric(series, errors='coerce')
-            # arredonda valores válidos (caso venham como 0.0/1.0)
-            s = s.where(s.isna(), np.rint(s))
-            out = pd.Series(pd.NA, index=s.index, dtype='Int64')
-            out.loc[s.notna()] = s.loc[s.notna()].astype('int64').values
-            return out
-
-        for src in int_flags:
-            if src in df_raw.columns:
-                df_out[src] = _to_int64_safe(df_raw[src])
-
-        for src in int_counters:
-            if src in df_raw.columns:
-                df_out[src] = _to_int64_safe(df_raw[src])
-
-        # 5) Completa colunas esperadas pelo app
-        expected_cols = [
-            'ModoVoo',
-            'Roll', 'Pitch', 'Yaw',
-            'Latitude', 'Longitude', 'AltitudeAbs',
-            'Voltage', 'Satellites', 'QNE', 'ASI', 'AT',
-            'Porcent_bat', 'RPM', 'CHT',
-            'FuelLevel_dig', 'FuelLevel_anag', 'isVTOL',
-            'WSI',
-            # Extras úteis sempre presentes no embarcado
-            'SystemCounter', 'GroundLevel', 'ADC_DynamicPressure',
-            'GNSS_LatError', 'GNSS_LonError', 'GNSS_AltError',
-        ]
-        for col in expected_cols:
-            if col not in df_out.columns:
-                df_out[col] = np.nan
-
-        # 6) Tipos finais para o conjunto padrão do app
-        numeric_cols = [
-            'Roll', 'Pitch', 'Yaw', 'Latitude', 'Longitude', 'AltitudeAbs',
-            'Voltage', 'QNE', 'ASI', 'AT', 'RPM', 'CHT', 'WSI',
-            'SystemCounter', 'GroundLevel', 'ADC_DynamicPressure',
-            'GNSS_LatError', 'GNSS_LonError', 'GNSS_AltError',
-        ]
-        for col in numeric_cols:
-            if col in df_out.columns:
-                df_out[col] = pd.to_numeric(df_out[col], errors='coerce')
-
-        int_cols = ['Satellites', 'Porcent_bat', 'FuelLevel_dig', 'FuelLevel_anag', 'ModoVoo']
-        for col in int_cols:
-            if col in df_out.columns:
-                df_out[col] = _to_int64_safe(df_out[col])
+    return df_out
+
+
+def parse_afgs_monitoring_log(file_path):
+    """
+    Lê e desempacota o log embarcado binário 'AFGS_Monitoring.log' (float64, 128 portas)
+    e retorna um DataFrame no MESMO formato esperado pelo app (compatível com parse_log_file):
+      - Timestamp (datetime)
+      - Timestamp_str (HH:MM:SS.mmm)
+      - Colunas: Roll, Pitch, Yaw, Latitude, Longitude, AltitudeAbs, ASI, AT, etc.
+    Sinais ausentes no log embarcado são criados com NaN para manter compatibilidade.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if not os.path.exists(file_path):
+        print(f"ERRO: Arquivo '{file_path}' não encontrado.")
+        return pd.DataFrame()
+
+    try:
+        # Lê o arquivo binário como float64
+        file_bin = read_binary_array(file_path, np.float64)
+        if file_bin.size == 0:
+            print("AVISO: AFGS_Monitoring.log vazio ou ilegível.")
+            return pd.DataFrame()
+
+        # Cada amostra tem 128 "portas"
+        num_logs = file_bin.size // 128
+        if num_logs == 0:
+            print("AVISO: Tamanho do arquivo não múltiplo de 128 amostras.")
+            return pd.DataFrame()
+
+        if file_bin.size % 128 != 0:
+            print(f"AVISO: {file_bin.size % 128} floats ignorados no final (não múltiplo de 128).")
+
+        log_data = file_bin[:num_logs * 128].reshape((num_logs, 128))
+
+        df_out = _afgs_frame(log_data, 0, _infer_base_time_from_parent(file_path))
 
         # 7) Ordena por Timestamp e reseta índice
         df_out = df_out.sort_values('Timestamp').reset_index(drop=True)
@@ -581,6 +603,32 @@ def parse_afgs_monitoring_log(file_path):
         import traceback; traceback.print_exc()
         return pd.DataFrame()
 
+def iter_afgs_monitoring_chunks(file_path, chunk_rows=50_000):
+    """
+    Versão em blocos de parse_afgs_monitoring_log para logs muito longos: lê o
+    arquivo sequencialmente, ``chunk_rows`` amostras por vez, e devolve um DataFrame
+    por bloco (mesmas colunas). Só um bloco fica na memória de cada vez.
+    """
+    base_time = _infer_base_time_from_parent(file_path)
+    record_bytes = 128 * 8
+    first_sample = 0
+    with open_log_binary(file_path) as handle:
+        while True:
+            data = handle.read(chunk_rows * record_bytes)
+            num_logs = len(data) // record_bytes
+            if num_logs == 0:
+                if data:
+                    print(f"AVISO: {len(data) // 8} floats ignorados no final (não múltiplo de 128).")
+                break
+            log_data = np.frombuffer(data, dtype=np.float64, count=num_logs * 128).reshape((num_logs, 128))
+            yield _afgs_frame(log_data, first_sample, base_time)
+            first_sample += num_logs
+            if len(data) < chunk_rows * record_bytes:
+                if len(data) % record_bytes:
+                    print(f"AVISO: {(len(data) % record_bytes) // 8} floats ignorados no final (não múltiplo de 128).")
+                break
+
+
 def parse_mat_file(file_path, DEBUG_PRINT=False):
     """
     Lê um arquivo .mat (scipy.loadmat ou HDF5 v7.3 via h5py), desempacota as 128 portas
@@ -957,77 +1005,100 @@ def parse_mat_file(file_path, DEBUG_PRINT=False):
 # === Funções de Parsing XCockpit ===
 # ==========================================
 
-def parse_log_file(file_path):
+# Teclas do log Xcockpit -> nomes de coluna do app
+XCOCKPIT_KEY_TO_NAME = {
+    '?': 'ModoVoo', 'P': 'Pitch', 'R': 'Roll', 'Y': 'Yaw', 'H': 'AltitudeAbs',
+    'S': 'ASI', 'Q': 'QNE', 'u': 'WSI', 'o': 'WindDirection', '%': 'GNSS_Select',
+    'n': 'RPM', 't': 'CHT', 's': 'FuelLevel_dig', '¢': 'AT', '=': 'FuelLevel_anag',
+    'N': 'Latitude', 'E': 'Longitude', 'V': 'VSI', 'U': 'GSI', 'D': 'Alt_geoidal',
+    'O': 'Path_angle', 'I': 'RTK_Status', 'G': 'Satellites', 'F': 'Sat_use',
+    'h': 'Incert_Long', 'v': 'Incert_pos_z', 'y': 'Spoofing', 'x': 'Jamming',
+    'a': 'Voltage', 'e': 'Filt_VDC', 'b': 'Porcent_bat', "'": 'ForceG',
+    "¨": 'IsFlying', '@': 'N_ForcedLanding', 'c': 'IsForcedLanding',
+    'd': 'isVTOL', 'l': 'Elevator', 'r': 'Aileron', 'f': 'FailNumber',
+    'p': 'ProtectionNumber', 'º': 'VTOL_vbat', 'B': 'AFGNS_Select',
+}
+
+
+def _log_rows_frame(data, base_time):
+    """Linhas já lidas do log Xcockpit (lista de dicts) -> DataFrame do app."""
+    df = pd.DataFrame(data)
+
+    time_deltas = pd.to_timedelta(df['Timestamp_str'], errors='coerce')
+    df['Timestamp'] = (base_time + time_deltas).where(time_deltas.notna())
+    df = df.dropna(subset=['Timestamp']).reset_index(drop=True)
+    if not df.empty:
+        df['Timestamp_str'] = df['Timestamp'].dt.strftime('%H:%M:%S.%f').str[:-3]
+
+    if "Yaw" in df.columns and not df["Yaw"].isnull().all():
+        df["Yaw"] = ((df["Yaw"] + 180) % 360) - 180
+
+    return df
+
+
+def iter_log_file_chunks(file_path, chunk_rows=50_000):
     """
-    Analisa o arquivo de log para extrair todos os dados de telemetria
-    de forma robusta à ordem dos campos.
+    Lê o log Xcockpit em blocos de ``chunk_rows`` linhas, devolvendo um DataFrame
+    por bloco (mesmas colunas de parse_log_file). Usado direto para logs muito
+    longos, que não cabem inteiros na memória.
     """
-    key_to_name = {
-        '?': 'ModoVoo', 'P': 'Pitch', 'R': 'Roll', 'Y': 'Yaw', 'H': 'AltitudeAbs',
-        'S': 'ASI', 'Q': 'QNE', 'u': 'WSI', 'o': 'WindDirection', '%': 'GNSS_Select',
-        'n': 'RPM', 't': 'CHT', 's': 'FuelLevel_dig', '¢': 'AT', '=': 'FuelLevel_anag',
-        'N': 'Latitude', 'E': 'Longitude', 'V': 'VSI', 'U': 'GSI', 'D': 'Alt_geoidal',
-        'O': 'Path_angle', 'I': 'RTK_Status', 'G': 'Satellites', 'F': 'Sat_use',
-        'h': 'Incert_Long', 'v': 'Incert_pos_z', 'y': 'Spoofing', 'x': 'Jamming',
-        'a': 'Voltage', 'e': 'Filt_VDC', 'b': 'Porcent_bat', "'": 'ForceG',
-        "¨": 'IsFlying', '@': 'N_ForcedLanding', 'c': 'IsForcedLanding',
-        'd': 'isVTOL', 'l': 'Elevator', 'r': 'Aileron', 'f': 'FailNumber',
-        'p': 'ProtectionNumber', 'º': 'VTOL_vbat', 'B': 'AFGNS_Select',
-    }
-    
+    key_to_name = XCOCKPIT_KEY_TO_NAME
     keys_str = ''.join(re.escape(k) for k in key_to_name.keys())
     pattern = re.compile(f"([{keys_str}])(-?\\d+(?:\\.\\d+)?)")
+    base_time = _infer_base_time_from_parent(file_path)
 
     data = []
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                ts_match = re.match(r"^(\d{2}:\d{2}:\d{2}\.\d{3})", line)
-                if not ts_match:
-                    continue
-                
-                timestamp_str = ts_match.group(1)
-                
-                row_data = {name: np.nan for name in key_to_name.values()}
-                row_data["Timestamp_str"] = timestamp_str
-
-                matches = pattern.findall(line)
-                
-                for key, value in matches:
-                    col_name = key_to_name.get(key)
-                    if col_name:
-                        try:
-                            row_data[col_name] = float(value)
-                        except (ValueError, TypeError):
-                            pass
-                
-                data.append(row_data)
+    with open_log_text(file_path) as f:
+        for line in f:
+            ts_match = re.match(r"^(\d{2}:\d{2}:\d{2}\.\d{3})", line)
+            if not ts_match:
+                continue
+
+            timestamp_str = ts_match.group(1)
+
+            row_data = {name: np.nan for name in key_to_name.values()}
+            row_data["Timestamp_str"] = timestamp_str
+
+            matches = pattern.findall(line)
 
+            for key, value in matches:
+                col_name = key_to_name.get(key)
+                if col_name:
+                    try:
+                        row_data[col_name] = float(value)
+                    except (ValueError, TypeError):
+                        pass
+
+            data.append(row_data)
+            if len(data) >= chunk_rows:
+                yield _log_rows_frame(data, base_time)
+                data = []
+
+    if data:
+        yield _log_rows_frame(data, base_time)
+
+
+def parse_log_file(file_path):
+    """
+    Analisa o arquivo de log para extrair todos os dados de telemetria
+    de forma robusta à ordem dos campos.
+    """
+    try:
+        chunks = [chunk for chunk in iter_log_file_chunks(file_path) if not chunk.empty]
     except Exception as e:
         print(f"Erro ao ler o arquivo: {e}")
         return pd.DataFrame()
 
-    if not data:
+    if not chunks:
         return pd.DataFrame()
 
-    df = pd.DataFrame(data)
-
-    base_time = _infer_base_time_from_parent(file_path)
-    time_deltas = pd.to_timedelta(df['Timestamp_str'], errors='coerce')
-    df['Timestamp'] = (base_time + time_deltas).where(time_deltas.notna())
-    df = df.dropna(subset=['Timestamp']).reset_index(drop=True)
-    if not df.empty:
-        df['Timestamp_str'] = df['Timestamp'].dt.strftime('%H:%M:%S.%f').str[:-3]
-    
-    if "Yaw" in df.columns and not df["Yaw"].isnull().all():
-        df["Yaw"] = ((df["Yaw"] + 180) % 360) - 180
-        
-    return df
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
 
 def parse_csv_file(file_path):
     """Analisa CSV no formato Monit_X_SY e converte para DataFrame compatível com o app."""
     try:
-        df = pd.read_csv(file_path)
+        with open_log_binary(file_path) as handle:
+            df = pd.read_csv(handle)
 
         base_time = _infer_base_time_from_parent(file_path)
         # Em muitos CSVs o passo é ~1s; se o seu CSV tiver uma coluna de tempo, pode trocar por ela.
@@ -1089,7 +1160,8 @@ def parse_datalogger_file(file_path):
 
     try:
         # separador ';'
-        df_raw = pd.read_csv(file_path, sep=';', engine='python')
+        with open_log_binary(file_path) as handle:
+            df_raw = pd.read_csv(handle, sep=';', engine='python')
     except Exception as e:
         print(f"ERRO ao ler datalogger '{file_path}': {e}")
         return pd.DataFrame()
@@ -1220,20 +1292,140 @@ def parse_datalogger_file(file_path):
 # ==========================================================
 # === Classe Worker Modificada para Busca Hierárquica ===
 # ==========================================================
+def _parse_maybe_chunked(file_path, parse, iter_chunks):
+    """``parse(file_path)`` ou, acima do limite de tamanho, o resumo do armazenamento em blocos."""
+    settings = chunked_settings()
+    if not should_chunk(file_path, settings):
+        return parse(file_path)
+    try:
+        return load_chunked_log(file_path, iter_chunks, settings)
+    except Exception as e:
+        print(f"ERRO ao processar {os.path.basename(file_path)} em blocos: {e}. Lendo o arquivo inteiro.")
+        import traceback; traceback.print_exc()
+        return parse(file_path)
+
+
+def load_folder_logs(folder_path, folder_label, on_loaded=None, existing_names=()):
+    """Lê os logs de UMA pasta (principal + dataloggers), como no carregamento da GUI.
+
+    Retorna uma lista de ``(nome_exibido, df, tipo, arquivo_fonte)``; a função
+    é usada tanto pelo :class:`LogProcessingWorker` quanto pelos relatórios
+    em lote (em processos separados). ``on_loaded(nome, tipo)`` é chamado a
+    cada log lido; ``existing_names`` são nomes já usados por outras pastas.
+    """
+    results = []
+    df_main = pd.DataFrame()
+    main_type = "Nenhum"
+    main_filename = ""
+
+    # 1. Procura por GCFS_AIRPLANE_*.log (Xcockpit)
+    try:
+        for filename in os.listdir(folder_path):
+            if filename.startswith("GCFS_AIRPLANE_") and strip_compression(filename).lower().endswith(".log"):
+                log_file_path = os.path.join(folder_path, filename)
+                df_main = _parse_maybe_chunked(log_file_path, parse_log_file, iter_log_file_chunks)
+                if not df_main.empty:
+                    main_type = "Xcockpit (.log)"
+                    main_filename = filename
+                break
+    except Exception as list_e:
+        print(f"Erro ao listar arquivos .log em {folder_path}: {list_e}")
+
+    # 2. Se não encontrou Xcockpit .log, procura por GCFS_AIRPLANE_*.csv
+    if df_main.empty:
+        try:
+            for filename in os.listdir(folder_path):
+                if filename.startswith("GCFS_AIRPLANE_") and strip_compression(filename).lower().endswith(".csv"):
+                    log_file_path = os.path.join(folder_path, filename)
+                    df_main = parse_csv_file(log_file_path)
+                    if not df_main.empty:
+                        main_type = "CSV (.csv)"
+                        main_filename = filename
+                    break
+        except Exception as list_e:
+            print(f"Erro ao listar arquivos .csv em {folder_path}: {list_e}")
+
+    # 3. Se não encontrou Xcockpit nem CSV, procura por spi.log e chama o C Decoder
+    if df_main.empty:
+        spi_path = find_log_file(os.path.join(folder_path, "spi.log"))
+        if spi_path:
+            df_main = parse_spi_log_via_c(spi_path)
+            if not df_main.empty:
+                main_type = "Embarcado (spi.log via C)"
+                main_filename = os.path.basename(spi_path)
+
+    # 4. Se ainda não achou nada, procura o log embarcado AFGS_Monitoring.log
+    if df_main.empty:
+        afgs_path = find_log_file(os.path.join(folder_path, "AFGS_Monitoring.log"))
+        if afgs_path:
+            df_main = _parse_maybe_chunked(afgs_path, parse_afgs_monitoring_log, iter_afgs_monitoring_chunks)
+            if not df_main.empty:
+                main_type = "Embarcado (AFGS_Monitoring.log)"
+                main_filename = os.path.basename(afgs_path)
+
+    # 5. Busca .mat (embarcado em .mat - mesmo mapeamento do AFGS.log)
+    if df_main.empty:
+        try:
+            for filename in os.listdir(folder_path):
+                if filename.lower().endswith(".mat"):
+                    mat_path = os.path.join(folder_path, filename)
+                    df_main = parse_mat_file(mat_path)
+                    if not df_main.empty:
+                        main_type = "Embarcado (.mat)"
+                        main_filename = filename
+                        break
+        except Exception as list_e:
+            print(f"Erro ao listar/ler .mat em {folder_path}: {list_e}")
+
+    # 6. Busca logXX.csv (Datalogger) – pode haver vários na mesma pasta
+    names = set()
+    try:
+        for filename in os.listdir(folder_path):
+            if filename.lower().startswith("log") and strip_compression(filename).lower().endswith(".csv"):
+                log_path = os.path.join(folder_path, filename)
+                df_d = parse_datalogger_file(log_path)
+                if not df_d.empty:
+                    # Nome exibido: <pasta> - <arquivo>
+                    display_name = f"{folder_label} - {filename}"
+                    names.add(display_name)
+                    results.append((display_name, df_d, "Datalogger (logXX.csv)", log_path))
+                    if on_loaded is not None:
+                        on_loaded(display_name, "Datalogger (logXX.csv)")
+    except Exception as list_e:
+        print(f"Erro ao ler datalogger .csv em {folder_path}: {list_e}")
+
+    # Se encontrou um log "principal" (telemetria), registra também
+    if not df_main.empty:
+        # Se já existe chave com o mesmo nome, desambigua
+        display_name = folder_label
+        if display_name in names or display_name in existing_names:
+            display_name = f"{folder_label} - {main_filename or main_type}"
+        results.append((display_name, df_main, main_type, os.path.join(folder_path, main_filename)))
+        if on_loaded is not None:
+            on_loaded(display_name, main_type)
+    return results
+
+
 class LogProcessingWorker(QObject):
-    finished = pyqtSignal(dict)
+    finished = pyqtSignal(object)       # dict (ou o LogStore recebido) nome -> DataFrame
     progress = pyqtSignal(int)          # porcentagem
     log_loaded = pyqtSignal(str, str)   # (log_name, log_type)
+    sources_ready = pyqtSignal(dict)    # log_name -> arquivo de origem (emitido antes de finished)
     error = pyqtSignal(str)
 
-    def __init__(self, root_path):
+    def __init__(self, root_path, signal_index=None, log_store=None):
         super().__init__()
         self.root_path = root_path
+        # SignalIndex opcional: os nomes de sinais são indexados à medida que cada log carrega
+        self.signal_index = signal_index
+        # LogStore opcional: cada log entra nele ao ser lido (o teto de RAM vale já no carregamento)
+        self.log_store = log_store
         self._is_running = True
 
     def run(self):
         try:
-            loaded_logs = {}
+            loaded_logs = self.log_store if self.log_store is not None else {}
+            log_sources = {}
 
             # -------------------------------------------
             # Conta diretórios + prepara lista de itens
@@ -1258,96 +1450,18 @@ class LogProcessingWorker(QObject):
             # (serve tanto pra raiz quanto pras subpastas)
             # -------------------------------------------
             def process_folder(folder_path, folder_label):
-                nonlocal processed_count, loaded_logs, total_units
+                nonlocal processed_count, total_units
 
                 if not self._is_running:
                     return
 
-                df_main = pd.DataFrame()
-                main_type = "Nenhum"
-                main_filename = ""
-
-                # 1. Procura por GCFS_AIRPLANE_*.log (Xcockpit)
-                try:
-                    for filename in os.listdir(folder_path):
-                        if filename.startswith("GCFS_AIRPLANE_") and filename.lower().endswith(".log"):
-                            log_file_path = os.path.join(folder_path, filename)
-                            df_main = parse_log_file(log_file_path)
-                            if not df_main.empty:
-                                main_type = "Xcockpit (.log)"
-                                main_filename = filename
-                            break
-                except Exception as list_e:
-                    print(f"Erro ao listar arquivos .log em {folder_path}: {list_e}")
-
-                # 2. Se não encontrou Xcockpit .log, procura por GCFS_AIRPLANE_*.csv
-                if df_main.empty:
-                    try:
-                        for filename in os.listdir(folder_path):
-                            if filename.startswith("GCFS_AIRPLANE_") and filename.lower().endswith(".csv"):
-                                log_file_path = os.path.join(folder_path, filename)
-                                df_main = parse_csv_file(log_file_path)
-                                if not df_main.empty:
-                                    main_type = "CSV (.csv)"
-                                    main_filename = filename
-                                break
-                    except Exception as list_e:
-                        print(f"Erro ao listar arquivos .csv em {folder_path}: {list_e}")
-
-                # 3. Se não encontrou Xcockpit nem CSV, procura por spi.log e chama o C Decoder
-                if df_main.empty:
-                    spi_path = os.path.join(folder_path, "spi.log")
-                    if os.path.exists(spi_path):
-                        df_main = parse_spi_log_via_c(spi_path)
-                        if not df_main.empty:
-                            main_type = "Embarcado (spi.log via C)"
-                            main_filename = "spi.log"
-
-                # 4. Se ainda não achou nada, procura o log embarcado AFGS_Monitoring.log
-                if df_main.empty:
-                    afgs_path = os.path.join(folder_path, "AFGS_Monitoring.log")
-                    if os.path.exists(afgs_path):
-                        df_main = parse_afgs_monitoring_log(afgs_path)
-                        if not df_main.empty:
-                            main_type = "Embarcado (AFGS_Monitoring.log)"
-                            main_filename = "AFGS_Monitoring.log"
-
-                # 5. Busca .mat (embarcado em .mat - mesmo mapeamento do AFGS.log)
-                if df_main.empty:
-                    try:
-                        for filename in os.listdir(folder_path):
-                            if filename.lower().endswith(".mat"):
-                                mat_path = os.path.join(folder_path, filename)
-                                df_main = parse_mat_file(mat_path)
-                                if not df_main.empty:
-                                    main_type = "Embarcado (.mat)"
-                                    main_filename = filename
-                                    break
-                    except Exception as list_e:
-                        print(f"Erro ao listar/ler .mat em {folder_path}: {list_e}")
-
-                # 6. Busca logXX.csv (Datalogger) – pode haver vários na mesma pasta
-                try:
-                    for filename in os.listdir(folder_path):
-                        if filename.lower().startswith("log") and filename.lower().endswith(".csv"):
-                            log_path = os.path.join(folder_path, filename)
-                            df_d = parse_datalogger_file(log_path)
-                            if not df_d.empty:
-                                # Nome exibido: <pasta> - <arquivo>
-                                display_name = f"{folder_label} - {filename}"
-                                loaded_logs[display_name] = df_d
-                                self.log_loaded.emit(display_name, "Datalogger (logXX.csv)")
-                except Exception as list_e:
-                    print(f"Erro ao ler datalogger .csv em {folder_path}: {list_e}")
-
-                # Se encontrou um log "principal" (telemetria), registra também
-                if not df_main.empty:
-                    # Se já existe chave com o mesmo nome, desambigua
-                    display_name = folder_label
-                    if display_name in loaded_logs:
-                        display_name = f"{folder_label} - {main_filename or main_type}"
-                    loaded_logs[display_name] = df_main
-                    self.log_loaded.emit(display_name, main_type)
+                for display_name, df, _log_type, source in load_folder_logs(
+                    folder_path, folder_label, on_loaded=self.log_loaded.emit, existing_names=loaded_logs
+                ):
+                    loaded_logs[display_name] = df
+                    log_sources[display_name] = source
+                    if self.signal_index is not None:
+                        self.signal_index.add_log(display_name, df)
 
                 # Atualiza progresso para essa unidade (pasta ou raiz)
                 processed_count += 1
@@ -1374,6 +1488,7 @@ class LogProcessingWorker(QObject):
                 self.progress.emit(100)
 
             if self._is_running:
+                self.sources_ready.emit(log_sources)
                 self.finished.emit(loaded_logs)
 
         except Exception as e:
@@ -4,7 +4,6 @@
 
 import sys
 import os
-import io
 import time
 import shutil
 import json
@@ -12,6 +11,7 @@ import math
 from string import Template
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -20,30 +20,49 @@ from PyQt6.QtWidgets import (
     QLabel, QDialog, QProgressBar, QTextEdit,
     QCheckBox, QStackedWidget
 )
-from PyQt6.QtCore import Qt, QUrl, QThread, pyqtSignal, QIODevice, QBuffer, QTimer
+from PyQt6.QtCore import Qt, QUrl, QThread, pyqtSignal, QTimer, QEvent
 from PyQt6.QtGui import QMovie
+# O QtWebEngine precisa ser importado antes de criar a QApplication
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineSettings
+from PyQt6.QtWebEngineCore import QWebEngineSettings, QWebEngineProfile, QWebEnginePage
 import pandas as pd
 import numpy as np
-import folium
-from folium import CustomIcon
-from geopy.distance import geodesic
 
-# Importações da arquitetura modular
+# Importações da arquitetura modular. Subsistemas pesados (folium, matplotlib,
+# pyqtgraph, reportlab) e diálogos sob demanda são importados no primeiro uso.
 from src.data_parser import LogProcessingWorker
-from src.widgets.standard_plots_widget import StandardPlotsWidget
-from src.widgets.all_plots_widget import AllPlotsWidget
-from src.widgets.custom_plot_widget import CustomPlotWidget
+from src.utils import startup_profile
 from src.utils.config_manager import load_config
 from src.utils.local_server import MapServer
-from src.utils.pdf_reporter import PdfReportWorker
-from src.utils.resource_paths import get_logs_directory, resource_path
-from src.utils.sharepoint_downloader import SharePointClient, SharePointCredentialError
-from src.widgets.log_download_dialog import LogDownloadDialog
-from src.widgets.options_dialog import OptionsDialog
-from src.utils.gpu_utils import apply_best_gpu_env
-from src.utils.mode_utils import compute_mode_segments, build_mode_path_segments
+from src.utils.vendor_assets import (
+    cesium_base_url,
+    has_local_cesium,
+    leaflet_resource_urls,
+    localize_folium_resources,
+    warmup_resource_urls,
+)
+from src.utils.web_surface import SURFACE_MAP_JS_NAME, render_web_surface_html
+from src.utils.tile_cache import (
+    DEFAULT_TILE_PROVIDERS,
+    FETCH_TIMEOUT_S,
+    SEED_MAX_WORKERS,
+    TileCache,
+    TileSeedWorker,
+    bbox_from_coordinates,
+)
+from src.utils.resource_paths import get_appdata_dir, get_logs_directory, get_tile_cache_dir, resource_path
+from src.utils.gpu_utils import start_gpu_probe
+from src.utils.track_payload import build_track_payload, encode_payload, summarize_payload
+from src.utils.log_artifacts import ArtifactCache, ArtifactPreparationWorker
+from src.utils.log_store import LogStore, format_bytes
+from src.utils.event_index import EventIndex, TimeLookup, marker_events
+from src.utils.mode_utils import epoch_seconds_array
+from src.utils.signal_index import SignalIndex
+
+if TYPE_CHECKING:
+    from src.utils.sharepoint_downloader import SharePointClient
+    from src.widgets.fleet_stats_dialog import FleetStatsDialog
+    from src.widgets.log_download_dialog import LogDownloadDialog
 
 AIRCRAFT_ICON_PATH = resource_path('aircraft.svg')
 WIND_ICON_PATH = resource_path('seta.svg')
@@ -86,32 +105,59 @@ class LoadingDialog(QDialog):
             self.movie.stop()
 
 class TelemetryApp(QMainWindow):
+    # Emitido quando a parte adiada da inicialização (abas, mapa, 3D) termina
+    startup_finished = pyqtSignal()
+    # Log saiu da RAM (o LogStore pode avisar de dentro do worker de carregamento)
+    log_evicted = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         self.original_window_title = "SUPER VISUALIZADOR DE LOG DO EULER!! (～￣▽￣)～ - v0.2.3"
         self.setWindowTitle(self.original_window_title) 
         self.setGeometry(100, 100, 1600, 900)
         
-        self.log_data = {}
+        # Logs carregados (nome -> DataFrame) com teto de RAM: os vistos há mais tempo vão para o disco
+        self.log_data = LogStore()
+        self.log_data.add_evict_listener(self._on_log_evicted)
+        self.log_evicted.connect(self._release_evicted_log)
+        # Arquivo de origem e tipo de cada log (relatórios em lote)
+        self.log_sources = {}
+        self.log_types = {}
+        # Nomes de sinais de todos os logs (alimentado pelo worker durante o carregamento)
+        self.signal_index = SignalIndex()
         self.current_log_name = ""
         self.df = pd.DataFrame()
         self.thread = None
         self.worker = None
 
         self.app_config = load_config()
-        self.selected_gpu = apply_best_gpu_env(self.app_config.get("gpu", {}).get("preferred_index"))
+        # nvidia-smi roda em paralelo (o run.py já o inicia antes dos imports da GUI)
+        self.gpu_probe = start_gpu_probe(self.app_config.get("gpu", {}).get("preferred_index"))
+        self.selected_gpu = None
 
         self.default_logs_dir = DEFAULT_LOGS_DIR
         self.last_logs_root = DEFAULT_LOGS_DIR
 
-        self.map_server = MapServer()
-        self.map_server.start()
+        self.tile_cache = self._create_tile_cache(self.app_config.get("tiles", {}))
+        self.tile_seed_jobs = []
+        # Relatório PDF: jobs de renderização e pool de processos reaproveitado
+        self.report_jobs = []
+        self.batch_report_jobs = []
+        self.report_executor = None
+        self.map_server = MapServer(tile_cache=self.tile_cache)
+        with startup_profile.section("servidor local"):
+            self.map_server.start()
         self.temp_map_file_path = ""
         self.map_js_name = ""
         self.map_is_ready = False 
         self.aircraft_marker_js_name = ""
         self.wind_marker_js_name = ""
         self.standard_plots_tab = None
+        self.custom_plot_tab = None
+        self.all_plots_tab = None
+        self.summary_tab = None
+        self.events_tab = None
+        self._deferred_startup_scheduled = False
 
         self.loading_widget = LoadingDialog(self, animation_path=LOADING_GIF_PATH)
 
@@ -131,36 +177,10 @@ class TelemetryApp(QMainWindow):
         self.cesium_sync_timer = QTimer(self)
         self.cesium_sync_timer.setInterval(self._current_sync_interval())
         self.cesium_sync_timer.timeout.connect(self._sync_cesium_timeline_into_app)
-        self.cesium_imagery_presets = [
-            {
-                "key": "osm",
-                "label": "OpenStreetMap (padrão)",
-                "url": "https://tile.openstreetmap.org/{z}/{x}/{y}.png",
-                "credit": "© OpenStreetMap contributors",
-                "tilingScheme": "webMercator",
-                "maximumLevel": 19
-            },
-            {
-                "key": "esriWorldImagery",
-                "label": "Esri World Imagery (satélite)",
-                "url": "https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}",
-                "credit": "Esri, Maxar, GeoEye, Earthstar Geographics",
-                "tilingScheme": "webMercator",
-                "maximumLevel": 19
-            },
-            {
-                "key": "cartoDark",
-                "label": "Carto Dark Matter",
-                "url": "https://cartodb-basemaps-a.global.ssl.fastly.net/dark_all/{z}/{x}/{y}.png",
-                "credit": "© CARTO",
-                "tilingScheme": "webMercator",
-                "maximumLevel": 19
-            }
-        ]
+        self.cesium_imagery_presets = self._build_imagery_presets()
         self.current_cesium_imagery_key = self.cesium_imagery_presets[0]["key"] if self.cesium_imagery_presets else "osm"
         self.altitude_reference = 0.0
         self.current_timeline_index = 0
-        self.last_plot_cursor_update_time = 0.0
 
         self.aircraft_icon_filename = None
         self.wind_icon_filename = None
@@ -169,10 +189,187 @@ class TelemetryApp(QMainWindow):
 
         self.copy_assets_to_server(self.cesium_plane_asset)
 
-        self.setup_ui()
+        self.web_profile = None
+        self.web_warmup_view = None
+        self.map_page_loaded = False
+        self.track_payload = None
+        self.track_payload_url = ""
+        self.track_payload_name = ""
+        self.track_payload_seq = 0
+        self.cesium_state = None
+        # Artefatos por log (trajetória, segmentos de modo, índices de plot) preparados em background
+        self.artifact_cache = ArtifactCache()
+        self.artifact_jobs = []
+        self.artifact_inflight = set()
+        self.pending_log_selection = ""
+        # Modo opcional: mapa 2D, globo 3D e timeline numa única página/renderer
+        self.use_web_surface = bool(self.app_config.get("web", {}).get("single_surface", False))
+        self.web_surface = None
+        self.web_surface_path = ""
+        # As flags do Chromium precisam estar no ambiente antes da primeira view web
+        probe_timeout_s = float(self.app_config.get("startup", {}).get("gpu_probe_timeout_ms", 2000)) / 1000.0
+        with startup_profile.section("espera da consulta de GPU"):
+            self.selected_gpu = self.gpu_probe.apply(timeout=probe_timeout_s)
+        with startup_profile.section("setup_ui"):
+            self.setup_ui()
+        # Abas de gráficos, mapa e 3D ficam para depois da primeira pintura (_finish_startup)
+
+        self.sharepoint_client: "SharePointClient | None" = None
+        self.log_download_dialog: "LogDownloadDialog | None" = None
+        self.fleet_stats_dialog: "FleetStatsDialog | None" = None
+
+    def event(self, event):
+        if not self._deferred_startup_scheduled and event.type() == QEvent.Type.Paint:
+            startup_profile.mark(startup_profile.FIRST_PAINT_MARK)
+            self._schedule_deferred_startup()
+        return super().event(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Garantia caso a janela seja mostrada sem pintar (ex.: minimizada)
+        QTimer.singleShot(1000, self._schedule_deferred_startup)
+
+    def _schedule_deferred_startup(self):
+        if self._deferred_startup_scheduled:
+            return
+        self._deferred_startup_scheduled = True
+        QTimer.singleShot(0, self._finish_startup)
+
+    def _finish_startup(self):
+        """Parte da inicialização feita logo depois de a janela aparecer."""
+        with startup_profile.section("abas de gráficos (adiado)"):
+            self.setup_tabs()
+        # Mapa, 3D e timeline são carregados uma única vez; trocar de log só envia dados
+        with startup_profile.section("páginas do mapa e do 3D (adiado)"):
+            self.load_map_page()
+            self.show_cesium_3d_view()
+        self._prewarm_web_runtime()
+        startup_profile.mark(startup_profile.DEFERRED_DONE_MARK)
+        self.startup_finished.emit()
+
+    def _create_tile_cache(self, tiles_cfg):
+        try:
+            max_mb = float(tiles_cfg.get("cache_max_mb", 1024))
+            cache = TileCache(
+                get_tile_cache_dir(create=True),
+                max_bytes=int(max_mb * 1024 * 1024),
+                offline=bool(tiles_cfg.get("offline", False)),
+            )
+            print(f"INFO: Cache de tiles em {cache.root} ({cache.total_bytes / 1e6:.1f} MB)")
+            return cache
+        except Exception as exc:
+            print(f"AVISO: Cache de tiles indisponível, usando tiles direto da internet: {exc}")
+            return None
+
+    def _build_imagery_presets(self):
+        """Presets de imagery do Cesium apontando para o proxy local de tiles."""
+        presets = []
+        for provider in DEFAULT_TILE_PROVIDERS.values():
+            if self.tile_cache is not None:
+                url = self.map_server.tile_url_template(provider.key)
+                subdomains = []
+            else:
+                url = provider.url
+                subdomains = list(provider.subdomains)
+            preset = {
+                "key": provider.key,
+                "label": provider.label,
+                "url": url,
+                "credit": provider.credit,
+                "tilingScheme": "webMercator",
+                "maximumLevel": provider.max_zoom,
+            }
+            if subdomains:
+                preset["subdomains"] = subdomains
+            presets.append(preset)
+        return presets
+
+    def _map_tile_layer(self, provider_key="osm"):
+        import folium
+
+        provider = DEFAULT_TILE_PROVIDERS[provider_key]
+        if self.tile_cache is not None:
+            tiles_url = self.map_server.tile_url_template(provider_key)
+        else:
+            tiles_url = provider.url
+        return folium.TileLayer(
+            tiles=tiles_url,
+            attr=provider.credit,
+            name=provider.label,
+            max_zoom=provider.max_zoom,
+            subdomains="".join(provider.subdomains) or "abc",
+        )
+
+    def _start_tile_seed(self):
+        """Pré-carrega em segundo plano os tiles da área do voo ativo."""
+        if self.tile_cache is None or self.df.empty:
+            return
+        tiles_cfg = self.app_config.get("tiles", {})
+        if not tiles_cfg.get("seed_on_load", False) or self.tile_cache.offline:
+            return
+        if 'Latitude' not in self.df.columns or 'Longitude' not in self.df.columns:
+            return
+        bbox = bbox_from_coordinates(self.df['Latitude'].to_numpy(), self.df['Longitude'].to_numpy())
+        if bbox is None:
+            return
+        self._cancel_tile_seed()
+
+        thread = QThread()
+        worker = TileSeedWorker(
+            self.tile_cache,
+            tiles_cfg.get("seed_providers", ["esriWorldImagery"]),
+            bbox,
+            tiles_cfg.get("seed_zooms", []),
+            max_workers=int(tiles_cfg.get("seed_workers", SEED_MAX_WORKERS)),
+            max_tiles=int(tiles_cfg.get("seed_max_tiles", 4000)),
+        )
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_tile_seed_finished)
+        worker.error.connect(lambda msg: print(f"AVISO: Pré-carregamento de tiles falhou: {msg}"))
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        worker.finished.connect(worker.deleteLater)
+        worker.error.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        job = (thread, worker)
+        thread.finished.connect(lambda job=job: self._on_tile_seed_thread_finished(job))
+        # Mantém referências até a thread terminar (um job cancelado pode
+        # ainda estar rodando quando o próximo log é selecionado).
+        self.tile_seed_jobs.append(job)
+        thread.start()
+
+    def _cancel_tile_seed(self):
+        for _thread, worker in list(self.tile_seed_jobs):
+            try:
+                worker.cancel()
+            except RuntimeError:
+                pass
+
+    def _wait_tile_seed(self):
+        """Espera os pré-carregamentos cancelados soltarem o cache (antes de fechar o índice SQLite)."""
+        for _thread, worker in list(self.tile_seed_jobs):
+            try:
+                if not worker.wait_done(FETCH_TIMEOUT_S + 2.0):
+                    print("AVISO: Pré-carregamento de tiles não terminou a tempo.")
+            except RuntimeError:
+                pass
+
+    def _on_tile_seed_finished(self, result):
+        if result is None or result.cancelled:
+            return
+        print(
+            f"INFO: Tiles do voo: {result.requested} pedidos, {result.cached} já em cache, "
+            f"{result.downloaded} baixados, {result.failed} indisponíveis"
+        )
+        if result.downloaded:
+            self.statusBar().showMessage(
+                f"Mapa offline: {result.downloaded} tiles novos salvos em cache", 4000
+            )
 
-        self.sharepoint_client: SharePointClient | None = None
-        self.log_download_dialog: LogDownloadDialog | None = None
+    def _on_tile_seed_thread_finished(self, job):
+        if job in self.tile_seed_jobs:
+            self.tile_seed_jobs.remove(job)
 
     def _register_static_assets(self):
         self.aircraft_icon_filename = self.copy_assets_to_server(AIRCRAFT_ICON_PATH)
@@ -230,10 +427,24 @@ class TelemetryApp(QMainWindow):
         self.log_selector_combo.currentTextChanged.connect(self._on_log_selected)
         self.log_selector_combo.setEnabled(False)
         top_controls_layout.addWidget(self.log_selector_combo, 1)
+        self.log_memory_label = QLabel("")
+        self.log_memory_label.setStyleSheet("color: gray;")
+        top_controls_layout.addWidget(self.log_memory_label)
         self.btn_save_pdf = QPushButton("Salvar Relatório em PDF (do Log Ativo)")
         self.btn_save_pdf.clicked.connect(self.save_report_as_pdf)
         self.btn_save_pdf.setEnabled(False)
         top_controls_layout.addWidget(self.btn_save_pdf)
+        self.btn_batch_reports = QPushButton("Relatórios em Lote...")
+        self.btn_batch_reports.setToolTip("Gera um PDF por voo carregado e um índice (PDF/CSV) com o resumo de todos")
+        self.btn_batch_reports.clicked.connect(self.generate_batch_reports)
+        self.btn_batch_reports.setEnabled(False)
+        top_controls_layout.addWidget(self.btn_batch_reports)
+        self.btn_fleet_stats = QPushButton("Estatísticas da Frota...")
+        self.btn_fleet_stats.setToolTip(
+            "Histograma, percentis ou médias por modo de um sinal em todos os voos de uma pasta raiz"
+        )
+        self.btn_fleet_stats.clicked.connect(self.open_fleet_stats)
+        top_controls_layout.addWidget(self.btn_fleet_stats)
 
         self.view_toggle_checkbox = QCheckBox("Visualização 3D")
         self.view_toggle_checkbox.stateChanged.connect(self.on_view_toggle_changed)
@@ -264,8 +475,7 @@ class TelemetryApp(QMainWindow):
         self.splitter = QSplitter(Qt.Orientation.Horizontal)
 
         # --- Abas (Painel Esquerdo do Splitter) ---
-        self.tabs = QTabWidget()
-        self.setup_tabs() # Cria e adiciona as abas ao QTabWidget
+        self.tabs = QTabWidget() # As abas são criadas em _finish_startup
         self.splitter.addWidget(self.tabs) # Adiciona o QTabWidget ao splitter
         self.tabs.currentChanged.connect(self._on_tab_changed)
 
@@ -273,12 +483,18 @@ class TelemetryApp(QMainWindow):
         map_panel_widget = QWidget()
         map_panel_layout = QVBoxLayout(map_panel_widget)
         map_panel_layout.setContentsMargins(0, 0, 0, 0) # Sem margens internas
-        self.mapWidget = QWebEngineView()
-        self._configure_webview(self.mapWidget)
-        self.mapWidget.loadFinished.connect(self.on_map_load_finished)
-        self.cesiumWidget = QWebEngineView()
+        if self.use_web_surface:
+            # Uma só view para os três painéis; os nomes antigos apontam para ela
+            self.web_surface = self._create_web_view()
+            self.web_surface.loadFinished.connect(self.on_web_surface_load_finished)
+            self.mapWidget = self.web_surface
+            self.cesiumWidget = self.web_surface
+        else:
+            self.mapWidget = self._create_web_view()
+            self.mapWidget.loadFinished.connect(self.on_map_load_finished)
+            self.cesiumWidget = self._create_web_view()
 
-        self.cesiumWidget.loadFinished.connect(self.on_three_d_view_load_finished)
+            self.cesiumWidget.loadFinished.connect(self.on_three_d_view_load_finished)
 
         self.cesium_controls_container = QWidget()
         cesium_controls_layout = QHBoxLayout(self.cesium_controls_container)
@@ -301,7 +517,8 @@ class TelemetryApp(QMainWindow):
 
         self.map_stack = QStackedWidget()
         self.map_stack.addWidget(self.mapWidget)
-        self.map_stack.addWidget(self.cesiumWidget)
+        if self.cesiumWidget is not self.mapWidget:
+            self.map_stack.addWidget(self.cesiumWidget)
         map_panel_layout.addWidget(self.map_stack, 1)
         map_panel_layout.addWidget(self.cesium_controls_container)
         self.map_stack.setCurrentWidget(self.mapWidget)
@@ -327,6 +544,70 @@ class TelemetryApp(QMainWindow):
                 5000,
             )
 
+    def _get_web_profile(self):
+        """Perfil web persistente compartilhado pelas views (cache HTTP em disco).
+
+        O perfil padrão do Qt 6 é "off-the-record" e descarta o cache ao fechar;
+        com um perfil nomeado o Cesium/Leaflet e o código JS compilado ficam
+        em disco entre execuções.
+        """
+        if self.web_profile is None:
+            profile = QWebEngineProfile("XmobotsLogViewer", QApplication.instance())
+            try:
+                cache_dir = get_appdata_dir("WebCache", create=True)
+                profile.setCachePath(str(cache_dir))
+                profile.setPersistentStoragePath(str(cache_dir / "storage"))
+                profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+                profile.setHttpCacheMaximumSize(512 * 1024 * 1024)
+            except Exception as exc:
+                print(f"AVISO: Não foi possível configurar o cache web em disco: {exc}")
+            self.web_profile = profile
+        return self.web_profile
+
+    def _create_web_view(self):
+        view = QWebEngineView()
+        page = QWebEnginePage(self._get_web_profile(), view)
+        view.setPage(page)
+        self._configure_webview(view)
+        return view
+
+    def _server_url(self, relative_path):
+        return f"http://127.0.0.1:{self.map_server.get_port()}/{relative_path}"
+
+    def _prewarm_web_runtime(self):
+        """Carrega Cesium/Leaflet numa view oculta para aquecer o cache HTTP e de código."""
+        try:
+            urls = warmup_resource_urls(self.map_server.get_port())
+        except Exception as exc:
+            print(f"AVISO: Pré-aquecimento web ignorado: {exc}")
+            return
+        tags = []
+        for url in urls:
+            if url.endswith(".css"):
+                tags.append(f"<link rel='stylesheet' href='{url}'>")
+            else:
+                tags.append(f"<script src='{url}' defer></script>")
+        html = "<!DOCTYPE html><html><head><meta charset='utf-8'>" + "".join(tags) + "</head><body></body></html>"
+        warmup_path = os.path.join(self.map_server.get_temp_dir(), "warmup.html")
+        with open(warmup_path, "w", encoding="utf-8") as f:
+            f.write(html)
+
+        self.web_warmup_view = self._create_web_view()
+        self.web_warmup_view.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+        started = time.perf_counter()
+
+        def _done(ok):
+            elapsed = (time.perf_counter() - started) * 1000.0
+            origin = "local" if has_local_cesium() else "CDN"
+            print(f"INFO: Runtime web pré-aquecido ({origin}) em {elapsed:.0f} ms (ok={ok})")
+            view = self.web_warmup_view
+            self.web_warmup_view = None
+            if view is not None:
+                view.deleteLater()
+
+        self.web_warmup_view.loadFinished.connect(_done)
+        self.web_warmup_view.load(QUrl(self._server_url("warmup.html")))
+
     def _configure_webview(self, webview):
         if not webview:
             return
@@ -341,23 +622,41 @@ class TelemetryApp(QMainWindow):
         )
 
     def setup_tabs(self):
+        # matplotlib/pyqtgraph só são carregados aqui, depois da primeira pintura
+        from src.widgets.standard_plots_widget import StandardPlotsWidget
+        from src.widgets.all_plots_widget import AllPlotsWidget
+        from src.widgets.custom_plot_widget import CustomPlotWidget
+        from src.widgets.flight_summary_widget import FlightSummaryWidget
+        from src.widgets.event_list_widget import EventListWidget
+
         self.standard_plots_tab = StandardPlotsWidget(self) # Cria o novo widget
         self.tabs.addTab(self.standard_plots_tab, "Gráficos Padrão")
 
-        self.custom_plot_tab = CustomPlotWidget(self)
+        self.custom_plot_tab = CustomPlotWidget(self, signal_index=self.signal_index)
         self.tabs.addTab(self.custom_plot_tab, "Gráfico de Comparação")
 
         self.all_plots_tab = AllPlotsWidget(self)
         self.tabs.addTab(self.all_plots_tab, "Todos os Gráficos (Log Ativo)")
 
+        self.summary_tab = FlightSummaryWidget(self)
+        self.tabs.addTab(self.summary_tab, "Resumo dos Voos")
+
+        self.events_tab = EventListWidget(self)
+        self.events_tab.event_activated.connect(self._jump_to_event)
+        self.tabs.addTab(self.events_tab, "Eventos")
+
     def setup_timeline_controls(self, parent_layout):
         wrapper_layout = QHBoxLayout()
         #wrapper_layout.setContentsMargins(4, 4, 4, 4)
         #wrapper_layout.setSpacing(10)
 
-        self.timelineWidget = QWebEngineView()
-        self.timelineWidget.setFixedHeight(45)
-        self.timelineWidget.loadFinished.connect(self.on_timeline_load_finished)
+        if self.web_surface is not None:
+            # A timeline fica no rodapé da página única (mesmo relógio do 3D)
+            self.timelineWidget = self.web_surface
+        else:
+            self.timelineWidget = self._create_web_view()
+            self.timelineWidget.setFixedHeight(45)
+            self.timelineWidget.loadFinished.connect(self.on_timeline_load_finished)
 
         controls_layout = QHBoxLayout()
         controls_layout.setContentsMargins(0, 0, 0, 0)
@@ -376,7 +675,10 @@ class TelemetryApp(QMainWindow):
         controls_container = QWidget()
         controls_container.setLayout(controls_layout)
 
-        wrapper_layout.addWidget(self.timelineWidget, 1)
+        if self.web_surface is None:
+            wrapper_layout.addWidget(self.timelineWidget, 1)
+        else:
+            wrapper_layout.addStretch(1)
         wrapper_layout.addWidget(controls_container, 0)
         parent_layout.addLayout(wrapper_layout)
         self.refresh_timeline_html()
@@ -402,6 +704,8 @@ class TelemetryApp(QMainWindow):
             graph_states = self.all_plots_tab.get_graph_states()
             apply_graphs_cb = self.all_plots_tab.apply_graph_visibility
 
+        from src.widgets.options_dialog import OptionsDialog
+
         dialog = OptionsDialog(
             self,
             graph_titles=graphs_titles,
@@ -411,8 +715,15 @@ class TelemetryApp(QMainWindow):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.app_config = load_config()
             self.cesium_sync_timer.setInterval(self._current_sync_interval())
+            if self.tile_cache is not None:
+                self.tile_cache.set_offline(bool(self.app_config.get("tiles", {}).get("offline", False)))
+            if bool(self.app_config.get("web", {}).get("single_surface", False)) != self.use_web_surface:
+                self.statusBar().showMessage("Modo de página web alterado: reinicie o programa para aplicar.", 6000)
 
     def open_sharepoint_downloader(self):
+        from src.utils.sharepoint_downloader import SharePointClient, SharePointCredentialError
+        from src.widgets.log_download_dialog import LogDownloadDialog
+
         if self.sharepoint_client is None:
             try:
                 self.sharepoint_client = SharePointClient()
@@ -492,21 +803,26 @@ class TelemetryApp(QMainWindow):
         self.loading_widget.open()
 
         self.thread = QThread()
-        self.worker = LogProcessingWorker(root_path)
+        self.worker = LogProcessingWorker(root_path, signal_index=self.signal_index, log_store=self.log_data)
         self.worker.moveToThread(self.thread)
         self.thread.started.connect(self.worker.run)
         self.worker.finished.connect(self.on_loading_finished)
         self.worker.error.connect(self.on_loading_error)
         self.worker.progress.connect(self.on_loading_progress)
         self.worker.log_loaded.connect(self.on_log_item_loaded)
+        self.worker.sources_ready.connect(self._on_log_sources_ready)
 
         self.worker.finished.connect(self.thread.quit)
         self.worker.finished.connect(self.worker.deleteLater)
         self.thread.finished.connect(self.thread.deleteLater)
         self.thread.start()
 
+    def _on_log_sources_ready(self, sources):
+        self.log_sources = dict(sources)
+
     def on_log_item_loaded(self, log_name, log_type):
         """Atualiza a área de texto com o status de cada log."""
+        self.log_types[log_name] = log_type
         message = f"INFO: Log '{log_name}' carregado (Tipo: {log_type})"
         self.status_log_output.append(message)
         print(message) # Mantém no console também, se desejar
@@ -545,13 +861,20 @@ class TelemetryApp(QMainWindow):
             return
 
         self.log_data = loaded_logs
+        if self.summary_tab: self.summary_tab.set_logs(self.log_data)
+        self.btn_batch_reports.setEnabled(not self.batch_report_jobs)
         self.log_selector_combo.blockSignals(True); self.log_selector_combo.addItems(sorted(self.log_data.keys())); self.log_selector_combo.blockSignals(False)
         self.log_selector_combo.setEnabled(True)
         self._on_log_selected(self.log_selector_combo.currentText()) # Seleciona o primeiro
-        self.custom_plot_tab.reload_data(self.log_data)
+        self._update_log_memory_label()
+        if self.custom_plot_tab: self.custom_plot_tab.reload_data(self.log_data)
         self.statusBar().showMessage(f"{len(loaded_logs)} log(s) carregado(s)!!!", 5000)
-        self.loading_widget.stop_animation()
-        self.loading_widget.close()
+        if self.app_config.get("artifacts", {}).get("prefetch_all", True):
+            # Prepara os demais logs em segundo plano: trocar de log vira só "anexar"
+            self._start_artifact_preparation(sorted(self.log_data.keys()))
+        if not self.pending_log_selection:
+            self.loading_widget.stop_animation()
+            self.loading_widget.close()
 
     def on_loading_error(self, error_message):
 
@@ -567,8 +890,16 @@ class TelemetryApp(QMainWindow):
         #self.btn_open.setEnabled(True)
 
     def _clear_all_data(self):
-        self.map_is_ready = False
+        self._cancel_artifact_preparation()
+        self.artifact_cache.clear()
+        self.artifact_inflight.clear()
+        self.pending_log_selection = ""
         self.log_data.clear()
+        self._update_log_memory_label()
+        self.log_sources = {}
+        self.log_types = {}
+        self.signal_index.clear()
+        self.btn_batch_reports.setEnabled(False)
         self.df = pd.DataFrame()
         self.current_log_name = ""
         self.log_selector_combo.blockSignals(True)
@@ -584,86 +915,220 @@ class TelemetryApp(QMainWindow):
 
         if self.map_stack:
             self.map_stack.setCurrentWidget(self.mapWidget)
-
-        self.cleanup_cesium_html()
+        self._set_surface_pane('2d')
 
         if self.standard_plots_tab: self.standard_plots_tab.load_dataframe(pd.DataFrame())
         if self.custom_plot_tab: self.custom_plot_tab.reload_data({})
         if self.all_plots_tab: self.all_plots_tab.load_dataframe(pd.DataFrame(), "")
+        if self.summary_tab: self.summary_tab.set_logs({})
+        self._set_log_events(None)
 
-        self.mapWidget.setHtml("")
+        # As páginas continuam carregadas; só recebem uma trajetória vazia
+        self.track_payload = self._publish_track_payload()
+        self.cesium_state = None
+        self.plot_map_route()
         self.setup_timeline()
 
     def _on_log_selected(self, log_name):
         if not log_name or log_name not in self.log_data: return
         self.current_log_name = log_name
-        self.df = self.log_data[log_name]
+        # O log na tela fica fixo na RAM: self.df e as abas nunca apontam para um log despejado
+        self.df = self.log_data.set_active(log_name)
+        self._update_log_memory_label()
         self._update_altitude_reference()
+        if self.summary_tab: self.summary_tab.set_active_log(log_name)
+
+        artifacts = self.artifact_cache.get(log_name, self.df)
+        if artifacts is not None:
+            self.pending_log_selection = ""
+            self._apply_log_artifacts(artifacts)
+            return
 
+        # Ainda não preparado: calcula fora da GUI e anexa quando ficar pronto
+        self.pending_log_selection = log_name
+        self.statusBar().showMessage(f"Preparando visualizações de '{log_name}'...")
         self.loading_widget.start_animation()
         self.loading_widget.open()
-        QApplication.processEvents()
-
+        self._start_artifact_preparation([log_name])
+
+    def _on_log_evicted(self, log_name):
+        """Log saiu da RAM (LogStore): os artefatos dele apontam para o DataFrame antigo."""
+        self.artifact_cache.discard(log_name)
+        self.log_evicted.emit(log_name)
+
+    def _release_evicted_log(self, log_name):
+        """Na thread da GUI: as abas soltam o que guardavam do log despejado."""
+        if self.custom_plot_tab: self.custom_plot_tab.release_log(log_name)
+        self._update_log_memory_label()
+
+    def _update_log_memory_label(self):
+        """Uso de memória dos logs (total no rótulo, por log na dica)."""
+        usage = self.log_data.usage()
+        if not usage:
+            self.log_memory_label.setText("")
+            self.log_memory_label.setToolTip("")
+            return
+        resident = sum(item.memory_bytes for item in usage if item.resident)
+        spilled = sum(1 for item in usage if not item.resident)
+        text = f"RAM dos logs: {format_bytes(resident)}"
+        if self.log_data.budget_bytes > 0:
+            text += f" / {format_bytes(self.log_data.budget_bytes)}"
+        if spilled:
+            text += f" ({spilled} em disco)"
+        lines = ["Memória por log (visto por último primeiro):"]
+        for item in usage:
+            where = "RAM" if item.resident else f"disco, {format_bytes(item.disk_bytes)}"
+            lines.append(f"{item.name}: {format_bytes(item.memory_bytes)} ({where})")
+        self.log_memory_label.setText(text)
+        self.log_memory_label.setToolTip("\n".join(lines))
+
+    def _apply_log_artifacts(self, artifacts):
+        """Anexa aos widgets os artefatos já calculados do log ativo (thread da GUI)."""
         try:
+            self._set_log_events(artifacts.events if artifacts is not None else None)
             if self.standard_plots_tab: self.standard_plots_tab.load_dataframe(self.df, self.current_log_name)
-            if self.all_plots_tab: self.all_plots_tab.load_dataframe(self.df, self.current_log_name)
+            if self.all_plots_tab: self.all_plots_tab.load_dataframe(self.df, self.current_log_name, artifacts=artifacts)
             # O custom_plot_tab já recebe todos os logs no on_loading_finished
 
             if self.tabs and self.standard_plots_tab:
                 self.tabs.setCurrentWidget(self.standard_plots_tab)
                 self.standard_plots_tab.show_position_plot()
 
-            self.plot_map_route() # Recria o mapa
+            # Páginas web já carregadas: só publica e envia a nova trajetória
+            self.track_payload = self._publish_track_payload(artifacts)
+            self.plot_map_route()
             self.setup_timeline()
 
             self.map_stack.setCurrentWidget(self.mapWidget)
+            self._set_surface_pane('2d')
             self.view_toggle_checkbox.blockSignals(True)
             self.view_toggle_checkbox.setChecked(False)
             self.view_toggle_checkbox.blockSignals(False)
-            self.cesium_state = None
-            self.cesium_ready = False
-            self.cesium_start_timestamp = None
-            self.cleanup_cesium_html()
             self._update_cesium_controls_state()
 
-            cesium_state = self.build_cesium_state_from_dataframe()
-            if cesium_state:
-                self.cesium_state = cesium_state
-                self.view_toggle_checkbox.setEnabled(True)
+            if artifacts is not None:
+                self.cesium_state = artifacts.cesium_state
             else:
-                self.view_toggle_checkbox.setEnabled(False)
+                self.cesium_state = self.build_cesium_state_from_dataframe()
+            self.view_toggle_checkbox.setEnabled(bool(self.cesium_state))
+
+            self._start_tile_seed()
         finally:
             self.loading_widget.stop_animation()
             self.loading_widget.close()
 
+    # --- Preparação de artefatos em segundo plano ---
+
+    def _start_artifact_preparation(self, log_names):
+        jobs = []
+        for name in log_names:
+            # Logs em disco (LogStore) ficam para quando forem selecionados
+            df = self.log_data.peek(name)
+            if df is None or name in self.artifact_inflight or self.artifact_cache.get(name, df) is not None:
+                continue
+            jobs.append((name, df, self.log_sources.get(name)))
+        if not jobs:
+            return
+        names = [job[0] for job in jobs]
+        cfg = self.app_config.get("artifacts", {})
+        try:
+            max_workers = int(cfg.get("max_workers", 2))
+        except Exception:
+            max_workers = 2
+        thread = QThread()
+        worker = ArtifactPreparationWorker(jobs, max_workers=max_workers)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.prepared.connect(self._on_artifacts_prepared)
+        worker.error.connect(self._on_artifacts_error)
+        worker.finished.connect(thread.quit)
+        worker.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        job = (thread, worker, tuple(names))
+        thread.finished.connect(lambda job=job: self._on_artifact_thread_finished(job))
+        self.artifact_inflight.update(names)
+        self.artifact_jobs.append(job)
+        thread.start()
+
+    def _cancel_artifact_preparation(self):
+        for _thread, worker, _names in list(self.artifact_jobs):
+            try:
+                worker.cancel()
+            except RuntimeError:
+                pass
+
+    def _on_artifacts_prepared(self, log_name, artifacts):
+        df = self.log_data.peek(log_name)
+        if df is None or not artifacts.matches(df):
+            return  # Resultado de um carregamento anterior
+        self.artifact_cache.put(artifacts)
+        self.artifact_inflight.discard(log_name)
+        if self.summary_tab and artifacts.stats is not None:
+            self.summary_tab.set_stats(log_name, artifacts.stats)
+        print(f"INFO: Artefatos de '{log_name}' prontos em {artifacts.prepare_ms:.0f} ms")
+        if log_name == self.pending_log_selection and log_name == self.current_log_name:
+            self.pending_log_selection = ""
+            self.statusBar().clearMessage()
+            self._apply_log_artifacts(artifacts)
+
+    def _on_artifacts_error(self, log_name, message):
+        print(f"ERRO: Falha ao preparar artefatos de '{log_name}': {message}")
+        self.artifact_inflight.discard(log_name)
+        if log_name == self.pending_log_selection and log_name == self.current_log_name:
+            # Segue sem artefatos: cada widget calcula o que precisa
+            self.pending_log_selection = ""
+            self._apply_log_artifacts(None)
+
+    def _on_artifact_thread_finished(self, job):
+        if job in self.artifact_jobs:
+            self.artifact_jobs.remove(job)
+        for name in job[2]:
+            if name not in self.artifact_cache:
+                self.artifact_inflight.discard(name)
+        # Seleção pendente cujo job foi cancelado: pede de novo
+        pending = self.pending_log_selection
+        if pending and pending == self.current_log_name and pending not in self.artifact_inflight:
+            self._start_artifact_preparation([pending])
+
     def _on_tab_changed(self, index):
         if not self.tabs:
             return
         widget = self.tabs.widget(index)
         if widget is self.all_plots_tab and self.all_plots_tab:
             self.all_plots_tab.ensure_ready()
-
-    def build_cesium_state_from_dataframe(self):
+        elif widget is self.summary_tab and self.summary_tab:
+            self.summary_tab.ensure_ready()
+
+    # --- Eventos do log ativo ---
+
+    def _set_log_events(self, events):
+        """Lista de eventos + marcas nos gráficos (o AllPlots recebe pelos artefatos)."""
+        log_name = self.current_log_name if events is not None else ""
+        markers = marker_events(events)
+        if self.events_tab: self.events_tab.set_events(log_name, events if events is not None else EventIndex())
+        if self.standard_plots_tab: self.standard_plots_tab.set_events(markers)
+        if self.custom_plot_tab: self.custom_plot_tab.set_events(log_name, markers)
+
+    def _time_lookup(self):
+        """Busca binária instante -> linha do log ativo (vem pronta nos artefatos)."""
+        artifacts = self.artifact_cache.get(self.current_log_name, self.df)
+        if artifacts is not None and artifacts.time_lookup is not None:
+            return artifacts.time_lookup
+        return TimeLookup(epoch_seconds_array(self.df['Timestamp']))
+
+    def _jump_to_event(self, event):
         if self.df.empty:
-            return None
-        if 'Latitude' not in self.df.columns or 'Longitude' not in self.df.columns:
-            return None
+            return
+        row = event.row if 0 <= event.row < len(self.df) else self._time_lookup().row_at(event.time)
+        if row < 0:
+            return
+        self.update_views_from_timeline(row, push_to_cesium=True, sync_timeline_widget=True)
+        self.statusBar().showMessage(f"Evento: {event.label}", 5000)
 
-        samples = self._build_cesium_samples()
-        valid_samples = [s for s in samples if s and pd.notna(s.get('lat')) and pd.notna(s.get('lon'))]
-        if len(valid_samples) < 2:
+    def build_cesium_state_from_dataframe(self):
+        if self.df.empty or not self.track_payload:
             return None
-
-        times = [s.get('timeMs') for s in valid_samples if s and s.get('timeMs') is not None]
-        start_ms = min(times) if times else None
-        end_ms = max(times) if times else None
-
-        return {
-            'count': len(valid_samples),
-            'startMs': start_ms,
-            'endMs': end_ms,
-            'hasModes': any(s.get('mode') is not None for s in valid_samples)
-        }
+        return summarize_payload(self.track_payload)
 
     # --- Funções do Mapa e Timeline ---
     
@@ -672,8 +1137,8 @@ class TelemetryApp(QMainWindow):
             # ### ALTERAÇÃO SIMPLIFICADA ###
             # Define imediatamente como pronto. O JS cuidará da espera interna.
             self.map_is_ready = True
-            #print("DEBUG: Carregamento HTML do mapa finalizado. JS cuidará da inicialização.")
-            # Atualiza a posição inicial assim que possível
+            # Página carregada uma única vez: envia a trajetória atual (se houver)
+            self._push_track_to_view(self.mapWidget, self.map_is_ready)
             self.update_views_from_timeline(self.current_timeline_index)
         else:
             self.map_is_ready = False
@@ -698,62 +1163,39 @@ class TelemetryApp(QMainWindow):
                 self.view_toggle_checkbox.blockSignals(False)
                 return
             self.map_stack.setCurrentWidget(self.cesiumWidget)
+            self._set_surface_pane('3d')
         else:
             self.map_stack.setCurrentWidget(self.mapWidget)
+            self._set_surface_pane('2d')
         self._update_cesium_controls_state()
 
-    def plot_map_route(self):
-        if 'Latitude' not in self.df.columns or 'Longitude' not in self.df.columns:
-            self.mapWidget.setHtml("<html><body><h1>Mas num tem dado GPS meu filho!!.</h1></body></html>"); return
-        coords = self.df[['Latitude', 'Longitude']].dropna().values.tolist()
-        if not coords:
-            self.mapWidget.setHtml("<html><body><h1>Mas num tem dado GPS meu filho!! kkkkk</h1></body></html>"); return
-
-        # --- Cria o mapa base ---
-        map_center = self.df[['Latitude', 'Longitude']].mean().values.tolist()
-        m = folium.Map(location=map_center, zoom_start=15)
-        self.map_js_name = m.get_name() # Guarda o nome JS do mapa principal
+    def create_map_html(self):
+        """Gera (uma única vez) a página base do mapa 2D com a API ``loadTrack``."""
+        import folium
 
-        mode_segments = compute_mode_segments(self.df)
-        mode_paths = build_mode_path_segments(self.df, mode_segments)
-        if mode_paths:
-            for seg in mode_paths:
-                seg_coords = [(lat, lon) for lat, lon, _ in seg['points']]
-                if len(seg_coords) < 2:
-                    continue
-                folium.PolyLine(seg_coords, color=self._rgb_to_hex(seg['color']), weight=3, opacity=0.9,
-                                tooltip=seg.get('label', '')).add_to(m)
-        else:
-            folium.PolyLine(coords, color="blue", weight=3, opacity=0.8).add_to(m)
-        folium.Marker(location=coords[0], popup="Início", icon=folium.Icon(color="green")).add_to(m)
-        folium.Marker(location=coords[-1], popup="Fim", icon=folium.Icon(color="red")).add_to(m)
+        default_center = [-15.7, -47.9]
+        m = folium.Map(location=default_center, zoom_start=4, tiles=None)
+        localize_folium_resources(m, self.map_server.get_port())
+        self._map_tile_layer("osm").add_to(m)
+        self.map_js_name = m.get_name() # Guarda o nome JS do mapa principal
 
         # --- Ícone do aviaum  ---
         temp_dir = Path(self.map_server.get_temp_dir())
         icon_filename = self.aircraft_icon_filename
         icon_url = None
-        if icon_filename:
-            icon_path = temp_dir / icon_filename
-            icon_url = QUrl.fromLocalFile(str(icon_path)).toString()
-        
+        if icon_filename and (temp_dir / icon_filename).exists():
+            icon_url = self._server_url(icon_filename)
+
         icon_size = (60, 60)       # Tamanho desejado do ícone em pixels
         icon_aircraft_anchor = (30, 30)     # Ponto do ícone que corresponde à coordenada (centro)
-        half_w, half_h = icon_size[0] // 2, icon_size[1] // 2
-        half_w, half_h = icon_size[0] // 2, icon_size[1] // 2
-
-        offset_x = 6    # + direita, - esquerda
-        offset_y = 0   # + desce, -sobe
 
         aircraft_html = f"""
         <div id='aircraft-icon' style='
             width:{icon_size[0]}px;
             height:{icon_size[1]}px;
-            //margin-left:-{half_w - offset_x}px;
             margin-left:0px;
-            //margin-top:-{half_h - offset_y}px;
             margin-top:0px;
             transform-origin:center center;
-            //position: relative;
             '>
             <img id='aircraft-img' src='{icon_url}'
                  style='width:{icon_size[0]}px;
@@ -765,7 +1207,7 @@ class TelemetryApp(QMainWindow):
             if icon_url:
                 aircraft_icon = folium.DivIcon(html=aircraft_html, icon_anchor=icon_aircraft_anchor)
                 aircraft_marker = folium.Marker(
-                    location=coords[0],
+                    location=default_center,
                     icon=aircraft_icon,
                     popup='Aeronave'
                 )
@@ -778,7 +1220,7 @@ class TelemetryApp(QMainWindow):
             print(f"ERRO ao criar ícone do avião: {e}")
             # Fallback simples
             aircraft_marker = folium.CircleMarker(
-                location=coords[0],
+                location=default_center,
                 radius=6,
                 color='red',
                 fill=True,
@@ -791,12 +1233,9 @@ class TelemetryApp(QMainWindow):
         # --- Ícone da Seta de Vento ---
         icon_wind_filename = self.wind_icon_filename
         icon_wind_url = None
-        if icon_wind_filename:
-            icon_wind_path = temp_dir / icon_wind_filename
-            icon_wind_url = QUrl.fromLocalFile(str(icon_wind_path)).toString()
+        if icon_wind_filename and (temp_dir / icon_wind_filename).exists():
+            icon_wind_url = self._server_url(icon_wind_filename)
         icon_wind_size = (120, 120); icon_wind_anchor = (60, 60) # Centralizado
-        # Posiciona a seta um pouco acima e à direita do avião via margens negativas
-        # Ajuste 'margin-left' e 'margin-top' para mudar a posição relativa
         wind_html = f"""
         <div style='position: relative; width:{icon_wind_size[0]}px; height:{icon_wind_size[1]}px;
                     margin-left: 0px;  /* Ajuste para deslocar p/ direita */
@@ -809,8 +1248,7 @@ class TelemetryApp(QMainWindow):
         try:
             if icon_wind_url:
                 wind_icon = folium.DivIcon(html=wind_html, icon_size=icon_wind_size, icon_anchor=icon_wind_anchor)
-                # Cria o marcador da seta NA MESMA POSIÇÃO INICIAL do avião (o offset é visual no HTML)
-                wind_marker = folium.Marker(location=coords[0], icon=wind_icon, popup='Vento', interactive=False, keyboard=False)
+                wind_marker = folium.Marker(location=default_center, icon=wind_icon, popup='Vento', interactive=False, keyboard=False)
                 wind_marker.add_to(m)
                 self.wind_marker_js_name = wind_marker.get_name()
                 print(f"DEBUG: Marcador de vento criado. Nome JS: {self.wind_marker_js_name}")
@@ -819,85 +1257,305 @@ class TelemetryApp(QMainWindow):
         except Exception as e:
             print(f"ERRO ao criar ícone de vento: {e}"); self.wind_marker_js_name = "" # Reseta
 
-        # --- Função JS global para atualizar posição e rotação ---
-        js_update_function = f"""
+        # --- Funções JS globais: atualização dos marcadores e carga da trajetória ---
+        js_functions = Template("""
+        <div id='no-gps-overlay' style='display:none; position:absolute; z-index:1000; top:40%; width:100%;
+             text-align:center; font:bold 22px sans-serif; color:#333; pointer-events:none;'>
+            Mas num tem dado GPS meu filho!!
+        </div>
         <script>
-            // Garante que só define uma vez
-            if (typeof window.updateMarkers === 'undefined') {{
-                window.updateMarkers = function(lat, lon, aircraft_yaw, wind_dir, wind_speed) {{
-                    //console.log(`JS: updateMarkers called - Yaw: ${{aircraft_yaw}}, WindDir: ${{wind_dir}}`);
-                    var aircraftMarker = window[{repr(self.aircraft_marker_js_name)}];
-                    var windMarker = window[{repr(self.wind_marker_js_name)}];
-
-                    if (aircraftMarker && typeof aircraftMarker.setLatLng === 'function') {{
-                        var newLatLng = L.latLng(lat, lon);
-                        aircraftMarker.setLatLng(newLatLng);
+            (function () {
+                const mapName = $MAP_NAME;
+                const aircraftName = $AIRCRAFT_NAME;
+                const windName = $WIND_NAME;
+
+                window.updateMarkers = function(lat, lon, aircraft_yaw, wind_dir, wind_speed) {
+                    var aircraftMarker = window[aircraftName];
+                    var windMarker = window[windName];
+
+                    if (aircraftMarker && typeof aircraftMarker.setLatLng === 'function') {
+                        aircraftMarker.setLatLng(L.latLng(lat, lon));
                         var aircraftImg = document.getElementById('aircraft-img');
-                        if (aircraftImg) {{
+                        if (aircraftImg) {
                             // Assumindo SVG do avião aponta para CIMA
                             aircraftImg.style.transform = 'rotate(' + aircraft_yaw + 'deg)';
-                        }}
-                    }} else {{
-                        //console.warn("JS: Marcador de avião não encontrado ou inválido.");
-                    }}
-
-                    if (windMarker && typeof windMarker.setLatLng === 'function') {{
-                        var newLatLngWind = L.latLng(lat, lon); // Mantem na mesma posição do avião
-                        windMarker.setLatLng(newLatLngWind);
+                        }
+                    }
+
+                    if (windMarker && typeof windMarker.setLatLng === 'function') {
+                        windMarker.setLatLng(L.latLng(lat, lon)); // Mantem na mesma posição do avião
                         var windImg = document.getElementById('wind-arrow-img');
-                        if (windImg) {{
+                        if (windImg) {
                             // Rotação: wind_dir é DE ONDE VEM (0=Norte). Seta aponta PARA ONDE VAI.
-                            var windRotation = wind_dir;
-                            // var windRotation = 90;
-                            // windImg.style.transform = 'rotate(' + windRotation + 'deg)';
-
-                            // Opcional: Escala/Opacidade baseada na velocidade (WSI)
-                            // Exemplo simples de opacidade:
-                            var opacity = 0.8 + (Math.min(wind_speed, 20) / 20) * 0.7; // Escala opacidade de 0.3 a 1.0 para 0-20 m/s
+                            var opacity = 0.8 + (Math.min(wind_speed, 20) / 20) * 0.7;
                             windImg.style.opacity = opacity.toFixed(2);
+                            var scale = 0.7 + (Math.min(wind_speed, 15) / 15);
+                            windImg.style.transform = 'rotate(' + wind_dir + 'deg) scale(' + scale.toFixed(2) + ')';
+                        }
+                    }
+                };
+
+                function rgbToHex(rgb) {
+                    if (!Array.isArray(rgb) || rgb.length < 3) return '#2196f3';
+                    return '#' + rgb.slice(0, 3).map(function (v) {
+                        var h = Math.max(0, Math.min(255, Math.round(v))).toString(16);
+                        return h.length === 1 ? '0' + h : h;
+                    }).join('');
+                }
+
+                function endpointMarker(latlng, color, label) {
+                    if (L.AwesomeMarkers && L.AwesomeMarkers.icon) {
+                        return L.marker(latlng, {
+                            icon: L.AwesomeMarkers.icon({ markerColor: color, icon: 'info-sign', prefix: 'glyphicon' })
+                        }).bindPopup(label);
+                    }
+                    return L.circleMarker(latlng, { radius: 7, color: color, fill: true }).bindPopup(label);
+                }
+
+                function applyTrack(payload) {
+                    var map = window[mapName];
+                    if (!map) {
+                        setTimeout(function () { applyTrack(payload); }, 50);
+                        return;
+                    }
+                    if (window.__trackLayer) {
+                        window.__trackLayer.remove();
+                    }
+                    var layer = L.layerGroup().addTo(map);
+                    window.__trackLayer = layer;
+
+                    var lat = (payload && payload.lat) || [];
+                    var lon = (payload && payload.lon) || [];
+                    function pointsBetween(a, b) {
+                        var pts = [];
+                        for (var i = Math.max(0, a); i <= Math.min(lat.length - 1, b); i++) {
+                            if (lat[i] !== null && lon[i] !== null) pts.push([lat[i], lon[i]]);
+                        }
+                        return pts;
+                    }
+
+                    var hasGps = !!(payload && payload.hasGps);
+                    document.getElementById('no-gps-overlay').style.display = (payload && payload.count && !hasGps) ? 'block' : 'none';
+                    if (!hasGps) {
+                        window.__trackLoaded = true;
+                        return;
+                    }
+
+                    var paths = payload.modePaths || [];
+                    if (paths.length) {
+                        paths.forEach(function (seg) {
+                            var pts = pointsBetween(seg.start, seg.end);
+                            if (pts.length < 2) return;
+                            L.polyline(pts, { color: rgbToHex(seg.color), weight: 3, opacity: 0.9 })
+                                .bindTooltip(seg.label || '')
+                                .addTo(layer);
+                        });
+                    } else {
+                        L.polyline(pointsBetween(0, lat.length - 1), { color: 'blue', weight: 3, opacity: 0.8 }).addTo(layer);
+                    }
 
-                            // Exemplo simples de escala (pode ficar estranho):
-                            var scale = 0.7 + (Math.min(wind_speed, 15) / 15); // Escala tamanho de 70% a 120% para 0-15 m/s
-                            windImg.style.transform = 'rotate(' + windRotation + 'deg) scale(' + scale.toFixed(2) + ')';
-
-                        }} else {{
-                             console.warn("JS: Imagem #wind-arrow-img não encontrada.");
-                        }}
-                    }} else {{
-                        //console.warn("JS: Marcador de vento não encontrado ou inválido.");
-                    }}
-                }};
-                console.log("DEBUG JS: Função global updateMarkers(lat, lon, yaw, wind_dir, wind_speed) definida.");
-            }}
+                    var first = -1, last = -1;
+                    for (var i = 0; i < lat.length; i++) { if (lat[i] !== null && lon[i] !== null) { first = i; break; } }
+                    for (var j = lat.length - 1; j >= 0; j--) { if (lat[j] !== null && lon[j] !== null) { last = j; break; } }
+                    if (first >= 0) {
+                        endpointMarker([lat[first], lon[first]], 'green', 'Início').addTo(layer);
+                        endpointMarker([lat[last], lon[last]], 'red', 'Fim').addTo(layer);
+                        window.updateMarkers(lat[first], lon[first], 0, 0, 0);
+                    }
+                    if (payload.bounds) {
+                        map.fitBounds(payload.bounds, { padding: [20, 20], maxZoom: 17 });
+                    }
+                    window.__trackLoaded = true;
+                }
+
+                window.loadTrack = function (source) {
+                    window.__trackLoaded = false;
+                    if (typeof source === 'string') {
+                        return fetch(source)
+                            .then(function (resp) { return resp.json(); })
+                            .then(applyTrack)
+                            .catch(function (err) { console.error('loadTrack falhou', err); });
+                    }
+                    applyTrack(source);
+                    return Promise.resolve();
+                };
+                window.__mapPageReady = true;
+            })();
         </script>
-        """
-        m.get_root().html.add_child(folium.Element(js_update_function))
+        """)
+        js_block = js_functions.substitute(
+            MAP_NAME=json.dumps(self.map_js_name),
+            AIRCRAFT_NAME=json.dumps(self.aircraft_marker_js_name),
+            WIND_NAME=json.dumps(self.wind_marker_js_name),
+        )
+        m.get_root().html.add_child(folium.Element(js_block))
 
-        temp_dir_str = self.map_server.get_temp_dir()
-        self.temp_map_file_path = os.path.join(temp_dir_str, f"map_{time.time()}.html")
+        self.temp_map_file_path = os.path.join(self.map_server.get_temp_dir(), "map_view.html")
         m.save(self.temp_map_file_path)
-        map_url = QUrl.fromLocalFile(self.temp_map_file_path)
+        return self.temp_map_file_path
+
+    def load_map_page(self):
+        """Carrega a página do mapa uma única vez; depois só recebe dados."""
+        if self.web_surface is not None:
+            self.load_web_surface()
+            return
+        if self.map_page_loaded:
+            return
+        try:
+            self.create_map_html()
+        except Exception as exc:
+            print(f"ERRO: Não foi possível preparar o mapa 2D: {exc}")
+            self.mapWidget.setHtml("<html><body><h1>Falha ao preparar o mapa.</h1></body></html>")
+            return
+        self.map_page_loaded = True
         self.map_is_ready = False
-        self.mapWidget.load(map_url)
+        self.mapWidget.load(QUrl(self._server_url(os.path.basename(self.temp_map_file_path))))
 
-    def cleanup_cesium_html(self):
-        if self.cesium_html_path and os.path.exists(self.cesium_html_path):
-            try:
-                os.remove(self.cesium_html_path)
-            except OSError:
-                pass
-        self.cesium_html_path = ""
-        self.cesium_is_ready = False
-        self.cesium_sync_timer.stop()
+    def plot_map_route(self):
+        """Envia a trajetória do log ativo para o mapa já carregado."""
+        if not self.map_page_loaded:
+            self.load_map_page()
+            return
+        self._push_track_to_view(self.mapWidget, self.map_is_ready)
 
-    def cleanup_timeline_html(self):
-        if self.timeline_html_path and os.path.exists(self.timeline_html_path):
-            try:
-                os.remove(self.timeline_html_path)
-            except OSError:
-                pass
-        self.timeline_html_path = ""
-        self.timeline_is_ready = False
+    # --- Pacote de trajetória compartilhado pelas páginas web ---
+
+    def _publish_track_payload(self, artifacts=None):
+        """Publica no servidor local o pacote de trajetória do log ativo.
+
+        Com ``artifacts`` o pacote já vem pronto (calculado em background).
+        """
+        previous = self.track_payload_name
+        self.track_payload_seq += 1
+        name = f"track_{self.track_payload_seq}.json"
+        started = time.perf_counter()
+        if artifacts is not None:
+            payload, data = artifacts.track_payload, artifacts.track_payload_bytes
+        else:
+            payload = build_track_payload(self.df, altitude_ref=self.altitude_reference) if not self.df.empty else build_track_payload(None)
+            data = encode_payload(payload)
+        self.track_payload_url = self.map_server.publish_data(name, data)
+        self.track_payload_name = name
+        if previous:
+            self.map_server.unpublish_data(previous)
+        print(f"INFO: Trajetória publicada ({payload.get('count', 0)} amostras) em {(time.perf_counter() - started) * 1000:.0f} ms")
+        return payload
+
+    def _push_track_to_view(self, view, ready):
+        if view is None or not ready or not self.track_payload_url:
+            return
+        js_code = (
+            "if (typeof loadTrack === 'function') {"
+            f"loadTrack({json.dumps(self.track_payload_url)});"
+            "}"
+        )
+        view.page().runJavaScript(js_code)
+
+    def _push_track_to_all_views(self):
+        pushed = []
+        for view, ready in (
+            (self.mapWidget, self.map_is_ready),
+            (self.cesiumWidget, self.cesium_is_ready),
+            (self.timelineWidget, self.timeline_is_ready),
+        ):
+            # Na superfície única as três referências são a mesma view
+            if view is None or any(view is other for other in pushed):
+                continue
+            self._push_track_to_view(view, ready)
+            pushed.append(view)
+
+    # --- Superfície web única (mapa 2D + globo 3D + timeline) ---
+
+    def create_web_surface_html(self):
+        """Gera a página única que hospeda mapa, globo e timeline."""
+        port = self.map_server.get_port()
+        temp_dir = Path(self.map_server.get_temp_dir())
+        self.copy_assets_to_server(self.cesium_plane_asset)
+        leaflet_js, leaflet_css = leaflet_resource_urls(port)
+        aircraft_url = None
+        if self.aircraft_icon_filename and (temp_dir / self.aircraft_icon_filename).exists():
+            aircraft_url = self._server_url(self.aircraft_icon_filename)
+        wind_url = None
+        if self.wind_icon_filename and (temp_dir / self.wind_icon_filename).exists():
+            wind_url = self._server_url(self.wind_icon_filename)
+        html_content = render_web_surface_html(
+            cesium_base=cesium_base_url(port),
+            leaflet_js=leaflet_js,
+            leaflet_css=leaflet_css,
+            plane_url=self._server_url(os.path.basename(self.cesium_plane_asset)),
+            imagery_presets=self.cesium_imagery_presets,
+            default_imagery_key=self.current_cesium_imagery_key,
+            aircraft_icon_url=aircraft_url,
+            wind_icon_url=wind_url,
+        )
+        output_path = os.path.join(self.map_server.get_temp_dir(), "web_surface.html")
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        return output_path
+
+    def load_web_surface(self):
+        """Carrega a superfície única uma só vez (mapa, 3D e timeline)."""
+        if self.web_surface is None:
+            return False
+        if self.web_surface_path:
+            return True
+        try:
+            html_path = self.create_web_surface_html()
+        except Exception as exc:
+            QMessageBox.warning(self, "Visualização", f"Não foi possível preparar a página de mapa/3D: {exc}")
+            return False
+        self.web_surface_path = html_path
+        self.cesium_html_path = html_path
+        self.timeline_html_path = html_path
+        self.map_page_loaded = True
+        self.map_js_name = SURFACE_MAP_JS_NAME
+        self.map_is_ready = self.cesium_is_ready = self.timeline_is_ready = False
+        self.web_surface.load(QUrl(self._server_url(os.path.basename(html_path))))
+        return True
+
+    def on_web_surface_load_finished(self, ok):
+        if ok:
+            self._wait_for_surface_ready()
+        else:
+            self.map_is_ready = self.cesium_is_ready = self.timeline_is_ready = False
+            self.statusBar().showMessage("Falha ao carregar a página de mapa/3D.", 5000)
+
+    def _wait_for_surface_ready(self, retries=40):
+        if self.web_surface is None:
+            return
+
+        def _handle_ready(result):
+            if result:
+                self.map_is_ready = self.cesium_is_ready = self.timeline_is_ready = True
+                self.statusBar().showMessage("Mapa, 3D e timeline prontos!", 3000)
+                self._push_track_to_view(self.web_surface, True)
+                self.update_cesium_imagery_layer(self.current_cesium_imagery_key)
+                checked = bool(self.view_toggle_checkbox and self.view_toggle_checkbox.isChecked())
+                self._set_surface_pane('3d' if checked else '2d')
+                self._update_cesium_controls_state()
+                self.update_cesium_index(self.current_timeline_index)
+                if not self.cesium_sync_timer.isActive():
+                    self.cesium_sync_timer.start()
+            elif retries > 0:
+                QTimer.singleShot(200, lambda: self._wait_for_surface_ready(retries - 1))
+            else:
+                self.statusBar().showMessage("Não consegui inicializar a página de mapa/3D.", 5000)
+                self._update_cesium_controls_state()
+
+        try:
+            self.web_surface.page().runJavaScript("Boolean(window.__surfaceReady)", _handle_ready)
+        except RuntimeError:
+            self.map_is_ready = self.cesium_is_ready = self.timeline_is_ready = False
+
+    def _set_surface_pane(self, pane):
+        if self.web_surface is None or not self.cesium_is_ready:
+            return
+        js_code = (
+            "if (typeof setActivePane === 'function') {"
+            f"setActivePane({json.dumps(pane)});"
+            "}"
+        )
+        self.web_surface.page().runJavaScript(js_code)
 
     def populate_cesium_imagery_combo(self):
         if self.cesium_imagery_combo is None:
@@ -962,6 +1620,7 @@ class TelemetryApp(QMainWindow):
                 self.cesium_follow_checkbox.blockSignals(False)
 
     def create_cesium_viewer_html(self):
+        """Gera (uma única vez) a página do Cesium; a trajetória chega via ``loadTrack``."""
         try:
             self.copy_assets_to_server(self.cesium_plane_asset)
             port = self.map_server.get_port()
@@ -969,14 +1628,12 @@ class TelemetryApp(QMainWindow):
             plane_literal = json.dumps(plane_url)
             imagery_config_literal = json.dumps(self.cesium_imagery_presets)
             default_imagery_key = json.dumps(self.current_cesium_imagery_key)
-            samples_literal = json.dumps(self._build_cesium_samples())
-            mode_paths_literal = json.dumps(self._build_cesium_mode_paths())
             html_template = Template("""<!DOCTYPE html>
 <html lang='pt-BR'>
 <head>
     <meta charset='utf-8'>
     <title>Visualização 3D - Cesium</title>
-    <link rel='stylesheet' href='https://cdn.jsdelivr.net/npm/cesium@1.121.0/Build/Cesium/Widgets/widgets.css'>
+    <link rel='stylesheet' href='${CESIUM_BASE}Widgets/widgets.css'>
     <style>
         html, body, #cesiumContainer {
             width: 100%;
@@ -1019,7 +1676,8 @@ class TelemetryApp(QMainWindow):
         <div><strong>Pitch:</strong> <span id='hud-pitch'>--</span>°</div>
         <div><strong>Roll:</strong> <span id='hud-roll'>--</span>°</div>
     </div>
-    <script src='https://cdn.jsdelivr.net/npm/cesium@1.121.0/Build/Cesium/Cesium.js'></script>
+    <script>window.CESIUM_BASE_URL = '${CESIUM_BASE}';</script>
+    <script src='${CESIUM_BASE}Cesium.js'></script>
     <script>
         (function () {
             const terrainProvider = new Cesium.EllipsoidTerrainProvider();
@@ -1046,18 +1704,6 @@ class TelemetryApp(QMainWindow):
                 return acc;
             }, {});
             const defaultImageryKey = $DEFAULT_IMAGERY_KEY;
-            const samples = $SAMPLES_JSON;
-            const modePaths = $MODE_PATHS_JSON;
-            const sampleTimes = Array.isArray(samples)
-                ? samples.map(s => (s && Number.isFinite(s.timeMs)) ? s.timeMs : null)
-                : [];
-            const routePositions = Array.isArray(samples)
-                ? samples.map(s => (s && Number.isFinite(s.lat) && Number.isFinite(s.lon))
-                    ? { lat: s.lat, lon: s.lon, alt: Number.isFinite(s.alt) ? s.alt : 0.0 }
-                    : null)
-                : [];
-            let startJulian = undefined;
-            let stopJulian = undefined;
             function buildTilingScheme(cfg) {
                 if (cfg.tilingScheme === 'geographic') {
                     return new Cesium.GeographicTilingScheme();
@@ -1069,7 +1715,8 @@ class TelemetryApp(QMainWindow):
                     url: cfg.url,
                     credit: cfg.credit || '',
                     tilingScheme: buildTilingScheme(cfg),
-                    maximumLevel: Number.isFinite(cfg.maximumLevel) ? cfg.maximumLevel : undefined
+                    maximumLevel: Number.isFinite(cfg.maximumLevel) ? cfg.maximumLevel : undefined,
+                    subdomains: Array.isArray(cfg.subdomains) && cfg.subdomains.length ? cfg.subdomains : undefined
                 });
             }
             function applyImageryLayer(key) {
@@ -1097,32 +1744,6 @@ class TelemetryApp(QMainWindow):
                 const b = Number.isFinite(rgb?.[2]) ? rgb[2] : 243;
                 return Cesium.Color.fromBytes(r, g, b, alpha ?? 200);
             }
-            function toCartesianFromPoints(list) {
-                const arr = [];
-                for (const p of list || []) {
-                    if (!Number.isFinite(p?.lon) || !Number.isFinite(p?.lat)) continue;
-                    arr.push(p.lon, p.lat, Number.isFinite(p.alt) ? p.alt : 0.0);
-                }
-                return arr.length ? Cesium.Cartesian3.fromDegreesArrayHeights(arr) : [];
-            }
-            try {
-                if (Array.isArray(modePaths)) {
-                    modePaths.forEach(seg => {
-                        const positions = toCartesianFromPoints(seg?.points);
-                        if (positions.length >= 2) {
-                            modePolylineCollection.add({
-                                positions,
-                                width: 3,
-                                material: Cesium.Material.fromType('Color', {
-                                    color: colorFromRgb(seg?.color, 235)
-                                })
-                            });
-                        }
-                    });
-                }
-            } catch (err) {
-                console.error('Mode path render fallback', err);
-            }
             const scratchHPR = new Cesium.HeadingPitchRoll();
             const defaultPosition = Cesium.Cartesian3.fromDegrees(-47.9, -15.7, 1000.0);
             const aircraftEntity = viewer.entities.add({
@@ -1141,6 +1762,7 @@ class TelemetryApp(QMainWindow):
                 )
             });
             viewer.trackedEntity = aircraftEntity;
+            window.__followEnabled = true;
             const hudLat = document.getElementById('hud-lat');
             const hudLon = document.getElementById('hud-lon');
             const hudAlt = document.getElementById('hud-alt');
@@ -1157,18 +1779,33 @@ class TelemetryApp(QMainWindow):
                 return Cesium.Math.toRadians(Number.isFinite(valueDeg) ? valueDeg : 0.0);
             }
             const headingOffset = Cesium.Math.toRadians(-90.0);
-            function applySample(sample) {
-                if (!sample || !Number.isFinite(sample.lat) || !Number.isFinite(sample.lon)) {
+
+            // --- Estado da trajetória atual (pacote colunar enviado pelo Python) ---
+            let track = null;
+            let timeIndex = new Float64Array(0);
+            let routeCartesians = [];
+            let validPrefix = new Int32Array(0);
+            let currentIndex = -1;
+            let pendingIndex = 0;
+            let lastClockMs = NaN;
+
+            function sampleValid(i) {
+                return !!track && track.lat[i] !== null && track.lon[i] !== null;
+            }
+            function applySampleAt(i) {
+                if (!sampleValid(i)) {
                     return;
                 }
-                const safeAlt = Number.isFinite(sample.alt) ? sample.alt : 0.0;
-                const position = Cesium.Cartesian3.fromDegrees(sample.lon, sample.lat, safeAlt);
+                const lat = track.lat[i];
+                const lon = track.lon[i];
+                const safeAlt = Number.isFinite(track.alt[i]) ? track.alt[i] : 0.0;
+                const position = Cesium.Cartesian3.fromDegrees(lon, lat, safeAlt);
                 aircraftEntity.position = position;
-                scratchHPR.heading = radiansOrZero(sample.heading) + headingOffset;
-                scratchHPR.pitch = radiansOrZero(sample.pitch);
-                scratchHPR.roll = radiansOrZero(sample.roll);
+                scratchHPR.heading = radiansOrZero(track.heading[i]) + headingOffset;
+                scratchHPR.pitch = radiansOrZero(track.pitch[i]);
+                scratchHPR.roll = radiansOrZero(track.roll[i]);
                 aircraftEntity.orientation = Cesium.Transforms.headingPitchRollQuaternion(position, scratchHPR);
-                updateHud(sample.lat, sample.lon, safeAlt, sample.pitch, sample.roll);
+                updateHud(lat, lon, safeAlt, track.pitch[i], track.roll[i]);
             }
             window.centerCameraOnAircraft = function() {
                 if (!aircraftEntity) {
@@ -1203,103 +1840,162 @@ class TelemetryApp(QMainWindow):
                     material: Cesium.Color.WHITE.withAlpha(0.25)
                 }
             });
-            function toCartesian(pts) {
-                const arr = [];
-                for (const p of pts) {
-                    if (!p) continue;
-                    arr.push(p.lon, p.lat, p.alt);
-                }
-                return arr.length ? Cesium.Cartesian3.fromDegreesArrayHeights(arr) : [];
-            }
             function updateRouteProgress(index) {
-                if (!Array.isArray(routePositions) || !routePositions.length) {
+                if (!routeCartesians.length || !validPrefix.length) {
                     return;
                 }
-                const clamped = Math.max(0, Math.min(routePositions.length, index + 1));
-                const done = routePositions.slice(0, clamped);
-                const nextSegment = routePositions.slice(Math.max(0, clamped - 1));
-                completedPath.polyline.positions = toCartesian(done);
-                upcomingPath.polyline.positions = toCartesian(nextSegment);
+                const done = validPrefix[Math.max(0, Math.min(validPrefix.length - 1, index))];
+                completedPath.polyline.positions = routeCartesians.slice(0, done);
+                upcomingPath.polyline.positions = routeCartesians.slice(Math.max(0, done - 1));
             }
             function julianFromMs(ms) {
                 return Cesium.JulianDate.fromDate(new Date(ms));
             }
-            function findIndexForJulian(jd) {
-                if (!sampleTimes.length) return 0;
-                const currentMs = Cesium.JulianDate.toDate(jd).getTime();
-                for (let i = 0; i < sampleTimes.length; i++) {
-                    const t = sampleTimes[i];
-                    if (t === null) continue;
-                    const next = sampleTimes[Math.min(sampleTimes.length - 1, i + 1)];
-                    if (currentMs <= (next ?? currentMs)) {
-                        return i;
-                    }
+            function buildTimeIndex(times) {
+                // Preenche lacunas (null) para permitir busca binária monotônica
+                const arr = new Float64Array(times.length);
+                let last = NaN;
+                for (let i = 0; i < times.length; i++) {
+                    const t = times[i];
+                    if (t !== null && Number.isFinite(t)) last = t;
+                    arr[i] = last;
                 }
-                return sampleTimes.length - 1;
+                let next = NaN;
+                for (let i = arr.length - 1; i >= 0; i--) {
+                    if (Number.isFinite(arr[i])) { next = arr[i]; break; }
+                }
+                for (let i = 0; i < arr.length && !Number.isFinite(arr[i]); i++) arr[i] = next;
+                return arr;
+            }
+            function findIndexForMs(ms) {
+                let lo = 0;
+                let hi = timeIndex.length - 1;
+                if (hi < 0) return 0;
+                if (ms <= timeIndex[0]) return 0;
+                if (ms >= timeIndex[hi]) return hi;
+                while (lo < hi) {
+                    const mid = (lo + hi + 1) >> 1;
+                    if (timeIndex[mid] <= ms) lo = mid; else hi = mid - 1;
+                }
+                return lo;
             }
             function clampIndex(idx) {
-                return Math.max(0, Math.min(samples.length - 1, Number(idx) || 0));
+                const count = track ? track.count : 0;
+                return Math.max(0, Math.min(count - 1, Number(idx) || 0));
             }
-            let currentIndex = 0;
             function applyIndex(idx) {
-                if (!Array.isArray(samples) || !samples.length) return;
+                if (!track || !track.count) return;
                 const clamped = clampIndex(idx);
                 if (clamped === currentIndex && !viewer.clock.shouldAnimate) return;
                 currentIndex = clamped;
-                const sample = samples[clamped];
-                if (sample) {
-                    applySample(sample);
-                    if (window.__followEnabled !== false) {
-                        viewer.trackedEntity = aircraftEntity;
-                    }
+                applySampleAt(clamped);
+                if (window.__followEnabled !== false) {
+                    viewer.trackedEntity = aircraftEntity;
                 }
                 updateRouteProgress(clamped);
                 window.__currentTimelineIndex = clamped;
             }
             window.setTimelineIndex = function(index) {
-                if (!sampleTimes.length) return;
+                if (!track || !track.count) {
+                    pendingIndex = Number(index) || 0;
+                    return;
+                }
                 const clamped = clampIndex(index);
-                const t = sampleTimes[clamped];
+                const t = timeIndex[clamped];
                 if (Number.isFinite(t)) {
                     viewer.clock.shouldAnimate = false;
                     viewer.clock.currentTime = julianFromMs(t);
-                    applyIndex(clamped);
+                    lastClockMs = t;
                 }
+                applyIndex(clamped);
             };
-            if (Array.isArray(samples) && samples.length) {
-                const firstValidTime = sampleTimes.find(t => t !== null);
-                const lastValidTime = [...sampleTimes].reverse().find(t => t !== null);
-                if (Number.isFinite(firstValidTime) && Number.isFinite(lastValidTime)) {
-                    startJulian = julianFromMs(firstValidTime);
-                    stopJulian = julianFromMs(lastValidTime);
-                    viewer.clock.startTime = startJulian.clone();
-                    viewer.clock.stopTime = stopJulian.clone();
-                    viewer.clock.currentTime = startJulian.clone();
+            function renderModePaths() {
+                modePolylineCollection.removeAll();
+                (track.modePaths || []).forEach(seg => {
+                    const flat = [];
+                    for (let i = Math.max(0, seg.start); i <= Math.min(track.count - 1, seg.end); i++) {
+                        if (!sampleValid(i)) continue;
+                        flat.push(track.lon[i], track.lat[i], Number.isFinite(track.alt[i]) ? track.alt[i] : 0.0);
+                    }
+                    if (flat.length >= 6) {
+                        modePolylineCollection.add({
+                            positions: Cesium.Cartesian3.fromDegreesArrayHeights(flat),
+                            width: 3,
+                            material: Cesium.Material.fromType('Color', {
+                                color: colorFromRgb(seg.color, 235)
+                            })
+                        });
+                    }
+                });
+            }
+            function applyTrack(payload) {
+                track = (payload && payload.count) ? payload : null;
+                currentIndex = -1;
+                lastClockMs = NaN;
+                routeCartesians = [];
+                validPrefix = new Int32Array(0);
+                modePolylineCollection.removeAll();
+                completedPath.polyline.positions = [];
+                upcomingPath.polyline.positions = [];
+                window.__currentTimelineIndex = 0;
+                if (!track) {
+                    timeIndex = new Float64Array(0);
+                    updateHud();
+                    window.__trackLoaded = true;
+                    return;
+                }
+                timeIndex = buildTimeIndex(track.timeMs || []);
+                const flat = [];
+                validPrefix = new Int32Array(track.count);
+                let valid = 0;
+                for (let i = 0; i < track.count; i++) {
+                    if (sampleValid(i)) {
+                        flat.push(track.lon[i], track.lat[i], Number.isFinite(track.alt[i]) ? track.alt[i] : 0.0);
+                        valid++;
+                    }
+                    validPrefix[i] = valid;
+                }
+                routeCartesians = flat.length ? Cesium.Cartesian3.fromDegreesArrayHeights(flat) : [];
+                try {
+                    renderModePaths();
+                } catch (err) {
+                    console.error('Mode path render fallback', err);
+                }
+                if (Number.isFinite(track.startMs) && Number.isFinite(track.endMs)) {
+                    viewer.clock.startTime = julianFromMs(track.startMs);
+                    viewer.clock.stopTime = julianFromMs(track.endMs);
+                    viewer.clock.currentTime = julianFromMs(track.startMs);
                     viewer.clock.clockRange = Cesium.ClockRange.CLAMPED;
                     viewer.clock.shouldAnimate = false;
                 }
-                const initialSample = samples.find(s => !!s);
-                if (initialSample) {
-                    const startPosition = Cesium.Cartesian3.fromDegrees(initialSample.lon, initialSample.lat, initialSample.alt || 0.0);
-                    aircraftEntity.position = startPosition;
-                    aircraftEntity.orientation = Cesium.Transforms.headingPitchRollQuaternion(
-                        startPosition,
-                        new Cesium.HeadingPitchRoll()
-                    );
+                applyIndex(pendingIndex);
+                pendingIndex = 0;
+                if (window.__followEnabled !== false) {
+                    viewer.trackedEntity = aircraftEntity;
                 }
-                viewer.trackedEntity = aircraftEntity;
-                window.__followEnabled = true;
-                viewer.clock.onTick.addEventListener(function(clock) {
-                    if (!sampleTimes.length) return;
-                    const idx = findIndexForJulian(clock.currentTime);
-                    if (idx !== currentIndex || clock.shouldAnimate) {
-                        applyIndex(idx);
-                    }
-                });
-            } else {
-                viewer.trackedEntity = aircraftEntity;
-                window.__followEnabled = true;
+                window.__trackLoaded = true;
             }
+            window.loadTrack = function(source) {
+                window.__trackLoaded = false;
+                if (typeof source === 'string') {
+                    return fetch(source)
+                        .then(resp => resp.json())
+                        .then(applyTrack)
+                        .catch(err => console.error('loadTrack falhou', err));
+                }
+                applyTrack(source);
+                return Promise.resolve();
+            };
+            viewer.clock.onTick.addEventListener(function(clock) {
+                if (!track || !timeIndex.length) return;
+                const ms = Cesium.JulianDate.toDate(clock.currentTime).getTime();
+                if (ms === lastClockMs && !clock.shouldAnimate) return;
+                lastClockMs = ms;
+                const idx = findIndexForMs(ms);
+                if (idx !== currentIndex || clock.shouldAnimate) {
+                    applyIndex(idx);
+                }
+            });
             window.__cesiumViewerReady = true;
         })();
     </script>
@@ -1307,14 +2003,12 @@ class TelemetryApp(QMainWindow):
           </html>
           """)
             html_content = html_template.substitute(
+                CESIUM_BASE=cesium_base_url(port),
                 PLANE_LITERAL=plane_literal,
                 IMAGERY_CONFIG_JSON=imagery_config_literal,
                 DEFAULT_IMAGERY_KEY=default_imagery_key,
-                SAMPLES_JSON=samples_literal,
-                MODE_PATHS_JSON=mode_paths_literal
             )
-            output_name = f"cesium_view_{int(time.time()*1000)}.html"
-            output_path = os.path.join(self.map_server.get_temp_dir(), output_name)
+            output_path = os.path.join(self.map_server.get_temp_dir(), "cesium_view.html")
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(html_content)
             return output_path
@@ -1323,14 +2017,14 @@ class TelemetryApp(QMainWindow):
             return ""
 
     def create_cesium_timeline_html(self):
+        """Gera (uma única vez) a página da timeline; a trajetória chega via ``loadTrack``."""
         try:
-            samples_literal = json.dumps(self._build_cesium_samples())
             html_template = Template("""<!DOCTYPE html>
     <html lang='pt-BR'>
     <head>
         <meta charset='utf-8'>
         <title>Timeline - Cesium</title>
-        <link rel='stylesheet' href='https://cdn.jsdelivr.net/npm/cesium@1.121.0/Build/Cesium/Widgets/widgets.css'>
+        <link rel='stylesheet' href='${CESIUM_BASE}Widgets/widgets.css'>
         <style>
             html, body, #timelineContainer {
                 width: 100%;
@@ -1357,13 +2051,10 @@ class TelemetryApp(QMainWindow):
     </head>
     <body>
         <div id='timelineContainer'></div>
-        <script src='https://cdn.jsdelivr.net/npm/cesium@1.121.0/Build/Cesium/Cesium.js'></script>
+        <script>window.CESIUM_BASE_URL = '${CESIUM_BASE}';</script>
+    <script src='${CESIUM_BASE}Cesium.js'></script>
         <script>
             (function () {
-                const samples = $SAMPLES_JSON;
-                const sampleTimes = Array.isArray(samples)
-                    ? samples.map(s => (s && Number.isFinite(s.timeMs)) ? s.timeMs : null)
-                    : [];
                 const viewer = new Cesium.Viewer('timelineContainer', {
                     animation: false,
                     timeline: true,
@@ -1380,31 +2071,57 @@ class TelemetryApp(QMainWindow):
                 });
                 viewer.scene.canvas.style.display = 'none';
                 viewer.cesiumWidget.screenSpaceEventHandler.removeInputAction(Cesium.ScreenSpaceEventType.LEFT_DOUBLE_CLICK);
+                let count = 0;
+                let timeIndex = new Float64Array(0);
+                let currentIndex = 0;
+                let pendingIndex = 0;
+                let lastClockMs = NaN;
+                window.__currentTimelineIndex = 0;
                 function julianFromMs(ms) { return Cesium.JulianDate.fromDate(new Date(ms)); }
-                function clampIndex(idx) { return Math.max(0, Math.min(samples.length - 1, Number(idx) || 0)); }
-                function findIndexForJulian(jd) {
-                    if (!sampleTimes.length) return 0;
-                    const currentMs = Cesium.JulianDate.toDate(jd).getTime();
-                    for (let i = 0; i < sampleTimes.length; i++) {
-                        const t = sampleTimes[i];
-                        if (t === null) continue;
-                        const next = sampleTimes[Math.min(sampleTimes.length - 1, i + 1)];
-                        if (currentMs <= (next ?? currentMs)) { return i; }
+                function clampIndex(idx) { return Math.max(0, Math.min(count - 1, Number(idx) || 0)); }
+                function buildTimeIndex(times) {
+                    const arr = new Float64Array(times.length);
+                    let last = NaN;
+                    for (let i = 0; i < times.length; i++) {
+                        const t = times[i];
+                        if (t !== null && Number.isFinite(t)) last = t;
+                        arr[i] = last;
                     }
-                    return sampleTimes.length - 1;
+                    let next = NaN;
+                    for (let i = arr.length - 1; i >= 0; i--) {
+                        if (Number.isFinite(arr[i])) { next = arr[i]; break; }
+                    }
+                    for (let i = 0; i < arr.length && !Number.isFinite(arr[i]); i++) arr[i] = next;
+                    return arr;
                 }
-                function configureClock() {
-                    if (!sampleTimes.length) {
-                        if (viewer.timeline) {
-                            viewer.timeline.zoomTo(viewer.clock.startTime, viewer.clock.stopTime);
-                        }
-                        return;
+                function findIndexForMs(ms) {
+                    let lo = 0;
+                    let hi = timeIndex.length - 1;
+                    if (hi < 0) return 0;
+                    if (ms <= timeIndex[0]) return 0;
+                    if (ms >= timeIndex[hi]) return hi;
+                    while (lo < hi) {
+                        const mid = (lo + hi + 1) >> 1;
+                        if (timeIndex[mid] <= ms) lo = mid; else hi = mid - 1;
                     }
-                    const firstValidTime = sampleTimes.find(t => t !== null);
-                    const lastValidTime = [...sampleTimes].reverse().find(t => t !== null);
-                    if (Number.isFinite(firstValidTime) && Number.isFinite(lastValidTime)) {
-                        const start = julianFromMs(firstValidTime);
-                        const stop = julianFromMs(lastValidTime);
+                    return lo;
+                }
+                function applyIndex(idx) {
+                    if (!count) return;
+                    const clamped = clampIndex(idx);
+                    if (clamped === currentIndex && !viewer.clock.shouldAnimate) return;
+                    currentIndex = clamped;
+                    window.__currentTimelineIndex = clamped;
+                }
+                function applyTrack(payload) {
+                    count = (payload && payload.count) ? payload.count : 0;
+                    timeIndex = count ? buildTimeIndex(payload.timeMs || []) : new Float64Array(0);
+                    currentIndex = 0;
+                    lastClockMs = NaN;
+                    window.__currentTimelineIndex = 0;
+                    if (count && Number.isFinite(payload.startMs) && Number.isFinite(payload.endMs)) {
+                        const start = julianFromMs(payload.startMs);
+                        const stop = julianFromMs(payload.endMs);
                         viewer.clock.startTime = start.clone();
                         viewer.clock.stopTime = stop.clone();
                         viewer.clock.currentTime = start.clone();
@@ -1413,44 +2130,60 @@ class TelemetryApp(QMainWindow):
                         if (viewer.timeline) {
                             viewer.timeline.zoomTo(start, stop);
                         }
+                        window.setTimelineIndex(pendingIndex);
+                    } else if (viewer.timeline) {
+                        viewer.timeline.zoomTo(viewer.clock.startTime, viewer.clock.stopTime);
                     }
-                }
-                let currentIndex = 0;
-                window.__currentTimelineIndex = 0;
-                function applyIndex(idx) {
-                    if (!Array.isArray(samples) || !samples.length) return;
-                    const clamped = clampIndex(idx);
-                    if (clamped === currentIndex && !viewer.clock.shouldAnimate) return;
-                    currentIndex = clamped;
-                    window.__currentTimelineIndex = clamped;
+                    pendingIndex = 0;
+                    window.__trackLoaded = true;
                 }
                 viewer.clock.onTick.addEventListener(function(clock) {
-                    if (!sampleTimes.length) return;
-                    const idx = findIndexForJulian(clock.currentTime);
+                    if (!timeIndex.length) return;
+                    const ms = Cesium.JulianDate.toDate(clock.currentTime).getTime();
+                    if (ms === lastClockMs && !clock.shouldAnimate) return;
+                    lastClockMs = ms;
+                    const idx = findIndexForMs(ms);
                     if (idx !== currentIndex || clock.shouldAnimate) {
                         applyIndex(idx);
                     }
                 });
                 window.setTimelineIndex = function(index) {
-                    if (!sampleTimes.length) return;
+                    if (!count) {
+                        pendingIndex = Number(index) || 0;
+                        return;
+                    }
                     const clamped = clampIndex(index);
-                    const t = sampleTimes[clamped];
+                    const t = timeIndex[clamped];
                     if (Number.isFinite(t)) {
                         viewer.clock.shouldAnimate = false;
                         viewer.clock.currentTime = julianFromMs(t);
-                        applyIndex(clamped);
+                        lastClockMs = t;
                     }
+                    currentIndex = clamped;
+                    window.__currentTimelineIndex = clamped;
                 };
-                configureClock();
+                window.loadTrack = function(source) {
+                    window.__trackLoaded = false;
+                    if (typeof source === 'string') {
+                        return fetch(source)
+                            .then(resp => resp.json())
+                            .then(applyTrack)
+                            .catch(err => console.error('loadTrack falhou', err));
+                    }
+                    applyTrack(source);
+                    return Promise.resolve();
+                };
+                applyTrack(null);
                 window.__timelineReady = true;
             })();
         </script>
     </body>
     </html>
     """)
-            html_content = html_template.substitute(SAMPLES_JSON=samples_literal)
-            output_name = f"cesium_timeline_{int(time.time()*1000)}.html"
-            output_path = os.path.join(self.map_server.get_temp_dir(), output_name)
+            html_content = html_template.substitute(
+                CESIUM_BASE=cesium_base_url(self.map_server.get_port()),
+            )
+            output_path = os.path.join(self.map_server.get_temp_dir(), "cesium_timeline.html")
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(html_content)
             return output_path
@@ -1459,37 +2192,33 @@ class TelemetryApp(QMainWindow):
             return ""
 
     def show_cesium_3d_view(self):
-        self.cleanup_cesium_html()
+        """Garante que a página do Cesium foi carregada (uma única vez)."""
+        if self.web_surface is not None:
+            return self.load_web_surface()
+        if self.cesium_html_path:
+            return True
         html_path = self.create_cesium_viewer_html()
         if not html_path:
             return False
         self.cesium_html_path = html_path
-        port = self.map_server.get_port()
         self.cesium_is_ready = False
-        url = QUrl(f"http://127.0.0.1:{port}/{os.path.basename(html_path)}")
-        self.cesiumWidget.load(url)
+        self.cesiumWidget.load(QUrl(self._server_url(os.path.basename(html_path))))
         return True
 
     def refresh_timeline_html(self):
-        if not self.timelineWidget:
+        """Carrega a timeline uma única vez; trocas de log só enviam dados."""
+        if self.web_surface is not None or not self.timelineWidget or self.timeline_html_path:
             return
-        self.cleanup_timeline_html()
         html_path = self.create_cesium_timeline_html()
         if not html_path:
             return
         self.timeline_html_path = html_path
-        port = self.map_server.get_port()
         self.timeline_is_ready = False
-        url = QUrl(f"http://127.0.0.1:{port}/{os.path.basename(html_path)}")
-        self.timelineWidget.load(url)
+        self.timelineWidget.load(QUrl(self._server_url(os.path.basename(html_path))))
 
     def on_timeline_load_finished(self, ok):
         if ok:
-            if self.df.empty:
-                self.timeline_is_ready = True
-                self.statusBar().showMessage("Timeline pronta (sem dados carregados).", 2000)
-            else:
-                self._wait_for_timeline_ready()
+            self._wait_for_timeline_ready()
         else:
             self.timeline_is_ready = True
             self.statusBar().showMessage("Timeline simples carregada.", 4000)
@@ -1502,7 +2231,8 @@ class TelemetryApp(QMainWindow):
             if result:
                 self.timeline_is_ready = True
                 self.statusBar().showMessage("Timeline pronta!", 2000)
-                self.update_views_from_timeline(self.current_timeline_index, push_to_cesium=True, sync_timeline_widget=False, force_plot_update=True)
+                self._push_track_to_view(self.timelineWidget, self.timeline_is_ready)
+                self.update_views_from_timeline(self.current_timeline_index, push_to_cesium=True, sync_timeline_widget=False)
                 if not self.cesium_sync_timer.isActive():
                     self.cesium_sync_timer.start()
             elif retries > 0:
@@ -1526,6 +2256,7 @@ class TelemetryApp(QMainWindow):
             if result:
                 self.cesium_is_ready = True
                 self.statusBar().showMessage("Cesium pronto e timeline carregada!", 3000)
+                self._push_track_to_view(self.cesiumWidget, self.cesium_is_ready)
                 self.update_cesium_imagery_layer(self.current_cesium_imagery_key)
                 self._update_cesium_controls_state()
                 self.update_views_from_timeline(self.current_timeline_index)
@@ -1549,8 +2280,14 @@ class TelemetryApp(QMainWindow):
 
 
     def setup_timeline(self):
-        self.last_plot_cursor_update_time = 0.0
         self.refresh_timeline_html()
+        if not self.cesium_html_path:
+            self.show_cesium_3d_view()
+        # Timeline e Cesium recebem a mesma trajetória publicada
+        # (na superfície única o plot_map_route já enviou para a página toda)
+        if self.web_surface is None:
+            self._push_track_to_view(self.timelineWidget, self.timeline_is_ready)
+            self._push_track_to_view(self.cesiumWidget, self.cesium_is_ready)
         if not self.df.empty:
             self.current_timeline_index = 0
             if 'Timestamp' in self.df.columns and not self.df['Timestamp'].empty:
@@ -1559,16 +2296,13 @@ class TelemetryApp(QMainWindow):
                     self.timestamp_label.setText(f"Timestamp: {first_ts.strftime('%H:%M:%S.%f')[:-3]}")
             self.btn_set_timestamp.setEnabled(True)
             self.btn_save_pdf.setEnabled(True)
-            # Mantém a timeline do Cesium como única fonte de playback
-            if not self.cesium_html_path:
-                self.show_cesium_3d_view()
         else:
             self.current_timeline_index = 0
             self.btn_set_timestamp.setEnabled(False)
             self.btn_save_pdf.setEnabled(False)
             self.timestamp_label.setText("Timestamp: --:--:--.---")
             
-    def update_views_from_timeline(self, index, push_to_cesium=False, sync_timeline_widget=False, force_plot_update=False):
+    def update_views_from_timeline(self, index, push_to_cesium=False, sync_timeline_widget=False):
         if self.df.empty or index >= len(self.df):
             return
         self.current_timeline_index = index
@@ -1577,7 +2311,11 @@ class TelemetryApp(QMainWindow):
 
         self.timestamp_label.setText(f"Timestamp: {timestamp.strftime('%H:%M:%S.%f')[:-3]}")
 
-        if 'Latitude' in data_row and 'Longitude' in data_row:
+        if self.web_surface is not None:
+            # A página única move marcador 2D, globo e timeline a partir do índice
+            if push_to_cesium:
+                self.update_cesium_index(index)
+        elif 'Latitude' in data_row and 'Longitude' in data_row:
 
             yaw = self._extract_heading_deg(data_row)
             pitch = data_row.get('Pitch', 0)
@@ -1602,10 +2340,9 @@ class TelemetryApp(QMainWindow):
                 if sync_timeline_widget:
                     self.update_timeline_index(index)
 
-        now = time.monotonic()
-        if force_plot_update or (now - self.last_plot_cursor_update_time) >= 1.0:
-            self._update_plot_cursors(timestamp)
-            self.last_plot_cursor_update_time = now
+        # Cursores baratos (blit no matplotlib, setValue no pyqtgraph): seguem a timeline sem throttle
+        self._update_plot_cursors(timestamp)
+        if self.events_tab: self.events_tab.set_current_time(timestamp)
 
     def _update_plot_cursors(self, timestamp):
         if self.standard_plots_tab: self.standard_plots_tab.update_cursor(timestamp)
@@ -1648,7 +2385,11 @@ class TelemetryApp(QMainWindow):
 
         target_widget = None
         push_to_cesium = True
-        if self.timeline_is_ready and self.timelineWidget is not None:
+        if self.web_surface is not None:
+            # O índice vem da própria página: nada a devolver para ela
+            target_widget = self.web_surface if self.timeline_is_ready else None
+            push_to_cesium = False
+        elif self.timeline_is_ready and self.timelineWidget is not None:
             target_widget = self.timelineWidget
         elif self.cesium_is_ready and self.cesiumWidget is not None:
             target_widget = self.cesiumWidget
@@ -1700,22 +2441,6 @@ class TelemetryApp(QMainWindow):
             self.altitude_reference = float(alt_abs)
         return max(0.0, float(alt_abs) - float(self.altitude_reference))
 
-    def _timestamp_to_epoch_ms(self, timestamp):
-        if timestamp is None:
-            return None
-        try:
-            ts = pd.to_datetime(timestamp)
-            if hasattr(ts, 'tz_convert') and ts.tzinfo is not None:
-                ts = ts.tz_convert(None)
-            elif hasattr(ts, 'tz_localize'):
-                try:
-                    ts = ts.tz_localize(None)
-                except Exception:
-                    pass
-            return int(ts.value // 1_000_000)
-        except Exception:
-            return None
-
     def _extract_heading_deg(self, row):
         yaw_candidates = [
             ('Yaw', False),
@@ -1750,76 +2475,6 @@ class TelemetryApp(QMainWindow):
         first_valid = self.df['AltitudeAbs'].dropna()
         self.altitude_reference = float(first_valid.iloc[0]) if not first_valid.empty else 0.0
 
-    def _rgb_to_hex(self, color_tuple):
-        try:
-            r, g, b = color_tuple
-            return '#{0:02x}{1:02x}{2:02x}'.format(int(r), int(g), int(b))
-        except Exception:
-            return '#2196f3'
-
-    def _build_cesium_samples(self):
-        samples = []
-        if self.df.empty:
-            return samples
-        for _, row in self.df.iterrows():
-            lat = row.get('Latitude') if 'Latitude' in row else None
-            lon = row.get('Longitude') if 'Longitude' in row else None
-            if pd.notna(lat) and pd.notna(lon):
-                alt_abs = row.get('AltitudeAbs') if 'AltitudeAbs' in row else None
-                alt_rel = self._compute_relative_altitude(alt_abs)
-                timestamp = row.get('Timestamp') if 'Timestamp' in row else None
-                time_ms = self._timestamp_to_epoch_ms(timestamp) if pd.notna(timestamp) else None
-                samples.append({
-                    'lat': float(lat),
-                    'lon': float(lon),
-                    'alt': float(alt_rel),
-                    'heading': float(self._extract_heading_deg(row)),
-                    'pitch': float(row.get('Pitch', 0) if pd.notna(row.get('Pitch', 0)) else 0),
-                    'roll': float(row.get('Roll', 0) if pd.notna(row.get('Roll', 0)) else 0),
-                    'timeMs': time_ms,
-                    'mode': int(row.get('ModoVoo')) if pd.notna(row.get('ModoVoo', None)) else None
-                })
-            else:
-                samples.append(None)
-        return samples
-
-    def _build_cesium_mode_paths(self):
-        segments = compute_mode_segments(self.df)
-        paths = build_mode_path_segments(self.df, segments)
-        result = []
-        for seg in paths:
-            pts = []
-            for lat, lon, alt in seg['points']:
-                if lat is None or lon is None:
-                    continue
-                pts.append({
-                    'lat': float(lat),
-                    'lon': float(lon),
-                    'alt': float(self._compute_relative_altitude(alt)) if alt is not None else 0.0,
-                })
-            if len(pts) >= 2:
-                result.append({
-                    'label': seg.get('label', ''),
-                    'color': seg.get('color', (33, 150, 243)),
-                    'points': pts
-                })
-        return result
-
-    def _build_mode_segments_for_timeline(self):
-        segments = compute_mode_segments(self.df)
-        mode_blocks = []
-        for seg in segments:
-            start_ms = int(seg.start * 1000)
-            end_ms = int(seg.end * 1000)
-            if end_ms <= start_ms:
-                continue
-            mode_blocks.append({
-                'startMs': start_ms,
-                'endMs': end_ms,
-                'color': seg.color,
-            })
-        return mode_blocks
-
     def set_timestamp_manually(self):
         if self.df.empty: return
         current_ts_str = self.df['Timestamp'].iloc[self.current_timeline_index].strftime('%H:%M:%S.%f')[:-3]
@@ -1829,9 +2484,11 @@ class TelemetryApp(QMainWindow):
                 date_part = self.df['Timestamp'].iloc[0].date()
                 time_part = pd.to_datetime(text, format='%H:%M:%S.%f').time()
                 target_timestamp = pd.Timestamp.combine(date_part, time_part)
-                closest_index = (self.df['Timestamp'] - target_timestamp).abs().idxmin()
+                closest_index = self._time_lookup().row_at(target_timestamp.value / 1e9)
+                if closest_index < 0:
+                    return
 
-                self.update_views_from_timeline(int(closest_index), push_to_cesium=True, sync_timeline_widget=True, force_plot_update=True)
+                self.update_views_from_timeline(closest_index, push_to_cesium=True, sync_timeline_widget=True)
 
             except ValueError:
                 QMessageBox.warning(self, "Erro de Formato", "Use HH:MM:SS.mmm.")
@@ -1846,58 +2503,145 @@ class TelemetryApp(QMainWindow):
 
         if not file_path:
             return
-        
-        self.statusBar().showMessage("Capturando imagens para o relatório...")
-        QApplication.processEvents()
 
-        plot_images = self._capture_plot_images()
-        map_images = self._capture_map_images()
+        # Imagens geradas fora da GUI: gráficos em Agg (pool de processos) e
+        # mapas a partir do cache de tiles; nada de capturar a tela.
+        self.statusBar().showMessage("Gerando imagens do relatório em segundo plano...")
+        self.btn_save_pdf.setEnabled(False)
 
+        from src.utils.pdf_reporter import ReportRenderWorker
+
+        derived_cache = getattr(self.standard_plots_tab, "derived_cache", None)
+        report_cfg = self.app_config.get("report", {})
+        thread = QThread()
+        worker = ReportRenderWorker(
+            self.df,
+            self.current_log_name,
+            tile_cache=self.tile_cache,
+            derived_cache=derived_cache,
+            report_cfg=report_cfg,
+            executor=self._report_executor(),
+        )
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(lambda msg: self.statusBar().showMessage(msg))
+        worker.finished.connect(
+            lambda images, path=file_path, name=self.current_log_name: self._start_pdf_writer(path, name, images)
+        )
+        worker.error.connect(self.on_pdf_error)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        worker.finished.connect(worker.deleteLater)
+        worker.error.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        job = (thread, worker)
+        thread.finished.connect(lambda job=job: self.report_jobs.remove(job) if job in self.report_jobs else None)
+        self.report_jobs.append(job)
+        thread.start()
+
+    def _report_executor(self):
+        """Pool de processos dos gráficos do relatório, criado na primeira vez e reaproveitado."""
+        if self.report_executor is None:
+            from src.utils.report_renderer import create_plot_executor
+
+            max_workers = int(self.app_config.get("report", {}).get("max_workers", 0))
+            self.report_executor = create_plot_executor(max_workers)
+        return self.report_executor
+
+    def _start_pdf_writer(self, file_path, log_name, images):
         self.statusBar().showMessage("Escrevendo arquivo PDF em segundo plano...")
-        self.btn_save_pdf.setEnabled(False)
+        from src.utils.pdf_reporter import PdfReportWorker
 
         self.pdf_thread = QThread()
-        self.pdf_worker = PdfReportWorker(file_path, self.current_log_name, plot_images, map_images)
+        self.pdf_worker = PdfReportWorker(file_path, log_name, images)
         self.pdf_worker.moveToThread(self.pdf_thread)
 
         self.pdf_thread.started.connect(self.pdf_worker.run)
         self.pdf_worker.finished.connect(self.on_pdf_finished)
         self.pdf_worker.error.connect(self.on_pdf_error)
-        
+
         self.pdf_worker.finished.connect(self.pdf_thread.quit)
+        self.pdf_worker.error.connect(self.pdf_thread.quit)
         self.pdf_worker.finished.connect(self.pdf_worker.deleteLater)
         self.pdf_thread.finished.connect(self.pdf_thread.deleteLater)
 
         self.pdf_thread.start()
 
-    def _capture_plot_images(self):
-        images = []
-        canvas_list = self.all_plots_tab.findChildren(FigureCanvas)
-        for canvas in canvas_list:
-            buf = io.BytesIO()
-            canvas.figure.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-            buf.seek(0)
-            images.append(buf)
-        return images
-        
-    def _capture_map_images(self):
-         # ### ALTERAÇÃO ### Usa o nome JS do mapa (self.map_js_name) em vez de window.map_instance
-        images = []
-        map_zooms = [17, 15, 12]
-        if not self.map_js_name: # Verifica se temos o nome JS do mapa
-             print("AVISO: Nome JS do mapa não definido. Pulando captura de mapas.")
-             return images
-        for zoom in map_zooms:
-            if not self.map_is_ready: continue
-            # Usa o nome correto da instância do mapa
-            self.mapWidget.page().runJavaScript(f"{self.map_js_name}.setZoom({zoom});")
-            start_time = time.time()
-            while time.time() < start_time + 1.5: QApplication.processEvents()
-            pixmap = self.mapWidget.grab(); buffer = QBuffer(); buffer.open(QIODevice.OpenModeFlag.ReadWrite)
-            pixmap.save(buffer, "PNG"); img_bytes = io.BytesIO(buffer.data()); img_bytes.seek(0); images.append(img_bytes)
-        # Usa o nome correto da instância do mapa
-        self.mapWidget.page().runJavaScript(f"{self.map_js_name}.setZoom(15);")
-        return images
+    def generate_batch_reports(self):
+        if not self.log_data or self.batch_report_jobs:
+            return
+        from src.utils.batch_reports import DEFAULT_OUTPUT_DIRNAME, BatchReportWorker
+
+        default_dir = os.path.join(str(self.last_logs_root or ""), DEFAULT_OUTPUT_DIRNAME)
+        out_dir = QFileDialog.getExistingDirectory(self, "Pasta dos Relatórios em Lote", default_dir)
+        if not out_dir:
+            return
+
+        self.btn_batch_reports.setEnabled(False)
+        self.statusBar().showMessage(f"Relatórios em lote: 0/{len(self.log_data)} voos...")
+
+        thread = QThread()
+        worker = BatchReportWorker(
+            self.log_data.transient_view(),
+            self.log_sources,
+            out_dir,
+            report_cfg=self.app_config.get("report", {}),
+            tile_cache=self.tile_cache,
+            derived_cache=getattr(self.standard_plots_tab, "derived_cache", None),
+            executor=self._report_executor(),
+            log_types=self.log_types,
+        )
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(
+            lambda done, total: self.statusBar().showMessage(f"Relatórios em lote: {done}/{total} voos...")
+        )
+        worker.finished.connect(lambda flights, path=out_dir: self._on_batch_reports_finished(path, flights))
+        worker.error.connect(self._on_batch_reports_error)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        worker.finished.connect(worker.deleteLater)
+        worker.error.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        job = (thread, worker)
+        thread.finished.connect(lambda job=job: self._on_batch_report_thread_finished(job))
+        self.batch_report_jobs.append(job)
+        thread.start()
+
+    def open_fleet_stats(self):
+        from src.widgets.fleet_stats_dialog import FleetStatsDialog
+
+        if self.fleet_stats_dialog is None:
+            self.fleet_stats_dialog = FleetStatsDialog(
+                str(self.last_logs_root or ""), self.signal_index.names(), self
+            )
+            self.fleet_stats_dialog.destroyed.connect(self._on_fleet_stats_dialog_destroyed)
+        self.fleet_stats_dialog.show()
+        self.fleet_stats_dialog.raise_()
+        self.fleet_stats_dialog.activateWindow()
+
+    def _on_fleet_stats_dialog_destroyed(self, _obj=None):
+        self.fleet_stats_dialog = None
+
+    def _on_batch_report_thread_finished(self, job):
+        if job in self.batch_report_jobs:
+            self.batch_report_jobs.remove(job)
+        self.btn_batch_reports.setEnabled(bool(self.log_data))
+
+    def _on_batch_reports_finished(self, out_dir, flights):
+        from src.utils.batch_reports import STATUS_CREATED, STATUS_ERROR, STATUS_UP_TO_DATE
+
+        created = sum(1 for f in flights if f.status == STATUS_CREATED)
+        skipped = sum(1 for f in flights if f.status == STATUS_UP_TO_DATE)
+        failed = [f for f in flights if f.status == STATUS_ERROR]
+        summary = f"{created} relatório(s) gerado(s), {skipped} já em dia, {len(failed)} com erro."
+        self.statusBar().showMessage(f"Relatórios em lote: {summary}", 10000)
+        details = "".join(f"\n- {f.name}: {f.error}" for f in failed[:10])
+        QMessageBox.information(self, "Relatórios em Lote", f"{summary}\n\nÍndice e relatórios em:\n{out_dir}{details}")
+
+    def _on_batch_reports_error(self, error_msg):
+        self.statusBar().showMessage("Erro nos relatórios em lote.", 5000)
+        QMessageBox.critical(self, "Erro", error_msg)
 
     def on_pdf_finished(self, file_path):
         self.statusBar().showMessage(f"Relatório salvo em: {file_path}", 10000)
@@ -1911,5 +2655,20 @@ class TelemetryApp(QMainWindow):
     
     def closeEvent(self, event):
         print("Fechando aplicação...")
+        self._cancel_tile_seed()
+        self._wait_tile_seed()
+        self._cancel_artifact_preparation()
+        if self.summary_tab: self.summary_tab.cancel_jobs()
+        for _thread, worker in list(self.batch_report_jobs):
+            try:
+                worker.cancel()
+            except RuntimeError:
+                pass
+        if self.report_executor is not None:
+            self.report_executor.shutdown(wait=False, cancel_futures=True)
+        if self.log_download_dialog is not None:
+            self.log_download_dialog.shutdown_background_jobs()
         self.map_server.stop()
+        # Apaga os logs gravados em disco pelo LogStore nesta sessão
+        self.log_data.clear()
         super().closeEvent(event)
\ No newline at end of file
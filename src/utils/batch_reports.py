@@ -0,0 +1,530 @@
+"""Relatórios PDF em lote para todos os voos de uma pasta raiz.
+
+Dois modos de uso:
+
+* GUI (:class:`BatchReportWorker`): reaproveita os DataFrames já carregados,
+  o cache de séries derivadas e o pool de processos do relatório;
+* linha de comando (``python run.py --batch-report <raiz>`` ou
+  ``python -m src.utils.batch_reports <raiz>``): cada pasta é lida e
+  relatada num processo do pool.
+
+Um manifesto JSON na pasta de saída guarda a assinatura (nome, tamanho,
+mtime) dos arquivos de cada pasta de voo e as configurações do relatório;
+pastas sem mudanças são puladas. No fim é escrito um índice (CSV e PDF)
+com o resumo de todos os voos.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QObject, pyqtSignal
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+
+from src.utils.geodesy import geo_series
+from src.utils.log_store import TransientLogView
+from src.utils.mode_utils import epoch_seconds_array
+from src.utils.pdf_reporter import collect_plot_jobs, track_coordinates, write_report_pdf
+from src.utils.report_renderer import DEFAULT_MAP_SIZE, DEFAULT_MAP_ZOOMS, render_report_images
+from src.utils.track_payload import altitude_reference
+
+REPORT_SUFFIX = "_Relatorio.pdf"
+MANIFEST_NAME = "indice_relatorios.json"
+INDEX_CSV_NAME = "indice_voos.csv"
+INDEX_PDF_NAME = "indice_voos.pdf"
+DEFAULT_OUTPUT_DIRNAME = "Relatorios"
+# Incrementar quando o conteúdo do relatório mudar (invalida o manifesto)
+MANIFEST_VERSION = 2
+
+STATUS_CREATED = "gerado"
+STATUS_UP_TO_DATE = "em dia"
+STATUS_ERROR = "erro"
+
+
+@dataclass
+class FlightSummary:
+    name: str
+    folder: str
+    log_type: str = ""
+    source: str = ""
+    samples: int = 0
+    start: str = ""
+    end: str = ""
+    duration_s: float = math.nan
+    # Acima da altitude do início do log (decolagem), não MSL
+    max_altitude_m: float = math.nan
+    total_distance_m: float = math.nan
+    max_distance_m: float = math.nan
+    report: str = ""
+    status: str = ""
+    error: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FlightSummary":
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+
+# ------------------------------------------------------------------- resumo
+def summarize_flight(name: str, df: pd.DataFrame, folder: str, log_type: str = "", source: str = "") -> FlightSummary:
+    summary = FlightSummary(name=name, folder=folder, log_type=log_type, source=source, samples=int(len(df)))
+    if 'Timestamp' in df.columns:
+        epochs = epoch_seconds_array(df['Timestamp'])
+        finite = epochs[np.isfinite(epochs)]
+        if finite.size:
+            start, end = float(finite.min()), float(finite.max())
+            summary.start = pd.Timestamp(start, unit='s').isoformat(sep=' ', timespec='seconds')
+            summary.end = pd.Timestamp(end, unit='s').isoformat(sep=' ', timespec='seconds')
+            summary.duration_s = end - start
+    if 'AltitudeAbs' in df.columns:
+        alt = pd.to_numeric(df['AltitudeAbs'], errors='coerce').to_numpy(dtype=float)
+        if np.isfinite(alt).any():
+            summary.max_altitude_m = float(np.nanmax(alt)) - altitude_reference(df)
+    geo = geo_series(df)
+    if geo is not None:
+        summary.total_distance_m = geo.total_distance_m
+        summary.max_distance_m = geo.max_distance_from_origin_m
+    return summary
+
+
+def _fmt_duration(seconds: float) -> str:
+    if seconds is None or not math.isfinite(seconds):
+        return "-"
+    seconds = int(round(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _fmt_number(value: float, scale: float = 1.0, digits: int = 0) -> str:
+    if value is None or not math.isfinite(value):
+        return "-"
+    return f"{value / scale:.{digits}f}"
+
+
+# ---------------------------------------------------------------- arquivos
+def report_filename(log_name: str) -> str:
+    safe = re.sub(r'[^\w\-.]+', '_', log_name, flags=re.UNICODE).strip('._') or "voo"
+    return safe + REPORT_SUFFIX
+
+
+def folder_label(folder_path: str) -> str:
+    return os.path.basename(os.path.normpath(folder_path)) or folder_path
+
+
+def folder_signature(folder_path: str) -> List[List]:
+    """(nome, tamanho, mtime_ns) dos arquivos da pasta (não recursivo)."""
+    entries = []
+    try:
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                if entry.is_file():
+                    st = entry.stat()
+                    entries.append([entry.name, int(st.st_size), int(st.st_mtime_ns)])
+    except OSError:
+        return []
+    return sorted(entries)
+
+
+def discover_folders(root: str, exclude: Iterable[str] = ()) -> List[Tuple[str, str]]:
+    """Pastas de voo como no carregamento da GUI: a raiz e cada subpasta direta."""
+    excluded = {os.path.normcase(os.path.abspath(p)) for p in exclude}
+    folders = [(root, folder_label(root))]
+    try:
+        with os.scandir(root) as it:
+            subdirs = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+    except OSError as exc:
+        print(f"AVISO: Não foi possível listar {root}: {exc}")
+        subdirs = []
+    for entry in subdirs:
+        if os.path.normcase(os.path.abspath(entry.path)) in excluded:
+            continue
+        folders.append((entry.path, entry.name))
+    return folders
+
+
+def report_settings(report_cfg: Optional[dict]) -> dict:
+    """Parte da configuração que muda o conteúdo do PDF (entra no manifesto)."""
+    cfg = report_cfg or {}
+    return {
+        "version": MANIFEST_VERSION,
+        "dpi": int(cfg.get("dpi", 150)),
+        "map_provider": cfg.get("map_provider", "osm"),
+        "map_zooms": [int(z) for z in cfg.get("map_zooms", DEFAULT_MAP_ZOOMS)],
+        "map_size": [int(v) for v in cfg.get("map_size", DEFAULT_MAP_SIZE)],
+    }
+
+
+class BatchManifest:
+    """Estado dos relatórios já gerados numa pasta de saída."""
+
+    def __init__(self, out_dir: Path | str):
+        self.out_dir = Path(out_dir)
+        self.path = self.out_dir / MANIFEST_NAME
+        self.entries: Dict[str, dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and isinstance(data.get("folders"), dict):
+                self.entries = data["folders"]
+        except (OSError, ValueError):
+            pass
+
+    def is_up_to_date(self, label: str, signature: list, settings: dict) -> bool:
+        entry = self.entries.get(label)
+        if not entry or entry.get("signature") != signature or entry.get("settings") != settings:
+            return False
+        flights = entry.get("flights") or []
+        return all(
+            f.get("status") != STATUS_ERROR and f.get("report") and (self.out_dir / f["report"]).exists()
+            for f in flights
+        )
+
+    def flights(self, label: str) -> List[FlightSummary]:
+        return [FlightSummary.from_dict(f) for f in (self.entries.get(label) or {}).get("flights", [])]
+
+    def update(self, label: str, signature: list, settings: dict, flights: Sequence[FlightSummary]) -> None:
+        self.entries[label] = {
+            "signature": signature,
+            "settings": settings,
+            "flights": [asdict(f) for f in flights],
+        }
+
+    def save(self) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "folders": self.entries}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+
+# ------------------------------------------------------------------ geração
+def write_flight_report(name: str, df: pd.DataFrame, out_dir: Path | str, *, folder: str = "", log_type: str = "",
+                        source: str = "", report_cfg: Optional[dict] = None, tile_source=None,
+                        derived_cache=None, executor=None) -> FlightSummary:
+    """Gera o PDF de um voo e devolve o resumo para o índice."""
+    cfg = report_cfg or {}
+    summary = summarize_flight(name, df, folder, log_type, source)
+    jobs = collect_plot_jobs(df, name, derived_cache)
+    lats, lons = track_coordinates(df)
+    images = render_report_images(
+        jobs,
+        tile_source=tile_source,
+        provider=cfg.get("map_provider", "osm"),
+        lats=lats,
+        lons=lons,
+        zooms=cfg.get("map_zooms", DEFAULT_MAP_ZOOMS),
+        map_size=cfg.get("map_size", DEFAULT_MAP_SIZE),
+        dpi=int(cfg.get("dpi", 150)),
+        executor=executor,
+        # Sem pool compartilhado (ex.: dentro de um processo do lote) desenha em série
+        max_workers=1,
+    )
+    path = Path(out_dir) / report_filename(name)
+    write_report_pdf(str(path), name, images.plots, images.maps)
+    summary.report = path.name
+    summary.status = STATUS_CREATED
+    return summary
+
+
+def _open_tile_cache(tile_root: Optional[str]):
+    """Cache de tiles só para leitura (offline) dentro de um processo do lote."""
+    if not tile_root or not os.path.isdir(tile_root):
+        return None
+    try:
+        from src.utils.tile_cache import TileCache
+        return TileCache(tile_root, offline=True)
+    except Exception as exc:
+        print(f"AVISO: Cache de tiles indisponível no lote ({exc}); mapas sem fundo.")
+        return None
+
+
+def report_folder(folder_path: str, label: str, out_dir: str, report_cfg: Optional[dict] = None,
+                  tile_root: Optional[str] = None) -> List[dict]:
+    """Lê uma pasta de voo e gera os relatórios de todos os seus logs (roda no pool)."""
+    from src.data_parser import load_folder_logs
+
+    tile_source = _open_tile_cache(tile_root)
+    flights: List[dict] = []
+    try:
+        for name, df, log_type, source in load_folder_logs(folder_path, label):
+            try:
+                summary = write_flight_report(
+                    name, df, out_dir, folder=label, log_type=log_type, source=source,
+                    report_cfg=report_cfg, tile_source=tile_source,
+                )
+            except Exception as exc:
+                summary = FlightSummary(name=name, folder=label, log_type=log_type, source=source,
+                                        samples=int(len(df)), status=STATUS_ERROR, error=str(exc))
+            flights.append(asdict(summary))
+    finally:
+        if tile_source is not None:
+            tile_source.close()
+    return flights
+
+
+# ------------------------------------------------------------------- índice
+_INDEX_COLUMNS = (
+    ("Voo", 2.6), ("Tipo", 1.7), ("Início", 1.5), ("Duração", 0.8),
+    ("Alt. máx rel. (m)", 0.9), ("Percurso (km)", 0.9), ("Dist. máx (km)", 0.9), ("Situação", 0.8),
+)
+
+
+def _index_row(f: FlightSummary) -> List[str]:
+    return [
+        f.name, f.log_type, f.start or "-", _fmt_duration(f.duration_s),
+        _fmt_number(f.max_altitude_m), _fmt_number(f.total_distance_m, 1000.0, 2),
+        _fmt_number(f.max_distance_m, 1000.0, 2), f.status,
+    ]
+
+
+def write_index(out_dir: Path | str, flights: Sequence[FlightSummary]) -> Tuple[Path, Path]:
+    """Escreve o índice de voos em CSV e em PDF (com links para cada relatório)."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    flights = sorted(flights, key=lambda f: (f.start or "", f.name))
+
+    csv_path = out_dir / INDEX_CSV_NAME
+    names = [f.name for f in fields(FlightSummary)]
+    with open(csv_path, "w", newline="", encoding="utf-8-sig") as fh:
+        writer = csv.writer(fh, delimiter=";")
+        writer.writerow(names)
+        for f in flights:
+            writer.writerow(["" if isinstance(v, float) and not math.isfinite(v) else v
+                             for v in (getattr(f, n) for n in names)])
+
+    pdf_path = out_dir / INDEX_PDF_NAME
+    c = canvas.Canvas(str(pdf_path), pagesize=landscape(A4))
+    width, height = landscape(A4)
+    scale = (width - 1 * inch) / sum(w for _, w in _INDEX_COLUMNS)
+    col_x = [0.5 * inch]
+    for _title, w in _INDEX_COLUMNS[:-1]:
+        col_x.append(col_x[-1] + w * scale)
+    row_h = 0.24 * inch
+    ok = sum(1 for f in flights if f.status != STATUS_ERROR)
+    total_km = sum(f.total_distance_m for f in flights if math.isfinite(f.total_distance_m)) / 1000.0
+    total_h = sum(f.duration_s for f in flights if math.isfinite(f.duration_s)) / 3600.0
+
+    def header(y):
+        c.setFont("Helvetica-Bold", 16)
+        c.drawString(0.5 * inch, height - 0.7 * inch, "Índice de Voos")
+        c.setFont("Helvetica", 9)
+        c.drawRightString(width - 0.5 * inch, height - 0.7 * inch,
+                          f"{len(flights)} voos ({ok} com relatório) · {total_h:.1f} h · {total_km:.1f} km · "
+                          f"gerado em {time.strftime('%d/%m/%Y %H:%M:%S')}")
+        c.setFont("Helvetica-Bold", 8)
+        for (title, _w), x in zip(_INDEX_COLUMNS, col_x):
+            c.drawString(x, y, title)
+        c.line(0.5 * inch, y - 4, width - 0.5 * inch, y - 4)
+        return y - row_h
+
+    y = header(height - 1.1 * inch)
+    for f in flights:
+        if y < 0.6 * inch:
+            c.showPage()
+            y = header(height - 1.1 * inch)
+        c.setFont("Helvetica", 8)
+        for value, x, (_title, w) in zip(_index_row(f), col_x, _INDEX_COLUMNS):
+            text = str(value)
+            max_chars = max(4, int(w * scale / 4.4))
+            c.drawString(x, y, text if len(text) <= max_chars else text[:max_chars - 1] + "…")
+        if f.report and f.status != STATUS_ERROR:
+            c.linkURL(f.report, (col_x[0], y - 2, col_x[1] - 4, y + 8), relative=1)
+        y -= row_h
+    c.save()
+    return csv_path, pdf_path
+
+
+# ----------------------------------------------------------- lote headless
+def run_batch(root: str, out_dir: Optional[str] = None, *, workers: int = 0, force: bool = False,
+              report_cfg: Optional[dict] = None, tile_root: Optional[str] = None,
+              progress: Optional[Callable[[str], None]] = None) -> List[FlightSummary]:
+    """Gera os relatórios de todas as pastas de ``root`` num pool de processos."""
+    notify = progress or print
+    out_dir = out_dir or os.path.join(root, DEFAULT_OUTPUT_DIRNAME)
+    os.makedirs(out_dir, exist_ok=True)
+    settings = report_settings(report_cfg)
+    manifest = BatchManifest(out_dir)
+
+    flights: List[FlightSummary] = []
+    pending = []
+    for folder_path, label in discover_folders(root, exclude=[out_dir]):
+        signature = folder_signature(folder_path)
+        if not force and manifest.is_up_to_date(label, signature, settings):
+            for f in manifest.flights(label):
+                f.status = STATUS_UP_TO_DATE
+                flights.append(f)
+            continue
+        pending.append((folder_path, label, signature))
+
+    notify(f"INFO: {len(pending)} pastas para relatar, {len(flights)} relatórios já em dia.")
+    if pending:
+        max_workers = int(workers) if workers else max(1, min(len(pending), (os.cpu_count() or 2) - 1))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(report_folder, folder_path, label, out_dir, report_cfg, tile_root): (label, signature)
+                for folder_path, label, signature in pending
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                label, signature = futures[future]
+                try:
+                    folder_flights = [FlightSummary.from_dict(d) for d in future.result()]
+                except Exception as exc:
+                    notify(f"ERRO: Pasta '{label}' falhou: {exc}")
+                    continue
+                # Pastas sem logs também entram no manifesto para não serem relidas
+                manifest.update(label, signature, settings, folder_flights)
+                manifest.save()
+                flights.extend(folder_flights)
+                notify(f"INFO: [{done}/{len(pending)}] '{label}': {len(folder_flights)} relatório(s).")
+
+    if flights:
+        csv_path, pdf_path = write_index(out_dir, flights)
+        notify(f"INFO: Índice de voos em {pdf_path} e {csv_path}")
+    return flights
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from src.utils.config_manager import load_config
+    from src.utils.resource_paths import get_tile_cache_dir
+
+    parser = argparse.ArgumentParser(
+        prog="run.py --batch-report",
+        description="Gera relatórios PDF de todos os voos de uma pasta raiz (sem interface gráfica).",
+    )
+    parser.add_argument("raiz", help="Pasta que contém as pastas de log (a mesma aberta na interface)")
+    parser.add_argument("-o", "--saida", help=f"Pasta dos relatórios (padrão: <raiz>/{DEFAULT_OUTPUT_DIRNAME})")
+    parser.add_argument("-p", "--processos", type=int, default=0, help="Processos em paralelo (padrão: automático)")
+    parser.add_argument("-f", "--forcar", action="store_true", help="Regera mesmo os relatórios que já estão em dia")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.raiz):
+        print(f"ERRO: Pasta não encontrada: {args.raiz}")
+        return 2
+    started = time.perf_counter()
+    flights = run_batch(
+        args.raiz,
+        args.saida,
+        workers=args.processos,
+        force=args.forcar,
+        report_cfg=load_config().get("report", {}),
+        tile_root=str(get_tile_cache_dir(create=False)),
+    )
+    errors = [f for f in flights if f.status == STATUS_ERROR]
+    for f in errors:
+        print(f"ERRO: '{f.name}': {f.error}")
+    print(f"INFO: {len(flights)} voos no índice, {len(errors)} com erro, em {time.perf_counter() - started:.1f} s")
+    return 1 if errors else 0
+
+
+# --------------------------------------------------------------- lote na GUI
+class BatchReportWorker(QObject):
+    """Relatórios em lote dos logs já carregados na GUI (padrão moveToThread).
+
+    Usa os DataFrames em memória e o cache de séries derivadas; os gráficos
+    de cada voo vão para o pool de processos compartilhado do relatório.
+    """
+
+    progress = pyqtSignal(int, int)   # (voos processados, total)
+    message = pyqtSignal(str)
+    finished = pyqtSignal(object)     # List[FlightSummary]
+    error = pyqtSignal(str)
+
+    def __init__(self, log_data: Mapping[str, pd.DataFrame], log_sources: Dict[str, str], out_dir: str,
+                 report_cfg=None, tile_cache=None, derived_cache=None, executor=None, force: bool = False,
+                 log_types: Optional[Dict[str, str]] = None):
+        super().__init__()
+        # Visão do LogStore: cada log é lido (do disco, se preciso) só na vez do seu relatório
+        self.log_data = log_data if isinstance(log_data, TransientLogView) else dict(log_data)
+        self.log_sources = dict(log_sources or {})
+        self.log_types = dict(log_types or {})
+        self.out_dir = out_dir
+        self.report_cfg = dict(report_cfg or {})
+        self.tile_cache = tile_cache
+        self.derived_cache = derived_cache
+        self.executor = executor
+        self.force = force
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _groups(self) -> Dict[str, Tuple[Optional[str], List[str]]]:
+        """label da pasta -> (caminho da pasta, logs dessa pasta)."""
+        groups: Dict[str, Tuple[Optional[str], List[str]]] = {}
+        for name in sorted(self.log_data):
+            source = self.log_sources.get(name)
+            folder = os.path.dirname(source) if source else None
+            label = folder_label(folder) if folder else name
+            groups.setdefault(label, (folder, []))[1].append(name)
+        return groups
+
+    def run(self):
+        try:
+            os.makedirs(self.out_dir, exist_ok=True)
+            settings = report_settings(self.report_cfg)
+            manifest = BatchManifest(self.out_dir)
+            flights: List[FlightSummary] = []
+            total = len(self.log_data)
+            done = 0
+            for label, (folder, names) in self._groups().items():
+                if self._cancelled:
+                    break
+                signature = folder_signature(folder) if folder else None
+                if (not self.force and signature is not None
+                        and manifest.is_up_to_date(label, signature, settings)
+                        and {f.name for f in manifest.flights(label)} >= set(names)):
+                    for f in manifest.flights(label):
+                        f.status = STATUS_UP_TO_DATE
+                        flights.append(f)
+                    done += len(names)
+                    self.progress.emit(done, total)
+                    continue
+                folder_flights = []
+                for name in names:
+                    if self._cancelled:
+                        break
+                    self.message.emit(f"Gerando relatório de '{name}'...")
+                    try:
+                        summary = write_flight_report(
+                            name, self.log_data[name], self.out_dir,
+                            folder=label, log_type=self.log_types.get(name, ""),
+                            source=self.log_sources.get(name, ""),
+                            report_cfg=self.report_cfg, tile_source=self.tile_cache,
+                            derived_cache=self.derived_cache, executor=self.executor,
+                        )
+                    except Exception as exc:
+                        print(f"ERRO: Relatório de '{name}' falhou: {exc}")
+                        summary = FlightSummary(name=name, folder=label, log_type=self.log_types.get(name, ""),
+                                                status=STATUS_ERROR, error=str(exc))
+                    folder_flights.append(summary)
+                    done += 1
+                    self.progress.emit(done, total)
+                if signature is not None and len(folder_flights) == len(names):
+                    manifest.update(label, signature, settings, folder_flights)
+                    manifest.save()
+                flights.extend(folder_flights)
+            if flights:
+                write_index(self.out_dir, flights)
+        except Exception as e:
+            self.error.emit(f"Ocorreu um erro nos relatórios em lote: {e}")
+            return
+        finally:
+            self.log_data = {}
+        self.finished.emit(flights)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,623 @@
+"""Processamento "fora da memória" de logs muito longos.
+
+Os parsers montam o log inteiro na RAM (e, no embarcado, mais de uma vez:
+dados brutos desempacotados + DataFrame de saída). Ensaios de endurance de
+vários dias estouram a memória de notebooks de campo. Acima de um tamanho
+de arquivo (``chunked.threshold_mb``) o log é parseado em blocos de
+``chunked.chunk_rows`` linhas e cada bloco vai direto para um armazenamento
+colunar em disco (:class:`ChunkedStoreWriter`): um ``.npy`` por coluna e
+por bloco, mais um manifesto JSON.
+
+A GUI recebe só um resumo (:meth:`ChunkedLog.summary`) com no máximo as
+linhas que cabem no teto de memória (``chunked.memory_ceiling_mb``). O
+resumo é feito de amostras reais (não médias): linhas espaçadas
+uniformemente mais as linhas com o mínimo e o máximo de cada coluna em cada
+trecho, então picos, flags curtas e a trajetória continuam corretos. Ao dar zoom, os gráficos
+pedem a janela visível em resolução total (:meth:`ChunkedLog.window`).
+
+O armazenamento fica no AppData (``ChunkStore``) e é reaproveitado enquanto
+o arquivo de origem não mudar (tamanho e mtime): reabrir o log não parseia
+de novo. A cada log grande aberto, :func:`prune_chunk_stores` apaga os
+armazenamentos cujo arquivo de origem mudou, os sem uso há mais de
+``chunked.store_max_age_days`` e, acima de ``chunked.store_max_mb``, os
+usados há mais tempo.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.compressed_io import compression_of, uncompressed_size
+from src.utils.frame_memo import FrameMemo
+from src.utils.resource_paths import get_appdata_dir
+
+STORE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+# Extremos de cada coluna são guardados a cada BUCKET_ROWS linhas
+BUCKET_ROWS = 1024
+# Sem índice de blocos, o tamanho original de um .gz/.xz é estimado por este fator
+COMPRESSED_SIZE_FACTOR = 6
+
+DEFAULT_THRESHOLD_MB = 512
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_MEMORY_CEILING_MB = 512
+DEFAULT_STORE_MAX_MB = 20 * 1024
+DEFAULT_STORE_MAX_AGE_DAYS = 30
+STORE_DIRNAME = "ChunkStore"
+# Pasta sem manifesto (parse interrompido) só é apagada depois disso
+STALE_PARTIAL_AGE_S = 24 * 3600
+
+# Colunas com tratamento especial
+TIMESTAMP_COLUMN = "Timestamp"
+TIMESTAMP_STR_COLUMN = "Timestamp_str"
+KIND_DATETIME = "datetime"
+KIND_NULLABLE_INT = "Int64"
+KIND_NUMBER = "number"
+KIND_DERIVED = "derived"
+
+
+@dataclass(frozen=True)
+class ChunkedSettings:
+    enabled: bool = True
+    threshold_bytes: int = DEFAULT_THRESHOLD_MB * 1024 * 1024
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+    memory_ceiling_bytes: int = DEFAULT_MEMORY_CEILING_MB * 1024 * 1024
+    # <= 0 desliga o respectivo limite da limpeza
+    store_max_bytes: int = DEFAULT_STORE_MAX_MB * 1024 * 1024
+    store_max_age_s: float = DEFAULT_STORE_MAX_AGE_DAYS * 86400.0
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "ChunkedSettings":
+        cfg = cfg or {}
+        return cls(
+            enabled=bool(cfg.get("enabled", True)),
+            threshold_bytes=int(float(cfg.get("threshold_mb", DEFAULT_THRESHOLD_MB)) * 1024 * 1024),
+            chunk_rows=max(1000, int(cfg.get("chunk_rows", DEFAULT_CHUNK_ROWS))),
+            memory_ceiling_bytes=int(float(cfg.get("memory_ceiling_mb", DEFAULT_MEMORY_CEILING_MB)) * 1024 * 1024),
+            store_max_bytes=int(float(cfg.get("store_max_mb", DEFAULT_STORE_MAX_MB)) * 1024 * 1024),
+            store_max_age_s=float(cfg.get("store_max_age_days", DEFAULT_STORE_MAX_AGE_DAYS)) * 86400.0,
+        )
+
+    # Metade do teto para o resumo residente; um quarto para a janela em resolução total
+    @property
+    def summary_bytes(self) -> int:
+        return self.memory_ceiling_bytes // 2
+
+    @property
+    def window_bytes(self) -> int:
+        return self.memory_ceiling_bytes // 4
+
+
+def chunked_settings() -> ChunkedSettings:
+    from src.utils.config_manager import load_config
+
+    try:
+        return ChunkedSettings.from_config(load_config().get("chunked", {}))
+    except Exception as exc:
+        print(f"AVISO: Configuração 'chunked' inválida ({exc}); usando padrões.")
+        return ChunkedSettings()
+
+
+def estimated_log_bytes(path: str) -> int:
+    size = uncompressed_size(path)
+    if size is not None:
+        return int(size)
+    return os.path.getsize(path) * COMPRESSED_SIZE_FACTOR
+
+
+def should_chunk(path: str, settings: Optional[ChunkedSettings] = None) -> bool:
+    """Se o log deve ser lido em blocos para o armazenamento em disco."""
+    settings = settings or chunked_settings()
+    if not settings.enabled:
+        return False
+    try:
+        return estimated_log_bytes(path) >= settings.threshold_bytes
+    except OSError:
+        return False
+
+
+def store_dir_for(source_path: str) -> Path:
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(source_path)).encode("utf-8")).hexdigest()[:20]
+    return get_appdata_dir(STORE_DIRNAME, create=True) / key
+
+
+def source_signature(path: str) -> List:
+    st = os.stat(path)
+    return [os.path.basename(path), int(st.st_size), int(st.st_mtime_ns), compression_of(path) or ""]
+
+
+# ------------------------------------------------------------------- escrita
+def _column_kind(series: pd.Series) -> Optional[str]:
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return KIND_DATETIME
+    if isinstance(series.dtype, pd.Int64Dtype):
+        return KIND_NULLABLE_INT
+    if pd.api.types.is_numeric_dtype(series):
+        return KIND_NUMBER
+    return None
+
+
+class ChunkedStoreWriter:
+    """Recebe o log em blocos (DataFrames) e grava cada coluna em disco.
+
+    O primeiro bloco define as colunas; blocos seguintes sem alguma delas
+    recebem NaN. Para cada trecho de ``BUCKET_ROWS`` linhas são guardados o
+    mínimo e o máximo de cada coluna e a linha onde ocorrem (base do resumo).
+    """
+
+    def __init__(self, directory: Path | str, signature: Sequence, source_path: Optional[str] = None):
+        self.directory = Path(directory)
+        if self.directory.exists():
+            shutil.rmtree(self.directory, ignore_errors=True)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.signature = list(signature)
+        # Caminho de origem: a limpeza confere se o arquivo mudou desde o parse
+        self.source_path = os.path.abspath(source_path) if source_path else ""
+        self.columns: List[Tuple[str, str, str]] = []   # (nome, tipo, dtype numpy)
+        self.chunks: List[dict] = []
+        self.rows = 0
+        self._buckets: Dict[str, List[np.ndarray]] = {}
+
+    def _define_columns(self, df: pd.DataFrame) -> None:
+        for name in df.columns:
+            name = str(name)
+            if name == TIMESTAMP_STR_COLUMN:
+                self.columns.append((name, KIND_DERIVED, ""))
+                continue
+            kind = _column_kind(df[name])
+            if kind is None:
+                continue
+            if kind == KIND_DATETIME:
+                dtype = "int64"
+            elif kind == KIND_NULLABLE_INT:
+                dtype = "float64"
+            else:
+                dtype = np.dtype(df[name].dtype).str
+            self.columns.append((name, kind, dtype))
+
+    def _storage_array(self, df: pd.DataFrame, name: str, kind: str, dtype: str) -> np.ndarray:
+        n = len(df)
+        if name not in df.columns:
+            if kind == KIND_DATETIME:
+                return np.full(n, np.iinfo(np.int64).min, dtype=np.int64)
+            return np.full(n, np.nan, dtype=np.float64 if np.dtype(dtype).kind != 'f' else np.dtype(dtype))
+        series = df[name]
+        if kind == KIND_DATETIME:
+            return pd.to_datetime(series, errors='coerce').to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        if kind == KIND_NULLABLE_INT:
+            return series.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = series.to_numpy()
+        if values.dtype != np.dtype(dtype):
+            values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64)
+        return values
+
+    def append(self, df: pd.DataFrame) -> None:
+        if df is None or df.empty:
+            return
+        if not self.columns:
+            self._define_columns(df)
+        index = len(self.chunks)
+        n = len(df)
+        files = {}
+        t_min = t_max = math.nan
+        for col_idx, (name, kind, dtype) in enumerate(self.columns):
+            if kind == KIND_DERIVED:
+                continue
+            values = np.ascontiguousarray(self._storage_array(df, name, kind, dtype))
+            filename = f"c{index:05d}_{col_idx:04d}.npy"
+            np.save(self.directory / filename, values, allow_pickle=False)
+            files[name] = filename
+            if kind == KIND_DATETIME and name == TIMESTAMP_COLUMN:
+                valid = values[values != np.iinfo(np.int64).min]
+                if valid.size:
+                    t_min, t_max = float(valid.min()) / 1e9, float(valid.max()) / 1e9
+            else:
+                self._add_buckets(name, values.astype(np.float64, copy=False))
+        self.chunks.append({"rows": n, "offset": self.rows, "t_min": t_min, "t_max": t_max, "files": files})
+        self.rows += n
+
+    def _add_buckets(self, name: str, values: np.ndarray) -> None:
+        # Trechos alinhados ao início do bloco; o último trecho do bloco pode ser menor
+        n = values.size
+        n_buckets = -(-n // BUCKET_ROWS)
+        padded = np.full(n_buckets * BUCKET_ROWS, np.nan)
+        padded[:n] = values
+        grid = padded.reshape(n_buckets, BUCKET_ROWS)
+        finite = np.isfinite(grid)
+        low = np.where(finite, grid, np.inf)
+        high = np.where(finite, grid, -np.inf)
+        arg_low = low.argmin(axis=1)
+        arg_high = high.argmax(axis=1)
+        rows = np.arange(n_buckets)
+        base = self.rows + rows * BUCKET_ROWS
+        entry = np.stack([
+            low[rows, arg_low],
+            high[rows, arg_high],
+            (base + arg_low).astype(np.float64),
+            (base + arg_high).astype(np.float64),
+        ], axis=1)
+        self._buckets.setdefault(name, []).append(entry)
+
+    def close(self) -> "ChunkedLog":
+        """Grava extremos e manifesto; devolve o log pronto para leitura."""
+        bucket_files = {}
+        for col_idx, (name, kind, _dtype) in enumerate(self.columns):
+            parts = self._buckets.get(name)
+            if not parts:
+                continue
+            filename = f"b_{col_idx:04d}.npy"
+            np.save(self.directory / filename, np.concatenate(parts), allow_pickle=False)
+            bucket_files[name] = filename
+        manifest = {
+            "version": STORE_VERSION,
+            "signature": self.signature,
+            "source": self.source_path,
+            "rows": self.rows,
+            "columns": [list(c) for c in self.columns],
+            "chunks": self.chunks,
+            "buckets": bucket_files,
+        }
+        tmp = self.directory / (MANIFEST_NAME + ".tmp")
+        tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp, self.directory / MANIFEST_NAME)
+        self._buckets.clear()
+        return ChunkedLog(self.directory, manifest)
+
+
+# ------------------------------------------------------------------- leitura
+class ChunkedLog:
+    """Log gravado por :class:`ChunkedStoreWriter` (colunas lidas via memmap)."""
+
+    def __init__(self, directory: Path | str, manifest: Optional[dict] = None):
+        self.directory = Path(directory)
+        if manifest is None:
+            manifest = json.loads((self.directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+        self.manifest = manifest
+        self.rows = int(manifest["rows"])
+        self.columns: List[Tuple[str, str, str]] = [tuple(c) for c in manifest["columns"]]
+        self.chunks: List[dict] = manifest["chunks"]
+        self._offsets = np.array([c["offset"] for c in self.chunks] + [self.rows], dtype=np.int64)
+
+    @classmethod
+    def open_if_current(cls, directory: Path | str, signature: Sequence) -> Optional["ChunkedLog"]:
+        """O armazenamento já gravado, se for da mesma versão do arquivo de origem."""
+        try:
+            manifest = json.loads((Path(directory) / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if manifest.get("version") != STORE_VERSION or manifest.get("signature") != list(signature):
+            return None
+        return cls(directory, manifest)
+
+    @property
+    def column_names(self) -> List[str]:
+        return [name for name, _kind, _dtype in self.columns]
+
+    @property
+    def row_bytes(self) -> int:
+        """Bytes por linha na RAM (aproximado) quando o log vira DataFrame."""
+        total = 0
+        for _name, kind, dtype in self.columns:
+            if kind == KIND_DERIVED:
+                total += 64   # string HH:MM:SS.mmm como objeto Python
+            elif kind == KIND_NULLABLE_INT:
+                total += 9
+            else:
+                total += np.dtype(dtype).itemsize
+        return max(total, 1)
+
+    @property
+    def time_range(self) -> Tuple[float, float]:
+        starts = [c["t_min"] for c in self.chunks if math.isfinite(c["t_min"])]
+        ends = [c["t_max"] for c in self.chunks if math.isfinite(c["t_max"])]
+        return (min(starts), max(ends)) if starts else (math.nan, math.nan)
+
+    def _chunk_column(self, chunk: dict, name: str) -> Optional[np.ndarray]:
+        filename = chunk["files"].get(name)
+        if filename is None:
+            return None
+        return np.load(self.directory / filename, mmap_mode='r', allow_pickle=False)
+
+    def _frame(self, parts: Dict[str, List[np.ndarray]], columns: Sequence[Tuple[str, str, str]]) -> pd.DataFrame:
+        data = {}
+        for name, kind, _dtype in columns:
+            if kind == KIND_DERIVED:
+                continue
+            values = np.concatenate(parts[name]) if parts.get(name) else np.empty(0)
+            if kind == KIND_DATETIME:
+                data[name] = pd.to_datetime(values.astype(np.int64), unit='ns', errors='coerce')
+            elif kind == KIND_NULLABLE_INT:
+                data[name] = pd.array(np.where(np.isfinite(values), values, np.nan), dtype="Float64").astype("Int64")
+            else:
+                data[name] = values
+        df = pd.DataFrame(data)
+        names = [name for name, _kind, _dtype in columns]
+        if TIMESTAMP_STR_COLUMN in names and TIMESTAMP_COLUMN in df.columns:
+            df[TIMESTAMP_STR_COLUMN] = df[TIMESTAMP_COLUMN].dt.strftime('%H:%M:%S.%f').str[:-3]
+            df = df[[name for name in names if name in df.columns]]
+        return df
+
+    def _select_columns(self, columns: Optional[Iterable[str]]) -> List[Tuple[str, str, str]]:
+        if columns is None:
+            return list(self.columns)
+        wanted = set(columns) | {TIMESTAMP_COLUMN}
+        return [c for c in self.columns if c[0] in wanted]
+
+    def take(self, rows: np.ndarray, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Linhas ``rows`` (índices globais em ordem crescente) como DataFrame."""
+        selected = self._select_columns(columns)
+        rows = np.asarray(rows, dtype=np.int64)
+        chunk_of = np.searchsorted(self._offsets, rows, side='right') - 1
+        parts: Dict[str, List[np.ndarray]] = {}
+        for chunk_idx in np.unique(chunk_of).tolist():
+            chunk = self.chunks[chunk_idx]
+            local = rows[chunk_of == chunk_idx] - chunk["offset"]
+            for name, kind, _dtype in selected:
+                if kind == KIND_DERIVED:
+                    continue
+                values = self._chunk_column(chunk, name)
+                if values is None:
+                    values = np.full(chunk["rows"], np.nan)
+                parts.setdefault(name, []).append(np.asarray(values[local]))
+        return self._frame(parts, selected)
+
+    def column_array(self, name: str, dtype=np.float64) -> np.ndarray:
+        """Coluna inteira em resolução total (uma coluna cabe na RAM mesmo quando o log não cabe)."""
+        parts = []
+        for chunk in self.chunks:
+            values = self._chunk_column(chunk, name)
+            parts.append(np.full(chunk["rows"], np.nan, dtype=dtype) if values is None
+                         else np.asarray(values, dtype=dtype))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    def summary_rows(self, settings: Optional[ChunkedSettings] = None) -> int:
+        settings = settings or chunked_settings()
+        return max(1000, settings.summary_bytes // self.row_bytes)
+
+    def summary(self, max_rows: Optional[int] = None) -> pd.DataFrame:
+        """Resumo com amostras reais: mínimo/máximo de cada coluna por trecho + linhas espaçadas.
+
+        Metade de ``max_rows`` vai para os extremos (trechos agrupados até caberem)
+        e o restante para linhas espaçadas uniformemente, incluindo a primeira e a última.
+        """
+        max_rows = max_rows or self.summary_rows()
+        if self.rows <= max_rows:
+            df = self.take(np.arange(self.rows))
+        else:
+            picked = []
+            bucket_files = self.manifest.get("buckets", {})
+            for filename in bucket_files.values():
+                extremes = np.load(self.directory / filename)
+                n_buckets = extremes.shape[0]
+                groups = int(min(n_buckets, max(1, (max_rows // 2) // (2 * len(bucket_files)))))
+                size = -(-n_buckets // groups)
+                groups = -(-n_buckets // size)
+                pad = groups * size - n_buckets
+                low = np.concatenate([extremes[:, 0], np.full(pad, np.inf)]).reshape(groups, size)
+                high = np.concatenate([extremes[:, 1], np.full(pad, -np.inf)]).reshape(groups, size)
+                low_rows = np.concatenate([extremes[:, 2], np.zeros(pad)]).reshape(groups, size)
+                high_rows = np.concatenate([extremes[:, 3], np.zeros(pad)]).reshape(groups, size)
+                g = np.arange(groups)
+                arg_low, arg_high = low.argmin(axis=1), high.argmax(axis=1)
+                # Trechos sem nenhum valor finito não contribuem
+                picked.append(low_rows[g, arg_low][np.isfinite(low[g, arg_low])])
+                picked.append(high_rows[g, arg_high][np.isfinite(high[g, arg_high])])
+            extremes_rows = np.unique(np.concatenate(picked).astype(np.int64)) if picked else np.empty(0, dtype=np.int64)
+            spaced = np.linspace(0, self.rows - 1, max(2, max_rows - extremes_rows.size)).astype(np.int64)
+            df = self.take(np.union1d(extremes_rows, spaced))
+        # Mesma ordem do arquivo (como os parsers comuns)
+        df.attrs["chunk_store"] = str(self.directory)
+        df.attrs["chunk_rows"] = self.rows
+        return df
+
+    def _overlapping(self, t0: float, t1: float) -> List[dict]:
+        return [c for c in self.chunks
+                if not (math.isfinite(c["t_min"]) and (c["t_max"] < t0 or c["t_min"] > t1))]
+
+    def rows_between(self, t0: float, t1: float) -> int:
+        """Estimativa de linhas com tempo em [t0, t1] (proporcional dentro de cada bloco)."""
+        total = 0.0
+        for chunk in self._overlapping(t0, t1):
+            span = chunk["t_max"] - chunk["t_min"]
+            if not math.isfinite(span) or span <= 0:
+                total += chunk["rows"]
+                continue
+            overlap = min(t1, chunk["t_max"]) - max(t0, chunk["t_min"])
+            total += chunk["rows"] * max(0.0, min(1.0, overlap / span))
+        return int(total)
+
+    def window_arrays(self, t0: float, t1: float, columns: Sequence[str]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """(tempo epoch em s, {coluna: valores float}) em resolução total dentro de [t0, t1]."""
+        times: List[np.ndarray] = []
+        values: Dict[str, List[np.ndarray]] = {name: [] for name in columns}
+        for chunk in self._overlapping(t0, t1):
+            ts = self._chunk_column(chunk, TIMESTAMP_COLUMN)
+            if ts is None:
+                continue
+            epoch = np.asarray(ts, dtype=np.float64) / 1e9
+            epoch[np.asarray(ts) == np.iinfo(np.int64).min] = np.nan
+            mask = (epoch >= t0) & (epoch <= t1)
+            if not mask.any():
+                continue
+            times.append(epoch[mask])
+            for name in columns:
+                column = self._chunk_column(chunk, name)
+                if column is None:
+                    values[name].append(np.full(int(mask.sum()), np.nan))
+                else:
+                    values[name].append(np.asarray(column[mask], dtype=np.float64))
+        if not times:
+            return np.empty(0), {name: np.empty(0) for name in columns}
+        return np.concatenate(times), {name: np.concatenate(parts) for name, parts in values.items()}
+
+    def window(self, t0: float, t1: float, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Linhas com tempo em [t0, t1] em resolução total, como DataFrame."""
+        chunks = self._overlapping(t0, t1)
+        rows = []
+        for chunk in chunks:
+            ts = self._chunk_column(chunk, TIMESTAMP_COLUMN)
+            if ts is None:
+                continue
+            epoch = np.asarray(ts, dtype=np.float64) / 1e9
+            rows.append(chunk["offset"] + np.flatnonzero((epoch >= t0) & (epoch <= t1)))
+        return self.take(np.concatenate(rows) if rows else np.empty(0, dtype=np.int64), columns)
+
+
+# --------------------------------------------------------------- integração
+def load_chunked_log(file_path: str, iter_chunks: Callable[[str, int], Iterable[pd.DataFrame]],
+                     settings: Optional[ChunkedSettings] = None) -> pd.DataFrame:
+    """Resumo do log via armazenamento em disco (parseia em blocos só se preciso)."""
+    settings = settings or chunked_settings()
+    directory = store_dir_for(file_path)
+    signature = source_signature(file_path)
+    _mark_in_use(directory)
+    store = ChunkedLog.open_if_current(directory, signature)
+    if store is None:
+        print(f"INFO: Log grande ({estimated_log_bytes(file_path) / 1e6:.0f} MB); "
+              f"parseando em blocos de {settings.chunk_rows} linhas para {directory}")
+        writer = ChunkedStoreWriter(directory, signature, file_path)
+        for chunk in iter_chunks(file_path, settings.chunk_rows):
+            writer.append(chunk)
+        if not writer.rows:
+            return pd.DataFrame()
+        store = writer.close()
+    else:
+        print(f"INFO: Reaproveitando armazenamento em blocos de {os.path.basename(file_path)} ({store.rows} linhas)")
+        # mtime do manifesto = último uso (ordem da limpeza por tamanho/idade)
+        try:
+            os.utime(directory / MANIFEST_NAME)
+        except OSError:
+            pass
+    prune_chunk_stores(settings)
+    df = store.summary(store.summary_rows(settings))
+    print(f"INFO: Resumo residente com {len(df)} de {store.rows} linhas (teto {settings.memory_ceiling_bytes // 2**20} MB)")
+    return df
+
+
+# ------------------------------------------------------------------ limpeza
+# Armazenamentos abertos nesta sessão (logs carregados): nunca são apagados
+_IN_USE: set = set()
+_IN_USE_LOCK = threading.Lock()
+
+
+def _mark_in_use(directory: Path) -> None:
+    with _IN_USE_LOCK:
+        _IN_USE.add(os.path.normcase(str(directory)))
+
+
+def _dir_bytes(directory: Path) -> int:
+    total = 0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return total
+
+
+def _source_changed(manifest: dict) -> bool:
+    """Se o arquivo de origem existe e não bate mais com a assinatura gravada."""
+    source = manifest.get("source") or ""
+    if not source or not os.path.exists(source):
+        return False
+    try:
+        return source_signature(source) != manifest.get("signature")
+    except OSError:
+        return False
+
+
+def prune_chunk_stores(settings: Optional[ChunkedSettings] = None, root: Optional[Path | str] = None) -> int:
+    """Apaga armazenamentos obsoletos, velhos ou além do teto de disco; devolve os bytes liberados.
+
+    Obsoletos: outra versão do formato ou arquivo de origem modificado. Os
+    abertos nesta sessão são mantidos mesmo que passem dos limites.
+    """
+    settings = settings or chunked_settings()
+    root = Path(root) if root is not None else get_appdata_dir(STORE_DIRNAME, create=True)
+    now = time.time()
+    with _IN_USE_LOCK:
+        in_use = set(_IN_USE)
+    kept: List[Tuple[float, int, Path]] = []   # (último uso, bytes, pasta)
+    freed = removed = 0
+    try:
+        children = [child for child in root.iterdir() if child.is_dir()]
+    except OSError:
+        return 0
+
+    def remove(directory: Path, size: int, reason: str) -> None:
+        nonlocal freed, removed
+        shutil.rmtree(directory, ignore_errors=True)
+        if not directory.exists():
+            freed += size
+            removed += 1
+        else:
+            print(f"AVISO: Não foi possível apagar o armazenamento em blocos {directory.name} ({reason}).")
+
+    for directory in children:
+        if os.path.normcase(str(directory)) in in_use:
+            continue
+        manifest_path = directory / MANIFEST_NAME
+        try:
+            last_use = manifest_path.stat().st_mtime
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            try:
+                if now - directory.stat().st_mtime > STALE_PARTIAL_AGE_S:
+                    remove(directory, _dir_bytes(directory), "parse incompleto")
+            except OSError:
+                pass
+            continue
+        size = _dir_bytes(directory)
+        if manifest.get("version") != STORE_VERSION or _source_changed(manifest):
+            remove(directory, size, "origem modificada")
+        elif settings.store_max_age_s > 0 and now - last_use > settings.store_max_age_s:
+            remove(directory, size, "sem uso")
+        else:
+            kept.append((last_use, size, directory))
+
+    if settings.store_max_bytes > 0:
+        total = sum(size for _last, size, _dir in kept)
+        for _last, size, directory in sorted(kept, key=lambda item: item[0]):
+            if total <= settings.store_max_bytes:
+                break
+            remove(directory, size, "teto de disco")
+            total -= size
+    if removed:
+        print(f"INFO: {removed} armazenamento(s) em blocos apagado(s) ({freed / 1e6:.0f} MB liberados)")
+    return freed
+
+
+_MEMO = FrameMemo()
+
+
+def chunked_log_for(df: pd.DataFrame) -> Optional[ChunkedLog]:
+    """O :class:`ChunkedLog` de onde veio o resumo ``df`` (ou None para logs comuns)."""
+    if df is None or "chunk_store" not in getattr(df, "attrs", {}):
+        return None
+    memo = _MEMO.store_for(df)
+    store = memo.get("chunked_log")
+    if store is None:
+        _mark_in_use(Path(df.attrs["chunk_store"]))
+        try:
+            store = ChunkedLog(df.attrs["chunk_store"])
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"AVISO: Armazenamento em blocos indisponível ({exc}); usando só o resumo.")
+            return None
+        memo["chunked_log"] = store
+    return store
@@ -0,0 +1,240 @@
+"""Leitura e escrita transparente de logs comprimidos (gzip/xz).
+
+Os logs locais podem ser guardados como ``arquivo.log.gz`` ou
+``arquivo.log.xz``. O arquivo comprimido é uma sequência de membros gzip (ou
+streams xz) independentes, um por bloco de ``DEFAULT_BLOCK_BYTES`` do
+original: ``gzip.open``/``lzma.open`` leem tudo de forma sequencial e sem
+descomprimir para o disco. Para os logs embarcados binários há ainda um
+índice ``<arquivo>.blocks.json`` com o deslocamento de cada bloco, o que
+permite ler só um trecho (registros ``start..start+count``) descomprimindo
+apenas os blocos envolvidos.
+"""
+from __future__ import annotations
+
+import contextlib
+import gzip
+import json
+import lzma
+import os
+import shutil
+import tempfile
+import zlib
+from typing import BinaryIO, Callable, Iterator, List, Optional, TextIO
+
+import numpy as np
+
+GZIP = "gzip"
+XZ = "xz"
+COMPRESSION_SUFFIXES = {GZIP: ".gz", XZ: ".xz"}
+_SUFFIX_TO_METHOD = {suffix: method for method, suffix in COMPRESSION_SUFFIXES.items()}
+# Extensões que valem a pena comprimir (.mat já usa zlib internamente)
+COMPRESSIBLE_EXTS = {".log", ".csv"}
+# Logs embarcados binários: ganham índice de blocos para acesso aleatório
+BINARY_LOG_NAMES = {"spi.log", "afgs_monitoring.log"}
+# Múltiplo de 1024 bytes = 128 floats64, o registro do AFGS_Monitoring.log
+DEFAULT_BLOCK_BYTES = 1024 * 1024
+BLOCK_INDEX_SUFFIX = ".blocks.json"
+
+
+def compression_of(path: str | os.PathLike) -> Optional[str]:
+    """Método de compressão pelo sufixo (``None`` para arquivo comum)."""
+    return _SUFFIX_TO_METHOD.get(os.path.splitext(os.fspath(path))[1].lower())
+
+
+def strip_compression(name: str) -> str:
+    """Nome sem o sufixo de compressão: ``spi.log.gz`` -> ``spi.log``."""
+    return os.path.splitext(name)[0] if compression_of(name) else name
+
+
+def log_suffix(name: str) -> str:
+    """Extensão do log ignorando a compressão: ``log01.csv.xz`` -> ``.csv``."""
+    return os.path.splitext(strip_compression(name))[1].lower()
+
+
+def find_log_file(path: str | os.PathLike) -> Optional[str]:
+    """O próprio ``path`` se existir, senão a versão comprimida (.gz/.xz)."""
+    path = os.fspath(path)
+    for candidate in (path, *(path + suffix for suffix in COMPRESSION_SUFFIXES.values())):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def open_log_binary(path: str | os.PathLike) -> BinaryIO:
+    method = compression_of(path)
+    if method == GZIP:
+        return gzip.open(path, "rb")
+    if method == XZ:
+        return lzma.open(path, "rb")
+    return open(path, "rb")
+
+
+def open_log_text(path: str | os.PathLike, encoding: str = "utf-8", errors: str = "ignore") -> TextIO:
+    method = compression_of(path)
+    if method == GZIP:
+        return gzip.open(path, "rt", encoding=encoding, errors=errors)
+    if method == XZ:
+        return lzma.open(path, "rt", encoding=encoding, errors=errors)
+    return open(path, "r", encoding=encoding, errors=errors)
+
+
+@contextlib.contextmanager
+def materialized(path: str | os.PathLike) -> Iterator[str]:
+    """Caminho de um arquivo comum com o conteúdo do log (para programas externos).
+
+    Logs comprimidos são descomprimidos num temporário apagado ao sair.
+    """
+    path = os.fspath(path)
+    if compression_of(path) is None:
+        yield path
+        return
+    base = strip_compression(os.path.basename(path))
+    fd, tmp_path = tempfile.mkstemp(prefix="log_", suffix="_" + base)
+    try:
+        with os.fdopen(fd, "wb") as dst, open_log_binary(path) as src:
+            shutil.copyfileobj(src, dst, DEFAULT_BLOCK_BYTES)
+        yield tmp_path
+    finally:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+
+
+# ----------------------------------------------------------------- escrita
+def _compress_block(data: bytes, method: str) -> bytes:
+    if method == GZIP:
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if method == XZ:
+        return lzma.compress(data, format=lzma.FORMAT_XZ, preset=6)
+    raise ValueError(f"Compressão desconhecida: '{method}'")
+
+
+def compress_file(
+    source: str | os.PathLike,
+    target: str | os.PathLike,
+    method: str,
+    *,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+    write_index: bool = False,
+    on_bytes: Callable[[int], None] | None = None,
+) -> None:
+    """Comprime ``source`` em ``target`` bloco a bloco (membros independentes).
+
+    Com ``write_index`` grava também ``<target>.blocks.json``. ``on_bytes``
+    recebe a quantidade de bytes originais processada a cada bloco.
+    """
+    offsets: List[int] = []
+    total = 0
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        while True:
+            chunk = src.read(block_bytes)
+            if not chunk:
+                break
+            offsets.append(dst.tell())
+            dst.write(_compress_block(chunk, method))
+            total += len(chunk)
+            if on_bytes:
+                on_bytes(len(chunk))
+        offsets.append(dst.tell())
+    if write_index:
+        index = {"method": method, "block_bytes": block_bytes, "size": total, "offsets": offsets}
+        with open(os.fspath(target) + BLOCK_INDEX_SUFFIX, "w", encoding="utf-8") as handle:
+            json.dump(index, handle)
+
+
+# ----------------------------------------------------------------- leitura
+def _load_block_index(path: str) -> Optional[dict]:
+    try:
+        with open(path + BLOCK_INDEX_SUFFIX, "r", encoding="utf-8") as handle:
+            index = json.load(handle)
+        if index.get("method") == compression_of(path) and len(index.get("offsets", ())) >= 1:
+            return index
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _decompress_block(data: bytes, method: str) -> bytes:
+    if method == GZIP:
+        return zlib.decompress(data, wbits=31)
+    return lzma.decompress(data, format=lzma.FORMAT_XZ)
+
+
+def read_range(path: str | os.PathLike, offset: int, size: int) -> bytes:
+    """Lê ``size`` bytes (do conteúdo original) a partir de ``offset``.
+
+    Com índice de blocos só os blocos do trecho são descomprimidos; sem
+    índice o stream é percorrido desde o início.
+    """
+    path = os.fspath(path)
+    method = compression_of(path)
+    if method is None:
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            return handle.read(size)
+    index = _load_block_index(path)
+    if index is None:
+        with open_log_binary(path) as handle:
+            handle.seek(offset)
+            return handle.read(size)
+    block_bytes = int(index["block_bytes"])
+    offsets = index["offsets"]
+    end = min(offset + size, int(index["size"]))
+    if end <= offset:
+        return b""
+    first, last = offset // block_bytes, (end - 1) // block_bytes
+    parts = []
+    with open(path, "rb") as handle:
+        handle.seek(offsets[first])
+        raw = handle.read(offsets[last + 1] - offsets[first])
+    for block in range(first, last + 1):
+        start = offsets[block] - offsets[first]
+        parts.append(_decompress_block(raw[start:offsets[block + 1] - offsets[first]], method))
+    data = b"".join(parts)
+    skip = offset - first * block_bytes
+    return data[skip:skip + (end - offset)]
+
+
+def uncompressed_size(path: str | os.PathLike) -> Optional[int]:
+    """Tamanho original, se conhecido sem descomprimir (arquivo comum ou com índice)."""
+    path = os.fspath(path)
+    if compression_of(path) is None:
+        return os.path.getsize(path)
+    index = _load_block_index(path)
+    return int(index["size"]) if index else None
+
+
+def read_binary_array(path: str | os.PathLike, dtype, start: int = 0, count: Optional[int] = None) -> np.ndarray:
+    """Equivalente a ``np.fromfile`` que aceita logs comprimidos.
+
+    ``start``/``count`` são em itens de ``dtype``; com índice de blocos a
+    leitura parcial descomprime apenas os blocos necessários.
+    """
+    dtype = np.dtype(dtype)
+    path = os.fspath(path)
+    if compression_of(path) is None:
+        return np.fromfile(path, dtype=dtype, count=-1 if count is None else count, offset=start * dtype.itemsize)
+    total = uncompressed_size(path)
+    if start or count is not None:
+        if count is None and total is not None:
+            count = max(total // dtype.itemsize - start, 0)
+        if count is not None:
+            data = bytearray(read_range(path, start * dtype.itemsize, count * dtype.itemsize))
+            return np.frombuffer(data, dtype=dtype, count=len(data) // dtype.itemsize)
+    with open_log_binary(path) as handle:
+        if start:
+            handle.seek(start * dtype.itemsize)
+        if total is None:
+            data = bytearray(handle.read())
+        else:
+            # Tamanho conhecido pelo índice: descomprime direto no buffer final
+            data = bytearray(total - start * dtype.itemsize)
+            view = memoryview(data)
+            filled = 0
+            while filled < len(data):
+                read = handle.readinto(view[filled:])
+                if not read:
+                    break
+                filled += read
+            del view
+            del data[filled:]
+    return np.frombuffer(data, dtype=dtype, count=len(data) // dtype.itemsize)
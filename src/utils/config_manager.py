@@ -12,6 +12,66 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "gpu": {
         "preferred_index": None,
     },
+    "tiles": {
+        "offline": False,
+        "cache_max_mb": 1024,
+        "seed_on_load": False,
+        "seed_zooms": [10, 11, 12, 13, 14, 15, 16, 17],
+        "seed_providers": ["esriWorldImagery"],
+        "seed_workers": 2,
+        "seed_max_tiles": 4000,
+    },
+    "web": {
+        "single_surface": False,
+    },
+    "artifacts": {
+        "max_workers": 2,
+        "prefetch_all": True,
+    },
+    "comparison": {
+        "backend": "matplotlib",
+        "grid_step_s": 0.1,
+    },
+    "report": {
+        "max_workers": 0,
+        "dpi": 150,
+        "map_provider": "osm",
+        "map_zooms": [17, 15, 12],
+        "map_size": [1600, 1000],
+    },
+    "download": {
+        "max_workers": 4,
+        "verify_hash": False,
+        "compression": "none",
+    },
+    "catalog": {
+        "auto_index": True,
+        "max_workers": 2,
+    },
+    "stats": {
+        "max_workers": 4,
+    },
+    "fleet": {
+        "max_workers": 0,
+        "bins": 50,
+    },
+    "log_store": {
+        "enabled": True,
+        "memory_budget_mb": 2048,
+        "spill_compress_level": 1,
+    },
+    "chunked": {
+        "enabled": True,
+        "threshold_mb": 512,
+        "memory_ceiling_mb": 512,
+        "chunk_rows": 50000,
+        "store_max_mb": 20480,
+        "store_max_age_days": 30,
+    },
+    "startup": {
+        "budget_ms": 2500,
+        "gpu_probe_timeout_ms": 2000,
+    },
 }
 
 CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.json"
@@ -22,17 +82,14 @@ def _ensure_defaults(config: Dict[str, Any]) -> Dict[str, Any]:
     graphs = config.get("graphs", {}) if isinstance(config, dict) else {}
     merged["graphs"] = graphs if isinstance(graphs, dict) else {}
 
-    sync_cfg = DEFAULT_CONFIG["sync"].copy()
-    user_sync = config.get("sync", {}) if isinstance(config, dict) else {}
-    if isinstance(user_sync, dict):
-        sync_cfg.update({k: v for k, v in user_sync.items() if v is not None})
-    merged["sync"] = sync_cfg
-
-    gpu_cfg = DEFAULT_CONFIG["gpu"].copy()
-    user_gpu = config.get("gpu", {}) if isinstance(config, dict) else {}
-    if isinstance(user_gpu, dict):
-        gpu_cfg.update({k: v for k, v in user_gpu.items() if v is not None})
-    merged["gpu"] = gpu_cfg
+    for section, defaults in DEFAULT_CONFIG.items():
+        if section == "graphs" or not isinstance(defaults, dict):
+            continue
+        section_cfg = dict(defaults)
+        user_section = config.get(section, {}) if isinstance(config, dict) else {}
+        if isinstance(user_section, dict):
+            section_cfg.update({k: v for k, v in user_section.items() if v is not None})
+        merged[section] = section_cfg
     return merged
 
 
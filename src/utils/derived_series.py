@@ -0,0 +1,241 @@
+"""Séries derivadas (variância/desvio móveis) com cache por log.
+
+Os gráficos de variabilidade do vento e de variância RPY/Altitude
+recalculavam ``rolling().var()/std()`` e a estatística circular da direção
+do vento a cada troca de gráfico ou de log. Aqui os cálculos usam somas
+acumuladas (O(N), independente do tamanho da janela) e o resultado fica em
+:class:`DerivedSeriesCache`, indexado por (log, sinal, janela, estatística).
+Quando algo não está em cache, :class:`DerivedSeriesWorker` calcula fora da
+thread da GUI.
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.utils.frame_memo import LogResultCache
+
+# Conjuntos de linhas usados por cada gráfico (mesmo dropna(subset=...) de antes)
+FRAMES: Dict[str, Tuple[str, ...]] = {
+    'wind': ('WSI', 'WindDirection'),
+    'attitude': ('Roll', 'Pitch', 'Yaw', 'AltitudeAbs'),
+}
+
+# (sinal, estatística) pedidos por cada gráfico; sinal = "<frame>:<coluna>"
+WIND_VARIABILITY_SERIES: Tuple[Tuple[str, str], ...] = (
+    ('wind:WSI', 'var'),
+    ('wind:WSI', 'std'),
+    ('wind:WindDirection', 'circ_var'),
+    ('wind:WindDirection', 'circ_std'),
+)
+ATTITUDE_VARIANCE_SERIES: Tuple[Tuple[str, str], ...] = (
+    ('attitude:Roll', 'var'),
+    ('attitude:Pitch', 'var'),
+    ('attitude:Yaw', 'var'),
+    ('attitude:AltitudeAbs', 'var'),
+)
+
+# Saídas por bloco de somas acumuladas em rolling_var (limita o erro acumulado)
+VAR_BLOCK = 4096
+
+# Janela padrão (amostras) das estatísticas móveis de cada gráfico
+DEFAULT_DERIVED_WINDOWS: Dict[str, int] = {"wind": 30, "variance": 50}
+
+
+# ------------------------------------------------------------------ kernels
+def _window_sums(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Soma em janela (terminando em cada amostra) e quantidade de NaN na janela."""
+
+    n = values.size
+    nan_mask = np.isnan(values)
+    clean = np.where(nan_mask, 0.0, values)
+    csum = np.concatenate(([0.0], np.cumsum(clean)))
+    cnan = np.concatenate(([0], np.cumsum(nan_mask, dtype=np.int64)))
+    sums = np.full(n, np.nan)
+    nans = np.zeros(n, dtype=np.int64)
+    if window <= n:
+        sums[window - 1:] = csum[window:] - csum[:-window]
+        nans[window - 1:] = cnan[window:] - cnan[:-window]
+    return sums, nans
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Equivalente a ``Series.rolling(window).mean()`` (NaN até completar a janela)."""
+
+    values = np.asarray(values, dtype=float)
+    window = max(1, int(window))
+    sums, nans = _window_sums(values, window)
+    out = sums / window
+    out[nans > 0] = np.nan
+    return out
+
+
+def rolling_var(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """Equivalente a ``Series.rolling(window).var(ddof)`` via somas acumuladas.
+
+    As somas são feitas por blocos de :data:`VAR_BLOCK` saídas, cada bloco
+    centrado na própria média: o erro de arredondamento das somas acumuladas
+    não cresce com o tamanho do log e o cancelamento em sinais com offset
+    grande (ex.: altitude absoluta) fica restrito ao trecho local.
+    """
+
+    values = np.asarray(values, dtype=float)
+    window = max(1, int(window))
+    n = values.size
+    out = np.full(n, np.nan)
+    if window - ddof <= 0 or n < window:
+        return out
+    block = max(VAR_BLOCK, window)
+    for start in range(window - 1, n, block):
+        stop = min(n, start + block)
+        # Trecho com as (window - 1) amostras anteriores que entram na 1ª janela
+        segment = values[start - window + 1:stop]
+        finite = segment[np.isfinite(segment)]
+        centered = segment - (float(finite.mean()) if finite.size else 0.0)
+        sums, nans = _window_sums(centered, window)
+        sq_sums, _ = _window_sums(centered * centered, window)
+        var = (sq_sums - sums * sums / window) / (window - ddof)
+        var = np.maximum(var, 0.0)
+        var[nans > 0] = np.nan
+        out[start:stop] = var[window - 1:]
+    return out
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    return np.sqrt(rolling_var(values, window, ddof))
+
+
+def _circular_resultant(degrees: np.ndarray, window: int) -> np.ndarray:
+    rad = np.deg2rad(np.asarray(degrees, dtype=float))
+    mean_cos = rolling_mean(np.cos(rad), window)
+    mean_sin = rolling_mean(np.sin(rad), window)
+    # Mesma formulação usada historicamente no gráfico de variabilidade do vento
+    r_squared = np.clip(np.sqrt(mean_cos ** 2 + mean_sin ** 2), 0, 1)
+    return np.sqrt(np.clip(r_squared, 0, 1))
+
+
+def circular_variance(degrees: np.ndarray, window: int) -> np.ndarray:
+    """Variância circular móvel (0 a 1)."""
+
+    return 1 - _circular_resultant(degrees, window)
+
+
+def circular_std_deg(degrees: np.ndarray, window: int) -> np.ndarray:
+    """Desvio padrão circular móvel em graus."""
+
+    r = _circular_resultant(degrees, window)
+    return np.rad2deg(np.sqrt(-2 * np.log(r + 1e-15)))
+
+
+STATISTICS: Dict[str, Callable[[np.ndarray, int], np.ndarray]] = {
+    'mean': rolling_mean,
+    'var': rolling_var,
+    'std': rolling_std,
+    'circ_var': circular_variance,
+    'circ_std': circular_std_deg,
+}
+
+
+# -------------------------------------------------------------------- cache
+def _split_signal(signal: str) -> Tuple[str, str]:
+    frame, _, column = signal.partition(':')
+    if frame not in FRAMES or not column:
+        raise ValueError(f"Sinal derivado inválido: '{signal}'")
+    return frame, column
+
+
+class DerivedSeriesCache(LogResultCache):
+    """Cache (log, sinal, janela, estatística) -> array, validado pela identidade do DataFrame."""
+
+    def __init__(self, max_entries: int = 256):
+        super().__init__(max_entries)
+        self._frames: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+
+    def _drop_log(self, log_name: str) -> None:
+        super()._drop_log(log_name)
+        for key in [k for k in self._frames if k[0] == log_name]:
+            del self._frames[key]
+
+    def _clear_locked(self) -> None:
+        super()._clear_locked()
+        self._frames.clear()
+
+    def frame(self, log_name: str, df: pd.DataFrame, frame: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(índices das linhas válidas, timestamps dessas linhas) de um conjunto de colunas."""
+        with self._lock:
+            self._check_source(log_name, df)
+            cached = self._frames.get((log_name, frame))
+        if cached is not None:
+            return cached
+        columns = FRAMES[frame]
+        if df.empty or not all(c in df.columns for c in columns):
+            index = np.empty(0, dtype=np.intp)
+        else:
+            index = np.flatnonzero(df[list(columns)].notna().all(axis=1).to_numpy())
+        x = df['Timestamp'].to_numpy()[index] if 'Timestamp' in df.columns else index.astype(float)
+        with self._lock:
+            self._frames[(log_name, frame)] = (index, x)
+        return index, x
+
+    def lookup(self, log_name: str, df: pd.DataFrame, signal: str, window: int, statistic: str) -> Optional[np.ndarray]:
+        return self.get(df, (log_name, signal, int(window), statistic))
+
+    def series(self, log_name: str, df: pd.DataFrame, signal: str, window: int, statistic: str) -> np.ndarray:
+        """Série derivada (alinhada ao frame do sinal), calculando se necessário."""
+        cached = self.lookup(log_name, df, signal, window, statistic)
+        if cached is not None:
+            return cached
+        frame, column = _split_signal(signal)
+        index, _x = self.frame(log_name, df, frame)
+        raw = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)[index]
+        values = STATISTICS[statistic](raw, int(window))
+        self.put((log_name, signal, int(window), statistic), values)
+        return values
+
+    def lookup_bundle(self, log_name: str, df: pd.DataFrame, specs: Sequence[Tuple[str, str]], window: int):
+        """{(sinal, estatística): array} se tudo já estiver em cache, senão None."""
+        bundle = {}
+        for signal, statistic in specs:
+            values = self.lookup(log_name, df, signal, window, statistic)
+            if values is None:
+                return None
+            bundle[(signal, statistic)] = values
+        return bundle
+
+    def compute_bundle(self, log_name: str, df: pd.DataFrame, specs: Sequence[Tuple[str, str]], window: int):
+        return {
+            (signal, statistic): self.series(log_name, df, signal, window, statistic)
+            for signal, statistic in specs
+        }
+
+
+class DerivedSeriesWorker(QObject):
+    """Calcula um conjunto de séries derivadas fora da GUI (padrão moveToThread)."""
+
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, cache: DerivedSeriesCache, log_name: str, df: pd.DataFrame,
+                 specs: Sequence[Tuple[str, str]], window: int, token=None):
+        super().__init__()
+        self.cache = cache
+        self.log_name = log_name
+        self.df = df
+        self.specs = tuple(specs)
+        self.window = int(window)
+        self.token = token
+
+    def run(self):
+        try:
+            for signal, _statistic in self.specs:
+                self.cache.frame(self.log_name, self.df, _split_signal(signal)[0])
+            self.cache.compute_bundle(self.log_name, self.df, self.specs, self.window)
+        except Exception as exc:
+            self.error.emit(str(exc))
+            return
+        finally:
+            self.df = None
+        self.finished.emit(self.token)
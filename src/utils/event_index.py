@@ -0,0 +1,398 @@
+"""Linha do tempo de eventos de um log: flags, failsafes, modos e EmbeddedError.log.
+
+Os parsers embarcados já extraem dezenas de flags discretas (``KillSwitch``,
+``external_FS``, ``EKF_FailSafe``, ``in_transition``...). Aqui cada flag vira
+eventos de borda (ativado/desativado) detectados com ``np.diff`` sobre a
+série em ordem temporal; contadores de falha viram eventos a cada
+incremento e trocas de ``ModoVoo`` também entram. O ``EmbeddedError.log`` da
+pasta do voo (texto ``HH:MM:SS.mmm<TAB>nível<TAB> Class: X Event: texto``)
+é lido e repetições seguidas da mesma mensagem são agrupadas.
+
+Tudo fica num :class:`EventIndex` ordenado por tempo: achar o evento
+anterior/seguinte a um instante é uma busca binária (``np.searchsorted``).
+O índice é memorizado por DataFrame e segue nos artefatos do log.
+"""
+from __future__ import annotations
+
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.compressed_io import find_log_file, open_log_text
+from src.utils.frame_memo import FrameMemo
+from src.utils.mode_utils import ModeSegment, compute_mode_segments, epoch_seconds_array
+
+SEVERITY_INFO = "info"
+SEVERITY_WARNING = "aviso"
+SEVERITY_CRITICAL = "crítico"
+SEVERITY_RANK = {SEVERITY_INFO: 0, SEVERITY_WARNING: 1, SEVERITY_CRITICAL: 2}
+SEVERITY_COLORS = {
+    SEVERITY_INFO: (30, 136, 229),
+    SEVERITY_WARNING: (251, 140, 0),
+    SEVERITY_CRITICAL: (229, 57, 53),
+}
+
+KIND_FLAG = "flag"
+KIND_COUNTER = "contador"
+KIND_MODE = "modo"
+KIND_ERROR = "EmbeddedError"
+
+# coluna -> (rótulo, severidade) das flags 0/1
+FLAG_EVENTS: Dict[str, Tuple[str, str]] = {
+    'KillSwitch': ("Kill switch", SEVERITY_CRITICAL),
+    'external_FS': ("Failsafe externo", SEVERITY_CRITICAL),
+    'internal_FS': ("Failsafe interno", SEVERITY_CRITICAL),
+    'EKF_FailSafe': ("Failsafe do EKF", SEVERITY_CRITICAL),
+    'Parachute': ("Paraquedas", SEVERITY_CRITICAL),
+    'IsForcedLanding': ("Pouso forçado", SEVERITY_CRITICAL),
+    'CriticalLandStage': ("Estágio crítico de pouso", SEVERITY_WARNING),
+    'disarm_radio': ("Desarme pelo rádio", SEVERITY_WARNING),
+    'Spoofing': ("Spoofing GNSS", SEVERITY_WARNING),
+    'Jamming': ("Jamming GNSS", SEVERITY_WARNING),
+    'GNSS1_PackageFail': ("Falha de pacote GNSS1", SEVERITY_WARNING),
+    'GNSS2_PackageFail': ("Falha de pacote GNSS2", SEVERITY_WARNING),
+    'ForceActuationEnable': ("Atuação forçada", SEVERITY_WARNING),
+    'in_transition': ("Transição VTOL", SEVERITY_INFO),
+    'ManualTransition_RPA': ("Transição manual", SEVERITY_INFO),
+    'in_vtol_takeoff': ("Decolagem VTOL", SEVERITY_INFO),
+    'in_vtol_land': ("Pouso VTOL", SEVERITY_INFO),
+    'IsFlying': ("Em voo", SEVERITY_INFO),
+}
+
+# Contadores: cada incremento é um evento
+COUNTER_EVENTS: Dict[str, Tuple[str, str]] = {
+    'Fail_Number': ("Falha registrada", SEVERITY_WARNING),
+    'GNSS_FailNumber': ("Falha GNSS registrada", SEVERITY_WARNING),
+    'Protection_Number': ("Proteção acionada", SEVERITY_WARNING),
+    'N_ForcedLanding': ("Pouso forçado registrado", SEVERITY_CRITICAL),
+}
+
+EMBEDDED_ERROR_NAME = "EmbeddedError.log"
+# Mensagens iguais com menos que isso entre si viram um evento só
+REPEAT_MERGE_S = 2.0
+# Flags que oscilam amostra a amostra: limita os eventos por sinal
+MAX_EDGES_PER_SIGNAL = 500
+# Marcadores desenhados nos gráficos (os mais graves primeiro)
+MAX_PLOT_MARKERS = 200
+
+_ERROR_LINE = re.compile(
+    r"^\s*(\d{1,2}):(\d{2}):(\d{2}(?:\.\d+)?)\t([^\t]*)\t\s*(?:Class:\s*(.*?)\s+Event:\s*)?(.*?)\s*$"
+)
+_FOLDER_TIME = re.compile(r"(\d{4}-\d{2}-\d{2})-\d{2}-\d{2}-\d{2}")
+
+
+@dataclass(frozen=True)
+class FlightEvent:
+    time: float
+    kind: str
+    source: str
+    label: str
+    severity: str = SEVERITY_INFO
+    # Linha do DataFrame mais próxima (-1 se o log não tem timestamps)
+    row: int = -1
+    count: int = 1
+    end: float = math.nan
+
+
+class TimeLookup:
+    """Busca binária ``instante -> linha do DataFrame`` (timestamps fora de ordem são ordenados uma vez)."""
+
+    def __init__(self, epoch_s: np.ndarray):
+        epoch_s = np.asarray(epoch_s, dtype=float)
+        valid = np.flatnonzero(np.isfinite(epoch_s))
+        values = epoch_s[valid]
+        if values.size > 1 and np.any(values[1:] < values[:-1]):
+            order = np.argsort(values, kind='stable')
+            valid, values = valid[order], values[order]
+        self.rows = valid
+        self.times = values
+
+    def __len__(self) -> int:
+        return int(self.times.size)
+
+    def row_at(self, t: float) -> int:
+        """Linha com o timestamp mais próximo de ``t`` (-1 sem timestamps)."""
+        if self.times.size == 0 or not math.isfinite(t):
+            return -1
+        pos = int(np.searchsorted(self.times, t, side='left'))
+        if pos >= self.times.size:
+            pos = self.times.size - 1
+        elif pos > 0 and t - self.times[pos - 1] <= self.times[pos] - t:
+            pos -= 1
+        return int(self.rows[pos])
+
+    def rows_at(self, times: np.ndarray) -> np.ndarray:
+        times = np.asarray(times, dtype=float)
+        if self.times.size == 0:
+            return np.full(times.shape, -1, dtype=np.int64)
+        pos = np.clip(np.searchsorted(self.times, times, side='left'), 0, self.times.size - 1)
+        prev = np.maximum(pos - 1, 0)
+        use_prev = np.abs(times - self.times[prev]) <= np.abs(self.times[pos] - times)
+        return self.rows[np.where(use_prev, prev, pos)].astype(np.int64)
+
+
+class EventIndex:
+    """Eventos de um log ordenados por tempo, com buscas em O(log n)."""
+
+    def __init__(self, events: Sequence[FlightEvent] = ()):
+        ordered = sorted(events, key=lambda event: event.time)
+        self.events: Tuple[FlightEvent, ...] = tuple(ordered)
+        self.times = np.fromiter((event.time for event in ordered), dtype=float, count=len(ordered))
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __iter__(self) -> Iterator[FlightEvent]:
+        return iter(self.events)
+
+    def __getitem__(self, position: int) -> FlightEvent:
+        return self.events[position]
+
+    def next_after(self, t: float) -> Optional[int]:
+        """Posição do primeiro evento estritamente depois de ``t``."""
+        pos = int(np.searchsorted(self.times, t, side='right'))
+        return pos if pos < len(self.events) else None
+
+    def previous_before(self, t: float) -> Optional[int]:
+        """Posição do último evento estritamente antes de ``t``."""
+        pos = int(np.searchsorted(self.times, t, side='left')) - 1
+        return pos if pos >= 0 else None
+
+    def nearest(self, t: float) -> Optional[int]:
+        if not self.events:
+            return None
+        pos = int(np.searchsorted(self.times, t, side='left'))
+        if pos >= len(self.events):
+            return len(self.events) - 1
+        if pos > 0 and t - self.times[pos - 1] <= self.times[pos] - t:
+            return pos - 1
+        return pos
+
+    def between(self, start: float, end: float) -> Tuple[FlightEvent, ...]:
+        lo = int(np.searchsorted(self.times, start, side='left'))
+        hi = int(np.searchsorted(self.times, end, side='right'))
+        return self.events[lo:hi]
+
+    def counts_by_severity(self) -> Dict[str, int]:
+        counts = {severity: 0 for severity in SEVERITY_RANK}
+        for event in self.events:
+            counts[event.severity] = counts.get(event.severity, 0) + 1
+        return counts
+
+
+# ----------------------------------------------------------- extração
+def _ordered_column(df: pd.DataFrame, column: str, order: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Valores válidos da coluna em ordem temporal e as linhas correspondentes."""
+    values = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)[order]
+    valid = np.isfinite(values)
+    return values[valid], order[valid]
+
+
+def _capped(changes: np.ndarray, column: str) -> np.ndarray:
+    if changes.size > MAX_EDGES_PER_SIGNAL:
+        print(f"AVISO: '{column}' mudou {changes.size} vezes; só as {MAX_EDGES_PER_SIGNAL} primeiras viram eventos.")
+        return changes[:MAX_EDGES_PER_SIGNAL]
+    return changes
+
+
+def flag_events(df: pd.DataFrame, epoch_s: np.ndarray, lookup: TimeLookup) -> List[FlightEvent]:
+    """Bordas das flags 0/1 e incrementos dos contadores (vetorizado por coluna)."""
+    order = lookup.rows
+    events: List[FlightEvent] = []
+    for column, (label, severity) in FLAG_EVENTS.items():
+        if column not in df.columns:
+            continue
+        values, rows = _ordered_column(df, column, order)
+        if values.size == 0:
+            continue
+        active = values > 0.5
+        if active[0]:
+            events.append(FlightEvent(float(epoch_s[rows[0]]), KIND_FLAG, column,
+                                      f"{label} ativo no início do log", severity, int(rows[0])))
+        changes = _capped(np.flatnonzero(active[1:] != active[:-1]) + 1, column)
+        for pos in changes.tolist():
+            row = int(rows[pos])
+            rising = bool(active[pos])
+            events.append(FlightEvent(
+                float(epoch_s[row]), KIND_FLAG, column,
+                f"{label} {'ativado' if rising else 'desativado'}",
+                severity if rising else SEVERITY_INFO, row,
+            ))
+    for column, (label, severity) in COUNTER_EVENTS.items():
+        if column not in df.columns:
+            continue
+        values, rows = _ordered_column(df, column, order)
+        if values.size < 2:
+            continue
+        steps = np.diff(values)
+        increments = _capped(np.flatnonzero(steps > 0) + 1, column)
+        for pos in increments.tolist():
+            row = int(rows[pos])
+            events.append(FlightEvent(
+                float(epoch_s[row]), KIND_COUNTER, column,
+                f"{label} (#{int(values[pos])})", severity, row, count=int(steps[pos - 1]),
+            ))
+    return events
+
+
+def mode_events(segments: Sequence[ModeSegment], lookup: TimeLookup) -> List[FlightEvent]:
+    """Uma entrada por troca de ``ModoVoo`` (o primeiro modo marca o início)."""
+    if not segments:
+        return []
+    starts = np.array([segment.start for segment in segments], dtype=float)
+    rows = lookup.rows_at(starts)
+    return [
+        FlightEvent(segment.start, KIND_MODE, 'ModoVoo', f"Modo: {segment.label}", SEVERITY_INFO,
+                    int(row), end=segment.end)
+        for segment, row in zip(segments, rows.tolist())
+    ]
+
+
+def _error_severity(text: str) -> str:
+    upper = text.upper()
+    if "EMERGENC" in upper or "FAIL" in upper or "KILL" in upper:
+        return SEVERITY_CRITICAL
+    return SEVERITY_WARNING
+
+
+def _day_anchor(path: str, log_start: Optional[float]) -> Optional[Tuple[float, float]]:
+    """(meia-noite em epoch, horário de referência em s) para completar ``HH:MM:SS``."""
+    if log_start is not None and math.isfinite(log_start):
+        day = math.floor(log_start / 86400.0) * 86400.0
+        return day, log_start - day
+    match = _FOLDER_TIME.search(os.path.basename(os.path.dirname(os.path.abspath(path))))
+    if not match:
+        return None
+    day = pd.Timestamp(match.group(1))
+    return day.value / 1e9, 0.0
+
+
+def parse_embedded_error_log(path: str, log_start: Optional[float] = None) -> List[FlightEvent]:
+    """Lê o ``EmbeddedError.log`` e agrupa repetições seguidas da mesma mensagem.
+
+    O arquivo só tem o horário; a data vem do início do log (``log_start``,
+    segundos epoch) ou, sem ele, do nome da pasta do voo. Horários bem
+    antes do início do log são do dia seguinte (voo passando da meia-noite).
+    """
+    anchor = _day_anchor(path, log_start)
+    if anchor is None:
+        print(f"AVISO: Sem data de referência para '{path}'; eventos ignorados.")
+        return []
+    day, reference_tod = anchor
+    entries = []
+    try:
+        with open_log_text(path) as handle:
+            for line in handle:
+                match = _ERROR_LINE.match(line)
+                if not match:
+                    continue
+                hours, minutes, seconds, level, event_class, text = match.groups()
+                tod = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+                if tod < reference_tod - 6 * 3600:
+                    tod += 86400.0
+                entries.append((day + tod, (event_class or level or "").strip(), text.strip()))
+    except OSError as exc:
+        print(f"AVISO: Não foi possível ler '{path}': {exc}")
+        return []
+
+    # Linhas chegam levemente fora de ordem; agrupa por mensagem após ordenar
+    entries.sort(key=lambda entry: entry[0])
+    events: List[FlightEvent] = []
+    open_groups: Dict[Tuple[str, str], int] = {}
+    for time_s, event_class, text in entries:
+        key = (event_class, text)
+        position = open_groups.get(key)
+        if position is not None:
+            last = events[position]
+            last_time = last.end if math.isfinite(last.end) else last.time
+            if time_s - last_time <= REPEAT_MERGE_S:
+                events[position] = FlightEvent(last.time, last.kind, last.source, last.label, last.severity,
+                                               last.row, last.count + 1, time_s)
+                continue
+        label = f"{event_class}: {text}" if event_class else text
+        open_groups[key] = len(events)
+        events.append(FlightEvent(time_s, KIND_ERROR, EMBEDDED_ERROR_NAME, label, _error_severity(label)))
+    return events
+
+
+def find_embedded_error_log(source_path: Optional[str]) -> Optional[str]:
+    """``EmbeddedError.log`` (ou .gz/.xz) na pasta do arquivo de origem do log."""
+    if not source_path:
+        return None
+    folder = source_path if os.path.isdir(source_path) else os.path.dirname(source_path)
+    return find_log_file(os.path.join(folder, EMBEDDED_ERROR_NAME))
+
+
+_MEMO = FrameMemo()
+
+
+def clear_event_cache(df: Optional[pd.DataFrame] = None) -> None:
+    _MEMO.clear(df)
+
+
+def build_event_index(df: pd.DataFrame, source_path: Optional[str] = None, *,
+                      segments: Optional[Sequence[ModeSegment]] = None,
+                      lookup: Optional[TimeLookup] = None) -> EventIndex:
+    """Índice de eventos do log (memorizado por DataFrame e arquivo de origem)."""
+    if df is None or df.empty:
+        return EventIndex()
+    memo = _MEMO.store_for(df)
+    key = ('events', len(df), source_path or "")
+    cached = memo.get(key)
+    if cached is not None:
+        return cached
+
+    epoch_s = epoch_seconds_array(df['Timestamp']) if 'Timestamp' in df.columns else np.full(len(df), np.nan)
+    if lookup is None:
+        lookup = TimeLookup(epoch_s)
+    events = flag_events(df, epoch_s, lookup)
+    if segments is None:
+        segments = compute_mode_segments(df)
+    events.extend(mode_events(segments, lookup))
+
+    error_log = find_embedded_error_log(source_path)
+    if error_log:
+        log_start = float(lookup.times[0]) if len(lookup) else None
+        errors = parse_embedded_error_log(error_log, log_start)
+        if errors:
+            rows = lookup.rows_at(np.array([event.time for event in errors], dtype=float))
+            events.extend(
+                FlightEvent(event.time, event.kind, event.source, event.label, event.severity,
+                            int(row), event.count, event.end)
+                for event, row in zip(errors, rows.tolist())
+            )
+
+    index = EventIndex(events)
+    memo[key] = index
+    return index
+
+
+def reference_label(event: FlightEvent) -> str:
+    """Rótulo do evento sem o número da ocorrência (igual entre logs diferentes)."""
+    if event.kind == KIND_COUNTER and event.source in COUNTER_EVENTS:
+        return COUNTER_EVENTS[event.source][0]
+    return event.label
+
+
+def first_event_time(index: EventIndex, label: str) -> Optional[float]:
+    """Instante da primeira ocorrência do evento de rótulo ``label`` (ver :func:`reference_label`)."""
+    for event in index:
+        if reference_label(event) == label and math.isfinite(event.time):
+            return float(event.time)
+    return None
+
+
+def marker_events(index: Optional[EventIndex], limit: int = MAX_PLOT_MARKERS) -> List[FlightEvent]:
+    """Eventos para marcar nos gráficos: sem trocas de modo (já são faixas), os mais graves primeiro."""
+    if index is None:
+        return []
+    candidates = [event for event in index if event.kind != KIND_MODE]
+    if len(candidates) > limit:
+        candidates.sort(key=lambda event: (-SEVERITY_RANK.get(event.severity, 0), event.time))
+        candidates = sorted(candidates[:limit], key=lambda event: event.time)
+    return candidates
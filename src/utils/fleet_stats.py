@@ -0,0 +1,512 @@
+"""Estatísticas de frota: um sinal agregado sobre todos os voos de uma raiz.
+
+Perguntas como "distribuição de CHT em Survey em todos os voos do FW150
+neste trimestre" exigiriam abrir log a log na GUI. Aqui cada pasta de voo
+é processada num processo do pool (:func:`aggregate_folder`) e devolve um
+resumo compacto por log (:class:`FlightAggregate`): contagem, soma, soma
+dos quadrados, extremos, um esboço de quantis e as mesmas somas por modo
+de voo. Os resumos são somados em :class:`FleetAggregate` conforme as
+pastas terminam, então histograma, percentis e médias por modo aparecem
+parciais em poucos segundos e vão se refinando.
+
+Parsear um log é a parte cara; por isso as colunas usadas ficam num cache
+em disco (``FleetCache`` no AppData): uma pasta por voo com um manifesto
+JSON (assinatura dos arquivos, logs e colunas disponíveis) e um ``.npy``
+por coluna. Um voo só é parseado de novo se os arquivos mudarem ou se a
+consulta pedir uma coluna que ainda não foi guardada.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.utils.batch_reports import DEFAULT_OUTPUT_DIRNAME, folder_signature
+from src.utils.compressed_io import strip_compression
+from src.utils.mode_utils import epoch_seconds_array, mode_labels
+from src.utils.resource_paths import get_appdata_dir
+from src.utils.sharepoint_downloader import SUPPORTED_LOG_EXTS
+
+FLEET_CACHE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+AGG_HISTOGRAM = "histograma"
+AGG_PERCENTILES = "percentis"
+AGG_MODE_MEANS = "media_por_modo"
+AGGREGATIONS = (AGG_HISTOGRAM, AGG_PERCENTILES, AGG_MODE_MEANS)
+
+DEFAULT_BINS = 50
+DEFAULT_PERCENTILES = (1, 5, 10, 25, 50, 75, 90, 95, 99)
+# Pontos do esboço de quantis guardado por log (erro de ~0,2% nos percentis)
+SKETCH_POINTS = 513
+# Intervalo mínimo entre resultados parciais enviados para a interface
+PARTIAL_INTERVAL_S = 0.5
+
+MODE_COLUMN = "ModoVoo"
+FLYING_COLUMN = "IsFlying"
+
+
+def default_cache_root() -> Path:
+    return get_appdata_dir("FleetCache", create=True)
+
+
+@dataclass(frozen=True)
+class FleetQuery:
+    """Consulta de frota (vai para os processos do pool, precisa ser picklável)."""
+
+    signal: str
+    aggregation: str = AGG_HISTOGRAM
+    bins: int = DEFAULT_BINS
+    # Nomes de modo (vazio = todos)
+    modes: Tuple[str, ...] = ()
+    only_flying: bool = False
+    # Trecho do caminho da pasta (ex.: "FW150") e do tipo de log (ex.: "Xcockpit")
+    folder_filter: str = ""
+    log_type_filter: str = ""
+    # Início do log em segundos epoch (timestamps "ingênuos" lidos como UTC)
+    start: float = math.nan
+    end: float = math.nan
+
+    def accepts_folder(self, label: str) -> bool:
+        return not self.folder_filter or self.folder_filter.lower() in label.lower()
+
+    def accepts_log(self, log_type: str, start: float) -> bool:
+        if self.log_type_filter and self.log_type_filter.lower() not in log_type.lower():
+            return False
+        if math.isfinite(self.start) and not (math.isfinite(start) and start >= self.start):
+            return False
+        if math.isfinite(self.end) and not (math.isfinite(start) and start < self.end):
+            return False
+        return True
+
+
+@dataclass
+class FlightAggregate:
+    """Resumo do sinal consultado num log (o que volta de cada processo)."""
+
+    name: str
+    folder: str
+    log_type: str = ""
+    start: float = math.nan
+    count: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    minimum: float = math.nan
+    maximum: float = math.nan
+    # Quantis igualmente espaçados dos valores; cada ponto vale ``sketch_weight`` amostras
+    sketch: np.ndarray = field(default_factory=lambda: np.empty(0))
+    sketch_weight: float = 0.0
+    # nome do modo -> [amostras, soma, soma dos quadrados]
+    modes: Dict[str, List[float]] = field(default_factory=dict)
+    # Log sem IsFlying com "só em voo" marcado: todas as amostras entraram
+    flying_filter_skipped: bool = False
+    from_cache: bool = False
+    # Motivo de o log não entrar na conta (ex.: não tem o sinal)
+    skipped: str = ""
+    error: str = ""
+
+
+class ModeSummary(NamedTuple):
+    label: str
+    count: int
+    mean: float
+    std: float
+    flights: int
+
+
+# ------------------------------------------------------------------ pastas
+def discover_flight_folders(root: str) -> List[Tuple[str, str]]:
+    """Pastas (recursivo) que contêm arquivos de log, com o caminho relativo como rótulo."""
+    folders = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != DEFAULT_OUTPUT_DIRNAME)
+        if any(os.path.splitext(strip_compression(name))[1].lower() in SUPPORTED_LOG_EXTS for name in filenames):
+            label = os.path.relpath(dirpath, root)
+            folders.append((dirpath, os.path.basename(os.path.normpath(root)) if label == "." else label))
+    return folders
+
+
+# ------------------------------------------------------------------- cache
+def cache_dir_for(folder_path: str, cache_root: Path | str) -> Path:
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(folder_path)).encode("utf-8")).hexdigest()[:20]
+    return Path(cache_root) / key
+
+
+def _column_filename(index: int, column: str) -> str:
+    safe = re.sub(r'[^\w\-]+', '_', column, flags=re.ASCII).strip('_') or "col"
+    return f"{index:02d}_{safe}_{hashlib.sha1(column.encode('utf-8')).hexdigest()[:6]}.npy"
+
+
+def _read_manifest(cache_dir: Path) -> Optional[dict]:
+    try:
+        manifest = json.loads((cache_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return manifest if manifest.get("version") == FLEET_CACHE_VERSION else None
+
+
+def is_cached(folder_path: str, cache_root: Path | str, columns: Sequence[str]) -> bool:
+    """Se a pasta pode ser respondida só com o cache (assinatura em dia e colunas guardadas)."""
+    manifest = _read_manifest(cache_dir_for(folder_path, cache_root))
+    return manifest is not None and _manifest_covers(manifest, folder_signature(folder_path), columns)
+
+
+def _manifest_covers(manifest: dict, signature, columns: Sequence[str]) -> bool:
+    if manifest.get("signature") != signature:
+        return False
+    for log in manifest.get("logs", []):
+        for column in columns:
+            # Coluna que o log não tem não obriga a parsear de novo
+            if column in log.get("columns", ()) and column not in log.get("files", {}):
+                return False
+    return True
+
+
+def _load_cached_logs(cache_dir: Path, manifest: dict, columns: Sequence[str]) -> List[dict]:
+    logs = []
+    for log in manifest.get("logs", []):
+        arrays = {}
+        for column in columns:
+            filename = log.get("files", {}).get(column)
+            if filename:
+                arrays[column] = np.load(cache_dir / filename, allow_pickle=False)
+        logs.append({**log, "arrays": arrays})
+    return logs
+
+
+def _parse_and_cache(folder_path: str, label: str, cache_dir: Path, signature,
+                     columns: Sequence[str], previous: Optional[dict]) -> List[dict]:
+    """Parseia os logs da pasta e grava as colunas pedidas (e as que já estavam no cache)."""
+    from src.data_parser import load_folder_logs
+    from src.utils.chunked_store import chunked_log_for
+
+    keep = set(columns)
+    if previous is not None:
+        for log in previous.get("logs", []):
+            keep.update(log.get("files", {}))
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for stale in cache_dir.glob("*.npy"):
+        stale.unlink(missing_ok=True)
+
+    logs = []
+    for index, (name, df, log_type, _source) in enumerate(load_folder_logs(folder_path, label)):
+        if df is None or df.empty:
+            continue
+        numeric = [str(c) for c in df.columns if 'Timestamp' not in str(c) and pd.api.types.is_numeric_dtype(df[c])]
+        # Log grande lido em blocos: ``df`` é só o resumo; as colunas vêm do armazenamento em disco
+        store = chunked_log_for(df)
+        log = {"name": name, "log_type": log_type, "rows": int(store.rows if store is not None else len(df)),
+               "start": math.nan,
+               "columns": numeric, "files": {}, "mode_labels": {}}
+        arrays = {}
+        if 'Timestamp' in df.columns:
+            epochs = epoch_seconds_array(df['Timestamp'])
+            finite = epochs[np.isfinite(epochs)]
+            if finite.size:
+                log["start"] = float(finite.min())
+        for column in numeric:
+            if column in keep and store is not None:
+                arrays[column] = store.column_array(column, np.float32)
+            elif column in keep:
+                arrays[column] = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float32, na_value=np.nan)
+        if MODE_COLUMN in df.columns:
+            log["mode_labels"] = {str(value): text for value, text in mode_labels(df).items()}
+        for column, values in arrays.items():
+            filename = _column_filename(index, column)
+            tmp = cache_dir / (filename + ".tmp")
+            with open(tmp, "wb") as fh:
+                np.save(fh, values, allow_pickle=False)
+            os.replace(tmp, cache_dir / filename)
+            log["files"][column] = filename
+        logs.append({**log, "arrays": arrays})
+
+    manifest = {
+        "version": FLEET_CACHE_VERSION,
+        "folder": os.path.abspath(folder_path),
+        "signature": signature,
+        "logs": [{k: v for k, v in log.items() if k != "arrays"} for log in logs],
+    }
+    tmp = cache_dir / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, cache_dir / MANIFEST_NAME)
+    return logs
+
+
+def load_folder_columns(folder_path: str, label: str, columns: Sequence[str],
+                        cache_root: Path | str) -> Tuple[List[dict], bool]:
+    """Colunas ``columns`` (+ tempo) de cada log da pasta; ``True`` se veio do cache."""
+    cache_dir = cache_dir_for(folder_path, cache_root)
+    signature = folder_signature(folder_path)
+    manifest = _read_manifest(cache_dir)
+    if manifest is not None and _manifest_covers(manifest, signature, columns):
+        try:
+            return _load_cached_logs(cache_dir, manifest, columns), True
+        except (OSError, ValueError) as exc:
+            print(f"AVISO: Cache de frota de '{label}' ilegível ({exc}); o voo será lido de novo.")
+    return _parse_and_cache(folder_path, label, cache_dir, signature, columns, manifest), False
+
+
+# -------------------------------------------------------------- agregação
+def _sketch(values: np.ndarray) -> Tuple[np.ndarray, float]:
+    if values.size <= SKETCH_POINTS:
+        return np.sort(values), 1.0
+    points = np.quantile(values, np.linspace(0.0, 1.0, SKETCH_POINTS))
+    return points, values.size / SKETCH_POINTS
+
+
+def aggregate_log(log: dict, folder: str, query: FleetQuery) -> FlightAggregate:
+    result = FlightAggregate(name=log["name"], folder=folder, log_type=log.get("log_type", ""),
+                             start=float(log.get("start", math.nan)))
+    arrays = log.get("arrays", {})
+    values = arrays.get(query.signal)
+    if values is None:
+        result.skipped = f"Sem a coluna '{query.signal}'"
+        return result
+    values = values.astype(float)
+    mask = np.isfinite(values)
+
+    modes = arrays.get(MODE_COLUMN)
+    labels_of = {int(k): v for k, v in log.get("mode_labels", {}).items()}
+    if modes is not None:
+        modes = np.where(np.isfinite(modes), modes, -9999).astype(int)
+    if query.modes:
+        if modes is None:
+            result.skipped = "Sem a coluna ModoVoo"
+            return result
+        wanted = [value for value, text in labels_of.items() if text in query.modes]
+        mask &= np.isin(modes, wanted)
+    if query.only_flying:
+        flying = arrays.get(FLYING_COLUMN)
+        if flying is None:
+            result.flying_filter_skipped = True
+        else:
+            mask &= np.nan_to_num(flying.astype(float)) > 0.5
+
+    selected = values[mask]
+    if selected.size:
+        result.count = int(selected.size)
+        result.total = float(selected.sum())
+        result.total_sq = float(np.square(selected).sum())
+        result.minimum = float(selected.min())
+        result.maximum = float(selected.max())
+        result.sketch, result.sketch_weight = _sketch(selected)
+    if modes is not None and selected.size:
+        selected_modes = modes[mask]
+        unique, inverse = np.unique(selected_modes, return_inverse=True)
+        counts = np.bincount(inverse, minlength=unique.size)
+        sums = np.bincount(inverse, weights=selected, minlength=unique.size)
+        sums_sq = np.bincount(inverse, weights=np.square(selected), minlength=unique.size)
+        for i, value in enumerate(unique.tolist()):
+            text = labels_of.get(value, f"Modo {value}") if value != -9999 else "Sem modo"
+            acc = result.modes.setdefault(text, [0.0, 0.0, 0.0])
+            acc[0] += float(counts[i])
+            acc[1] += float(sums[i])
+            acc[2] += float(sums_sq[i])
+    return result
+
+
+def aggregate_folder(folder_path: str, label: str, query: FleetQuery,
+                     cache_root: Path | str) -> List[FlightAggregate]:
+    """Resumos de todos os logs de uma pasta (roda em processo separado)."""
+    columns = [query.signal, MODE_COLUMN, FLYING_COLUMN]
+    try:
+        logs, from_cache = load_folder_columns(folder_path, label, columns, cache_root)
+    except Exception as exc:
+        return [FlightAggregate(name=label, folder=label, error=str(exc))]
+    results = []
+    for log in logs:
+        if not query.accepts_log(log.get("log_type", ""), float(log.get("start", math.nan))):
+            continue
+        try:
+            result = aggregate_log(log, label, query)
+        except Exception as exc:
+            result = FlightAggregate(name=log.get("name", label), folder=label, error=str(exc))
+        result.from_cache = from_cache
+        results.append(result)
+    return results
+
+
+class FleetAggregate:
+    """Soma dos :class:`FlightAggregate` que já chegaram (parcial até o fim)."""
+
+    def __init__(self, query: FleetQuery, folders_total: int = 0):
+        self.query = query
+        self.folders_total = folders_total
+        self.folders_done = 0
+        self.flights: List[FlightAggregate] = []
+        self.errors: List[FlightAggregate] = []
+        self.skipped: List[FlightAggregate] = []
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.minimum = math.nan
+        self.maximum = math.nan
+        self.modes: Dict[str, List[float]] = {}
+        self._mode_flights: Dict[str, int] = {}
+
+    def add_folder(self, results: Sequence[FlightAggregate]) -> None:
+        self.folders_done += 1
+        for result in results:
+            self.add(result)
+
+    def add(self, flight: FlightAggregate) -> None:
+        if flight.error:
+            self.errors.append(flight)
+            return
+        if flight.skipped or not flight.count:
+            self.skipped.append(flight)
+            return
+        self.flights.append(flight)
+        self.count += flight.count
+        self.total += flight.total
+        self.total_sq += flight.total_sq
+        self.minimum = flight.minimum if not math.isfinite(self.minimum) else min(self.minimum, flight.minimum)
+        self.maximum = flight.maximum if not math.isfinite(self.maximum) else max(self.maximum, flight.maximum)
+        for label, (n, s, sq) in flight.modes.items():
+            acc = self.modes.setdefault(label, [0.0, 0.0, 0.0])
+            acc[0] += n
+            acc[1] += s
+            acc[2] += sq
+            self._mode_flights[label] = self._mode_flights.get(label, 0) + 1
+
+    def snapshot(self) -> "FleetAggregate":
+        """Cópia para enviar à interface enquanto o worker continua somando."""
+        copy = FleetAggregate(self.query, self.folders_total)
+        copy.folders_done = self.folders_done
+        copy.flights = list(self.flights)
+        copy.errors = list(self.errors)
+        copy.skipped = list(self.skipped)
+        copy.count, copy.total, copy.total_sq = self.count, self.total, self.total_sq
+        copy.minimum, copy.maximum = self.minimum, self.maximum
+        copy.modes = {label: list(acc) for label, acc in self.modes.items()}
+        copy._mode_flights = dict(self._mode_flights)
+        return copy
+
+    # --- resultados ---
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    @property
+    def std(self) -> float:
+        return _std(self.count, self.total, self.total_sq)
+
+    def _weighted_points(self) -> Tuple[np.ndarray, np.ndarray]:
+        if not self.flights:
+            return np.empty(0), np.empty(0)
+        points = np.concatenate([f.sketch for f in self.flights])
+        weights = np.concatenate([np.full(f.sketch.size, f.sketch_weight) for f in self.flights])
+        return points, weights
+
+    def histogram(self, bins: int = DEFAULT_BINS) -> Tuple[np.ndarray, np.ndarray]:
+        """(amostras por faixa, bordas) estimados a partir dos esboços de cada log."""
+        points, weights = self._weighted_points()
+        if not points.size:
+            return np.zeros(0), np.zeros(0)
+        low, high = self.minimum, self.maximum
+        if high <= low:
+            low, high = low - 0.5, high + 0.5
+        return np.histogram(points, bins=max(1, int(bins)), range=(low, high), weights=weights)
+
+    def percentiles(self, percents: Sequence[float] = DEFAULT_PERCENTILES) -> np.ndarray:
+        points, weights = self._weighted_points()
+        if not points.size:
+            return np.full(len(percents), np.nan)
+        order = np.argsort(points, kind='stable')
+        points, weights = points[order], weights[order]
+        # Posição de cada ponto na distribuição acumulada (centro do seu peso)
+        cumulative = (np.cumsum(weights) - 0.5 * weights) / weights.sum()
+        return np.interp(np.asarray(percents, dtype=float) / 100.0, cumulative, points)
+
+    def mode_table(self) -> List[ModeSummary]:
+        rows = []
+        for label, (n, s, sq) in self.modes.items():
+            count = int(n)
+            rows.append(ModeSummary(label, count, s / count if count else math.nan,
+                                    _std(count, s, sq), self._mode_flights.get(label, 0)))
+        rows.sort(key=lambda row: -row.count)
+        return rows
+
+
+def _std(count: float, total: float, total_sq: float) -> float:
+    if count < 2:
+        return math.nan
+    variance = (total_sq - total * total / count) / (count - 1)
+    return math.sqrt(max(variance, 0.0))
+
+
+# ------------------------------------------------------------------ worker
+class FleetStatsWorker(QObject):
+    """Roda :func:`aggregate_folder` em todas as pastas da raiz num pool de processos.
+
+    Pastas já em cache vão primeiro, para os primeiros resultados chegarem
+    rápido; ``partial`` recebe cópias de :class:`FleetAggregate` no máximo a
+    cada ``PARTIAL_INTERVAL_S``.
+    """
+
+    partial = pyqtSignal(object)      # FleetAggregate parcial
+    progress = pyqtSignal(int, int)   # (pastas processadas, total)
+    finished = pyqtSignal(object)     # FleetAggregate final
+    error = pyqtSignal(str)
+
+    def __init__(self, root: str, query: FleetQuery, max_workers: int = 0, cache_root: Optional[str] = None):
+        super().__init__()
+        self.root = root
+        self.query = query
+        self.max_workers = int(max_workers or 0)
+        self.cache_root = cache_root
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        pool = None
+        try:
+            cache_root = self.cache_root or str(default_cache_root())
+            columns = [self.query.signal, MODE_COLUMN, FLYING_COLUMN]
+            folders = [(path, label) for path, label in discover_flight_folders(self.root)
+                       if self.query.accepts_folder(label)]
+            # Cacheadas primeiro: respondem em milissegundos
+            folders.sort(key=lambda item: not is_cached(item[0], cache_root, columns))
+            aggregate = FleetAggregate(self.query, len(folders))
+            self.progress.emit(0, len(folders))
+            if folders:
+                max_workers = self.max_workers or max(1, min(len(folders), (os.cpu_count() or 2) - 1))
+                pool = ProcessPoolExecutor(max_workers=max_workers)
+                pending = {pool.submit(aggregate_folder, path, label, self.query, cache_root)
+                           for path, label in folders}
+                last_emit = 0.0
+                while pending and not self._cancelled:
+                    done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            aggregate.add_folder(future.result())
+                        except Exception as exc:
+                            print(f"ERRO: Pasta da frota falhou: {exc}")
+                            aggregate.folders_done += 1
+                    if done:
+                        self.progress.emit(aggregate.folders_done, len(folders))
+                        now = time.monotonic()
+                        if pending and now - last_emit >= PARTIAL_INTERVAL_S:
+                            last_emit = now
+                            self.partial.emit(aggregate.snapshot())
+            self.finished.emit(aggregate.snapshot())
+        except Exception as e:
+            self.error.emit(f"Ocorreu um erro nas estatísticas da frota: {e}")
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=not self._cancelled, cancel_futures=True)
@@ -0,0 +1,303 @@
+"""Catálogo local (SQLite) com metadados dos voos da pasta sincronizada.
+
+Cada pasta de voo é lida uma única vez, sem interface, pelos mesmos parsers
+do carregamento normal (:func:`src.data_parser.load_folder_logs`), num pool
+de processos. O resumo compacto (duração, altitude máxima, distância, modos,
+bateria mínima e área coberta) fica em ``flights.sqlite`` junto com uma
+assinatura dos arquivos de log (nome, tamanho e mtime); o voo só é lido de
+novo se a assinatura mudar. Com isso o diálogo de cópia filtra e ordena por
+esses campos sem abrir nenhum log.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.utils.geodesy import geo_series
+from src.utils.mode_utils import compute_mode_segments, epoch_seconds_array
+from src.utils.resource_paths import get_appdata_dir
+from src.utils.sharepoint_downloader import SUPPORTED_LOG_EXTS, SharePointClient, SharePointFlight
+from src.utils.track_payload import altitude_reference
+
+CATALOG_SCHEMA_VERSION = 2
+DATALOGGER_TYPE = "Datalogger (logXX.csv)"
+_SIGNATURE_WORKERS = 8
+
+
+def default_catalog_path() -> Path:
+    return get_appdata_dir("Catalog", create=True) / "flights.sqlite"
+
+
+@dataclass(slots=True)
+class FlightMetadata:
+    """Resumo de um voo; campos numéricos ausentes ficam NaN."""
+
+    source_path: str
+    signature: str
+    log_type: str = ""
+    samples: int = 0
+    start: float = math.nan
+    duration_s: float = math.nan
+    # Acima da altitude do início do log (decolagem), não MSL
+    max_altitude_m: float = math.nan
+    distance_m: float = math.nan
+    battery_min_v: float = math.nan
+    battery_min_pct: float = math.nan
+    lat_min: float = math.nan
+    lat_max: float = math.nan
+    lon_min: float = math.nan
+    lon_max: float = math.nan
+    modes: Tuple[str, ...] = field(default_factory=tuple)
+    error: str = ""
+
+    @property
+    def has_data(self) -> bool:
+        return self.samples > 0 and not self.error
+
+
+_COLUMNS = [f.name for f in fields(FlightMetadata)]
+
+
+# ---------------------------------------------------------------- indexação
+def flight_signature(source_dir: Path | str) -> str:
+    """Assinatura dos arquivos de log do voo (caminho relativo, tamanho, mtime)."""
+    entries = []
+    for dirpath, _dirnames, filenames in os.walk(source_dir):
+        for filename in filenames:
+            if os.path.splitext(filename)[1].lower() not in SUPPORTED_LOG_EXTS:
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append(f"{os.path.relpath(path, source_dir)}|{st.st_size}|{st.st_mtime_ns}")
+    return hashlib.sha1("\n".join(sorted(entries)).encode("utf-8")).hexdigest()
+
+
+def _finite(values: np.ndarray) -> np.ndarray:
+    return values[np.isfinite(values)]
+
+
+def summarize_log(df: pd.DataFrame, metadata: FlightMetadata) -> FlightMetadata:
+    """Preenche ``metadata`` com o resumo do DataFrame de um log."""
+    metadata.samples = int(len(df))
+    if 'Timestamp' in df.columns:
+        epochs = _finite(epoch_seconds_array(df['Timestamp']))
+        if epochs.size:
+            metadata.start = float(epochs.min())
+            metadata.duration_s = float(epochs.max() - epochs.min())
+    if 'AltitudeAbs' in df.columns:
+        alt = _finite(pd.to_numeric(df['AltitudeAbs'], errors='coerce').to_numpy(dtype=float))
+        if alt.size:
+            metadata.max_altitude_m = float(alt.max()) - altitude_reference(df)
+    if 'Voltage' in df.columns:
+        volts = _finite(pd.to_numeric(df['Voltage'], errors='coerce').to_numpy(dtype=float))
+        # Zeros indicam canal sem leitura, não bateria vazia
+        volts = volts[volts > 0]
+        if volts.size:
+            metadata.battery_min_v = float(volts.min())
+    if 'Porcent_bat' in df.columns:
+        pct = _finite(pd.to_numeric(df['Porcent_bat'], errors='coerce').to_numpy(dtype=float))
+        if pct.size:
+            metadata.battery_min_pct = float(pct.min())
+    if 'Latitude' in df.columns and 'Longitude' in df.columns:
+        lat = pd.to_numeric(df['Latitude'], errors='coerce').to_numpy(dtype=float)
+        lon = pd.to_numeric(df['Longitude'], errors='coerce').to_numpy(dtype=float)
+        valid = np.isfinite(lat) & np.isfinite(lon) & ((lat != 0) | (lon != 0))
+        if valid.any():
+            metadata.lat_min, metadata.lat_max = float(lat[valid].min()), float(lat[valid].max())
+            metadata.lon_min, metadata.lon_max = float(lon[valid].min()), float(lon[valid].max())
+    geo = geo_series(df)
+    if geo is not None:
+        metadata.distance_m = geo.total_distance_m
+    labels: List[str] = []
+    for segment in compute_mode_segments(df):
+        if segment.label not in labels:
+            labels.append(segment.label)
+    metadata.modes = tuple(labels)
+    return metadata
+
+
+def index_flight_folder(source_path: str, signature: str) -> FlightMetadata:
+    """Lê os logs do voo (todas as subpastas) e resume o log principal.
+
+    Roda em processo separado. O principal é o log de telemetria com mais
+    amostras; dataloggers só são usados se não houver telemetria.
+    """
+    from src.data_parser import load_folder_logs
+
+    metadata = FlightMetadata(source_path=source_path, signature=signature)
+    label = os.path.basename(os.path.normpath(source_path))
+    candidates = []
+    try:
+        for dirpath, _dirnames, filenames in os.walk(source_path):
+            if not any(os.path.splitext(name)[1].lower() in SUPPORTED_LOG_EXTS for name in filenames):
+                continue
+            for _name, df, log_type, _source in load_folder_logs(dirpath, label):
+                if df is not None and not df.empty:
+                    candidates.append((log_type != DATALOGGER_TYPE, len(df), log_type, df))
+    except Exception as exc:
+        metadata.error = str(exc)
+        return metadata
+    if not candidates:
+        metadata.error = "Nenhum log legível"
+        return metadata
+    _is_main, _size, log_type, df = max(candidates, key=lambda item: (item[0], item[1]))
+    metadata.log_type = log_type
+    try:
+        return summarize_log(df, metadata)
+    except Exception as exc:
+        metadata.error = str(exc)
+        return metadata
+
+
+# ----------------------------------------------------------------- catálogo
+class FlightCatalog:
+    """Tabela SQLite ``caminho da pasta do voo -> FlightMetadata``."""
+
+    def __init__(self, db_path: Path | str | None = None):
+        self.db_path = Path(db_path) if db_path else default_catalog_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version != CATALOG_SCHEMA_VERSION:
+            self._db.execute("DROP TABLE IF EXISTS flights")
+            self._db.execute(f"PRAGMA user_version={CATALOG_SCHEMA_VERSION}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS flights ("
+            " source_path TEXT PRIMARY KEY, signature TEXT NOT NULL, log_type TEXT, samples INTEGER,"
+            " start REAL, duration_s REAL, max_altitude_m REAL, distance_m REAL,"
+            " battery_min_v REAL, battery_min_pct REAL,"
+            " lat_min REAL, lat_max REAL, lon_min REAL, lon_max REAL,"
+            " modes TEXT, error TEXT)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _from_row(row: Sequence) -> FlightMetadata:
+        # NULL volta ao padrão do campo (NaN, 0 ou texto vazio)
+        values = {name: value for name, value in zip(_COLUMNS, row) if value is not None}
+        values["modes"] = tuple(m for m in values.get("modes", "").split("|") if m)
+        return FlightMetadata(**values)
+
+    @staticmethod
+    def _to_row(metadata: FlightMetadata) -> Tuple:
+        row = []
+        for name in _COLUMNS:
+            value = getattr(metadata, name)
+            if name == "modes":
+                value = "|" + "|".join(value) + "|" if value else ""
+            elif isinstance(value, float) and not math.isfinite(value):
+                value = None
+            row.append(value)
+        return tuple(row)
+
+    def lookup(self, source_paths: Iterable[str]) -> Dict[str, FlightMetadata]:
+        """Metadados dos voos pedidos que já estão no catálogo."""
+        paths = list(dict.fromkeys(source_paths))
+        found: Dict[str, FlightMetadata] = {}
+        with self._lock:
+            # Limite de parâmetros do SQLite: consulta em blocos
+            for start in range(0, len(paths), 500):
+                chunk = paths[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = self._db.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM flights WHERE source_path IN ({placeholders})", chunk
+                )
+                for row in cursor:
+                    metadata = self._from_row(row)
+                    found[metadata.source_path] = metadata
+        return found
+
+    def store(self, metadata: FlightMetadata) -> None:
+        placeholders = ",".join("?" * len(_COLUMNS))
+        with self._lock:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO flights ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                self._to_row(metadata),
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._db.close()
+            except sqlite3.Error:
+                pass
+
+
+def flight_source_path(client: SharePointClient, flight: SharePointFlight) -> str:
+    """Chave do voo no catálogo: caminho absoluto da pasta (independe da raiz escolhida)."""
+    return str(client.require_programs_root() / flight.relative_path)
+
+
+class CatalogIndexWorker(QObject):
+    """Indexa os voos ainda ausentes/desatualizados no catálogo (padrão moveToThread)."""
+
+    progress = pyqtSignal(int, int)
+    flight_indexed = pyqtSignal(object)
+    finished = pyqtSignal(int)
+    error = pyqtSignal(str)
+
+    def __init__(self, client: SharePointClient, flights: Sequence[SharePointFlight],
+                 catalog: FlightCatalog, max_workers: int = 2):
+        super().__init__()
+        self.client = client
+        self.flights = list(flights)
+        self.catalog = catalog
+        self.max_workers = max(1, int(max_workers))
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            self.finished.emit(self._index())
+        except Exception as exc:
+            self.error.emit(str(exc))
+
+    def _index(self) -> int:
+        paths = list(dict.fromkeys(flight_source_path(self.client, flight) for flight in self.flights))
+        with ThreadPoolExecutor(max_workers=_SIGNATURE_WORKERS) as pool:
+            signatures = dict(zip(paths, pool.map(flight_signature, paths)))
+        known = self.catalog.lookup(paths)
+        stale = [path for path in paths if path not in known or known[path].signature != signatures[path]]
+        total = len(stale)
+        print(f"INFO: Catálogo de voos: {len(paths) - total} em dia, {total} para indexar.")
+        self.progress.emit(0, total)
+        if not stale or self._cancel.is_set():
+            return 0
+
+        done = 0
+        pool = ProcessPoolExecutor(max_workers=min(self.max_workers, total))
+        try:
+            pending = {pool.submit(index_flight_folder, path, signatures[path]): path for path in stale}
+            while pending and not self._cancel.is_set():
+                finished, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    path = pending.pop(future)
+                    try:
+                        metadata = future.result()
+                    except Exception as exc:
+                        metadata = FlightMetadata(source_path=path, signature=signatures[path], error=str(exc))
+                    self.catalog.store(metadata)
+                    done += 1
+                    self.flight_indexed.emit(metadata)
+                    self.progress.emit(done, total)
+        finally:
+            pool.shutdown(wait=not self._cancel.is_set(), cancel_futures=True)
+        return done
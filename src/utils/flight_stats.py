@@ -0,0 +1,313 @@
+"""Estatísticas de voo por log: tempos, altitude, distância, bateria e combustível.
+
+Tudo é calculado de forma vetorizada (NumPy) sobre as colunas do log já
+parseado, inclusive o detalhamento por ``ModoVoo`` (tempo, trechos,
+distância e altitude máxima em cada modo). Altitudes são relativas ao
+início do log (decolagem), como na vista 3D, e não ao nível do mar. O
+resultado fica memorizado por DataFrame, como as séries geodésicas, e
+também segue nos artefatos do log (:attr:`LogArtifacts.stats`);
+:func:`compute_stats_table` monta a tabela de todos os logs carregados num
+pool de threads.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.utils.frame_memo import FrameMemo
+from src.utils.geodesy import GeoSeries, geo_series
+from src.utils.mode_utils import ModeSegment, compute_mode_segments, epoch_seconds_array
+from src.utils.track_payload import altitude_reference
+
+# Intervalos maiores entre amostras são lacunas do log, não tempo de voo
+MAX_SAMPLE_GAP_S = 5.0
+FUEL_COLUMNS = ('FuelLevel_dig', 'FuelLevel_anag')
+# Nível de combustível é ruidoso: início/fim são medianas das pontas do log
+FUEL_EDGE_FRACTION = 0.05
+FUEL_EDGE_MIN_SAMPLES = 5
+DEFAULT_STATS_WORKERS = 4
+
+
+@dataclass
+class ModeStats:
+    mode_value: int
+    label: str
+    time_s: float = 0.0
+    segments: int = 0
+    distance_m: float = math.nan
+    max_altitude_m: float = math.nan
+
+
+@dataclass
+class FlightStats:
+    """Resumo de um log; campos numéricos ausentes ficam NaN."""
+
+    samples: int = 0
+    start: float = math.nan
+    end: float = math.nan
+    duration_s: float = math.nan
+    # Com a coluna IsFlying: tempo com a aeronave voando; sem ela: tempo de log sem lacunas
+    flight_time_s: float = math.nan
+    flight_time_source: str = ""
+    # Acima da altitude do início do log (decolagem), não MSL
+    max_altitude_m: float = math.nan
+    total_distance_m: float = math.nan
+    max_distance_m: float = math.nan
+    max_ground_speed_ms: float = math.nan
+    min_voltage_v: float = math.nan
+    min_battery_pct: float = math.nan
+    fuel_column: str = ""
+    fuel_start: float = math.nan
+    fuel_end: float = math.nan
+    fuel_used: float = math.nan
+    modes: List[ModeStats] = field(default_factory=list)
+    error: str = ""
+
+
+def format_duration(seconds: float) -> str:
+    if seconds is None or not math.isfinite(seconds):
+        return "-"
+    seconds = int(round(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _numeric(df: pd.DataFrame, column: str) -> Optional[np.ndarray]:
+    if column not in df.columns:
+        return None
+    return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)
+
+
+def _finite_min(values: Optional[np.ndarray], *, positive: bool = False) -> float:
+    if values is None:
+        return math.nan
+    values = values[np.isfinite(values)]
+    if positive:
+        # Zeros indicam canal sem leitura, não bateria vazia
+        values = values[values > 0]
+    return float(values.min()) if values.size else math.nan
+
+
+def _time_steps(epoch_s: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Ordem temporal das amostras válidas e o intervalo até a próxima amostra.
+
+    Lacunas maiores que ``MAX_SAMPLE_GAP_S`` contam como zero.
+    """
+    idx = np.flatnonzero(np.isfinite(epoch_s))
+    order = idx[np.argsort(epoch_s[idx], kind='stable')]
+    if order.size == 0:
+        return order, np.empty(0, dtype=float)
+    dt = np.diff(epoch_s[order], append=epoch_s[order[-1]])
+    dt[dt > MAX_SAMPLE_GAP_S] = 0.0
+    return order, dt
+
+
+def _path_steps(geo: Optional[GeoSeries], n: int) -> Optional[np.ndarray]:
+    """Distância percorrida até cada amostra desde a anterior válida (0 nas demais)."""
+    if geo is None:
+        return None
+    path = geo.path_length
+    valid = np.flatnonzero(np.isfinite(path))
+    steps = np.zeros(n, dtype=float)
+    if valid.size > 1:
+        steps[valid[1:]] = np.diff(path[valid])
+    return steps
+
+
+def _fuel_stats(df: pd.DataFrame, order: np.ndarray, stats: FlightStats) -> None:
+    for column in FUEL_COLUMNS:
+        values = _numeric(df, column)
+        if values is None:
+            continue
+        values = values[order]
+        # Nível zero é ausência de leitura do sensor
+        values = values[np.isfinite(values) & (values > 0)]
+        if values.size < 2:
+            continue
+        edge = min(max(FUEL_EDGE_MIN_SAMPLES, int(values.size * FUEL_EDGE_FRACTION)), values.size)
+        stats.fuel_column = column
+        stats.fuel_start = float(np.median(values[:edge]))
+        stats.fuel_end = float(np.median(values[-edge:]))
+        stats.fuel_used = stats.fuel_start - stats.fuel_end
+        return
+
+
+def _mode_stats(df: pd.DataFrame, order: np.ndarray, dt: np.ndarray, steps: Optional[np.ndarray],
+                altitude: Optional[np.ndarray], segments: Sequence[ModeSegment]) -> List[ModeStats]:
+    modes = _numeric(df, 'ModoVoo')
+    if modes is None or order.size == 0:
+        return []
+    modes = modes[order]
+    valid = np.isfinite(modes)
+    if not valid.any():
+        return []
+    rows = order[valid]
+    values = modes[valid].astype(int)
+    codes, inverse = np.unique(values, return_inverse=True)
+    n_codes = codes.size
+
+    time_s = np.bincount(inverse, weights=dt[valid], minlength=n_codes)
+    run_starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+    runs = np.bincount(inverse[run_starts], minlength=n_codes)
+    distance = (
+        np.bincount(inverse, weights=steps[rows], minlength=n_codes)
+        if steps is not None else np.full(n_codes, np.nan)
+    )
+    max_alt = np.full(n_codes, np.nan)
+    if altitude is not None:
+        alt = altitude[rows]
+        finite = np.isfinite(alt)
+        np.fmax.at(max_alt, inverse[finite], alt[finite])
+
+    labels = {segment.mode_value: segment.label for segment in segments}
+    result = [
+        ModeStats(
+            mode_value=int(code),
+            label=labels.get(int(code), f"Modo {int(code)}"),
+            time_s=float(time_s[i]),
+            segments=int(runs[i]),
+            distance_m=float(distance[i]),
+            max_altitude_m=float(max_alt[i]),
+        )
+        for i, code in enumerate(codes)
+    ]
+    result.sort(key=lambda item: item.time_s, reverse=True)
+    return result
+
+
+# Memo por log, como geo_series/compute_mode_segments
+_MEMO = FrameMemo()
+
+
+def clear_stats_cache(df: Optional[pd.DataFrame] = None) -> None:
+    _MEMO.clear(df)
+
+
+def compute_flight_stats(df: pd.DataFrame, *, segments: Optional[Sequence[ModeSegment]] = None,
+                         geo: Optional[GeoSeries] = None) -> FlightStats:
+    """Estatísticas do log (memorizadas por DataFrame).
+
+    ``segments``/``geo`` evitam recalcular o que os artefatos já têm; sem
+    eles são obtidos dos memos de :mod:`mode_utils` e :mod:`geodesy`.
+    """
+    if df is None or df.empty:
+        return FlightStats()
+    memo = _MEMO.store_for(df)
+    key = ('stats', len(df))
+    cached = memo.get(key)
+    if cached is not None:
+        return cached
+
+    stats = FlightStats(samples=int(len(df)))
+    epoch_s = epoch_seconds_array(df['Timestamp']) if 'Timestamp' in df.columns else np.full(len(df), np.nan)
+    order, dt = _time_steps(epoch_s)
+    if order.size:
+        stats.start = float(epoch_s[order[0]])
+        stats.end = float(epoch_s[order[-1]])
+        stats.duration_s = stats.end - stats.start
+        flying = _numeric(df, 'IsFlying')
+        if flying is not None and np.isfinite(flying).any():
+            stats.flight_time_s = float(dt[np.nan_to_num(flying[order]) > 0.5].sum())
+            stats.flight_time_source = 'IsFlying'
+        else:
+            stats.flight_time_s = float(dt.sum())
+            stats.flight_time_source = 'log'
+
+    altitude = _numeric(df, 'AltitudeAbs')
+    if altitude is not None and np.isfinite(altitude).any():
+        altitude = altitude - altitude_reference(df)
+        stats.max_altitude_m = float(np.nanmax(altitude))
+    if geo is None:
+        geo = geo_series(df)
+    if geo is not None:
+        stats.total_distance_m = geo.total_distance_m
+        stats.max_distance_m = geo.max_distance_from_origin_m
+        speed = geo.ground_speed[np.isfinite(geo.ground_speed)]
+        if speed.size:
+            stats.max_ground_speed_ms = float(speed.max())
+    stats.min_voltage_v = _finite_min(_numeric(df, 'Voltage'), positive=True)
+    stats.min_battery_pct = _finite_min(_numeric(df, 'Porcent_bat'))
+    _fuel_stats(df, order, stats)
+
+    if segments is None:
+        segments = compute_mode_segments(df)
+    stats.modes = _mode_stats(df, order, dt, _path_steps(geo, len(df)), altitude, segments)
+
+    memo[key] = stats
+    return stats
+
+
+def _stats_job(df_or_loader) -> FlightStats:
+    # Loader (função sem argumentos): o log só é lido quando o job roda
+    df = df_or_loader() if callable(df_or_loader) else df_or_loader
+    return compute_flight_stats(df)
+
+
+def compute_stats_table(
+    logs: Mapping[str, pd.DataFrame] | Sequence[Tuple[str, pd.DataFrame]],
+    *,
+    max_workers: int = DEFAULT_STATS_WORKERS,
+    on_result: Callable[[str, FlightStats], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> Dict[str, FlightStats]:
+    """Estatísticas de vários logs num pool de threads (NumPy libera o GIL).
+
+    Os logs são submetidos na ordem recebida; ``on_result`` é chamado (na
+    thread que chamou) assim que cada um fica pronto. Um log que falha
+    volta com ``error`` preenchido. No lugar do DataFrame o job pode trazer
+    uma função que o carrega (logs do ``LogStore`` que estão em disco).
+    """
+    jobs = list(logs.items()) if isinstance(logs, Mapping) else list(logs)
+    table: Dict[str, FlightStats] = {}
+    if not jobs:
+        return table
+    pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="flight-stats")
+    try:
+        futures = {pool.submit(_stats_job, df): name for name, df in jobs}
+        for future in as_completed(futures):
+            if cancel is not None and cancel.is_set():
+                break
+            name = futures[future]
+            try:
+                stats = future.result()
+            except Exception as exc:
+                stats = FlightStats(error=str(exc))
+            table[name] = stats
+            if on_result is not None:
+                on_result(name, stats)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return table
+
+
+class FlightStatsWorker(QObject):
+    """Calcula a tabela de estatísticas fora da GUI (padrão moveToThread)."""
+
+    computed = pyqtSignal(str, object)
+    finished = pyqtSignal()
+
+    def __init__(self, jobs: Sequence[Tuple[str, pd.DataFrame]], *, max_workers: int = DEFAULT_STATS_WORKERS):
+        super().__init__()
+        self.jobs = list(jobs)
+        self.max_workers = max(1, int(max_workers))
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            compute_stats_table(
+                self.jobs, max_workers=self.max_workers, on_result=self.computed.emit, cancel=self._cancel
+            )
+        except Exception as exc:
+            print(f"ERRO: Falha ao calcular estatísticas de voo: {exc}")
+        finally:
+            self.jobs = []
+            self.finished.emit()
@@ -0,0 +1,223 @@
+"""Varredura paralela de árvores de pastas com índice persistente por mtime.
+
+A pasta sincronizada do OneDrive é lenta para listar: cada ``scandir`` pode
+custar dezenas de milissegundos. Aqui cada diretório é lido uma única vez,
+em paralelo, e o resultado (subpastas + extensões de log presentes) fica
+num índice em disco. Na próxima varredura, um diretório cujo ``mtime`` não
+mudou reaproveita a entrada do índice e custa só um ``stat``: o ``mtime`` de
+uma pasta muda quando arquivos ou subpastas diretas são criados, removidos
+ou renomeados, que é exatamente o que o índice guarda.
+"""
+from __future__ import annotations
+
+import json
+import os
+import posixpath
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+INDEX_VERSION = 1
+ROOT_KEY = "."
+# Listagem de pastas é limitada por E/S (rede/OneDrive), não por CPU
+DEFAULT_SCAN_WORKERS = 8
+
+
+@dataclass(frozen=True, slots=True)
+class DirNode:
+    """Conteúdo direto de uma pasta: subpastas e extensões de interesse."""
+
+    mtime_ns: int
+    subdirs: Tuple[str, ...]
+    exts: Tuple[str, ...]
+
+
+@dataclass(slots=True)
+class WalkStats:
+    scanned: int = 0
+    reused: int = 0
+    failed: int = 0
+    elapsed_s: float = 0.0
+
+
+def child_key(parent: str, name: str) -> str:
+    """Chave (caminho relativo POSIX) de uma subpasta."""
+    return name if parent == ROOT_KEY else posixpath.join(parent, name)
+
+
+def _in_subtree(key: str, top: str) -> bool:
+    return top == ROOT_KEY or key == top or key.startswith(top + "/")
+
+
+class DirectoryIndex:
+    """Índice ``caminho relativo -> DirNode`` de uma raiz, salvo em JSON.
+
+    O arquivo guarda a raiz a que pertence; trocar de raiz descarta o índice.
+    """
+
+    def __init__(self, root: Path, index_file: Optional[Path] = None):
+        self.root = Path(root)
+        self.index_file = index_file
+        self.nodes: Dict[str, DirNode] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.index_file or not self.index_file.exists():
+            return
+        try:
+            payload = json.loads(self.index_file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"AVISO: Índice de pastas ilegível ({exc}); será reconstruído.")
+            return
+        if payload.get("version") != INDEX_VERSION or payload.get("root") != str(self.root):
+            return
+        for key, entry in (payload.get("dirs") or {}).items():
+            try:
+                mtime_ns, subdirs, exts = entry
+                self.nodes[key] = DirNode(int(mtime_ns), tuple(subdirs), tuple(exts))
+            except (TypeError, ValueError):
+                continue
+
+    def get(self, key: str) -> Optional[DirNode]:
+        return self.nodes.get(key)
+
+    def replace_subtree(self, top: str, nodes: Dict[str, DirNode]) -> None:
+        """Substitui as entradas sob ``top`` pelas da varredura (pastas apagadas somem)."""
+        for key in [k for k in self.nodes if _in_subtree(k, top)]:
+            del self.nodes[key]
+        self.nodes.update(nodes)
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self.index_file or not self._dirty:
+            return
+        payload = {
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "dirs": {key: [n.mtime_ns, list(n.subdirs), list(n.exts)] for key, n in self.nodes.items()},
+        }
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.index_file)
+            self._dirty = False
+        except OSError as exc:
+            print(f"AVISO: Não foi possível salvar o índice de pastas: {exc}")
+
+
+def scan_directory(
+    path: Path, cached: Optional[DirNode], extensions: Iterable[str]
+) -> Tuple[Optional[DirNode], bool]:
+    """Lê uma pasta (ou reaproveita ``cached`` se o mtime bate). Retorna (nó, reaproveitado)."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None, False
+    if cached is not None and cached.mtime_ns == mtime_ns:
+        return cached, True
+    subdirs = []
+    exts = set()
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        subdirs.append(entry.name)
+                    elif entry.is_file():
+                        suffix = os.path.splitext(entry.name)[1].lower()
+                        if suffix in extensions:
+                            exts.add(suffix)
+                except OSError:
+                    continue
+    except OSError as exc:
+        print(f"AVISO: Falha ao listar {path}: {exc}")
+        return None, False
+    return DirNode(mtime_ns, tuple(sorted(subdirs)), tuple(sorted(exts))), False
+
+
+def walk_tree(
+    index: DirectoryIndex,
+    start: str,
+    extensions: Iterable[str],
+    on_subtree: Callable[[str, Dict[str, DirNode]], None] | None = None,
+    max_workers: int = DEFAULT_SCAN_WORKERS,
+) -> Tuple[Dict[str, DirNode], WalkStats]:
+    """Percorre ``start`` (chave relativa à raiz do índice) visitando cada pasta uma vez.
+
+    Cada subpasta direta de ``start`` forma uma subárvore; assim que todas as
+    pastas dela foram lidas, ``on_subtree(chave, nós)`` é chamado (na thread
+    que chamou ``walk_tree``), permitindo mostrar resultados antes do fim.
+    O índice é atualizado com o resultado, mas não é salvo aqui.
+    """
+    extensions = frozenset(extensions)
+    nodes: Dict[str, DirNode] = {}
+    stats = WalkStats()
+    started = time.perf_counter()
+    pending: Dict[str, int] = {}
+    futures: Dict[Future, Tuple[str, Optional[str]]] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as pool:
+
+        def submit(key: str, subtree: Optional[str]) -> None:
+            path = index.root if key == ROOT_KEY else index.root / key
+            futures[pool.submit(scan_directory, path, index.get(key), extensions)] = (key, subtree)
+            if subtree is not None:
+                pending[subtree] = pending.get(subtree, 0) + 1
+
+        submit(start, None)
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, subtree = futures.pop(future)
+                node, reused = future.result()
+                if node is None:
+                    stats.failed += 1
+                else:
+                    nodes[key] = node
+                    if reused:
+                        stats.reused += 1
+                    else:
+                        stats.scanned += 1
+                    for name in node.subdirs:
+                        child = child_key(key, name)
+                        submit(child, subtree if subtree is not None else child)
+                if subtree is None:
+                    continue
+                pending[subtree] -= 1
+                if pending[subtree] == 0 and on_subtree is not None:
+                    on_subtree(subtree, nodes)
+
+    index.replace_subtree(start, nodes)
+    stats.elapsed_s = time.perf_counter() - started
+    return nodes, stats
+
+
+def subtree_extensions(key: str, nodes: Dict[str, DirNode], memo: Dict[str, frozenset]) -> frozenset:
+    """Extensões presentes em ``key`` e em todas as suas subpastas (memoizado)."""
+    cached = memo.get(key)
+    if cached is not None:
+        return cached
+    # Pós-ordem iterativa: árvores de voo podem ser profundas
+    stack = [(key, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if current in memo:
+            continue
+        node = nodes.get(current)
+        if node is None:
+            memo[current] = frozenset()
+            continue
+        children = [child_key(current, name) for name in node.subdirs]
+        if not expanded:
+            stack.append((current, True))
+            stack.extend((child, False) for child in children if child not in memo)
+            continue
+        found = set(node.exts)
+        for child in children:
+            found.update(memo.get(child, ()))
+        memo[current] = frozenset(found)
+    return memo[key]
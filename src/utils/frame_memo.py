@@ -0,0 +1,118 @@
+"""Memo de resultados derivados "por log" (por instância de DataFrame).
+
+DataFrames não são hasheáveis, então o memo é indexado por ``id(df)`` e
+guarda uma referência fraca para validar a identidade; a entrada some
+sozinha quando o DataFrame é coletado.
+
+:class:`LogResultCache` é a variante indexada pelo nome do log (chaves
+``(log, ...)`` com LRU), para caches que precisam descartar um log pelo nome;
+a identidade do DataFrame também é conferida a cada acesso.
+"""
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+
+class FrameMemo:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._items: Dict[int, Tuple[weakref.ref, dict]] = {}
+
+    def _forget(self, key: int, ref: weakref.ref) -> None:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and entry[0] is ref:
+                del self._items[key]
+
+    def store_for(self, df: pd.DataFrame) -> dict:
+        """Dicionário de resultados associado a ``df`` (criado sob demanda)."""
+        key = id(df)
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and entry[0]() is df:
+                return entry[1]
+            store: dict = {}
+            try:
+                ref = weakref.ref(df, lambda r, key=key: self._forget(key, r))
+            except TypeError:
+                return store
+            self._items[key] = (ref, store)
+            return store
+
+    def clear(self, df: Optional[pd.DataFrame] = None) -> None:
+        """Descarta os resultados de um DataFrame (ou de todos)."""
+        with self._lock:
+            if df is None:
+                self._items.clear()
+                return
+            entry = self._items.get(id(df))
+            if entry is not None and entry[0]() is df:
+                del self._items[id(df)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+
+class LogResultCache:
+    """Cache LRU ``(log, ...) -> resultado`` validado pela identidade do DataFrame.
+
+    Se o DataFrame de um log muda (log recarregado), as entradas desse log
+    são descartadas no próximo acesso. Subclasses com estruturas extras por
+    log estendem :meth:`_drop_log` e :meth:`_clear_locked`.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+        self._sources: Dict[str, weakref.ref] = {}
+
+    def _check_source(self, log_name: str, df: pd.DataFrame) -> None:
+        """Descarta as entradas do log se o DataFrame mudou (chamar com o lock)."""
+        ref = self._sources.get(log_name)
+        if ref is not None and ref() is df:
+            return
+        self._drop_log(log_name)
+        try:
+            self._sources[log_name] = weakref.ref(df)
+        except TypeError:
+            self._sources.pop(log_name, None)
+
+    def _drop_log(self, log_name: str) -> None:
+        for key in [k for k in self._items if k[0] == log_name]:
+            del self._items[key]
+        self._sources.pop(log_name, None)
+
+    def _clear_locked(self) -> None:
+        self._items.clear()
+        self._sources.clear()
+
+    def get(self, df: pd.DataFrame, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """Resultado de ``key`` (``key[0]`` é o nome do log) ou None."""
+        with self._lock:
+            self._check_source(key[0], df)
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def discard(self, log_name: str) -> None:
+        with self._lock:
+            self._drop_log(log_name)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear_locked()
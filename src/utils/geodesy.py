@@ -0,0 +1,268 @@
+"""Geodésia vetorizada (NumPy) para trajetórias de log.
+
+Substitui o ``geopy.geodesic`` chamado amostra a amostra: as distâncias são
+calculadas para o log inteiro de uma vez, com precisão selecionável:
+
+* ``"vincenty"``: inversa de Vincenty no elipsoide WGS-84 (sub-milimétrica,
+  equivalente ao geopy para distâncias de voo);
+* ``"haversine"``: esfera de raio médio (erro até ~0,5%);
+* ``"equirectangular"``: aproximação plana local, a mais rápida (boa para
+  distâncias curtas entre amostras consecutivas).
+
+:func:`geo_series` devolve distância da origem, comprimento acumulado do
+caminho, velocidade em solo e rumo, memorizados por log para que gráficos,
+mapa e painéis de estatística reaproveitem o mesmo cálculo.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.frame_memo import FrameMemo
+from src.utils.mode_utils import epoch_seconds_array
+
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = (1 - WGS84_F) * WGS84_A
+MEAN_EARTH_RADIUS_M = 6371008.8
+
+METHODS = ("vincenty", "haversine", "equirectangular")
+DEFAULT_METHOD = "vincenty"
+
+_VINCENTY_MAX_ITER = 200
+_VINCENTY_TOL = 1e-12
+
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+
+def haversine_m(lat1, lon1, lat2, lon2) -> np.ndarray:
+    phi1, phi2 = np.radians(_as_float(lat1)), np.radians(_as_float(lat2))
+    dphi = phi2 - phi1
+    dlmb = np.radians(_as_float(lon2) - _as_float(lon1))
+    h = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * MEAN_EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def equirectangular_m(lat1, lon1, lat2, lon2) -> np.ndarray:
+    phi1, phi2 = np.radians(_as_float(lat1)), np.radians(_as_float(lat2))
+    dlmb = np.radians(_as_float(lon2) - _as_float(lon1))
+    dlmb = (dlmb + np.pi) % (2 * np.pi) - np.pi
+    x = dlmb * np.cos((phi1 + phi2) / 2)
+    y = phi2 - phi1
+    return MEAN_EARTH_RADIUS_M * np.hypot(x, y)
+
+
+def vincenty_m(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Inversa de Vincenty vetorizada; pontos que não convergem (quase antípodas) usam haversine."""
+
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(_as_float(lat1), _as_float(lon1), _as_float(lat2), _as_float(lon2))
+    shape = lat1.shape
+    lat1, lon1, lat2, lon2 = (np.ravel(v) for v in (lat1, lon1, lat2, lon2))
+    f, a, b = WGS84_F, WGS84_A, WGS84_B
+    L = np.radians(lon2 - lon1)
+    U1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    U2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+    sinU1, cosU1 = np.sin(U1), np.cos(U1)
+    sinU2, cosU2 = np.sin(U2), np.cos(U2)
+
+    lam = L.copy()
+    active = np.isfinite(lam)
+    sin_sigma = np.zeros_like(lam)
+    cos_sigma = np.ones_like(lam)
+    sigma = np.zeros_like(lam)
+    cos_sq_alpha = np.ones_like(lam)
+    cos_2sigma_m = np.zeros_like(lam)
+    converged = ~active
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for _ in range(_VINCENTY_MAX_ITER):
+            if not active.any():
+                break
+            idx = np.flatnonzero(active)
+            sin_lam, cos_lam = np.sin(lam[idx]), np.cos(lam[idx])
+            s_sig = np.hypot(cosU2[idx] * sin_lam, cosU1[idx] * sinU2[idx] - sinU1[idx] * cosU2[idx] * cos_lam)
+            c_sig = sinU1[idx] * sinU2[idx] + cosU1[idx] * cosU2[idx] * cos_lam
+            sig = np.arctan2(s_sig, c_sig)
+            sin_alpha = np.where(s_sig == 0, 0.0, cosU1[idx] * cosU2[idx] * sin_lam / s_sig)
+            c_sq_alpha = 1 - sin_alpha ** 2
+            c_2sm = np.where(c_sq_alpha == 0, 0.0, c_sig - 2 * sinU1[idx] * sinU2[idx] / c_sq_alpha)
+            C = f / 16 * c_sq_alpha * (4 + f * (4 - 3 * c_sq_alpha))
+            lam_new = L[idx] + (1 - C) * f * sin_alpha * (
+                sig + C * s_sig * (c_2sm + C * c_sig * (-1 + 2 * c_2sm ** 2))
+            )
+            sin_sigma[idx], cos_sigma[idx], sigma[idx] = s_sig, c_sig, sig
+            cos_sq_alpha[idx], cos_2sigma_m[idx] = c_sq_alpha, c_2sm
+            done = np.abs(lam_new - lam[idx]) <= _VINCENTY_TOL
+            lam[idx] = lam_new
+            converged[idx[done]] = True
+            active[idx[done]] = False
+
+        u_sq = cos_sq_alpha * (a ** 2 - b ** 2) / b ** 2
+        A = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+        B = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+        delta_sigma = B * sin_sigma * (cos_2sigma_m + B / 4 * (
+            cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+            - B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+        ))
+        dist = b * A * (sigma - delta_sigma)
+
+    nan_input = ~np.isfinite(lat1) | ~np.isfinite(lon1) | ~np.isfinite(lat2) | ~np.isfinite(lon2)
+    dist[nan_input] = np.nan
+    failed = ~converged & ~nan_input
+    if failed.any():
+        dist[failed] = haversine_m(lat1[failed], lon1[failed], lat2[failed], lon2[failed])
+    return dist.reshape(shape)
+
+
+_DISTANCE_FUNCS = {
+    "vincenty": vincenty_m,
+    "haversine": haversine_m,
+    "equirectangular": equirectangular_m,
+}
+
+
+def distance_m(lat1, lon1, lat2, lon2, method: str = DEFAULT_METHOD) -> np.ndarray:
+    """Distância em metros entre pares de pontos (arrays com broadcast)."""
+
+    try:
+        func = _DISTANCE_FUNCS[method]
+    except KeyError:
+        raise ValueError(f"Método geodésico desconhecido: '{method}' (use {', '.join(METHODS)})") from None
+    return func(lat1, lon1, lat2, lon2)
+
+
+def initial_bearing_deg(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Rumo inicial (0-360°, a partir do norte) de cada ponto 1 para o ponto 2."""
+
+    phi1, phi2 = np.radians(_as_float(lat1)), np.radians(_as_float(lat2))
+    dlmb = np.radians(_as_float(lon2) - _as_float(lon1))
+    y = np.sin(dlmb) * np.cos(phi2)
+    x = np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(dlmb)
+    return np.degrees(np.arctan2(y, x)) % 360.0
+
+
+def distance_from_origin(lat, lon, origin: Optional[Tuple[float, float]] = None, method: str = DEFAULT_METHOD) -> np.ndarray:
+    """Distância de cada amostra até ``origin`` (padrão: primeira posição válida)."""
+
+    lat, lon = _as_float(lat), _as_float(lon)
+    if origin is None:
+        valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon))
+        if valid.size == 0:
+            return np.full(lat.shape, np.nan)
+        origin = (lat[valid[0]], lon[valid[0]])
+    return distance_m(origin[0], origin[1], lat, lon, method)
+
+
+def _consecutive_valid(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    return np.flatnonzero(np.isfinite(lat) & np.isfinite(lon))
+
+
+def path_length(lat, lon, method: str = DEFAULT_METHOD) -> np.ndarray:
+    """Comprimento acumulado do caminho (m) entre amostras válidas consecutivas; NaN nas inválidas."""
+
+    lat, lon = _as_float(lat), _as_float(lon)
+    out = np.full(lat.shape, np.nan)
+    idx = _consecutive_valid(lat, lon)
+    if idx.size == 0:
+        return out
+    steps = distance_m(lat[idx[:-1]], lon[idx[:-1]], lat[idx[1:]], lon[idx[1:]], method)
+    out[idx] = np.concatenate(([0.0], np.cumsum(steps)))
+    return out
+
+
+def ground_speed_mps(lat, lon, time_s, method: str = "equirectangular") -> np.ndarray:
+    """Velocidade em solo (m/s) entre amostras válidas consecutivas, atribuída à amostra final."""
+
+    lat, lon, time_s = _as_float(lat), _as_float(lon), _as_float(time_s)
+    out = np.full(lat.shape, np.nan)
+    idx = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon) & np.isfinite(time_s))
+    if idx.size < 2:
+        return out
+    steps = distance_m(lat[idx[:-1]], lon[idx[:-1]], lat[idx[1:]], lon[idx[1:]], method)
+    dt = np.diff(time_s[idx])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        speed = np.where(dt > 0, steps / dt, np.nan)
+    out[idx[1:]] = speed
+    return out
+
+
+def track_bearing_deg(lat, lon) -> np.ndarray:
+    """Rumo sobre o solo entre amostras válidas consecutivas (NaN se não houve deslocamento)."""
+
+    lat, lon = _as_float(lat), _as_float(lon)
+    out = np.full(lat.shape, np.nan)
+    idx = _consecutive_valid(lat, lon)
+    if idx.size < 2:
+        return out
+    lat0, lon0, lat1, lon1 = lat[idx[:-1]], lon[idx[:-1]], lat[idx[1:]], lon[idx[1:]]
+    bearing = initial_bearing_deg(lat0, lon0, lat1, lon1)
+    bearing[(lat0 == lat1) & (lon0 == lon1)] = np.nan
+    out[idx[1:]] = bearing
+    return out
+
+
+@dataclass
+class GeoSeries:
+    """Séries geodésicas de um log, alinhadas às linhas do DataFrame."""
+
+    method: str
+    origin: Optional[Tuple[float, float]]
+    distance_from_origin: np.ndarray
+    path_length: np.ndarray
+    ground_speed: np.ndarray
+    bearing: np.ndarray
+
+    @property
+    def total_distance_m(self) -> float:
+        finite = self.path_length[np.isfinite(self.path_length)]
+        return float(finite[-1]) if finite.size else 0.0
+
+    @property
+    def max_distance_from_origin_m(self) -> float:
+        finite = self.distance_from_origin[np.isfinite(self.distance_from_origin)]
+        return float(finite.max()) if finite.size else 0.0
+
+
+_MEMO = FrameMemo()
+
+
+def geo_series(df: pd.DataFrame, method: str = DEFAULT_METHOD, *, lat_col: str = 'Latitude', lon_col: str = 'Longitude') -> Optional[GeoSeries]:
+    """Séries geodésicas do log (memorizadas por DataFrame e método); None sem GPS."""
+
+    if df is None or df.empty or lat_col not in df.columns or lon_col not in df.columns:
+        return None
+    if method not in _DISTANCE_FUNCS:
+        raise ValueError(f"Método geodésico desconhecido: '{method}' (use {', '.join(METHODS)})")
+    memo = _MEMO.store_for(df)
+    key = ('geo', method, lat_col, lon_col, len(df))
+    cached = memo.get(key)
+    if cached is not None:
+        return cached
+
+    lat = pd.to_numeric(df[lat_col], errors='coerce').to_numpy(dtype=float)
+    lon = pd.to_numeric(df[lon_col], errors='coerce').to_numpy(dtype=float)
+    valid = _consecutive_valid(lat, lon)
+    if valid.size == 0:
+        return None
+    origin = (float(lat[valid[0]]), float(lon[valid[0]]))
+    time_s = epoch_seconds_array(df['Timestamp']) if 'Timestamp' in df.columns else np.full(len(df), np.nan)
+
+    series = GeoSeries(
+        method=method,
+        origin=origin,
+        distance_from_origin=distance_from_origin(lat, lon, origin, method),
+        path_length=path_length(lat, lon, method),
+        ground_speed=ground_speed_mps(lat, lon, time_s, method),
+        bearing=track_bearing_deg(lat, lon),
+    )
+    memo[key] = series
+    return series
+
+
+def clear_geo_cache(df: Optional[pd.DataFrame] = None) -> None:
+    _MEMO.clear(df)
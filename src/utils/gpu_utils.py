@@ -1,5 +1,6 @@
 import os
 import subprocess
+import threading
 from dataclasses import dataclass
 from typing import Iterable, Optional
 
@@ -60,23 +61,24 @@ def _pick_best_gpu(gpus: Iterable[GpuInfo]) -> Optional[GpuInfo]:
     return best
 
 
-def apply_best_gpu_env(preferred_index: int | None = None) -> Optional[GpuInfo]:
-    """Define variáveis de ambiente para privilegiar a GPU mais forte.
-
-    Se `preferred_index` for informado e existir, ele é priorizado; caso
-    contrário, escolhe a GPU com maior memória. Retorna a GPU escolhida
-    (ou ``None`` se nenhuma foi encontrada).
-    """
-
-    gpus = _parse_nvidia_smi()
-    if not gpus:
-        return None
+def select_gpu(gpus: Iterable[GpuInfo], preferred_index: int | None = None) -> Optional[GpuInfo]:
+    """GPU preferida (se existir) ou a de maior memória."""
 
+    gpus = list(gpus)
     chosen: Optional[GpuInfo] = None
     if preferred_index is not None:
         chosen = next((g for g in gpus if g.index == preferred_index), None)
     if chosen is None:
         chosen = _pick_best_gpu(gpus)
+    return chosen
+
+
+def apply_gpu_env(chosen: Optional[GpuInfo]) -> Optional[GpuInfo]:
+    """Aplica as variáveis de ambiente para a GPU escolhida (nada se ``None``).
+
+    Precisa rodar antes da primeira view/perfil do QWebEngine: o Chromium lê
+    ``QTWEBENGINE_CHROMIUM_FLAGS`` uma única vez, na inicialização.
+    """
 
     if chosen is None:
         return None
@@ -97,3 +99,62 @@ def apply_best_gpu_env(preferred_index: int | None = None) -> Optional[GpuInfo]:
     os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = " ".join(f for f in merged_flags if f)
 
     return chosen
+
+
+def apply_best_gpu_env(preferred_index: int | None = None) -> Optional[GpuInfo]:
+    """Define variáveis de ambiente para privilegiar a GPU mais forte.
+
+    Se `preferred_index` for informado e existir, ele é priorizado; caso
+    contrário, escolhe a GPU com maior memória. Retorna a GPU escolhida
+    (ou ``None`` se nenhuma foi encontrada).
+    """
+
+    return apply_gpu_env(select_gpu(_parse_nvidia_smi(), preferred_index))
+
+
+class GpuProbe:
+    """Consulta o `nvidia-smi` numa thread, em paralelo com os imports da GUI.
+
+    A thread só descobre a GPU; as variáveis de ambiente são aplicadas por
+    :meth:`apply` na thread principal, antes de o QWebEngine inicializar.
+    """
+
+    def __init__(self, preferred_index: int | None = None):
+        self.preferred_index = preferred_index
+        self._result: Optional[GpuInfo] = None
+        self._thread = threading.Thread(target=self._run, name="gpu-probe", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            self._result = select_gpu(_parse_nvidia_smi(), self.preferred_index)
+        except Exception:
+            self._result = None
+
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def apply(self, timeout: float | None = None) -> Optional[GpuInfo]:
+        """Espera a consulta (até ``timeout`` s) e aplica o ambiente da GPU escolhida.
+
+        Se a consulta não terminar a tempo, segue sem aceleração preferencial
+        (retorna ``None``) em vez de atrasar a janela.
+        """
+
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print("AVISO: Consulta de GPU (nvidia-smi) demorou demais; seguindo sem GPU preferencial.")
+            return None
+        return apply_gpu_env(self._result)
+
+
+_probe: Optional[GpuProbe] = None
+
+
+def start_gpu_probe(preferred_index: int | None = None) -> GpuProbe:
+    """Inicia (uma vez por processo) a consulta assíncrona de GPU."""
+
+    global _probe
+    if _probe is None:
+        _probe = GpuProbe(preferred_index)
+    return _probe
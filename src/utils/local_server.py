@@ -2,34 +2,152 @@ import http.server
 import socketserver
 import threading
 import tempfile
-import os
+import shutil
+import re
+
+from src.utils.tile_cache import TileCache
+from src.utils.vendor_assets import VENDOR_ROUTE, vendor_root
+
+
+DATA_ROUTE = "/data/"
+_TILE_ROUTE_RE = re.compile(r"^/tiles/(?P<provider>[A-Za-z0-9_\-]+)/(?P<z>\d+)/(?P<x>\d+)/(?P<y>\d+)(?:\.\w+)?$")
+
+
+class _MapRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serve o diretório temporário, ``/vendor/`` (runtimes web empacotados)
+    e, em ``/tiles/``, o proxy com cache."""
+
+    extensions_map = {
+        **http.server.SimpleHTTPRequestHandler.extensions_map,
+        ".js": "application/javascript",
+        ".mjs": "application/javascript",
+        ".json": "application/json",
+        ".wasm": "application/wasm",
+        ".glb": "model/gltf-binary",
+        ".gltf": "model/gltf+json",
+        ".ktx2": "image/ktx2",
+        ".woff2": "font/woff2",
+        ".woff": "font/woff",
+        ".ttf": "font/ttf",
+    }
+
+    def translate_path(self, path):
+        clean = path.split("?", 1)[0].split("#", 1)[0]
+        if clean.startswith(VENDOR_ROUTE):
+            root = str(vendor_root())
+            # Reaproveita a sanitização do SimpleHTTPRequestHandler trocando a raiz.
+            original = self.directory
+            self.directory = root
+            try:
+                return super().translate_path("/" + clean[len(VENDOR_ROUTE):])
+            finally:
+                self.directory = original
+        return super().translate_path(path)
+
+    def end_headers(self):
+        if self.path.startswith(VENDOR_ROUTE):
+            # Runtimes versionados: nunca revalida durante a sessão.
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+            self.send_header("Access-Control-Allow-Origin", "*")
+        super().end_headers()
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        match = _TILE_ROUTE_RE.match(path)
+        if match:
+            self._serve_tile(match)
+            return
+        if path.startswith(DATA_ROUTE):
+            self._serve_data(path[len(DATA_ROUTE):])
+            return
+        super().do_GET()
+
+    def _serve_data(self, name):
+        published = getattr(self.server, "published_data", {})
+        entry = published.get(name)
+        if entry is None:
+            self.send_error(404, "Dado não publicado")
+            return
+        data, content_type = entry
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _serve_tile(self, match):
+        tile_cache = getattr(self.server, "tile_cache", None)
+        if tile_cache is None:
+            self.send_error(404, "Cache de tiles desativado")
+            return
+        try:
+            data, content_type = tile_cache.get_tile(
+                match.group("provider"),
+                int(match.group("z")),
+                int(match.group("x")),
+                int(match.group("y")),
+            )
+        except Exception as exc:
+            print(f"ERRO: Falha ao servir tile {self.path}: {exc}")
+            data, content_type = None, ""
+        if data is None:
+            self.send_response(404)
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "public, max-age=86400")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Tiles geram centenas de requisições por tela; não polui o console.
+        if self.path.startswith(("/tiles/", VENDOR_ROUTE)):
+            return
+        super().log_message(format, *args)
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
 
 class MapServer:
     """
     Gerencia um servidor HTTP simples em uma thread separada para servir
-    os arquivos HTML do mapa Folium.
+    os arquivos HTML do mapa Folium e, opcionalmente, atuar como proxy de
+    tiles com cache em disco (ver ``src.utils.tile_cache``).
     """
-    def __init__(self, port=8000):
+    def __init__(self, port=8000, tile_cache: TileCache | None = None):
         self.port = port
         self.temp_dir = tempfile.mkdtemp()
         self.httpd = None
         self.server_thread = None
+        self.tile_cache = tile_cache
+        # Dados em memória servidos em /data/<nome> (ex.: trajetória do log ativo)
+        self.published_data = {}
 
     def start(self):
         if self.server_thread and self.server_thread.is_alive():
             print("Servidor já está rodando.")
             return
-            
+
         # Tenta encontrar uma porta livre se a padrão estiver em uso
         while True:
             try:
-                Handler = lambda *args, **kwargs: http.server.SimpleHTTPRequestHandler(*args, directory=self.temp_dir, **kwargs)
-                self.httpd = socketserver.TCPServer(("", self.port), Handler)
+                Handler = lambda *args, **kwargs: _MapRequestHandler(*args, directory=self.temp_dir, **kwargs)
+                self.httpd = _ThreadingServer(("", self.port), Handler)
                 break
             except OSError:
                 print(f"Porta {self.port} em uso. Tentando a próxima...")
                 self.port += 1
 
+        self.httpd.tile_cache = self.tile_cache
+        self.httpd.published_data = self.published_data
         self.server_thread = threading.Thread(target=self.httpd.serve_forever)
         self.server_thread.daemon = True
         self.server_thread.start()
@@ -40,14 +158,31 @@ class MapServer:
             print("Desligando o servidor...")
             self.httpd.shutdown()
             self.httpd.server_close()
+            if self.tile_cache is not None:
+                self.tile_cache.close()
             # Limpa o diretório temporário
-            for filename in os.listdir(self.temp_dir):
-                os.remove(os.path.join(self.temp_dir, filename))
-            os.rmdir(self.temp_dir)
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
             print("Servidor desligado e arquivos temporários limpos.")
 
+    def set_tile_cache(self, tile_cache: TileCache | None):
+        self.tile_cache = tile_cache
+        if self.httpd is not None:
+            self.httpd.tile_cache = tile_cache
+
+    def publish_data(self, name: str, data: bytes, content_type: str = "application/json") -> str:
+        """Publica ``data`` em memória e devolve o caminho relativo ``/data/<nome>``."""
+        self.published_data[name] = (data, content_type)
+        return f"{DATA_ROUTE}{name}"
+
+    def unpublish_data(self, name: str) -> None:
+        self.published_data.pop(name, None)
+
+    def tile_url_template(self, provider: str) -> str:
+        """URL local ``{z}/{x}/{y}`` usada pelo Leaflet e pelo Cesium."""
+        return f"http://127.0.0.1:{self.port}/tiles/{provider}/{{z}}/{{x}}/{{y}}"
+
     def get_temp_dir(self):
         return self.temp_dir
-    
+
     def get_port(self):
-        return self.port
\ No newline at end of file
+        return self.port
@@ -0,0 +1,233 @@
+"""Artefatos de visualização por log, preparados fora da thread da GUI.
+
+Trocar de log no seletor disparava, na thread da GUI, todo o trabalho de
+pandas/numpy (segmentos de modo, pacote da trajetória para mapa/Cesium,
+índices das séries plotadas, estatísticas do voo, eventos...). Este módulo concentra esse trabalho "só de
+dados" em :func:`prepare_log_artifacts`, que roda num pool de threads via
+:class:`ArtifactPreparationWorker`; o resultado fica em :class:`ArtifactCache`
+e a GUI apenas anexa os arrays prontos aos widgets.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.utils.event_index import EventIndex, TimeLookup, build_event_index
+from src.utils.flight_stats import FlightStats, compute_flight_stats
+from src.utils.geodesy import GeoSeries, geo_series
+from src.utils.mode_utils import ModeSegment, compute_mode_segments, epoch_seconds_array
+from src.utils.track_payload import (
+    altitude_reference,
+    build_track_payload,
+    encode_payload,
+    summarize_payload,
+)
+
+
+@dataclass
+class LogArtifacts:
+    log_name: str
+    row_count: int
+    epoch_s: np.ndarray
+    mode_segments: List[ModeSegment]
+    numeric_columns: List[str]
+    # coluna -> índices das amostras válidas (None = todas válidas)
+    plot_index: Dict[str, Optional[np.ndarray]]
+    track_payload: Dict
+    track_payload_bytes: bytes
+    cesium_state: Optional[Dict]
+    altitude_reference: float
+    geo: Optional[GeoSeries] = None
+    stats: Optional[FlightStats] = None
+    events: Optional[EventIndex] = None
+    # Busca binária instante -> linha (saltos para eventos, horário digitado)
+    time_lookup: Optional[TimeLookup] = None
+    prepare_ms: float = 0.0
+    _source: Optional[weakref.ref] = field(default=None, repr=False)
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """True se os artefatos foram gerados a partir deste mesmo DataFrame."""
+        return self._source is not None and self._source() is df
+
+    def has_data(self, column: str) -> bool:
+        return column in self.plot_index
+
+    def series(self, df: pd.DataFrame, column: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(x em segundos epoch, y) só com amostras válidas, pronto para plotar."""
+        if column not in self.plot_index or column not in df.columns:
+            return None
+        values = _column_values(df, column)
+        idx = self.plot_index[column]
+        if idx is None:
+            return self.epoch_s, values
+        return self.epoch_s[idx], values[idx]
+
+
+def _column_values(df: pd.DataFrame, column: str) -> np.ndarray:
+    series = df[column]
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=float, na_value=np.nan)
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+
+
+def build_plot_index(df: pd.DataFrame, epoch_s: np.ndarray, columns: Iterable[str]) -> Dict[str, Optional[np.ndarray]]:
+    """Índices válidos (timestamp e valor não nulos) por coluna; colunas vazias ficam de fora."""
+
+    ts_valid = ~np.isnan(epoch_s)
+    all_ts_valid = bool(ts_valid.all())
+    index: Dict[str, Optional[np.ndarray]] = {}
+    for col in columns:
+        if col not in df.columns:
+            continue
+        try:
+            values = _column_values(df, col)
+        except Exception:
+            continue
+        valid = ~np.isnan(values)
+        if all_ts_valid and valid.all():
+            index[col] = None
+            continue
+        valid &= ts_valid
+        if valid.any():
+            index[col] = np.flatnonzero(valid).astype(np.int32)
+    return index
+
+
+def prepare_log_artifacts(log_name: str, df: pd.DataFrame, source_path: Optional[str] = None) -> LogArtifacts:
+    """Calcula todos os artefatos "só de dados" de um log (seguro fora da GUI).
+
+    ``source_path`` é o arquivo de origem do log; a pasta dele é onde se
+    procura o ``EmbeddedError.log`` para a linha do tempo de eventos.
+    """
+
+    started = time.perf_counter()
+    if df is None or df.empty:
+        epoch_s = np.empty(0, dtype=float)
+    elif 'Timestamp' in df.columns:
+        epoch_s = epoch_seconds_array(df['Timestamp'])
+    else:
+        epoch_s = np.full(len(df), np.nan)
+
+    segments = compute_mode_segments(df) if df is not None and not df.empty else []
+    alt_ref = altitude_reference(df) if df is not None and not df.empty else 0.0
+    payload = build_track_payload(df, altitude_ref=alt_ref, segments=segments)
+    # Aquece o memo geodésico do log (gráfico de posição, estatísticas)
+    geo = geo_series(df) if df is not None and not df.empty else None
+    stats = compute_flight_stats(df, segments=segments, geo=geo) if df is not None and not df.empty else None
+    time_lookup = TimeLookup(epoch_s)
+    events = (
+        build_event_index(df, source_path, segments=segments, lookup=time_lookup)
+        if df is not None and not df.empty else EventIndex()
+    )
+
+    numeric_columns: List[str] = []
+    if df is not None and not df.empty:
+        numeric_columns = [
+            c for c in df.select_dtypes(include=np.number).columns
+            if 'Timestamp' not in str(c)
+        ]
+    plot_index = build_plot_index(df, epoch_s, numeric_columns) if numeric_columns else {}
+
+    artifacts = LogArtifacts(
+        log_name=log_name,
+        row_count=0 if df is None else len(df),
+        epoch_s=epoch_s,
+        mode_segments=segments,
+        numeric_columns=numeric_columns,
+        plot_index=plot_index,
+        track_payload=payload,
+        track_payload_bytes=encode_payload(payload),
+        cesium_state=summarize_payload(payload),
+        altitude_reference=alt_ref,
+        geo=geo,
+        stats=stats,
+        events=events,
+        time_lookup=time_lookup,
+        _source=weakref.ref(df) if df is not None else None,
+    )
+    artifacts.prepare_ms = (time.perf_counter() - started) * 1000.0
+    return artifacts
+
+
+class ArtifactCache:
+    """Cache por nome de log, validado pela identidade do DataFrame de origem."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: Dict[str, LogArtifacts] = {}
+
+    def get(self, log_name: str, df: Optional[pd.DataFrame] = None) -> Optional[LogArtifacts]:
+        with self._lock:
+            artifacts = self._items.get(log_name)
+        if artifacts is None:
+            return None
+        if df is not None and not artifacts.matches(df):
+            return None
+        return artifacts
+
+    def put(self, artifacts: LogArtifacts) -> None:
+        with self._lock:
+            self._items[artifacts.log_name] = artifacts
+
+    def discard(self, log_name: str) -> None:
+        with self._lock:
+            self._items.pop(log_name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __contains__(self, log_name: str) -> bool:
+        with self._lock:
+            return log_name in self._items
+
+
+class ArtifactPreparationWorker(QObject):
+    """Prepara artefatos de vários logs num pool de threads (padrão moveToThread).
+
+    Os logs são submetidos na ordem recebida, então o log ativo deve vir
+    primeiro; cada resultado é emitido assim que fica pronto. Cada job é
+    ``(nome, df)`` ou ``(nome, df, arquivo de origem)``.
+    """
+
+    prepared = pyqtSignal(str, object)
+    error = pyqtSignal(str, str)
+    finished = pyqtSignal()
+
+    def __init__(self, jobs: Sequence[Tuple], *, max_workers: int = 2):
+        super().__init__()
+        self.jobs = list(jobs)
+        self.max_workers = max(1, int(max_workers))
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="log-artifacts")
+        try:
+            futures = {
+                pool.submit(prepare_log_artifacts, *job): job[0]
+                for job in self.jobs
+            }
+            for future in as_completed(futures):
+                if self._cancel.is_set():
+                    break
+                name = futures[future]
+                try:
+                    artifacts = future.result()
+                except Exception as exc:
+                    self.error.emit(name, str(exc))
+                    continue
+                self.prepared.emit(name, artifacts)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            self.finished.emit()
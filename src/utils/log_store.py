@@ -0,0 +1,343 @@
+"""Conjunto de logs carregados com teto de memória RAM.
+
+``TelemetryApp.log_data`` era um ``dict`` com todos os DataFrames residentes
+durante a sessão; abrir uma raiz grande levava o app para o swap. O
+:class:`LogStore` tem a mesma interface de mapeamento (``store[nome]``,
+``in``, ``keys()``...), mas mede o uso de memória de cada log e, quando o
+total passa de ``log_store.memory_budget_mb``, grava em disco os logs vistos
+há mais tempo (LRU) e os tira da RAM. Pedir um log que está em disco o
+recarrega de forma transparente (e pode tirar outro da RAM).
+
+O formato em disco é o pickle (protocolo 5) do próprio DataFrame (tipos e
+``attrs`` preservados exatamente) passado por gzip no nível
+``log_store.spill_compress_level`` (1 por padrão: ~175 MB/s e arquivos bem
+menores que a RAM do log, já que flags e contadores se repetem muito; 0 grava
+sem compressão). Os arquivos ficam numa pasta por sessão no AppData
+(``LogSpill``) apagada ao limpar o conjunto.
+
+Trabalhos em segundo plano (estatísticas, relatórios) usam
+:meth:`LogStore.transient_view`: os logs em disco são lidos só para aquele
+trabalho, sem entrar no LRU nem tirar da RAM o log que está sendo visto.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, List, NamedTuple, Optional
+
+import pandas as pd
+
+from src.utils.resource_paths import get_appdata_dir
+
+DEFAULT_BUDGET_MB = 2048
+DEFAULT_SPILL_COMPRESS_LEVEL = 1
+SPILL_DIRNAME = "LogSpill"
+# Pastas de sessões antigas (app fechado sem limpar) são removidas depois disso
+STALE_SPILL_AGE_S = 24 * 3600
+
+
+@dataclass(frozen=True)
+class LogStoreSettings:
+    enabled: bool = True
+    budget_bytes: int = DEFAULT_BUDGET_MB * 1024 * 1024
+    spill_compress_level: int = DEFAULT_SPILL_COMPRESS_LEVEL
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]) -> "LogStoreSettings":
+        cfg = cfg or {}
+        return cls(
+            enabled=bool(cfg.get("enabled", True)),
+            budget_bytes=int(float(cfg.get("memory_budget_mb", DEFAULT_BUDGET_MB)) * 1024 * 1024),
+            spill_compress_level=min(9, max(0, int(cfg.get("spill_compress_level", DEFAULT_SPILL_COMPRESS_LEVEL)))),
+        )
+
+
+def log_store_settings() -> LogStoreSettings:
+    from src.utils.config_manager import load_config
+
+    try:
+        return LogStoreSettings.from_config(load_config().get("log_store", {}))
+    except Exception as exc:
+        print(f"AVISO: Configuração 'log_store' inválida ({exc}); usando padrões.")
+        return LogStoreSettings()
+
+
+def frame_memory_bytes(df: pd.DataFrame) -> int:
+    """Memória do DataFrame (inclui as strings de colunas ``object``)."""
+    try:
+        return int(df.memory_usage(index=True, deep=True).sum())
+    except Exception:
+        return 0
+
+
+def format_bytes(value: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if abs(value) < 1024.0:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024.0
+    return f"{value:.2f} GB"
+
+
+class LogUsage(NamedTuple):
+    name: str
+    # Memória do DataFrame quando residente (medida no carregamento)
+    memory_bytes: int
+    resident: bool
+    # Tamanho do arquivo em disco (0 se o log nunca saiu da RAM)
+    disk_bytes: int
+
+
+@dataclass
+class _Entry:
+    memory_bytes: int
+    df: Optional[pd.DataFrame] = None
+    spill_path: Optional[Path] = None
+    disk_bytes: int = 0
+
+
+def _read_spill_file(path: Path) -> pd.DataFrame:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as fh:
+        return pickle.load(fh)
+
+
+def _clean_stale_sessions(root: Path) -> None:
+    now = time.time()
+    try:
+        children = list(root.iterdir())
+    except OSError:
+        return
+    for child in children:
+        try:
+            if child.is_dir() and now - child.stat().st_mtime > STALE_SPILL_AGE_S:
+                shutil.rmtree(child, ignore_errors=True)
+        except OSError:
+            pass
+
+
+class LogStore(MutableMapping):
+    """Mapeamento nome -> DataFrame com teto de RAM e despejo LRU para o disco.
+
+    ``budget_bytes <= 0`` desliga o despejo (comporta-se como um ``dict``).
+    O log acessado por último e o log ativo (:meth:`set_active`, o que está
+    na tela) nunca saem da RAM, mesmo que sozinhos passem do teto.
+    """
+
+    def __init__(self, budget_bytes: Optional[int] = None, spill_root: Optional[Path | str] = None,
+                 compress_level: Optional[int] = None):
+        if budget_bytes is None or compress_level is None:
+            settings = log_store_settings()
+            if budget_bytes is None:
+                budget_bytes = settings.budget_bytes if settings.enabled else 0
+            if compress_level is None:
+                compress_level = settings.spill_compress_level
+        self.budget_bytes = int(budget_bytes)
+        self.compress_level = int(compress_level)
+        self._spill_root = Path(spill_root) if spill_root is not None else None
+        self._session_dir: Optional[Path] = None
+        self._lock = threading.RLock()
+        # Ordem = uso (o último é o mais recente)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._evict_listeners: List[Callable[[str], None]] = []
+        self._active: Optional[str] = None
+        self.spill_count = 0
+        self.reload_count = 0
+
+    # ----------------------------------------------------------- mapeamento
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        with self._lock:
+            entry = self._entries[name]
+            self._entries.move_to_end(name)
+            if entry.df is None:
+                started = time.perf_counter()
+                entry.df = self._read_spill(entry)
+                self.reload_count += 1
+                print(f"INFO: Log '{name}' recarregado do disco em "
+                      f"{(time.perf_counter() - started) * 1000.0:.0f} ms")
+                self._enforce_budget(keep=name)
+            return entry.df
+
+    def __setitem__(self, name: str, df: pd.DataFrame) -> None:
+        with self._lock:
+            old = self._entries.pop(name, None)
+            if old is not None:
+                self._remove_spill(old)
+            self._entries[name] = _Entry(memory_bytes=frame_memory_bytes(df), df=df)
+            self._enforce_budget(keep=name)
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(name)
+            self._remove_spill(entry)
+            if self._active == name:
+                self._active = None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, name) -> bool:
+        with self._lock:
+            return name in self._entries
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def clear(self) -> None:
+        """Remove todos os logs e apaga a pasta de despejo da sessão."""
+        with self._lock:
+            self._entries.clear()
+            self._active = None
+            if self._session_dir is not None:
+                shutil.rmtree(self._session_dir, ignore_errors=True)
+                self._session_dir = None
+
+    def set_active(self, name: Optional[str]) -> Optional[pd.DataFrame]:
+        """Marca o log em uso pela janela (não sai da RAM); devolve o DataFrame dele."""
+        with self._lock:
+            self._active = name if name in self._entries else None
+            return self[name] if self._active is not None else None
+
+    # ----------------------------------------------------------- consultas
+    def is_resident(self, name: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(name)
+            return entry is not None and entry.df is not None
+
+    def peek(self, name: str) -> Optional[pd.DataFrame]:
+        """O DataFrame se estiver na RAM (sem mexer no LRU nem ler do disco)."""
+        with self._lock:
+            entry = self._entries.get(name)
+            return entry.df if entry is not None else None
+
+    def load_transient(self, name: str) -> pd.DataFrame:
+        """O log para uso pontual: residente ou lido do disco sem voltar para a RAM do conjunto."""
+        with self._lock:
+            entry = self._entries[name]
+            if entry.df is not None:
+                return entry.df
+            spill_path = entry.spill_path
+        return _read_spill_file(spill_path)
+
+    def transient_view(self) -> "TransientLogView":
+        """Mapeamento com os nomes atuais que lê cada log via :meth:`load_transient`."""
+        return TransientLogView(self)
+
+    def usage(self) -> List[LogUsage]:
+        """Uso de memória por log, do mais recente para o mais antigo."""
+        with self._lock:
+            return [
+                LogUsage(name, entry.memory_bytes, entry.df is not None, entry.disk_bytes)
+                for name, entry in reversed(self._entries.items())
+            ]
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.memory_bytes for entry in self._entries.values() if entry.df is not None)
+
+    def spilled_names(self) -> List[str]:
+        with self._lock:
+            return [name for name, entry in self._entries.items() if entry.df is None]
+
+    def add_evict_listener(self, callback: Callable[[str], None]) -> None:
+        """``callback(nome)`` após um log sair da RAM (pode rodar fora da thread da GUI)."""
+        self._evict_listeners.append(callback)
+
+    # ----------------------------------------------------------- despejo
+    def _session(self) -> Path:
+        if self._session_dir is None:
+            root = self._spill_root or get_appdata_dir(SPILL_DIRNAME, create=True)
+            root.mkdir(parents=True, exist_ok=True)
+            _clean_stale_sessions(root)
+            self._session_dir = Path(tempfile.mkdtemp(prefix="session-", dir=root))
+        return self._session_dir
+
+    def _enforce_budget(self, keep: str) -> None:
+        if self.budget_bytes <= 0:
+            return
+        total = self.resident_bytes()
+        for name in list(self._entries):
+            if total <= self.budget_bytes:
+                break
+            entry = self._entries[name]
+            if name == keep or name == self._active or entry.df is None:
+                continue
+            try:
+                self._spill(name, entry)
+            except Exception as exc:
+                print(f"AVISO: Não foi possível gravar '{name}' em disco ({exc}); mantendo na memória.")
+                continue
+            total -= entry.memory_bytes
+            for callback in list(self._evict_listeners):
+                try:
+                    callback(name)
+                except Exception as exc:
+                    print(f"AVISO: Falha ao avisar a saída de '{name}' da memória: {exc}")
+
+    def _spill(self, name: str, entry: _Entry) -> None:
+        if entry.spill_path is None or not entry.spill_path.exists():
+            started = time.perf_counter()
+            key = hashlib.sha1(name.encode("utf-8")).hexdigest()[:16]
+            path = self._session() / (f"{key}.pkl.gz" if self.compress_level > 0 else f"{key}.pkl")
+            tmp = path.with_name(f"{key}.tmp")
+            if self.compress_level > 0:
+                with gzip.open(tmp, "wb", compresslevel=self.compress_level) as fh:
+                    pickle.dump(entry.df, fh, protocol=5)
+            else:
+                with open(tmp, "wb") as fh:
+                    pickle.dump(entry.df, fh, protocol=5)
+            os.replace(tmp, path)
+            entry.spill_path = path
+            entry.disk_bytes = path.stat().st_size
+            print(f"INFO: Log '{name}' gravado em disco ({format_bytes(entry.disk_bytes)}) em "
+                  f"{(time.perf_counter() - started) * 1000.0:.0f} ms para liberar "
+                  f"{format_bytes(entry.memory_bytes)} de RAM")
+        # Os logs não mudam depois de carregados: um arquivo já gravado continua válido
+        entry.df = None
+        self.spill_count += 1
+
+    def _read_spill(self, entry: _Entry) -> pd.DataFrame:
+        return _read_spill_file(entry.spill_path)
+
+    def _remove_spill(self, entry: _Entry) -> None:
+        if entry.spill_path is not None:
+            try:
+                entry.spill_path.unlink()
+            except OSError:
+                pass
+
+
+class TransientLogView(Mapping):
+    """Visão somente leitura de um :class:`LogStore` para trabalhos em segundo plano."""
+
+    def __init__(self, store: LogStore):
+        self._store = store
+        self._names = list(store)
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        if name not in self._names:
+            raise KeyError(name)
+        return self._store.load_transient(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name) -> bool:
+        return name in self._names
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 
+from src.utils.frame_memo import FrameMemo
+
 
 @dataclass
 class ModeSegment:
@@ -15,106 +17,152 @@ class ModeSegment:
     mode_value: int
 
 
+FW_MODE_PALETTE: Dict[int, Tuple[str, Tuple[int, int, int]]] = {
+    -1: ("RC Mode", (96, 125, 139)),
+    0: ("Subir (RTL)", (3, 155, 229)),
+    1: ("Manual (FW150)", (33, 150, 243)),
+    2: ("SEMI", (0, 188, 212)),
+    3: ("Survey", (76, 175, 80)),
+    4: ("Tracking", (255, 202, 40)),
+    5: ("Orbit", (255, 112, 67)),
+    8: ("Landing", (244, 67, 54)),
+    9: ("TakeOff", (141, 110, 99)),
+}
+RW_MODE_PALETTE: Dict[int, Tuple[str, Tuple[int, int, int]]] = {
+    0: ("Stabilize", (3, 169, 244)),
+    1: ("IDLE", (120, 144, 156)),
+    2: ("AUTO", (76, 175, 80)),
+    3: ("Forced Land", (244, 67, 54)),
+}
+
+
 def _resolve_mode_palette(df: pd.DataFrame) -> Dict[int, Tuple[str, Tuple[int, int, int]]]:
-    fw_modes = {
-        -1: ("RC Mode", (96, 125, 139)),
-        0: ("Subir (RTL)", (3, 155, 229)),
-        1: ("Manual (FW150)", (33, 150, 243)),
-        2: ("SEMI", (0, 188, 212)),
-        3: ("Survey", (76, 175, 80)),
-        4: ("Tracking", (255, 202, 40)),
-        5: ("Orbit", (255, 112, 67)),
-        8: ("Landing", (244, 67, 54)),
-        9: ("TakeOff", (141, 110, 99)),
-    }
-    rw_modes = {
-        0: ("Stabilize", (3, 169, 244)),
-        1: ("IDLE", (120, 144, 156)),
-        2: ("AUTO", (76, 175, 80)),
-        3: ("Forced Land", (244, 67, 54)),
-    }
     is_rw = False
     if 'isVTOL' in df.columns:
         try:
             is_rw = bool(df['isVTOL'].dropna().astype(float).mean() >= 0.5)
         except Exception:
             is_rw = False
-    return rw_modes if is_rw else fw_modes
+    return RW_MODE_PALETTE if is_rw else FW_MODE_PALETTE
 
 
-def compute_mode_segments(df: pd.DataFrame, *, timestamp_column: str = 'Timestamp', mode_column: str = 'ModoVoo') -> List[ModeSegment]:
-    if timestamp_column not in df.columns or mode_column not in df.columns or df.empty:
-        return []
+def mode_labels(df: pd.DataFrame) -> Dict[int, str]:
+    """Valor de ``ModoVoo`` -> nome do modo (paleta FW ou VTOL conforme o log)."""
+    return {value: label for value, (label, _color) in _resolve_mode_palette(df).items()}
 
-    try:
-        ts_series = df[timestamp_column].map(_to_epoch_seconds)
-        mode_data = pd.DataFrame({
-            '_ts_': ts_series,
-            'mode': df[mode_column]
-        }).dropna().sort_values('_ts_')
-    except Exception:
-        return []
 
-    if mode_data.empty:
-        return []
+def epoch_seconds_array(series: pd.Series) -> np.ndarray:
+    """Converte timestamps (datetime ou numéricos em segundos) para segundos epoch.
 
-    palette = _resolve_mode_palette(df)
-    segments: List[ModeSegment] = []
+    Versão vetorizada de ``_to_epoch_seconds``; valores inválidos viram NaN.
+    """
+    if series is None or len(series) == 0:
+        return np.empty(0, dtype=float)
+    if pd.api.types.is_numeric_dtype(series):
+        return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+    ts = pd.to_datetime(series, errors='coerce')
+    if getattr(ts.dt, 'tz', None) is not None:
+        ts = ts.dt.tz_convert(None)
+    values = ts.to_numpy(dtype='datetime64[ns]')
+    out = values.astype(np.int64).astype(float) / 1e9
+    out[np.isnat(values)] = np.nan
+    return out
+
+
+# Memo por log: os segmentos de um DataFrame são calculados uma única vez
+_MEMO = FrameMemo()
 
-    ts_values = mode_data['_ts_'].to_numpy(dtype=float)
-    mode_values = mode_data['mode'].to_numpy(dtype=int)
 
-    current_mode = mode_values[0]
-    start_ts = ts_values[0]
+def clear_mode_cache(df: Optional[pd.DataFrame] = None) -> None:
+    """Descarta os segmentos memorizados (de um DataFrame ou de todos)."""
+    _MEMO.clear(df)
 
-    def _append_segment(seg_start: float, seg_end: float, mode_value: int):
-        if seg_end <= seg_start:
-            return
-        label, color = palette.get(mode_value, (f"Modo {mode_value}", (160, 160, 160)))
-        segments.append(ModeSegment(seg_start, seg_end, label, color, int(mode_value)))
 
-    for idx in range(1, len(ts_values)):
-        ts = ts_values[idx]
-        mode_val = mode_values[idx]
-        if mode_val != current_mode:
-            _append_segment(start_ts, ts, current_mode)
-            start_ts = ts
-            current_mode = mode_val
+def _mode_runs(df: pd.DataFrame, timestamp_column: str, mode_column: str):
+    """Amostras válidas ordenadas por tempo e os limites de cada run de modo (RLE)."""
+    ts = epoch_seconds_array(df[timestamp_column])
+    modes = pd.to_numeric(df[mode_column], errors='coerce').to_numpy(dtype=float)
+    valid = ~np.isnan(ts) & ~np.isnan(modes)
+    ts = ts[valid]
+    modes = modes[valid]
+    if ts.size == 0:
+        return ts, modes.astype(int), np.empty(0, dtype=np.intp)
+    if ts.size > 1 and np.any(ts[1:] < ts[:-1]):
+        order = np.argsort(ts, kind='stable')
+        ts = ts[order]
+        modes = modes[order]
+    modes = modes.astype(int)
+    changes = np.flatnonzero(modes[1:] != modes[:-1]) + 1
+    return ts, modes, changes
 
-    last_ts = float(np.nanmax(ts_values)) if len(ts_values) else start_ts
-    _append_segment(start_ts, last_ts, current_mode)
+
+def compute_mode_segments(df: pd.DataFrame, *, timestamp_column: str = 'Timestamp', mode_column: str = 'ModoVoo') -> List[ModeSegment]:
+    if df is None or timestamp_column not in df.columns or mode_column not in df.columns or df.empty:
+        return []
+
+    memo = _MEMO.store_for(df)
+    memo_key = ('segments', timestamp_column, mode_column, len(df))
+    cached = memo.get(memo_key)
+    if cached is not None:
+        return list(cached)
+
+    try:
+        ts, modes, changes = _mode_runs(df, timestamp_column, mode_column)
+    except Exception:
+        return []
+
+    segments: List[ModeSegment] = []
+    if ts.size:
+        palette = _resolve_mode_palette(df)
+        starts = np.concatenate(([0], changes))
+        seg_start = ts[starts]
+        # Cada run termina no início do próximo; o último vai até o fim do log
+        seg_end = np.concatenate((ts[changes], [ts[-1]]))
+        seg_mode = modes[starts]
+        for start, end, mode_value in zip(seg_start.tolist(), seg_end.tolist(), seg_mode.tolist()):
+            if end <= start:
+                continue
+            label, color = palette.get(mode_value, (f"Modo {mode_value}", (160, 160, 160)))
+            segments.append(ModeSegment(start, end, label, color, int(mode_value)))
+
+    memo[memo_key] = tuple(segments)
     return segments
 
 
 def build_mode_path_segments(df: pd.DataFrame, segments: Iterable[ModeSegment], *, lat_col: str = 'Latitude', lon_col: str = 'Longitude', alt_col: str | None = 'AltitudeAbs') -> List[dict]:
     if df.empty or lat_col not in df.columns or lon_col not in df.columns:
         return []
-    ts_series = df['Timestamp'].map(_to_epoch_seconds) if 'Timestamp' in df.columns else pd.Series(dtype=float)
-    lat = df[lat_col]
-    lon = df[lon_col]
-    alt = df[alt_col] if alt_col and alt_col in df.columns else None
+    ts = epoch_seconds_array(df['Timestamp']) if 'Timestamp' in df.columns else np.full(len(df), np.nan)
+    lat = pd.to_numeric(df[lat_col], errors='coerce').to_numpy(dtype=float)
+    lon = pd.to_numeric(df[lon_col], errors='coerce').to_numpy(dtype=float)
+    alt = pd.to_numeric(df[alt_col], errors='coerce').to_numpy(dtype=float) if alt_col and alt_col in df.columns else None
+
+    finite_ts = ~np.isnan(ts)
+    monotonic = bool(finite_ts.all()) and (ts.size < 2 or not np.any(ts[1:] < ts[:-1]))
+    gps_valid = ~np.isnan(lat) & ~np.isnan(lon)
 
     results: List[dict] = []
     for seg in segments:
-        mask = (ts_series >= seg.start) & (ts_series <= seg.end)
-        seg_lat = lat[mask].dropna()
-        seg_lon = lon[mask].dropna()
-        if seg_lat.empty or seg_lon.empty:
+        if monotonic:
+            # Fatia contígua via busca binária em vez de máscara sobre o log inteiro
+            lo = int(np.searchsorted(ts, seg.start, side='left'))
+            hi = int(np.searchsorted(ts, seg.end, side='right'))
+            idx = lo + np.flatnonzero(gps_valid[lo:hi])
+        else:
+            idx = np.flatnonzero(finite_ts & (ts >= seg.start) & (ts <= seg.end) & gps_valid)
+        if idx.size == 0:
             continue
-        coords = list(zip(seg_lat.to_numpy(dtype=float), seg_lon.to_numpy(dtype=float)))
+        seg_lat = lat[idx].tolist()
+        seg_lon = lon[idx].tolist()
         if alt is not None:
-            seg_alt = alt[mask].reindex(seg_lat.index)
-            coords_with_alt = [
-                (lat_v, lon_v, float(a)) if pd.notna(a) else (lat_v, lon_v, None)
-                for (lat_v, lon_v), a in zip(coords, seg_alt)
-            ]
+            seg_alt = [None if np.isnan(a) else a for a in alt[idx].tolist()]
         else:
-            coords_with_alt = [(lat_v, lon_v, None) for lat_v, lon_v in coords]
+            seg_alt = [None] * idx.size
         results.append({
             'mode': seg.mode_value,
             'label': seg.label,
             'color': seg.color,
-            'points': coords_with_alt,
+            'points': list(zip(seg_lat, seg_lon, seg_alt)),
         })
     return results
 
@@ -1,89 +1,262 @@
+"""Relatório PDF do log ativo.
+
+:class:`ReportRenderWorker` prepara os dados e gera as imagens fora da GUI
+(gráficos em matplotlib Agg num pool de processos, mapas a partir do cache
+de tiles, ver :mod:`src.utils.report_renderer`); :class:`PdfReportWorker`
+apenas monta as páginas com as imagens prontas.
+"""
 import io
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 from PyQt6.QtCore import QObject, pyqtSignal
-from PyQt6.QtGui import QPixmap
 
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.units import inch
 from reportlab.lib.utils import ImageReader
 
+from src.utils.derived_series import (
+    ATTITUDE_VARIANCE_SERIES,
+    DEFAULT_DERIVED_WINDOWS,
+    WIND_VARIABILITY_SERIES,
+    DerivedSeriesCache,
+)
+from src.utils.geodesy import geo_series
+from src.utils.report_renderer import (
+    DEFAULT_MAP_SIZE,
+    DEFAULT_MAP_ZOOMS,
+    PlotJob,
+    ReportImages,
+    decimated,
+    render_report_images,
+)
+
+_WIND_SERIES_NAMES = {
+    ('wind:WSI', 'var'): 'wsi_var',
+    ('wind:WSI', 'std'): 'wsi_std',
+    ('wind:WindDirection', 'circ_var'): 'dir_var',
+    ('wind:WindDirection', 'circ_std'): 'dir_std',
+}
+
+
+def _has_data(df: pd.DataFrame, column: str) -> bool:
+    return column in df.columns and bool(df[column].notna().any())
+
+
+def _valid_rows(df: pd.DataFrame, columns) -> np.ndarray:
+    return np.flatnonzero(df[list(columns)].notna().all(axis=1).to_numpy())
+
+
+def _values(df: pd.DataFrame, column: str, rows: np.ndarray) -> np.ndarray:
+    return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)[rows]
+
+
+def collect_plot_jobs(df: pd.DataFrame, log_name: str, derived_cache: Optional[DerivedSeriesCache] = None,
+                      windows: Optional[Dict[str, int]] = None) -> List[PlotJob]:
+    """Extrai (e decima) as séries dos gráficos padrão para desenho headless.
+
+    Usa o mesmo cache de séries derivadas e a mesma geodésia memorizada dos
+    gráficos da tela, então um relatório logo após abrir os gráficos não
+    recalcula nada.
+    """
+    if df is None or df.empty or 'Timestamp' not in df.columns:
+        return []
+    cache = derived_cache if derived_cache is not None else DerivedSeriesCache()
+    windows = {**DEFAULT_DERIVED_WINDOWS, **(windows or {})}
+    ts = df['Timestamp'].to_numpy()
+    jobs: List[PlotJob] = []
+
+    position_cols = ["Latitude", "Longitude", "AltitudeAbs"]
+    if all(c in df.columns for c in position_cols):
+        rows = _valid_rows(df, position_cols)
+        geo = geo_series(df)
+        if rows.size and geo is not None:
+            alt = _values(df, "AltitudeAbs", rows)
+            jobs.append(PlotJob('position', f"Dist. da Posição Inicial ({log_name})", {
+                'distance': decimated(ts[rows], geo.distance_from_origin[rows]),
+                'altitude': decimated(ts[rows], alt - alt[0]),
+            }))
+
+    has_wind = _has_data(df, 'WSI') and _has_data(df, 'WindDirection')
+    has_path = _has_data(df, 'Path_angle')
+    if has_wind or has_path:
+        series, rows_kind = {}, []
+        if has_wind:
+            _idx, wind_ts = cache.frame(log_name, df, 'wind')
+            bundle = cache.compute_bundle(log_name, df, WIND_VARIABILITY_SERIES, windows['wind'])
+            for spec, name in _WIND_SERIES_NAMES.items():
+                series[name] = decimated(wind_ts, bundle[spec])
+            rows_kind += ['speed', 'direction']
+        if has_path:
+            rows = _valid_rows(df, ['Path_angle'])
+            series['Path_angle'] = decimated(ts[rows], _values(df, 'Path_angle', rows))
+            rows_kind.append('path')
+        jobs.append(PlotJob('wind', f"Variabilidade do Vento ({log_name})", series,
+                            {'window': windows['wind'], 'rows': tuple(rows_kind)}))
+
+    rpy_cols = ["Roll", "Pitch", "Yaw"]
+    if all(c in df.columns for c in rpy_cols):
+        rows = _valid_rows(df, rpy_cols)
+        if rows.size:
+            series = {c: decimated(ts[rows], _values(df, c, rows)) for c in rpy_cols}
+            for extra in ('AltitudeAbs', 'isVTOL'):
+                if _has_data(df, extra):
+                    series[extra] = decimated(ts[rows], _values(df, extra, rows))
+            jobs.append(PlotJob('rpy', f"RPY e Altitude ({log_name})", series))
+
+    if all(c in df.columns for c in rpy_cols + ["AltitudeAbs"]):
+        _idx, att_ts = cache.frame(log_name, df, 'attitude')
+        if len(att_ts):
+            bundle = cache.compute_bundle(log_name, df, ATTITUDE_VARIANCE_SERIES, windows['variance'])
+            series = {spec[0].split(':', 1)[1]: decimated(att_ts, values) for spec, values in bundle.items()}
+            jobs.append(PlotJob('variance', f"Variância RPY e Alt ({log_name})", series))
+
+    if _has_data(df, 'Voltage'):
+        rows = _valid_rows(df, ['Voltage'])
+        jobs.append(PlotJob('voltage', f"Tensão da Bateria ({log_name})", {
+            'Voltage': decimated(ts[rows], _values(df, 'Voltage', rows)),
+        }))
+    return jobs
+
+
+def track_coordinates(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitudes/longitudes válidas (sem zeros de GNSS sem fix) para os mapas."""
+    if df is None or 'Latitude' not in df.columns or 'Longitude' not in df.columns:
+        return np.empty(0), np.empty(0)
+    lats = pd.to_numeric(df['Latitude'], errors='coerce').to_numpy(dtype=float)
+    lons = pd.to_numeric(df['Longitude'], errors='coerce').to_numpy(dtype=float)
+    valid = np.isfinite(lats) & np.isfinite(lons) & ~((lats == 0) & (lons == 0))
+    return lats[valid], lons[valid]
+
+
+class ReportRenderWorker(QObject):
+    """Gera as imagens do relatório fora da GUI (padrão moveToThread)."""
+
+    progress = pyqtSignal(str)
+    finished = pyqtSignal(object)  # ReportImages
+    error = pyqtSignal(str)
+
+    def __init__(self, df, log_name, tile_cache=None, derived_cache=None, windows=None, report_cfg=None,
+                 executor=None):
+        super().__init__()
+        self.df = df
+        self.log_name = log_name
+        self.tile_cache = tile_cache
+        self.derived_cache = derived_cache
+        self.windows = windows
+        self.report_cfg = dict(report_cfg or {})
+        self.executor = executor
+
+    def run(self):
+        try:
+            cfg = self.report_cfg
+            self.progress.emit("Preparando dados do relatório...")
+            jobs = collect_plot_jobs(self.df, self.log_name, self.derived_cache, self.windows)
+            lats, lons = track_coordinates(self.df)
+            images = render_report_images(
+                jobs,
+                tile_source=self.tile_cache,
+                provider=cfg.get("map_provider", "osm"),
+                lats=lats,
+                lons=lons,
+                zooms=cfg.get("map_zooms", DEFAULT_MAP_ZOOMS),
+                map_size=cfg.get("map_size", DEFAULT_MAP_SIZE),
+                dpi=int(cfg.get("dpi", 150)),
+                executor=self.executor,
+                max_workers=int(cfg.get("max_workers", 0)),
+                progress=self.progress.emit,
+            )
+        except Exception as e:
+            self.error.emit(f"Ocorreu um erro ao gerar as imagens do relatório: {e}")
+            return
+        finally:
+            self.df = None
+        self.finished.emit(images)
+
+
 class PdfReportWorker(QObject):
     """
     Gera o relatório PDF em uma thread separada para não congelar a UI.
-    Recebe os dados e as imagens já capturadas da thread principal.
+    Só monta as páginas: as imagens (PNG) chegam prontas do ReportRenderWorker.
     """
     finished = pyqtSignal(str) # Emite o caminho do arquivo salvo ao terminar
     error = pyqtSignal(str)    # Emite mensagem de erro
 
-    def __init__(self, file_path, log_name, plot_images, map_images):
+    def __init__(self, file_path, log_name, images: ReportImages):
         super().__init__()
         self.file_path = file_path
         self.log_name = log_name
-        self.plot_images = plot_images  # Lista de buffers de imagem (BytesIO)
-        self.map_images = map_images    # Lista de buffers de imagem (BytesIO)
+        self.plot_images = images.plots  # Lista de PNGs (bytes)
+        self.map_images = images.maps    # Lista de (zoom, PNG)
 
     def run(self):
         """
         Executa a geração do PDF. Esta função não deve ter nenhuma interação com a UI.
         """
         try:
-            c = canvas.Canvas(self.file_path, pagesize=landscape(A4))
-            width, height = landscape(A4)
-
-            # --- Página de Título ---
-            self._create_title_page(c, width, height)
-
-            # --- Páginas de Gráficos ---
-            for img_buffer in self.plot_images:
-                self._add_image_page(c, width, height, img_buffer)
-            
-            # --- Páginas do Mapa ---
-            for i, img_buffer in enumerate(self.map_images):
-                zoom_level = [17, 15, 12][i] # Assumindo 3 níveis de zoom
-                title = f"Trajetória do Voo - Zoom: {zoom_level}"
-                self._add_image_page(c, width, height, img_buffer, title)
-
-            c.save()
+            write_report_pdf(self.file_path, self.log_name, self.plot_images, self.map_images)
             self.finished.emit(self.file_path)
 
         except Exception as e:
             self.error.emit(f"Ocorreu um erro ao gerar o PDF: {e}")
 
-    def _create_title_page(self, c, width, height):
-        c.setFont("Helvetica-Bold", 24)
-        c.drawCentredString(width / 2, height - 2 * inch, "Relatório de Voo Detalhado")
-        c.setFont("Helvetica", 14)
-        c.drawCentredString(width / 2, height - 2.5 * inch, f"Arquivo de Log: {self.log_name}")
-        c.setFont("Helvetica-Oblique", 12)
-        c.drawCentredString(width / 2, 1 * inch, f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-        c.showPage()
-
-    def _add_image_page(self, c, width, height, img_buffer, title=None):
-        img_buffer.seek(0)
-        image_reader = ImageReader(img_buffer)
-        
-        if title:
-            c.setFont("Helvetica-Bold", 16)
-            c.drawCentredString(width / 2, height - 1 * inch, title)
-            margin_top = 1.5 * inch
-        else:
-            margin_top = 1 * inch
-
-        img_w, img_h = image_reader.getSize()
-        aspect = img_h / float(img_w)
-        
-        draw_width = width - 2 * inch
-        draw_height = draw_width * aspect
-        
-        # Ajusta se a altura for excessiva
-        max_height = height - margin_top - 1 * inch
-        if draw_height > max_height:
-            draw_height = max_height
-            draw_width = draw_height / aspect
-
-        x = (width - draw_width) / 2
-        y = (height - draw_height - margin_top) / 2 + 1 * inch
-        
-        c.drawImage(image_reader, x, y, width=draw_width, height=draw_height, preserveAspectRatio=True)
-        c.showPage()
\ No newline at end of file
+
+def write_report_pdf(file_path, log_name, plot_images, map_images):
+    c = canvas.Canvas(file_path, pagesize=landscape(A4))
+    width, height = landscape(A4)
+
+    # --- Página de Título ---
+    _create_title_page(c, width, height, log_name)
+
+    # --- Páginas de Gráficos ---
+    for img in plot_images:
+        _add_image_page(c, width, height, img)
+
+    # --- Páginas do Mapa ---
+    for zoom_level, img in map_images:
+        title = f"Trajetória do Voo - Zoom: {zoom_level}"
+        _add_image_page(c, width, height, img, title)
+
+    c.save()
+
+
+def _create_title_page(c, width, height, log_name):
+    c.setFont("Helvetica-Bold", 24)
+    c.drawCentredString(width / 2, height - 2 * inch, "Relatório de Voo Detalhado")
+    c.setFont("Helvetica", 14)
+    c.drawCentredString(width / 2, height - 2.5 * inch, f"Arquivo de Log: {log_name}")
+    c.setFont("Helvetica-Oblique", 12)
+    c.drawCentredString(width / 2, 1 * inch, f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
+    c.showPage()
+
+
+def _add_image_page(c, width, height, image, title=None):
+    image_reader = ImageReader(io.BytesIO(image) if isinstance(image, (bytes, bytearray)) else image)
+
+    if title:
+        c.setFont("Helvetica-Bold", 16)
+        c.drawCentredString(width / 2, height - 1 * inch, title)
+        margin_top = 1.5 * inch
+    else:
+        margin_top = 1 * inch
+
+    img_w, img_h = image_reader.getSize()
+    aspect = img_h / float(img_w)
+
+    draw_width = width - 2 * inch
+    draw_height = draw_width * aspect
+
+    # Ajusta se a altura for excessiva
+    max_height = height - margin_top - 1 * inch
+    if draw_height > max_height:
+        draw_height = max_height
+        draw_width = draw_height / aspect
+
+    x = (width - draw_width) / 2
+    y = (height - draw_height - margin_top) / 2 + 1 * inch
+
+    c.drawImage(image_reader, x, y, width=draw_width, height=draw_height, preserveAspectRatio=True)
+    c.showPage()
@@ -0,0 +1,353 @@
+"""Renderização "headless" das imagens do relatório PDF.
+
+Os gráficos são desenhados com matplotlib Agg (sem canvas Qt) num pool de
+processos, a partir de arrays já preparados (:class:`PlotJob`), e os mapas
+são montados a partir dos tiles do cache em disco com a trajetória
+desenhada por cima, sem depender do ``QWebEngineView`` na tela.
+
+Este módulo não importa Qt: ele é importado pelos processos filhos do pool
+(``spawn`` no Windows) e precisa continuar leve.
+"""
+from __future__ import annotations
+
+import io
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image, ImageDraw
+
+TILE_SIZE = 256
+DEFAULT_MAP_ZOOMS: Tuple[int, ...] = (17, 15, 12)
+DEFAULT_MAP_SIZE: Tuple[int, int] = (1600, 1000)
+# Pontos por série depois da decimação (mín/máx por balde preserva picos)
+MAX_POINTS_PER_SERIES = 4000
+
+_MAP_BACKGROUND = (229, 229, 229)
+_TRACK_COLOR = (220, 20, 60)
+_START_COLOR = (46, 125, 50)
+_END_COLOR = (33, 33, 33)
+
+
+@dataclass
+class PlotJob:
+    """Um gráfico do relatório: tipo, título e séries já extraídas do log."""
+
+    kind: str
+    title: str
+    series: Dict[str, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+    params: Dict[str, object] = field(default_factory=dict)
+
+
+@dataclass
+class ReportImages:
+    plots: List[bytes] = field(default_factory=list)
+    maps: List[Tuple[int, bytes]] = field(default_factory=list)  # (zoom, PNG)
+
+
+# -------------------------------------------------------------- decimação
+def peak_decimate(x: np.ndarray, y: np.ndarray, max_points: int = MAX_POINTS_PER_SERIES) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduz (x, y) a ~``max_points`` mantendo mínimo e máximo de cada balde.
+
+    Para uma página de PDF não há diferença visual, e o pickle para o pool
+    de processos e o desenho ficam proporcionais ao tamanho da imagem, não
+    ao tamanho do log.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    buckets = max(1, int(max_points) // 2)
+    if n <= 2 * buckets:
+        return x, y
+    size = int(math.ceil(n / buckets))
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(buckets, size)
+    nan_rows = np.isnan(blocks).all(axis=1)
+    lo = np.argmin(np.where(np.isnan(blocks), np.inf, blocks), axis=1)
+    hi = np.argmax(np.where(np.isnan(blocks), -np.inf, blocks), axis=1)
+    base = np.arange(buckets) * size
+    picks = np.sort(np.concatenate([base + np.minimum(lo, hi), base + np.maximum(lo, hi)])[
+        np.concatenate([~nan_rows, ~nan_rows])
+    ])
+    picks = picks[picks < n]
+    return x[picks], y[picks]
+
+
+def decimated(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    return peak_decimate(x, y, MAX_POINTS_PER_SERIES)
+
+
+# ---------------------------------------------------------------- gráficos
+def _new_figure(dpi: int) -> Figure:
+    figure = Figure(figsize=(11.0, 7.0), dpi=dpi)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _plot_series(ax, job: PlotJob, key: str, **style):
+    if key not in job.series:
+        return []
+    x, y = job.series[key]
+    return ax.plot(x, y, **style)
+
+
+def _render_rpy(figure: Figure, job: PlotJob) -> None:
+    gs = figure.add_gridspec(2, 1, height_ratios=[1.4, 0.8])
+    ax_all = figure.add_subplot(gs[0, 0])
+    lines = []
+    lines += _plot_series(ax_all, job, 'Roll', label='Roll', color='#1f77b4', linewidth=0.8)
+    lines += _plot_series(ax_all, job, 'Pitch', label='Pitch', color='#2ca02c', linewidth=0.8)
+    lines += _plot_series(ax_all, job, 'Yaw', label='Yaw', color='#d62728', linewidth=0.8)
+    if 'AltitudeAbs' in job.series:
+        ax_alt = ax_all.twinx()
+        lines += _plot_series(ax_alt, job, 'AltitudeAbs', label='Altitude(m)', color='#9467bd', linestyle='--', linewidth=0.8)
+        ax_alt.set_ylabel("Altitude (m)")
+    ax_all.set_title(job.title, fontsize=12)
+    ax_all.set_ylabel("Ângulos (°)")
+    ax_all.grid(True, linestyle='--')
+    ax_all.legend(lines, [l.get_label() for l in lines], fontsize=8, loc='best')
+
+    ax_vtol = figure.add_subplot(gs[1, 0], sharex=ax_all)
+    if 'isVTOL' in job.series:
+        _plot_series(ax_vtol, job, 'isVTOL', label='isVTOL', color='#ff7f0e', drawstyle='steps-post')
+        ax_vtol.set_yticks([0, 1])
+        ax_vtol.legend(fontsize=8, loc='best')
+    else:
+        ax_vtol.text(0.5, 0.5, "'isVTOL' não disponível", ha="center", va="center", transform=ax_vtol.transAxes)
+    ax_vtol.set_title("Modo VTOL", fontsize=11)
+    ax_vtol.set_xlabel("Timestamp")
+    ax_vtol.grid(True, axis='y')
+
+
+def _render_position(figure: Figure, job: PlotJob) -> None:
+    ax1 = figure.add_subplot(211)
+    ax2 = figure.add_subplot(212, sharex=ax1)
+    _plot_series(ax1, job, 'distance', color="blue", label="Dist. Horiz.(m)")
+    ax1.set_ylabel("Dist(m)"); ax1.set_title(job.title, fontsize=12); ax1.grid(True); ax1.legend(fontsize=8)
+    _plot_series(ax2, job, 'altitude', color="green", label="Alt. Relativa(m)")
+    ax2.set_ylabel("Alt(m)"); ax2.set_xlabel("Timestamp"); ax2.set_title("Alt. Relativa à Inicial"); ax2.grid(True)
+    ax2.legend(fontsize=8)
+
+
+def _render_wind(figure: Figure, job: PlotJob) -> None:
+    window = job.params.get('window')
+    rows = [r for r in ('speed', 'direction', 'path') if r in job.params.get('rows', ())]
+    if not rows:
+        return
+    gs = figure.add_gridspec(len(rows), 1)
+    first_ax = None
+    for i, row in enumerate(rows):
+        ax = figure.add_subplot(gs[i, 0], sharex=first_ax)
+        first_ax = first_ax or ax
+        ax.grid(True, linestyle=':', alpha=0.6)
+        if row == 'path':
+            lines = _plot_series(ax, job, 'Path_angle', color='tab:green', label='Path Angle', linewidth=0.8)
+            ax.set_ylabel('Path Angle (°)', fontsize=9)
+            ax.set_title("Ângulo de Trajetória", fontsize=11)
+        else:
+            keys = ('wsi_var', 'wsi_std') if row == 'speed' else ('dir_var', 'dir_std')
+            colors = ('tab:blue', 'tab:cyan') if row == 'speed' else ('tab:red', 'tab:orange')
+            labels = (
+                (f'Var WSI (J={window})', f'Std Dev WSI (J={window})') if row == 'speed'
+                else (f'Var Dir (Circular, J={window})', f'Std Dev Dir (Circular, J={window})')
+            )
+            ylabels = ('Var WSI (m²/s²)', 'Std Dev WSI (m/s)') if row == 'speed' else ('Var Circular Dir (0-1)', 'Std Dev Circular (°)')
+            lines = _plot_series(ax, job, keys[0], color=colors[0], label=labels[0], linewidth=0.8)
+            ax.set_ylabel(ylabels[0], color=colors[0], fontsize=9)
+            twin = ax.twinx()
+            lines += _plot_series(twin, job, keys[1], color=colors[1], label=labels[1], linestyle='--', linewidth=0.8)
+            twin.set_ylabel(ylabels[1], color=colors[1], fontsize=9)
+            ax.set_title(f"Variabilidade {'Velocidade' if row == 'speed' else 'Direção'} Vento", fontsize=11)
+        ax.legend(lines, [l.get_label() for l in lines], loc='best', fontsize=7)
+    ax.set_xlabel('Timestamp', fontsize=9)
+    figure.suptitle(job.title, fontsize=12)
+
+
+def _render_variance(figure: Figure, job: PlotJob) -> None:
+    ax = figure.add_subplot(111)
+    _plot_series(ax, job, 'Roll', label='Var Roll', color='#1f77b4', linewidth=0.8)
+    _plot_series(ax, job, 'Pitch', label='Var Pitch', color='#2ca02c', linewidth=0.8)
+    _plot_series(ax, job, 'Yaw', label='Var Yaw', color='#d62728', linewidth=0.8)
+    _plot_series(ax, job, 'AltitudeAbs', label='Var Alt', color='#9467bd', linestyle='--', linewidth=0.8)
+    ax.set_title(job.title, fontsize=12)
+    ax.set_xlabel("Timestamp"); ax.set_ylabel("Variância"); ax.grid(True, linestyle='--')
+    ax.legend(fontsize=8)
+
+
+def _render_voltage(figure: Figure, job: PlotJob) -> None:
+    ax = figure.add_subplot(111)
+    _plot_series(ax, job, 'Voltage', label='Tensão (V)', linewidth=0.8)
+    ax.set_title(job.title, fontsize=12)
+    ax.set_xlabel('Timestamp'); ax.set_ylabel('Tensão (V)')
+    ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+    ax.legend(fontsize=8)
+
+
+_PLOT_RENDERERS: Dict[str, Callable[[Figure, PlotJob], None]] = {
+    'rpy': _render_rpy,
+    'position': _render_position,
+    'wind': _render_wind,
+    'variance': _render_variance,
+    'voltage': _render_voltage,
+}
+
+
+def render_plot_job(job: PlotJob, dpi: int = 150) -> bytes:
+    """Desenha um :class:`PlotJob` com matplotlib Agg e devolve o PNG."""
+    figure = _new_figure(dpi)
+    _PLOT_RENDERERS[job.kind](figure, job)
+    figure.tight_layout()
+    buf = io.BytesIO()
+    figure.savefig(buf, format='png', dpi=dpi)
+    return buf.getvalue()
+
+
+def default_process_workers(job_count: int) -> int:
+    return max(1, min(job_count, (os.cpu_count() or 2) - 1, 4))
+
+
+def create_plot_executor(max_workers: int = 0, job_count: int = 5) -> Optional[ProcessPoolExecutor]:
+    """Pool de processos para os gráficos (None se não for possível criar)."""
+    workers = int(max_workers) if max_workers else default_process_workers(job_count)
+    if workers <= 1:
+        return None
+    try:
+        return ProcessPoolExecutor(max_workers=workers)
+    except (OSError, ValueError, NotImplementedError) as exc:
+        print(f"AVISO: Pool de processos indisponível para o relatório ({exc}); desenhando em série.")
+        return None
+
+
+# -------------------------------------------------------------------- mapas
+def lonlat_to_pixels(lon, lat, zoom: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Lon/lat (graus) -> pixels globais Web Mercator no zoom dado (vetorizado)."""
+    scale = TILE_SIZE * float(1 << int(zoom))
+    lat = np.clip(np.asarray(lat, dtype=float), -85.05112878, 85.05112878)
+    px = (np.asarray(lon, dtype=float) + 180.0) / 360.0 * scale
+    py = (1.0 - np.arcsinh(np.tan(np.radians(lat))) / math.pi) / 2.0 * scale
+    return px, py
+
+
+def _load_tile(tile_source, provider: str, z: int, x: int, y: int) -> Optional[Image.Image]:
+    """Tile do cache em disco (nunca busca na rede: relatórios não baixam tiles)."""
+    try:
+        data = tile_source.get_cached(provider, z, x, y)
+    except Exception as exc:
+        print(f"AVISO: Falha ao ler tile {provider}/{z}/{x}/{y}: {exc}")
+        return None
+    if not data:
+        return None
+    try:
+        return Image.open(io.BytesIO(data)).convert("RGB")
+    except Exception:
+        return None
+
+
+def render_map_image(tile_source, provider: str, lats: np.ndarray, lons: np.ndarray, zoom: int,
+                     size: Sequence[int] = DEFAULT_MAP_SIZE, tile_workers: int = 4,
+                     credit: str = "") -> bytes:
+    """Mosaico de tiles centrado no voo, com a trajetória por cima.
+
+    Os tiles são lidos só do cache em disco (``tile_source.get_cached``), ou
+    seja, os que o mapa interativo já baixou; tiles ausentes ficam com o fundo
+    neutro. Sem ``tile_source`` só a trajetória é desenhada.
+    """
+    width, height = int(size[0]), int(size[1])
+    px, py = lonlat_to_pixels(lons, lats, zoom)
+    cx = (float(np.min(px)) + float(np.max(px))) / 2.0
+    cy = (float(np.min(py)) + float(np.max(py))) / 2.0
+    left, top = int(round(cx - width / 2.0)), int(round(cy - height / 2.0))
+
+    image = Image.new("RGB", (width, height), _MAP_BACKGROUND)
+    if tile_source is not None:
+        n = 1 << int(zoom)
+        tiles = [
+            (tx, ty)
+            for tx in range(left // TILE_SIZE, (left + width - 1) // TILE_SIZE + 1)
+            for ty in range(top // TILE_SIZE, (top + height - 1) // TILE_SIZE + 1)
+            if 0 <= ty < n
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, int(tile_workers))) as pool:
+            loaded = pool.map(lambda t: _load_tile(tile_source, provider, zoom, t[0] % n, t[1]), tiles)
+            for (tx, ty), tile in zip(tiles, loaded):
+                if tile is not None:
+                    image.paste(tile, (tx * TILE_SIZE - left, ty * TILE_SIZE - top))
+
+    # Trajetória: só os pixels distintos consecutivos (milhares de amostras viram centenas de vértices)
+    points = np.column_stack([np.round(px - left), np.round(py - top)]).astype(np.int64)
+    if points.shape[0] > 1:
+        keep = np.concatenate(([True], np.any(np.diff(points, axis=0) != 0, axis=1)))
+        points = points[keep]
+    draw = ImageDraw.Draw(image)
+    if points.shape[0] > 1:
+        draw.line([tuple(p) for p in points.tolist()], fill=_TRACK_COLOR, width=3, joint="curve")
+    for (x, y), color in ((points[0], _START_COLOR), (points[-1], _END_COLOR)):
+        draw.ellipse((x - 6, y - 6, x + 6, y + 6), fill=color, outline=(255, 255, 255), width=2)
+    if credit:
+        text_w = int(draw.textlength(credit))
+        draw.rectangle((width - text_w - 12, height - 18, width, height), fill=(255, 255, 255))
+        draw.text((width - text_w - 6, height - 16), credit, fill=(60, 60, 60))
+
+    buf = io.BytesIO()
+    image.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+# ------------------------------------------------------------------ pipeline
+def render_report_images(plot_jobs: Sequence[PlotJob], *, tile_source=None, provider: str = "osm",
+                         lats: Optional[np.ndarray] = None, lons: Optional[np.ndarray] = None,
+                         zooms: Sequence[int] = DEFAULT_MAP_ZOOMS, map_size: Sequence[int] = DEFAULT_MAP_SIZE,
+                         dpi: int = 150, executor: Optional[ProcessPoolExecutor] = None,
+                         max_workers: int = 0, progress: Optional[Callable[[str], None]] = None) -> ReportImages:
+    """Gera todas as imagens do relatório.
+
+    Os gráficos vão para o pool de processos (``executor`` compartilhado ou
+    um criado aqui) enquanto esta thread monta os mapas, que são limitados
+    por E/S de tiles. Se o pool falhar, os gráficos são desenhados em série.
+    """
+    notify = progress or (lambda _msg: None)
+    own_executor = executor is None and len(plot_jobs) > 1
+    if own_executor:
+        executor = create_plot_executor(max_workers, len(plot_jobs))
+    futures = []
+    try:
+        if executor is not None:
+            try:
+                futures = [executor.submit(render_plot_job, job, dpi) for job in plot_jobs]
+            except Exception as exc:
+                print(f"AVISO: Falha ao enviar gráficos ao pool de processos ({exc}); desenhando em série.")
+                futures = []
+
+        images = ReportImages()
+        if lats is not None and lons is not None and np.size(lats) > 0:
+            credit = ""
+            providers = getattr(tile_source, "providers", {}) or {}
+            if provider in providers:
+                credit = providers[provider].credit
+            for zoom in zooms:
+                notify(f"Montando mapa (zoom {zoom})...")
+                images.maps.append((int(zoom), render_map_image(
+                    tile_source, provider, lats, lons, int(zoom), map_size, credit=credit,
+                )))
+
+        notify("Desenhando gráficos...")
+        for index, job in enumerate(plot_jobs):
+            png = None
+            if index < len(futures):
+                try:
+                    png = futures[index].result()
+                except Exception as exc:
+                    print(f"AVISO: Gráfico '{job.title}' falhou no pool de processos ({exc}); desenhando aqui.")
+            if png is None:
+                png = render_plot_job(job, dpi)
+            images.plots.append(png)
+        return images
+    finally:
+        if own_executor and executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -63,13 +63,8 @@ def resource_path(*relative_parts: os.PathLike | str) -> Path:
     return _candidate_roots()[0] / relative_path
 
 
-def get_appdata_logs_dir(create: bool = True) -> Path:
-    """Retorna a pasta "Logs" dentro do AppData do usuário.
-
-    O caminho varia por sistema operacional, mas sempre termina em
-    ``XmobotsLogViewer/Logs``. Quando ``create`` é ``True`` a pasta é criada
-    automaticamente, caso ainda não exista.
-    """
+def get_appdata_dir(*parts: str, create: bool = True) -> Path:
+    """Retorna uma pasta dentro de ``XmobotsLogViewer`` no AppData do usuário."""
 
     if sys.platform.startswith("win"):
         base = Path(os.environ.get("APPDATA", Path.home() / "AppData" / "Roaming"))
@@ -78,10 +73,29 @@ def get_appdata_logs_dir(create: bool = True) -> Path:
     else:
         base = Path.home() / ".local" / "share"
 
-    logs_dir = base / "XmobotsLogViewer" / "Logs"
+    target = base / "XmobotsLogViewer"
+    for part in parts:
+        target = target / part
     if create:
-        logs_dir.mkdir(parents=True, exist_ok=True)
-    return logs_dir
+        target.mkdir(parents=True, exist_ok=True)
+    return target
+
+
+def get_appdata_logs_dir(create: bool = True) -> Path:
+    """Retorna a pasta "Logs" dentro do AppData do usuário.
+
+    O caminho varia por sistema operacional, mas sempre termina em
+    ``XmobotsLogViewer/Logs``. Quando ``create`` é ``True`` a pasta é criada
+    automaticamente, caso ainda não exista.
+    """
+
+    return get_appdata_dir("Logs", create=create)
+
+
+def get_tile_cache_dir(create: bool = True) -> Path:
+    """Pasta do cache de tiles de mapa (``XmobotsLogViewer/TileCache``)."""
+
+    return get_appdata_dir("TileCache", create=create)
 
 
 def get_logs_directory() -> Path | None:
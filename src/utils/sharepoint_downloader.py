@@ -3,13 +3,37 @@ from __future__ import annotations
 
 import json
 import os
+import glob
+import hashlib
+import posixpath
 import re
 import shutil
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Callable, List, Sequence
 
+from src.utils.compressed_io import (
+    BINARY_LOG_NAMES,
+    BLOCK_INDEX_SUFFIX,
+    COMPRESSIBLE_EXTS,
+    COMPRESSION_SUFFIXES,
+    compress_file,
+    open_log_binary,
+    strip_compression,
+)
+from src.utils.folder_walker import (
+    DEFAULT_SCAN_WORKERS,
+    DirNode,
+    DirectoryIndex,
+    child_key,
+    subtree_extensions,
+    walk_tree,
+)
+
 SHAREPOINT_ENSAIOS_FOLDER = "[01] Ensaios"
 FLIGHT_FOLDER_RE = re.compile(
     r"^(?P<class>[A-Z]{2})(?P<program>[A-Z0-9]{2})-(?P<date>\d{8})-(?P<flight>\d+)-(?P<serial>[A-Za-z0-9_.-]+)$"
@@ -18,6 +42,17 @@ SUPPORTED_LOG_EXTS = {".mat", ".log", ".csv"}
 CONFIG_DIR = Path.home() / ".config" / "xmobots"
 PROGRAMS_ROOT_FILE = CONFIG_DIR / "programs_root.json"
 PROGRAMS_ROOT_KEY = "programs_root"
+# Índice (por mtime) das pastas já varridas, para atualizar a listagem incrementalmente
+FOLDER_INDEX_FILE = CONFIG_DIR / "sharepoint_index.json"
+DEFAULT_COPY_WORKERS = 4
+COPY_CHUNK_BYTES = 4 * 1024 * 1024
+PART_SUFFIX = ".part"
+# Tolerância de mtime ao comparar arquivos: destinos com resolução de segundos
+# (FAT/exFAT arredondam para 2 s) aceitam até 2 s; os demais (NTFS, ext4, APFS)
+# só a diferença de granularidade em ns
+COARSE_MTIME_TOLERANCE_NS = 2_000_000_000
+FINE_MTIME_TOLERANCE_NS = 1_000_000
+PROGRESS_INTERVAL_S = 0.25
 
 
 class SharePointCredentialError(RuntimeError):
@@ -55,6 +90,166 @@ class SharePointFlight:
         return f"{self.name} — {serial} — {date_text} — Logs: {log_text}"
 
 
+@dataclass(slots=True)
+class CopyTask:
+    flight: SharePointFlight
+    source: Path
+    target: Path
+    size: int
+    mtime_ns: int
+    # "gzip"/"xz" para guardar o log comprimido (o destino já tem o sufixo)
+    compression: str | None = None
+
+    def part_path(self) -> Path:
+        """Arquivo temporário da cópia; o nome amarra a versão da origem para poder retomar."""
+        return self.target.with_name(f"{self.target.name}.{self.size}-{self.mtime_ns}{PART_SUFFIX}")
+
+
+@dataclass(slots=True)
+class CopyProgress:
+    total_bytes: int
+    done_bytes: int
+    files_total: int
+    files_done: int
+    skipped: int
+    current: str
+    bytes_per_s: float
+    eta_s: float | None
+
+    @property
+    def percent(self) -> int:
+        if self.total_bytes <= 0:
+            return 100 if self.files_done >= self.files_total else 0
+        return min(100, int(self.done_bytes * 100 / self.total_bytes))
+
+
+class _CopyState:
+    """Contadores compartilhados entre as threads de cópia."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.total_bytes = 0
+        self.done_bytes = 0
+        self.transferred_bytes = 0
+        self.files_total = 0
+        self.files_done = 0
+        self.skipped = 0
+        self.current = ""
+
+    def add_bytes(self, count: int, transferred: bool) -> None:
+        with self.lock:
+            self.done_bytes += count
+            if transferred:
+                self.transferred_bytes += count
+
+    def file_done(self, name: str, skipped: bool) -> None:
+        with self.lock:
+            self.files_done += 1
+            self.skipped += int(skipped)
+            self.current = name
+
+    def snapshot(self) -> CopyProgress:
+        with self.lock:
+            elapsed = max(time.monotonic() - self.started, 1e-6)
+            rate = self.transferred_bytes / elapsed
+            remaining = max(self.total_bytes - self.done_bytes, 0)
+            eta = remaining / rate if rate > 0 else None
+            return CopyProgress(
+                self.total_bytes, self.done_bytes, self.files_total, self.files_done,
+                self.skipped, self.current, rate, eta,
+            )
+
+
+def _file_digest(path: Path) -> str:
+    """Hash do conteúdo original (logs comprimidos são lidos descomprimidos)."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open_log_binary(path) as handle:
+        for chunk in iter(lambda: handle.read(COPY_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _mtime_tolerance_ns(target_mtime_ns: int) -> int:
+    """Tolerância conforme a resolução aparente do sistema de arquivos de destino.
+
+    O mtime é copiado da origem com precisão de ns; se o destino o guardou
+    num segundo inteiro, o sistema de arquivos arredonda (FAT/exFAT).
+    """
+    if target_mtime_ns % 1_000_000_000 == 0:
+        return COARSE_MTIME_TOLERANCE_NS
+    return FINE_MTIME_TOLERANCE_NS
+
+
+def _is_up_to_date(task: CopyTask, verify_hash: bool) -> bool:
+    try:
+        st = task.target.stat()
+    except OSError:
+        return False
+    # O tamanho de um destino comprimido não é comparável: vale o mtime copiado da origem
+    if task.compression is None and st.st_size != task.size:
+        return False
+    if abs(st.st_mtime_ns - task.mtime_ns) > _mtime_tolerance_ns(st.st_mtime_ns):
+        return False
+    return not verify_hash or _file_digest(task.source) == _file_digest(task.target)
+
+
+def _remove_other_variants(target: Path) -> None:
+    """Apaga a versão crua/comprimida alternativa do mesmo log (evita duplicatas na pasta)."""
+    plain = target.with_name(strip_compression(target.name))
+    for variant in (plain, *(plain.with_name(plain.name + suffix) for suffix in COMPRESSION_SUFFIXES.values())):
+        if variant != target:
+            variant.unlink(missing_ok=True)
+            Path(str(variant) + BLOCK_INDEX_SUFFIX).unlink(missing_ok=True)
+
+
+def _copy_task(task: CopyTask, state: _CopyState, verify_hash: bool) -> None:
+    """Copia um arquivo em blocos para ``.part`` (retomando se já existir) e renomeia no fim."""
+    if _is_up_to_date(task, verify_hash):
+        state.add_bytes(task.size, transferred=False)
+        state.file_done(task.source.name, skipped=True)
+        return
+    task.target.parent.mkdir(parents=True, exist_ok=True)
+    part = task.part_path()
+    if task.compression is not None:
+        # Comprimido não retoma: o .part é refeito do início
+        compress_file(
+            task.source,
+            part,
+            task.compression,
+            write_index=strip_compression(task.target.name).lower() in BINARY_LOG_NAMES,
+            on_bytes=lambda count: state.add_bytes(count, transferred=True),
+        )
+        index_part = Path(str(part) + BLOCK_INDEX_SUFFIX)
+        if index_part.exists():
+            os.replace(index_part, Path(str(task.target) + BLOCK_INDEX_SUFFIX))
+        os.replace(part, task.target)
+        shutil.copystat(task.source, task.target)
+        _remove_other_variants(task.target)
+        state.file_done(task.source.name, skipped=False)
+        return
+    # Parciais de outra versão da origem não servem para retomar
+    for stale in task.target.parent.glob(f"{glob.escape(task.target.name)}.*{PART_SUFFIX}"):
+        if stale != part:
+            stale.unlink(missing_ok=True)
+    offset = part.stat().st_size if part.exists() else 0
+    if offset > task.size:
+        offset = 0
+    if offset:
+        state.add_bytes(offset, transferred=False)
+    with open(task.source, "rb") as src, open(part, "r+b" if offset else "wb") as dst:
+        src.seek(offset)
+        dst.seek(offset)
+        dst.truncate()
+        for chunk in iter(lambda: src.read(COPY_CHUNK_BYTES), b""):
+            dst.write(chunk)
+            state.add_bytes(len(chunk), transferred=True)
+    os.replace(part, task.target)
+    shutil.copystat(task.source, task.target)
+    _remove_other_variants(task.target)
+    state.file_done(task.source.name, skipped=False)
+
+
 DEFAULT_PROGRAMS: Sequence[SharePointProgram] = (
     SharePointProgram(code="FW1000", name="FW1000", folder_name="[00] FW1000", icon_name="fw1000.png"),
     SharePointProgram(code="FW150", name="FW150", folder_name="[01] FW150", icon_name="fw150.png"),
@@ -140,6 +335,7 @@ class SharePointClient:
 
     def __init__(self, programs_root: Path | None = None):
         self.programs_root: Path | None = None
+        self._index: DirectoryIndex | None = None
         if programs_root:
             self.set_programs_root(programs_root, persist=False)
         else:
@@ -168,166 +364,144 @@ class SharePointClient:
         if persist:
             _save_programs_root(resolved)
 
-    def list_flights(self, program: SharePointProgram) -> List[SharePointFlight]:
+    def list_flights(
+        self,
+        program: SharePointProgram,
+        on_flights: Callable[[List[SharePointFlight]], None] | None = None,
+        max_workers: int = DEFAULT_SCAN_WORKERS,
+    ) -> List[SharePointFlight]:
+        """Lista os voos do programa, varrendo cada pasta uma única vez e em paralelo.
+
+        ``on_flights`` recebe os voos de cada serial/agenda assim que a subárvore
+        dela termina de ser lida. Pastas cujo mtime não mudou desde a última
+        varredura vêm do índice salvo em ``FOLDER_INDEX_FILE``.
+        """
         root = self.require_programs_root()
         flights: List[SharePointFlight] = []
 
-        def candidate_ensaios_dirs() -> List[tuple[Path, Path]]:
-            """Retorna pares (base_relativa, pasta_a_percorrer)."""
-
-            pairs: List[tuple[Path, Path]] = []
+        def candidate_ensaios_dirs() -> List[Path]:
+            dirs: List[Path] = []
             expected_program_dir = root / program.folder_name
             if expected_program_dir.exists():
-                ensaios_dir = expected_program_dir / SHAREPOINT_ENSAIOS_FOLDER
-                pairs.append((root, ensaios_dir if ensaios_dir.exists() else expected_program_dir))
+                dirs.append(expected_program_dir)
 
             # Se o usuário escolheu direto a pasta do programa ou uma agenda/serial.
             if root.name == program.folder_name or program.folder_name in root.parts:
-                ensaios_dir = root / SHAREPOINT_ENSAIOS_FOLDER
-                pairs.append((root, ensaios_dir if ensaios_dir.exists() else root))
-
-            if not pairs:
-                pairs.append((root, root))
-
-            deduped: List[tuple[Path, Path]] = []
-            seen = set()
-            for rel_base, scan_dir in pairs:
-                key = (str(rel_base), str(scan_dir))
-                if key in seen:
-                    continue
-                seen.add(key)
-                deduped.append((rel_base, scan_dir))
-            return deduped
+                dirs.append(root)
+
+            if not dirs:
+                dirs.append(root)
+
+            unique: List[Path] = []
+            for scan_dir in dirs:
+                inner = scan_dir / SHAREPOINT_ENSAIOS_FOLDER
+                ensaios_root = inner if scan_dir.name != SHAREPOINT_ENSAIOS_FOLDER and inner.is_dir() else scan_dir
+                if ensaios_root not in unique:
+                    unique.append(ensaios_root)
+            return unique
+
+        index = self._folder_index(root)
+        print(f"[debug][list_flights] Programa: {program.code} | raiz: {root}")
+        for ensaios_root in candidate_ensaios_dirs():
+            start = ensaios_root.relative_to(root).as_posix()
+            memo: dict[str, frozenset] = {}
+
+            def emit_subtree(top: str, nodes, start=start, memo=memo) -> None:
+                found = self._flights_in_subtree(program, top, start, nodes, memo)
+                if not found:
+                    return
+                found.sort(key=lambda flight: (flight.date or datetime.min), reverse=True)
+                flights.extend(found)
+                if on_flights:
+                    on_flights(found)
 
-        print(f"[debug][list_flights] Programa: {program.code}")
-        print(f"[debug][list_flights] Raiz configurada: {root}")
-
-        for rel_base, scan_dir in candidate_ensaios_dirs():
-            print(
-                "[debug][list_flights] Percorrendo a partir de",
-                f"base relativa={rel_base} | pasta de busca={scan_dir}",
-            )
-            if not scan_dir.exists():
-                print(f"[debug][list_flights] Pasta inexistente: {scan_dir}")
-                continue
             try:
-                ensaios_root = scan_dir
-                if scan_dir.name != SHAREPOINT_ENSAIOS_FOLDER:
-                    inner = scan_dir / SHAREPOINT_ENSAIOS_FOLDER
-                    if inner.exists():
-                        ensaios_root = inner
-                self._walk_program(program, rel_base, ensaios_root, None, flights, ensaios_root)
-            except Exception as exc:  # pragma: no cover - defensivo para logs ruins
+                _, stats = walk_tree(index, start, SUPPORTED_LOG_EXTS, emit_subtree, max_workers)
+            except Exception as exc:  # pragma: no cover - defensivo para pastas ruins
                 print(
                     "[debug][list_flights] Erro ao percorrer pastas; ignorando e mantendo o que já foi encontrado:",
                     exc,
                 )
+                continue
+            print(
+                f"[debug][list_flights] {ensaios_root}: {stats.scanned} pastas lidas, "
+                f"{stats.reused} do índice, {stats.failed} com falha em {stats.elapsed_s:.1f} s"
+            )
+        index.save()
 
         print(f"[debug][list_flights] Total de voos encontrados: {len(flights)}")
         flights.sort(key=lambda flight: (flight.date or datetime.min), reverse=True)
         return flights
 
-    def _walk_program(
+    def _folder_index(self, root: Path) -> DirectoryIndex:
+        if self._index is None or self._index.root != root:
+            self._index = DirectoryIndex(root, FOLDER_INDEX_FILE)
+        return self._index
+
+    def _flights_in_subtree(
         self,
         program: SharePointProgram,
-        root: Path,
-        folder_path: Path,
-        serial_hint: str | None,
-        flights: List[SharePointFlight],
-        ensaios_root: Path,
-    ) -> None:
-        if not folder_path.exists():
-            print(f"[debug][_walk_program] Ignorando pasta inexistente: {folder_path}")
-            return
-        try:
-            entries = sorted(folder_path.iterdir())
-        except PermissionError:
-            print(f"[debug][_walk_program] Sem permissão para acessar: {folder_path}")
-            return
-
-        print(f"[debug][_walk_program] Varredura em: {folder_path}")
-        for entry in entries:
-            kind = "dir" if entry.is_dir() else "file"
-            print(f"  [debug][_walk_program] Encontrado {kind}: {entry.name}")
-            if not entry.is_dir():
-                continue
-            name = entry.name
+        top: str,
+        ensaios_key: str,
+        nodes: dict[str, DirNode],
+        memo: dict[str, frozenset],
+    ) -> List[SharePointFlight]:
+        """Classifica as pastas já lidas de uma subárvore (serial/agenda) em voos.
+
+        Regras: nome no padrão de voo vira voo (mesmo sem logs) e não é
+        explorado; outra pasta com logs na subárvore vira voo e só é explorada
+        se estiver logo abaixo da pasta de ensaios (pode agrupar vários voos).
+        """
+        flights: List[SharePointFlight] = []
+        # (chave, está logo abaixo da pasta de ensaios, serial herdado)
+        stack: List[tuple[str, bool, str | None]] = [(top, True, None)]
+        while stack:
+            key, at_top, serial_hint = stack.pop()
+            name = posixpath.basename(key)
             match = FLIGHT_FOLDER_RE.match(name)
             if match:
                 try:
                     date = datetime.strptime(match.group("date"), "%Y%m%d")
-                except ValueError as exc:
-                    print(
-                        "  [debug][_walk_program] Pasta parece voo, mas a data é inválida; pulando: "
-                        f"{name} ({exc})"
-                    )
+                except ValueError:
+                    print(f"  [debug][list_flights] Pasta parece voo, mas a data é inválida; pulando: {name}")
                     continue
-                print(f"  [debug][_walk_program] Pasta de voo detectada por padrão: {name}")
-                has_logs, log_types = self._folder_log_types(entry)
-                flights.append(
-                    SharePointFlight(
-                        program=program,
-                        name=name,
-                        relative_path=entry.relative_to(root),
-                        serial_folder=serial_hint,
-                        date=date,
-                        log_types=tuple(sorted(log_types)) if has_logs else tuple(),
-                    )
-                )
-                if not has_logs:
-                    print(
-                        "  [debug][_walk_program] Pasta encaixa no padrão de voo, mas nenhum log foi "
-                        "identificado; mantendo na lista com tipos vazios."
-                    )
+                log_types = subtree_extensions(key, nodes, memo)
+                flights.append(self._make_flight(program, name, key, serial_hint, date, log_types))
                 continue
 
-            has_logs, log_types = self._folder_log_types(entry)
-            if has_logs:
-                inferred_date = self._infer_date_from_name(name)
-                print(
-                    "  [debug][_walk_program] Pasta tratada como voo por conter logs: "
-                    f"{name} (data inferida: {inferred_date})"
-                )
+            log_types = subtree_extensions(key, nodes, memo)
+            if log_types:
                 flights.append(
-                    SharePointFlight(
-                        program=program,
-                        name=name,
-                        relative_path=entry.relative_to(root),
-                        serial_folder=serial_hint,
-                        date=inferred_date,
-                        log_types=tuple(sorted(log_types)),
-                    )
+                    self._make_flight(program, name, key, serial_hint, self._infer_date_from_name(name), log_types)
                 )
-                if folder_path == ensaios_root:
-                    # A pasta parece conter logs, mas pode agrupar vários voos; continue explorando.
-                    print(
-                        "  [debug][_walk_program] Descendo para identificar voos dentro do serial/agenda "
-                        f"{name}"
-                    )
-                else:
+                if not at_top:
                     continue
 
-            next_serial = serial_hint
-            if folder_path == ensaios_root or name.upper().startswith("NS"):
-                next_serial = name
-            self._walk_program(program, root, entry, next_serial, flights, ensaios_root)
+            next_serial = name if at_top or name.upper().startswith("NS") else serial_hint
+            node = nodes.get(key)
+            if node is None:
+                continue
+            for child in reversed(node.subdirs):
+                stack.append((child_key(key, child), False, next_serial))
+        return flights
 
-    def _folder_log_types(self, folder: Path) -> tuple[bool, set[str]]:
-        try:
-            found_types: set[str] = set()
-            for candidate in folder.rglob("*"):
-                if not candidate.is_file():
-                    continue
-                suffix = candidate.suffix.lower()
-                if suffix in SUPPORTED_LOG_EXTS:
-                    print(f"  [debug][_walk_program] Arquivo de log identificado: {candidate}")
-                    found_types.add(suffix)
-            return (len(found_types) > 0, found_types)
-        except PermissionError:
-            print(f"  [debug][_walk_program] Sem permissão para inspecionar logs em: {folder}")
-        except OSError as exc:
-            print(f"  [debug][_walk_program] Falha ao inspecionar {folder}: {exc}")
-        return (False, set())
+    @staticmethod
+    def _make_flight(
+        program: SharePointProgram,
+        name: str,
+        key: str,
+        serial_hint: str | None,
+        date: datetime | None,
+        log_types: frozenset,
+    ) -> SharePointFlight:
+        return SharePointFlight(
+            program=program,
+            name=name,
+            relative_path=Path(key),
+            serial_folder=serial_hint,
+            date=date,
+            log_types=tuple(sorted(log_types)),
+        )
 
     def _infer_date_from_name(self, name: str) -> datetime | None:
         date_match = re.search(r"(\d{8})", name)
@@ -343,66 +517,122 @@ class SharePointClient:
         flight: SharePointFlight,
         destination_root: Path,
         progress_callback: Callable[[str], None] | None = None,
+        compression: str | None = None,
     ) -> Path:
+        """Copia um voo; com ``compression`` ("gzip"/"xz") os logs de texto ficam comprimidos."""
+
+        def relay(progress: CopyProgress) -> None:
+            if progress_callback and progress.current:
+                progress_callback(progress.current)
+
+        paths, errors = self.copy_flights(
+            [flight], destination_root, on_progress=relay, max_workers=1, compression=compression
+        )
+        if errors:
+            raise OSError("; ".join(errors))
+        return paths[0]
+
+    def plan_flight_copy(
+        self, flight: SharePointFlight, destination_root: Path, compression: str | None = None
+    ) -> tuple[Path, List[CopyTask]]:
+        """Lista os arquivos de log do voo e onde cada um vai parar (subpastas preservadas)."""
         root = self.require_programs_root()
         source_dir = root / flight.relative_path
-        print(f"[debug][download_flight] Copiando voo {flight.name}")
-        print(f"[debug][download_flight] Origem: {source_dir}")
-        if not source_dir.exists():
+        if not source_dir.is_dir():
             raise FileNotFoundError(f"Voo não encontrado em {source_dir}")
         target_dir = destination_root / flight.local_subpath()
-        print(f"[debug][download_flight] Destino: {target_dir}")
-        self._copy_logs_only(source_dir, target_dir, progress_callback)
-        return target_dir
-
-    def _copy_logs_only(
+        tasks: List[CopyTask] = []
+        for dirpath, _dirnames, filenames in os.walk(source_dir):
+            rel_dir = Path(dirpath).relative_to(source_dir)
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() not in SUPPORTED_LOG_EXTS:
+                    continue
+                source = Path(dirpath) / filename
+                try:
+                    st = source.stat()
+                except OSError as exc:
+                    print(f"AVISO: Ignorando {source}: {exc}")
+                    continue
+                target = target_dir / rel_dir / filename
+                method = compression if os.path.splitext(filename)[1].lower() in COMPRESSIBLE_EXTS else None
+                if method:
+                    target = target.with_name(filename + COMPRESSION_SUFFIXES[method])
+                tasks.append(CopyTask(flight, source, target, st.st_size, st.st_mtime_ns, method))
+        return target_dir, tasks
+
+    def copy_flights(
         self,
-        source: Path,
-        destination: Path,
-        progress_callback: Callable[[str], None] | None,
-    ) -> bool:
-        """Copia apenas arquivos suportados preservando subpastas.
-
-        Retorna True se ao menos um arquivo elegível foi copiado.
+        flights: Sequence[SharePointFlight],
+        destination_root: Path,
+        on_progress: Callable[[CopyProgress], None] | None = None,
+        max_workers: int = DEFAULT_COPY_WORKERS,
+        verify_hash: bool = False,
+        compression: str | None = None,
+    ) -> tuple[List[Path], List[str]]:
+        """Copia os logs de vários voos com um pool de threads compartilhado entre arquivos.
+
+        Arquivos que já existem no destino com o mesmo tamanho e mtime (e hash,
+        se ``verify_hash``) são pulados. Cada cópia é feita em blocos para um
+        ``.part`` que é renomeado no fim; uma cópia interrompida continua de
+        onde parou na próxima vez. ``on_progress`` é chamado na thread que
+        chamou este método, algumas vezes por segundo. Com ``compression``
+        ("gzip"/"xz") os logs .log/.csv são gravados comprimidos em blocos
+        (ver :mod:`src.utils.compressed_io`); esses não retomam do meio.
+        Retorna (pastas locais dos voos copiados sem erro, mensagens de erro).
         """
-
-        copied_any = False
-        print(f"[debug][_copy_logs_only] Varredura: {source}")
-        try:
-            entries = list(source.iterdir())
-        except OSError as exc:
-            print(f"  [debug][_copy_logs_only] Falha ao listar {source}: {exc}")
-            return copied_any
-
-        for entry in entries:
-            target = destination / entry.name
-            if entry.is_dir():
-                copied_child = self._copy_logs_only(entry, target, progress_callback)
-                copied_any = copied_any or copied_child
-                continue
-
-            if not entry.is_file():
-                continue
-
-            suffix = entry.suffix.lower()
-            if suffix not in SUPPORTED_LOG_EXTS:
-                print(f"  [debug][_copy_logs_only] Ignorando arquivo não suportado: {entry}")
-                continue
-
-            target.parent.mkdir(parents=True, exist_ok=True)
-            print(f"  [debug][_copy_logs_only] Copiando arquivo de log: {entry} -> {target}")
-            try:
-                shutil.copy2(entry, target)
-                copied_any = True
-                if progress_callback:
-                    progress_callback(entry.name)
-            except OSError as exc:
-                print(
-                    "  [debug][_copy_logs_only] Falha ao copiar arquivo; continuará com o restante: "
-                    f"{entry} -> {target} ({exc})"
-                )
-
-        return copied_any
+        workers = max(1, int(max_workers))
+        state = _CopyState()
+        errors: List[str] = []
+        targets: dict[str, Path] = {}
+        tasks: List[CopyTask] = []
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            if compression not in (None, *COMPRESSION_SUFFIXES):
+                raise ValueError(f"Compressão desconhecida: '{compression}'")
+            plans = {
+                pool.submit(self.plan_flight_copy, flight, destination_root, compression): flight
+                for flight in flights
+            }
+            for future, flight in plans.items():
+                try:
+                    target_dir, flight_tasks = future.result()
+                except Exception as exc:
+                    errors.append(f"{flight.name}: {exc}")
+                    continue
+                targets[str(flight.relative_path)] = target_dir
+                tasks.extend(flight_tasks)
+            # Uma agenda com logs também é listada como voo e contém os voos internos:
+            # o mesmo arquivo pode aparecer em dois voos com o mesmo destino.
+            unique: dict[Path, CopyTask] = {}
+            for task in tasks:
+                unique.setdefault(task.target, task)
+            tasks = list(unique.values())
+
+            state.files_total = len(tasks)
+            state.total_bytes = sum(task.size for task in tasks)
+            failed_flights: set[str] = set()
+            pending = {pool.submit(_copy_task, task, state, verify_hash): task for task in tasks}
+            while pending:
+                done, _ = wait(pending, timeout=PROGRESS_INTERVAL_S, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = pending.pop(future)
+                    try:
+                        future.result()
+                    except Exception as exc:
+                        failed_flights.add(str(task.flight.relative_path))
+                        errors.append(f"{task.flight.name}: {task.source.name}: {exc}")
+                        print(f"ERRO: Falha ao copiar {task.source} -> {task.target}: {exc}")
+                if on_progress:
+                    on_progress(state.snapshot())
+
+        if on_progress:
+            on_progress(state.snapshot())
+        print(
+            f"INFO: Cópia concluída: {state.files_done} arquivos ({state.skipped} já atualizados), "
+            f"{state.transferred_bytes / 1e6:.1f} MB transferidos."
+        )
+        local_paths = [path for key, path in targets.items() if key not in failed_flights]
+        return local_paths, errors
 
 
 def available_programs() -> Sequence[SharePointProgram]:
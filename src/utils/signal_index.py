@@ -0,0 +1,306 @@
+"""Índice invertido dos nomes de sinais de todos os logs carregados.
+
+Os logs embarcados expõem centenas de sinais (``Monit_*`` e os nomes
+mapeados por ``signal_name_map``); procurar um deles em dez logs pelos
+combos ordenados alfabeticamente é lento. Aqui cada sinal vira uma
+:class:`SignalEntry` (nome, aliases ``Monit_*``, unidade e logs em que
+existe) e os tokens do nome/aliases/unidade apontam para as entradas.
+
+A busca quebra a consulta em palavras; cada palavra casa por *prefixo* com
+os tokens (busca binária na lista ordenada de tokens) e as entradas que
+casam com todas as palavras são ordenadas por relevância. Sem resultado,
+cai numa busca aproximada por subsequência ("klsw" -> ``KillSwitch``).
+
+O índice é alimentado log a log enquanto o carregamento acontece (thread do
+``LogProcessingWorker``), então todas as operações passam por um lock.
+"""
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+import pandas as pd
+
+# Unidades dos sinais mais usados (os mesmos rótulos dos gráficos)
+SIGNAL_UNITS: Dict[str, str] = {
+    'Latitude': '°', 'Longitude': '°',
+    'AltitudeAbs': 'm', 'QNE': 'm', 'FW_altitude': 'm', 'GroundLevel': 'm', 'Altitude_PA1': 'm',
+    'VSI': 'm/s', 'ASI': 'm/s', 'WSI': 'm/s', 'vel_desired_xy': 'm/s',
+    'Roll': '°', 'Pitch': '°', 'Yaw': '°', 'WindDirection': '°', 'Declination': '°',
+    'EKF_roll': '°', 'EKF_pitch': '°', 'EKF_yaw': '°', 'DCM_roll': '°', 'DCM_pitch': '°', 'DCM_yaw': '°',
+    'AHRS_roll': 'rad', 'AHRS_pitch': 'rad', 'AHRS_yaw': 'rad',
+    'Voltage': 'V', 'VTOL_vbat': 'V', 'Filt_VDC': 'V',
+    'Porcent_bat': '%',
+    'RPM': 'rpm', 'CHT': '°C',
+    'Satellites': 'sat', 'Sat_use': 'sat', 'GNSS_NoS': 'sat',
+}
+# Sufixos de nome que já dizem a unidade
+UNIT_SUFFIXES: Tuple[Tuple[str, str], ...] = (
+    ('_cm', 'cm'), ('_deg', '°'), ('_rad', 'rad'), ('_ms', 'ms'), ('_pct', '%'),
+)
+DEFAULT_RESULT_LIMIT = 50
+
+_TOKEN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+# Consulta em minúsculas: letras e números viram palavras separadas ("s17" -> "s", "17")
+_QUERY_WORD = re.compile(r"[a-z]+|\d+|[^\sa-z\d_\-./]+")
+
+
+def signal_unit(name: str) -> str:
+    unit = SIGNAL_UNITS.get(name)
+    if unit is not None:
+        return unit
+    lower = name.lower()
+    for suffix, suffix_unit in UNIT_SUFFIXES:
+        if lower.endswith(suffix):
+            return suffix_unit
+    return ""
+
+
+def name_tokens(text: str) -> Set[str]:
+    """Tokens em minúsculas: partes do camelCase/snake_case, números e o nome inteiro."""
+    tokens = {token.lower() for token in _TOKEN.findall(text)}
+    tokens.add(text.lower())
+    return tokens
+
+
+def _default_aliases() -> Dict[str, Tuple[str, ...]]:
+    """Nome mapeado -> nomes ``Monit_*`` de origem (do ``signal_name_map`` do parser)."""
+    from src.data_parser import signal_name_map
+
+    reverse: Dict[str, List[str]] = {}
+    for raw, mapped in signal_name_map.items():
+        reverse.setdefault(mapped, []).append(raw)
+    return {mapped: tuple(sorted(raws)) for mapped, raws in reverse.items()}
+
+
+@dataclass
+class SignalEntry:
+    name: str
+    aliases: Tuple[str, ...] = ()
+    unit: str = ""
+    # Logs em que o sinal existe (ordem de carregamento)
+    logs: Dict[str, None] = field(default_factory=dict)
+
+
+class SignalMatch(NamedTuple):
+    entry: SignalEntry
+    score: int
+    # Onde a consulta casou: 'nome', 'alias', 'unidade' ou 'aproximado'
+    via: str
+
+
+class SignalIndex:
+    def __init__(self, aliases: Optional[Mapping[str, Iterable[str]]] = None):
+        self._lock = threading.RLock()
+        self._aliases = None if aliases is None else {k: tuple(v) for k, v in aliases.items()}
+        self._entries: List[SignalEntry] = []
+        self._by_name: Dict[str, int] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._sorted_tokens: Optional[List[str]] = None
+        # log -> (ref. fraca do DataFrame, colunas numéricas na ordem do DataFrame)
+        self._logs: Dict[str, Tuple[weakref.ref, List[str]]] = {}
+        # Logs com coluna Timestamp (eixos de tempo relativo sem consultar o DataFrame)
+        self._timed_logs: Set[str] = set()
+        # Muda a cada alteração (widgets usam para saber se precisam refazer a busca)
+        self.generation = 0
+
+    # ----------------------------------------------------------- montagem
+    def _alias_table(self) -> Dict[str, Tuple[str, ...]]:
+        if self._aliases is None:
+            try:
+                self._aliases = _default_aliases()
+            except Exception as exc:
+                print(f"AVISO: Aliases de sinais indisponíveis: {exc}")
+                self._aliases = {}
+        return self._aliases
+
+    def _entry_id(self, name: str) -> int:
+        entry_id = self._by_name.get(name)
+        if entry_id is not None:
+            return entry_id
+        aliases = self._alias_table().get(name, ())
+        unit = signal_unit(name)
+        entry_id = len(self._entries)
+        self._entries.append(SignalEntry(name, aliases, unit))
+        self._by_name[name] = entry_id
+        tokens = name_tokens(name)
+        for alias in aliases:
+            tokens |= name_tokens(alias)
+        if unit:
+            tokens.add(unit.lower())
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(entry_id)
+        self._sorted_tokens = None
+        return entry_id
+
+    def add_log(self, log_name: str, df: pd.DataFrame) -> int:
+        """Indexa as colunas numéricas do log; devolve quantos sinais novos surgiram."""
+        if df is None:
+            return 0
+        columns = [str(c) for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+        with self._lock:
+            known = self._logs.get(log_name)
+            if known is not None and known[0]() is df:
+                return 0
+            if known is not None:
+                self._drop_log(log_name)
+            before = len(self._entries)
+            self._logs[log_name] = (weakref.ref(df), columns)
+            if 'Timestamp' in df.columns:
+                self._timed_logs.add(log_name)
+            for column in columns:
+                if 'Timestamp' in column:
+                    continue
+                self._entries[self._entry_id(column)].logs[log_name] = None
+            self.generation += 1
+            return len(self._entries) - before
+
+    def _drop_log(self, log_name: str) -> None:
+        _ref, columns = self._logs.pop(log_name)
+        self._timed_logs.discard(log_name)
+        for column in columns:
+            entry_id = self._by_name.get(column)
+            if entry_id is not None:
+                self._entries[entry_id].logs.pop(log_name, None)
+
+    def remove_log(self, log_name: str) -> None:
+        with self._lock:
+            if log_name in self._logs:
+                self._drop_log(log_name)
+                self.generation += 1
+
+    def sync_logs(self, log_data: Mapping[str, pd.DataFrame]) -> None:
+        """Deixa o índice com os logs de ``log_data`` (só lê os que ainda não foram indexados).
+
+        Logs já indexados não são relidos: com o ``LogStore`` eles podem estar
+        em disco, e os nomes das colunas não mudam.
+        """
+        with self._lock:
+            for log_name in [name for name in self._logs if name not in log_data]:
+                self.remove_log(log_name)
+            for log_name in log_data:
+                if log_name not in self._logs:
+                    self.add_log(log_name, log_data[log_name])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_name.clear()
+            self._postings.clear()
+            self._sorted_tokens = None
+            self._logs.clear()
+            self._timed_logs.clear()
+            self.generation += 1
+
+    # ----------------------------------------------------------- consultas
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for entry in self._entries if entry.logs)
+
+    def log_names(self) -> List[str]:
+        with self._lock:
+            return list(self._logs)
+
+    def names(self) -> List[str]:
+        """Sinais presentes em pelo menos um log carregado."""
+        with self._lock:
+            return [entry.name for entry in self._entries if entry.logs]
+
+    def columns_for(self, log_name: str) -> List[str]:
+        """Colunas numéricas do log (já separadas na indexação, sem varrer o DataFrame)."""
+        with self._lock:
+            known = self._logs.get(log_name)
+            return list(known[1]) if known is not None else []
+
+    def has_timestamps(self, log_name: str) -> bool:
+        with self._lock:
+            return log_name in self._timed_logs
+
+    def entry(self, name: str) -> Optional[SignalEntry]:
+        with self._lock:
+            entry_id = self._by_name.get(name)
+            return self._entries[entry_id] if entry_id is not None else None
+
+    def _prefix_ids(self, word: str) -> Set[int]:
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        tokens = self._sorted_tokens
+        ids: Set[int] = set()
+        pos = bisect.bisect_left(tokens, word)
+        while pos < len(tokens) and tokens[pos].startswith(word):
+            ids |= self._postings[tokens[pos]]
+            pos += 1
+        return ids
+
+    def _score(self, entry: SignalEntry, query: str, words: List[str]) -> Tuple[int, str]:
+        name = entry.name.lower()
+        if name == query:
+            return 100, 'nome'
+        if name.startswith(query):
+            return 80, 'nome'
+        if query in name:
+            return 65, 'nome'
+        if entry.unit and entry.unit.lower() == query:
+            return 30, 'unidade'
+        tokens = name_tokens(entry.name)
+        if all(any(token.startswith(word) for token in tokens) for word in words):
+            return 60, 'nome'
+        if any(query in alias.lower() for alias in entry.aliases):
+            return 50, 'alias'
+        return 40, 'alias'
+
+    def search(self, query: str, *, limit: int = DEFAULT_RESULT_LIMIT,
+               log_name: Optional[str] = None) -> List[SignalMatch]:
+        """Sinais que casam com ``query`` (todas as palavras, por prefixo), mais relevantes primeiro.
+
+        ``log_name`` restringe aos sinais presentes naquele log.
+        """
+        query = query.strip().lower()
+        words = _QUERY_WORD.findall(query)
+        if not words:
+            return []
+        with self._lock:
+            # Consulta com símbolos que é um token inteiro (unidade "m/s", "°C"): casa direto
+            candidates: Optional[Set[int]] = None
+            if not query.replace("_", "").isalnum() and query in self._postings:
+                candidates = set(self._postings[query])
+                words = []
+            for word in sorted(words, key=len, reverse=True):
+                ids = self._prefix_ids(word)
+                candidates = ids if candidates is None else candidates & ids
+                if not candidates:
+                    break
+            matches: List[SignalMatch] = []
+            if candidates:
+                for entry_id in candidates:
+                    entry = self._entries[entry_id]
+                    if not entry.logs or (log_name is not None and log_name not in entry.logs):
+                        continue
+                    score, via = self._score(entry, query, words)
+                    matches.append(SignalMatch(entry, score, via))
+            else:
+                matches = self._fuzzy(query, log_name)
+        matches.sort(key=lambda m: (-m.score, -len(m.entry.logs), len(m.entry.name), m.entry.name))
+        return matches[:limit]
+
+    def _fuzzy(self, query: str, log_name: Optional[str]) -> List[SignalMatch]:
+        """Subsequência dos caracteres da consulta no nome (ou num alias)."""
+        compact = re.sub(r"[\s_\-./]+", "", query)
+        if len(compact) < 2:
+            return []
+        pattern = re.compile(".*?".join(re.escape(ch) for ch in compact), re.IGNORECASE)
+        matches = []
+        for entry in self._entries:
+            if not entry.logs or (log_name is not None and log_name not in entry.logs):
+                continue
+            found = pattern.search(entry.name)
+            if found is not None:
+                # Casamento mais compacto = mais relevante
+                matches.append(SignalMatch(entry, 20 - min(len(found.group(0)) - len(compact), 19), 'aproximado'))
+            elif any(pattern.search(alias) for alias in entry.aliases):
+                matches.append(SignalMatch(entry, 0, 'aproximado'))
+        return matches
@@ -0,0 +1,179 @@
+"""Medição do tempo de abertura do programa (``python run.py --profile-startup``).
+
+Com o perfil ativo, cada módulo importado é cronometrado por um finder no
+início de ``sys.meta_path``: o tempo *próprio* (sem os imports aninhados) é
+somado por pacote de topo (``pandas``, ``matplotlib``, ``src`` ...). Trechos
+da inicialização são marcados com :func:`section` e eventos pontuais com
+:func:`mark`. Sem perfil ativo essas funções não fazem nada, então podem
+ficar no código normal.
+
+Os tempos contam a partir de :func:`install`, chamado logo no início do
+``run.py`` (a partida do interpretador em si fica de fora).
+"""
+from __future__ import annotations
+
+import contextlib
+import importlib.abc
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_BUDGET_MS = 2500.0
+FIRST_PAINT_MARK = "primeira pintura da janela"
+DEFERRED_DONE_MARK = "inicialização adiada concluída"
+_TOP_PACKAGES = 12
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Embrulha o loader original só durante a execução do módulo."""
+
+    def __init__(self, profiler: "StartupProfiler", loader):
+        self._profiler = profiler
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Devolve o loader original ao módulo (importlib.resources, pkgutil...)
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        self._profiler._enter()
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._leave(module.__name__, time.perf_counter() - started)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(self._profiler, spec.loader)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.import_self_s: Dict[str, float] = {}
+        self.import_counts: Dict[str, int] = {}
+        self.sections: List[Tuple[str, float]] = []
+        self.marks: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._finder = _TimingFinder(self)
+
+    # ----------------------------------------------------------- imports
+    def _stack(self) -> List[float]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self) -> None:
+        # Acumula o tempo dos imports aninhados para descontar do pai
+        self._stack().append(0.0)
+
+    def _leave(self, name: str, elapsed: float) -> None:
+        stack = self._stack()
+        nested = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        package = name.partition(".")[0]
+        with self._lock:
+            self.import_self_s[package] = self.import_self_s.get(package, 0.0) + max(elapsed - nested, 0.0)
+            self.import_counts[package] = self.import_counts.get(package, 0) + 1
+
+    def install(self) -> None:
+        if self._finder not in sys.meta_path:
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    # ------------------------------------------------------------ trechos
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.origin) * 1000.0
+
+    def mark(self, name: str) -> None:
+        with self._lock:
+            self.marks.append((name, self.elapsed_ms()))
+
+    def mark_time(self, name: str) -> Optional[float]:
+        return next((at for label, at in self.marks if label == name), None)
+
+    @contextlib.contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.sections.append((name, (time.perf_counter() - started) * 1000.0))
+
+    # ----------------------------------------------------------- relatório
+    def report(self, budget_ms: float, milestone: str) -> str:
+        lines = ["", "=== Perfil de inicialização ==="]
+        total_import_ms = sum(self.import_self_s.values()) * 1000.0
+        modules = sum(self.import_counts.values())
+        lines.append(f"Imports: {total_import_ms:.0f} ms em {modules} módulos (tempo próprio por pacote):")
+        ranked = sorted(self.import_self_s.items(), key=lambda item: item[1], reverse=True)
+        for package, seconds in ranked[:_TOP_PACKAGES]:
+            lines.append(f"  {package:<24} {seconds * 1000.0:8.1f} ms  ({self.import_counts[package]} módulos)")
+        if len(ranked) > _TOP_PACKAGES:
+            rest = sum(seconds for _package, seconds in ranked[_TOP_PACKAGES:]) * 1000.0
+            lines.append(f"  {'(outros)':<24} {rest:8.1f} ms")
+        lines.append("Inicialização:")
+        for name, elapsed in self.sections:
+            lines.append(f"  {name:<40} {elapsed:8.1f} ms")
+        lines.append("Marcos (desde o início do run.py):")
+        for name, at in self.marks:
+            lines.append(f"  {name:<40} {at:8.1f} ms")
+        first_window = self.mark_time(milestone)
+        if first_window is None:
+            lines.append(f"ERRO: Marco '{milestone}' não foi atingido.")
+        else:
+            verdict = "dentro do" if first_window <= budget_ms else "ACIMA do"
+            lines.append(f"Tempo até a primeira janela: {first_window:.0f} ms ({verdict} orçamento de {budget_ms:.0f} ms)")
+        return "\n".join(lines)
+
+
+_active: Optional[StartupProfiler] = None
+
+
+def install() -> StartupProfiler:
+    """Ativa o perfil (idempotente) e passa a cronometrar os imports."""
+    global _active
+    if _active is None:
+        _active = StartupProfiler()
+    _active.install()
+    return _active
+
+
+def active() -> Optional[StartupProfiler]:
+    return _active
+
+
+def mark(name: str) -> None:
+    if _active is not None:
+        _active.mark(name)
+
+
+def section(name: str):
+    if _active is None:
+        return contextlib.nullcontext()
+    return _active.section(name)
@@ -0,0 +1,464 @@
+"""Cache em disco (LRU) para tiles de mapa e pré-carregamento por área de voo.
+
+O ``MapServer`` usa este módulo como proxy: o Leaflet (folium) e o Cesium
+pedem ``/tiles/<provedor>/{z}/{x}/{y}`` ao servidor local, que responde a
+partir do disco e só vai à internet quando o tile ainda não está em cache
+(ou nunca, no modo offline).
+"""
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+USER_AGENT = "XmobotsLogViewer/0.3 (tile cache)"
+FETCH_TIMEOUT_S = 8.0
+# Depois de uma falha de rede, evita novas tentativas por este intervalo
+# para não travar cada tile no timeout quando o notebook está sem internet.
+NETWORK_BACKOFF_S = 30.0
+MAX_TILE_ZOOM = 22
+# Últimos acessos (ordem do LRU) são gravados em lote: a cada N leituras ou após este intervalo
+ACCESS_FLUSH_BATCH = 256
+ACCESS_FLUSH_INTERVAL_S = 5.0
+# Conexões simultâneas no pré-carregamento (a política do OSM permite no máximo 2)
+SEED_MAX_WORKERS = 2
+
+
+@dataclass(slots=True)
+class TileProvider:
+    key: str
+    label: str
+    url: str  # template com {z}, {x}, {y} e opcionalmente {s}
+    credit: str = ""
+    max_zoom: int = 19
+    subdomains: Tuple[str, ...] = field(default_factory=tuple)
+    extension: str = "png"
+    # False para servidores cuja política proíbe download em massa/pré-carregamento
+    allows_seeding: bool = True
+
+    def upstream_url(self, z: int, x: int, y: int) -> str:
+        sub = self.subdomains[(x + y) % len(self.subdomains)] if self.subdomains else ""
+        return self.url.format(z=z, x=x, y=y, s=sub)
+
+
+DEFAULT_TILE_PROVIDERS: Dict[str, TileProvider] = {
+    "osm": TileProvider(
+        key="osm",
+        label="OpenStreetMap (padrão)",
+        url="https://tile.openstreetmap.org/{z}/{x}/{y}.png",
+        credit="© OpenStreetMap contributors",
+        max_zoom=19,
+        # https://operations.osmfoundation.org/policies/tiles/ (sem bulk download)
+        allows_seeding=False,
+    ),
+    "esriWorldImagery": TileProvider(
+        key="esriWorldImagery",
+        label="Esri World Imagery (satélite)",
+        url="https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}",
+        credit="Esri, Maxar, GeoEye, Earthstar Geographics",
+        max_zoom=19,
+        extension="jpg",
+    ),
+    "cartoDark": TileProvider(
+        key="cartoDark",
+        label="Carto Dark Matter",
+        url="https://cartodb-basemaps-{s}.global.ssl.fastly.net/dark_all/{z}/{x}/{y}.png",
+        credit="© CARTO",
+        max_zoom=19,
+        subdomains=("a", "b", "c", "d"),
+    ),
+}
+
+
+def _guess_content_type(data: bytes, fallback: str = "png") -> str:
+    if data.startswith(b"\x89PNG"):
+        return "image/png"
+    if data.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/jpeg" if fallback in ("jpg", "jpeg") else "image/png"
+
+
+def lonlat_to_tile(lon: float, lat: float, zoom: int) -> Tuple[int, int]:
+    """Converte lon/lat (graus) para índices de tile Web Mercator (XYZ)."""
+
+    lat = max(min(lat, 85.05112878), -85.05112878)
+    n = 1 << zoom
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_to_lonlat(x: float, y: float, zoom: int) -> Tuple[float, float]:
+    """Canto noroeste do tile (x, y) em lon/lat."""
+
+    n = float(1 << zoom)
+    lon = x / n * 360.0 - 180.0
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1.0 - 2.0 * y / n))))
+    return lon, lat
+
+
+def tiles_for_bbox(bbox: Sequence[float], zooms: Iterable[int]) -> Iterator[Tuple[int, int, int]]:
+    """Enumera (z, x, y) que cobrem ``bbox = (lon_min, lat_min, lon_max, lat_max)``."""
+
+    lon_min, lat_min, lon_max, lat_max = bbox
+    for z in zooms:
+        z = int(z)
+        if z < 0 or z > MAX_TILE_ZOOM:
+            continue
+        x0, y0 = lonlat_to_tile(lon_min, lat_max, z)
+        x1, y1 = lonlat_to_tile(lon_max, lat_min, z)
+        for x in range(min(x0, x1), max(x0, x1) + 1):
+            for y in range(min(y0, y1), max(y0, y1) + 1):
+                yield z, x, y
+
+
+def count_tiles_for_bbox(bbox: Sequence[float], zooms: Iterable[int]) -> int:
+    lon_min, lat_min, lon_max, lat_max = bbox
+    total = 0
+    for z in zooms:
+        x0, y0 = lonlat_to_tile(lon_min, lat_max, int(z))
+        x1, y1 = lonlat_to_tile(lon_max, lat_min, int(z))
+        total += (abs(x1 - x0) + 1) * (abs(y1 - y0) + 1)
+    return total
+
+
+class TileCache:
+    """Cache de tiles em disco com política LRU limitada por bytes.
+
+    Os tiles ficam em ``<raiz>/<provedor>/<z>/<x>/<y>.tile`` e um índice
+    SQLite guarda tamanho e último acesso de cada um, permitindo expulsar
+    os menos usados sem varrer o diretório inteiro.
+    """
+
+    def __init__(self, root: Path | str, max_bytes: int = 1024 * 1024 * 1024,
+                 providers: Optional[Dict[str, TileProvider]] = None,
+                 offline: bool = False):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.providers: Dict[str, TileProvider] = dict(providers or DEFAULT_TILE_PROVIDERS)
+        self.offline = bool(offline)
+        self._lock = threading.RLock()
+        self._network_down_until = 0.0
+        self._closed = False
+        # chave -> último acesso ainda não gravado no índice
+        self._pending_access: Dict[str, float] = {}
+        self._last_access_flush = time.monotonic()
+        self._db = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS tiles ("
+            " key TEXT PRIMARY KEY, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_tiles_access ON tiles(last_access)")
+        self._db.commit()
+        row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM tiles").fetchone()
+        self._total_bytes = int(row[0]) if row else 0
+
+    # ------------------------------------------------------------------ util
+    @staticmethod
+    def _key(provider: str, z: int, x: int, y: int) -> str:
+        return f"{provider}/{z}/{x}/{y}"
+
+    def _path_for(self, provider: str, z: int, x: int, y: int) -> Path:
+        return self.root / provider / str(z) / str(x) / f"{y}.tile"
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def set_offline(self, offline: bool) -> None:
+        self.offline = bool(offline)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self._flush_access_locked()
+                self._db.commit()
+                self._db.close()
+            except sqlite3.Error:
+                pass
+            self._closed = True
+
+    def _flush_access_locked(self) -> None:
+        """Grava (e comita) os últimos acessos acumulados por ``get_cached``."""
+        self._last_access_flush = time.monotonic()
+        if not self._pending_access:
+            return
+        pending = [(stamp, key) for key, stamp in self._pending_access.items()]
+        self._pending_access.clear()
+        self._db.executemany("UPDATE tiles SET last_access=? WHERE key=?", pending)
+        self._db.commit()
+
+    # ---------------------------------------------------------------- leitura
+    def get_cached(self, provider: str, z: int, x: int, y: int) -> Optional[bytes]:
+        path = self._path_for(provider, z, x, y)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        with self._lock:
+            if self._closed:
+                return data
+            self._pending_access[self._key(provider, z, x, y)] = time.time()
+            if (len(self._pending_access) >= ACCESS_FLUSH_BATCH
+                    or time.monotonic() - self._last_access_flush >= ACCESS_FLUSH_INTERVAL_S):
+                try:
+                    self._flush_access_locked()
+                except sqlite3.Error:
+                    pass
+        return data
+
+    def has_tile(self, provider: str, z: int, x: int, y: int) -> bool:
+        return self._path_for(provider, z, x, y).exists()
+
+    def get_tile(self, provider: str, z: int, x: int, y: int) -> Tuple[Optional[bytes], str]:
+        """Retorna (bytes, content_type) do tile, buscando na origem se preciso.
+
+        Quando o tile não está em cache e não há rede (ou o modo offline está
+        ativo) devolve ``(None, "")``.
+        """
+
+        prov = self.providers.get(provider)
+        if prov is None:
+            return None, ""
+        data = self.get_cached(provider, z, x, y)
+        if data is None:
+            data = self.fetch(provider, z, x, y)
+        if data is None:
+            return None, ""
+        return data, _guess_content_type(data, prov.extension)
+
+    # ------------------------------------------------------------------ rede
+    def network_available(self) -> bool:
+        return not self.offline and time.monotonic() >= self._network_down_until
+
+    def fetch(self, provider: str, z: int, x: int, y: int) -> Optional[bytes]:
+        prov = self.providers.get(provider)
+        if prov is None or z > prov.max_zoom or not self.network_available():
+            return None
+        request = urllib.request.Request(prov.upstream_url(z, x, y), headers={"User-Agent": USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT_S) as resp:
+                if resp.status != 200:
+                    return None
+                data = resp.read()
+        except urllib.error.HTTPError:
+            # Tile inexistente na origem (404 etc.): rede OK, só não há tile.
+            return None
+        except (urllib.error.URLError, OSError, TimeoutError) as exc:
+            self._network_down_until = time.monotonic() + NETWORK_BACKOFF_S
+            print(f"AVISO: Falha ao baixar tiles ({exc}). Servindo apenas o cache por {NETWORK_BACKOFF_S:.0f}s.")
+            return None
+        if data:
+            self.store(provider, z, x, y, data)
+        return data or None
+
+    # -------------------------------------------------------------- escrita
+    def store(self, provider: str, z: int, x: int, y: int, data: bytes) -> None:
+        path = self._path_for(provider, z, x, y)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".tmp{threading.get_ident()}")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            print(f"AVISO: Não foi possível gravar tile em cache ({exc}).")
+            return
+        key = self._key(provider, z, x, y)
+        with self._lock:
+            if self._closed:
+                return
+            self._pending_access.pop(key, None)
+            row = self._db.execute("SELECT size FROM tiles WHERE key=?", (key,)).fetchone()
+            previous = int(row[0]) if row else 0
+            self._db.execute(
+                "INSERT OR REPLACE INTO tiles(key, size, last_access) VALUES (?, ?, ?)",
+                (key, len(data), time.time()),
+            )
+            self._total_bytes += len(data) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict_locked()
+            else:
+                self._db.commit()
+
+    def _evict_locked(self) -> None:
+        # Ordem LRU com os acessos mais recentes já gravados
+        self._flush_access_locked()
+        # Libera até 90% do limite para não expulsar a cada novo tile.
+        target = int(self.max_bytes * 0.9)
+        cursor = self._db.execute("SELECT key, size FROM tiles ORDER BY last_access ASC")
+        removed: List[str] = []
+        for key, size in cursor:
+            if self._total_bytes <= target:
+                break
+            provider, z, x, y = key.split("/")
+            try:
+                self._path_for(provider, int(z), int(x), int(y)).unlink()
+            except OSError:
+                pass
+            self._total_bytes -= int(size)
+            removed.append(key)
+        if removed:
+            self._db.executemany("DELETE FROM tiles WHERE key=?", [(k,) for k in removed])
+        self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending_access.clear()
+            for key, in self._db.execute("SELECT key FROM tiles").fetchall():
+                provider, z, x, y = key.split("/")
+                try:
+                    self._path_for(provider, int(z), int(x), int(y)).unlink()
+                except OSError:
+                    pass
+            self._db.execute("DELETE FROM tiles")
+            self._db.commit()
+            self._total_bytes = 0
+
+
+@dataclass(slots=True)
+class SeedResult:
+    requested: int = 0
+    cached: int = 0
+    downloaded: int = 0
+    failed: int = 0
+    cancelled: bool = False
+
+
+def seed_tiles(cache: TileCache, providers: Sequence[str], bbox: Sequence[float],
+               zooms: Sequence[int], *, max_workers: int = SEED_MAX_WORKERS, max_tiles: int = 4000,
+               progress_callback: Optional[Callable[[int, int], None]] = None,
+               cancel_event: Optional[threading.Event] = None) -> SeedResult:
+    """Baixa para o cache todos os tiles do ``bbox`` nos ``zooms`` pedidos.
+
+    Roda em um ``ThreadPoolExecutor`` com no máximo :data:`SEED_MAX_WORKERS`
+    conexões; tiles já presentes no disco são contados sem tocar na rede.
+    Provedores com ``allows_seeding=False`` (OpenStreetMap) são ignorados e
+    ``max_tiles`` limita o total de tiles pedidos por área.
+    """
+
+    result = SeedResult()
+    zooms = sorted({int(z) for z in zooms})
+    jobs: List[Tuple[str, int, int, int]] = []
+    for provider in providers:
+        if provider not in cache.providers:
+            continue
+        if not cache.providers[provider].allows_seeding:
+            print(f"AVISO: O provedor '{provider}' não permite pré-carregamento; ignorado.")
+            continue
+        prov_zooms = [z for z in zooms if z <= cache.providers[provider].max_zoom]
+        for z, x, y in tiles_for_bbox(bbox, prov_zooms):
+            jobs.append((provider, z, x, y))
+            if len(jobs) >= max_tiles:
+                break
+        if len(jobs) >= max_tiles:
+            print(f"AVISO: Pré-carregamento limitado a {max_tiles} tiles.")
+            break
+
+    result.requested = len(jobs)
+    pending = []
+    for job in jobs:
+        if cache.has_tile(*job):
+            result.cached += 1
+        else:
+            pending.append(job)
+
+    done = result.cached
+    if progress_callback:
+        progress_callback(done, result.requested)
+    if not pending or not cache.network_available():
+        result.failed = len(pending)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, min(int(max_workers), SEED_MAX_WORKERS))) as pool:
+        futures = [pool.submit(cache.fetch, *job) for job in pending]
+        for future in as_completed(futures):
+            if cancel_event is not None and cancel_event.is_set():
+                result.cancelled = True
+                for f in futures:
+                    f.cancel()
+                break
+            try:
+                data = future.result()
+            except Exception:
+                data = None
+            if data:
+                result.downloaded += 1
+            else:
+                result.failed += 1
+            done += 1
+            if progress_callback:
+                progress_callback(done, result.requested)
+    return result
+
+
+def bbox_from_coordinates(lats, lons, margin_ratio: float = 0.1) -> Optional[Tuple[float, float, float, float]]:
+    """Calcula ``(lon_min, lat_min, lon_max, lat_max)`` com margem relativa."""
+
+    lat_arr = np.asarray(lats, dtype=float)
+    lon_arr = np.asarray(lons, dtype=float)
+    valid = np.isfinite(lat_arr) & np.isfinite(lon_arr) & ~((lat_arr == 0) & (lon_arr == 0))
+    if not valid.any():
+        return None
+    lat_min, lat_max = float(lat_arr[valid].min()), float(lat_arr[valid].max())
+    lon_min, lon_max = float(lon_arr[valid].min()), float(lon_arr[valid].max())
+    pad_lat = max((lat_max - lat_min) * margin_ratio, 0.002)
+    pad_lon = max((lon_max - lon_min) * margin_ratio, 0.002)
+    return lon_min - pad_lon, lat_min - pad_lat, lon_max + pad_lon, lat_max + pad_lat
+
+
+class TileSeedWorker(QObject):
+    """Executa ``seed_tiles`` fora da thread da GUI (padrão moveToThread)."""
+
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, cache: TileCache, providers: Sequence[str], bbox: Sequence[float],
+                 zooms: Sequence[int], *, max_workers: int = SEED_MAX_WORKERS, max_tiles: int = 4000):
+        super().__init__()
+        self.cache = cache
+        self.providers = list(providers)
+        self.bbox = tuple(bbox)
+        self.zooms = list(zooms)
+        self.max_workers = max_workers
+        self.max_tiles = max_tiles
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def wait_done(self, timeout: Optional[float] = None) -> bool:
+        """Espera ``run`` terminar (pool de downloads incluído); True se terminou."""
+        return self._done.wait(timeout)
+
+    def run(self):
+        try:
+            result = seed_tiles(
+                self.cache, self.providers, self.bbox, self.zooms,
+                max_workers=self.max_workers, max_tiles=self.max_tiles,
+                progress_callback=lambda done, total: self.progress.emit(done, total),
+                cancel_event=self._cancel,
+            )
+            self.finished.emit(result)
+        except Exception as exc:
+            self.error.emit(str(exc))
+        finally:
+            self._done.set()
@@ -0,0 +1,149 @@
+"""Verificação do :class:`TileCache` contra um servidor de tiles local (stand-in).
+
+Sobe um ``http.server`` em ``127.0.0.1`` que serve tiles sintéticos e conta
+as requisições, e exercita o cache sem tocar em servidores públicos:
+acerto/falta, 404 da origem, expulsão LRU pelo teto de bytes, modo offline,
+intervalo de espera após falha de rede e persistência do índice.
+
+Uso: ``python -m src.utils.tile_cache_check`` (código de saída 0 se tudo passar).
+"""
+from __future__ import annotations
+
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Sequence
+
+from src.utils.tile_cache import NETWORK_BACKOFF_S, TileCache, TileProvider
+
+TILE_BYTES = 1000
+# y que a origem responde com 404 (tile inexistente)
+MISSING_Y = 9999
+
+
+class _StandInTiles(BaseHTTPRequestHandler):
+    """``/{z}/{x}/{y}.png`` -> PNG sintético de ``TILE_BYTES`` bytes."""
+
+    requests: List[str] = []
+
+    def do_GET(self):
+        type(self).requests.append(self.path)
+        try:
+            z, x, y = (int(part) for part in self.path.strip("/").rsplit(".", 1)[0].split("/"))
+        except ValueError:
+            self.send_error(400)
+            return
+        if y == MISSING_Y:
+            self.send_error(404)
+            return
+        body = b"\x89PNG" + f"{z}/{x}/{y}".encode("ascii").ljust(TILE_BYTES - 4, b".")
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_checks() -> List[str]:
+    """Executa as verificações; devolve a lista de falhas (vazia = OK)."""
+    failures: List[str] = []
+
+    def check(condition: bool, label: str) -> None:
+        print(f"{'INFO' if condition else 'ERRO'}: {label}: {'ok' if condition else 'FALHOU'}")
+        if not condition:
+            failures.append(label)
+
+    _StandInTiles.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInTiles)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    providers = {
+        "local": TileProvider(key="local", label="Stand-in", url=base + "/{z}/{x}/{y}.png"),
+        "down": TileProvider(key="down", label="Fora do ar",
+                             url=f"http://127.0.0.1:{_closed_port()}" + "/{z}/{x}/{y}.png"),
+    }
+    root = tempfile.mkdtemp(prefix="tile-cache-check-")
+    cache: Optional[TileCache] = None
+    try:
+        cache = TileCache(root, max_bytes=5 * TILE_BYTES, providers=providers)
+
+        data, content_type = cache.get_tile("local", 3, 1, 1)
+        check(data is not None and len(data) == TILE_BYTES and content_type == "image/png"
+              and len(_StandInTiles.requests) == 1, "falta busca na origem e grava")
+        again, _ = cache.get_tile("local", 3, 1, 1)
+        check(again == data and len(_StandInTiles.requests) == 1, "acerto servido do disco sem rede")
+
+        missing, _ = cache.get_tile("local", 3, 1, MISSING_Y)
+        check(missing is None and cache.network_available(), "404 da origem não ativa a espera")
+
+        # LRU: 5 tiles enchem o teto; o 1º é relido e deve sobreviver à expulsão
+        for y in range(2, 6):
+            time.sleep(0.01)
+            cache.get_tile("local", 3, 1, y)
+        time.sleep(0.01)
+        cache.get_cached("local", 3, 1, 1)
+        for y in range(6, 8):
+            time.sleep(0.01)
+            cache.get_tile("local", 3, 1, y)
+        check(cache.total_bytes <= cache.max_bytes, "teto de bytes respeitado")
+        check(cache.has_tile("local", 3, 1, 1), "tile relido mantido (LRU)")
+        check(not cache.has_tile("local", 3, 1, 2) and not cache.has_tile("local", 3, 1, 3),
+              "tiles menos usados expulsos")
+
+        cache.set_offline(True)
+        before = len(_StandInTiles.requests)
+        offline, _ = cache.get_tile("local", 4, 0, 0)
+        check(offline is None and len(_StandInTiles.requests) == before, "modo offline não acessa a rede")
+        cached_offline, _ = cache.get_tile("local", 3, 1, 1)
+        check(cached_offline is not None, "modo offline ainda serve o cache")
+        cache.set_offline(False)
+
+        down, _ = cache.get_tile("down", 4, 0, 0)
+        remaining = cache._network_down_until - time.monotonic()
+        check(down is None and not cache.network_available()
+              and 0 < remaining <= NETWORK_BACKOFF_S, "falha de rede inicia a espera")
+        before = len(_StandInTiles.requests)
+        skipped, _ = cache.get_tile("local", 4, 1, 1)
+        check(skipped is None and len(_StandInTiles.requests) == before, "durante a espera não há novas tentativas")
+        cache._network_down_until = 0.0
+        resumed, _ = cache.get_tile("local", 4, 1, 1)
+        check(resumed is not None, "rede volta a ser usada após a espera")
+
+        total = cache.total_bytes
+        cache.close()
+        cache = TileCache(root, max_bytes=5 * TILE_BYTES, providers=providers)
+        check(cache.total_bytes == total and cache.get_cached("local", 3, 1, 1) is not None,
+              "índice persistido entre sessões")
+    finally:
+        if cache is not None:
+            cache.close()
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(root, ignore_errors=True)
+    return failures
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    failures = run_checks()
+    if failures:
+        print(f"ERRO: {len(failures)} verificação(ões) do cache de tiles falharam.")
+        return 1
+    print("INFO: Cache de tiles OK contra o servidor local.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+"""Alinhamento temporal de séries de logs diferentes (eixo X em tempo relativo).
+
+Cada log tem taxa de amostragem e instante inicial próprios. Para sobrepor o
+mesmo sinal de vários voos, o tempo é medido a partir de uma referência do
+log (início, decolagem ou primeira ocorrência de um evento) e os valores são
+interpolados numa grade comum ``k * passo``. O resultado fica em
+:class:`AlignedSeriesCache`, indexado por (log, sinal, grade): redesenhar ou
+sobrepor mais voos não repete a interpolação das séries já alinhadas.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.event_index import build_event_index, first_event_time
+from src.utils.frame_memo import FrameMemo, LogResultCache
+from src.utils.mode_utils import epoch_seconds_array
+
+REFERENCE_START = "start"
+REFERENCE_TAKEOFF = "takeoff"
+REFERENCE_EVENT = "event"
+REFERENCES: Tuple[str, ...] = (REFERENCE_START, REFERENCE_TAKEOFF, REFERENCE_EVENT)
+
+# Código de ModoVoo "TakeOff" na paleta de asa fixa (ver mode_utils)
+_FW_TAKEOFF_MODE = 9
+# Subida mínima (m) acima da altitude inicial para considerar decolagem
+_TAKEOFF_CLIMB_M = 10.0
+# Buracos maiores que N vezes o período típico não são interpolados
+_GAP_FACTOR = 5.0
+
+
+@dataclass(frozen=True)
+class TimeGrid:
+    """Grade comum de tempo relativo: pontos ``k * step`` segundos após a referência."""
+
+    reference: str = REFERENCE_START
+    step: float = 0.1
+    # Rótulo do evento (ver event_index.reference_label) quando reference == REFERENCE_EVENT
+    event: str = ""
+
+
+# ---------------------------------------------------------------- referências
+_MEMO = FrameMemo()
+
+
+def _timestamps(df: pd.DataFrame) -> np.ndarray:
+    store = _MEMO.store_for(df)
+    epochs = store.get('epochs')
+    if epochs is None:
+        if 'Timestamp' in df.columns:
+            epochs = epoch_seconds_array(df['Timestamp'])
+        else:
+            epochs = np.empty(0, dtype=float)
+        store['epochs'] = epochs
+    return epochs
+
+
+def _first_true(mask: np.ndarray) -> Optional[int]:
+    hits = np.flatnonzero(mask)
+    return int(hits[0]) if hits.size else None
+
+
+def _takeoff_index(df: pd.DataFrame) -> Optional[int]:
+    """Primeira amostra em voo: flag de decolagem VTOL, modo TakeOff ou subida de altitude."""
+    if 'in_vtol_takeoff' in df.columns:
+        idx = _first_true(pd.to_numeric(df['in_vtol_takeoff'], errors='coerce').fillna(0).to_numpy() > 0)
+        if idx is not None:
+            return idx
+    if 'ModoVoo' in df.columns:
+        is_rw = False
+        if 'isVTOL' in df.columns:
+            vtol = pd.to_numeric(df['isVTOL'], errors='coerce').dropna()
+            is_rw = bool(not vtol.empty and vtol.mean() >= 0.5)
+        if not is_rw:
+            idx = _first_true(pd.to_numeric(df['ModoVoo'], errors='coerce').to_numpy() == _FW_TAKEOFF_MODE)
+            if idx is not None:
+                return idx
+    if 'AltitudeAbs' in df.columns:
+        alt = pd.to_numeric(df['AltitudeAbs'], errors='coerce').to_numpy(dtype=float)
+        finite = alt[np.isfinite(alt)]
+        if finite.size:
+            baseline = float(np.median(finite[:max(10, finite.size // 50)]))
+            return _first_true(alt > baseline + _TAKEOFF_CLIMB_M)
+    return None
+
+
+def reference_time(df: pd.DataFrame, reference: str = REFERENCE_START, event: str = "") -> Optional[float]:
+    """Instante (s epoch) usado como zero do eixo relativo; None sem timestamps válidos.
+
+    Sem decolagem detectável, a referência de decolagem cai para o início do log.
+    A referência de evento é a primeira ocorrência de ``event`` entre os eventos
+    extraídos do DataFrame (flags, contadores e modos); o log que não tem o
+    evento fica sem referência (None).
+    """
+    if reference not in REFERENCES:
+        raise ValueError(f"Referência de tempo inválida: '{reference}'")
+    store = _MEMO.store_for(df)
+    key = ('reference', reference, event if reference == REFERENCE_EVENT else "")
+    if key in store:
+        return store[key]
+    epochs = _timestamps(df)
+    finite = np.flatnonzero(np.isfinite(epochs))
+    value = None
+    if finite.size:
+        value = float(epochs[finite[0]])
+        if reference == REFERENCE_TAKEOFF:
+            idx = _takeoff_index(df)
+            if idx is not None and np.isfinite(epochs[idx]):
+                value = float(epochs[idx])
+        elif reference == REFERENCE_EVENT:
+            value = first_event_time(build_event_index(df), event) if event else None
+    store[key] = value
+    return value
+
+
+def relative_seconds(df: pd.DataFrame, reference: str = REFERENCE_START, event: str = "") -> np.ndarray:
+    """Tempo (s) de cada amostra em relação à referência (NaN onde o timestamp é inválido)."""
+    zero = reference_time(df, reference, event)
+    epochs = _timestamps(df)
+    if zero is None:
+        return np.full(epochs.size, np.nan)
+    return epochs - zero
+
+
+# -------------------------------------------------------------- interpolação
+def align_to_grid(t: np.ndarray, values: np.ndarray, step: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Interpola ``values(t)`` nos pontos ``k * step`` dentro do intervalo coberto.
+
+    Amostras NaN são descartadas; pontos da grade que caem em buracos maiores
+    que ``_GAP_FACTOR`` períodos típicos ficam NaN (em vez de uma reta falsa).
+    """
+    t = np.asarray(t, dtype=float)
+    values = np.asarray(values, dtype=float)
+    valid = np.isfinite(t) & np.isfinite(values)
+    t, values = t[valid], values[valid]
+    if t.size < 2 or step <= 0:
+        return np.empty(0), np.empty(0)
+    if np.any(np.diff(t) < 0):
+        order = np.argsort(t, kind='stable')
+        t, values = t[order], values[order]
+    first, last = int(np.ceil(t[0] / step)), int(np.floor(t[-1] / step))
+    if last < first:
+        return np.empty(0), np.empty(0)
+    grid = np.arange(first, last + 1, dtype=float) * step
+    out = np.interp(grid, t, values)
+
+    dt = np.diff(t)
+    positive = dt[dt > 0]
+    if positive.size:
+        max_gap = _GAP_FACTOR * float(np.median(positive))
+        right = np.clip(np.searchsorted(t, grid, side='right'), 1, t.size - 1)
+        out[(t[right] - t[right - 1]) > max(max_gap, step)] = np.nan
+    return grid, out
+
+
+class AlignedSeriesCache(LogResultCache):
+    """Cache (log, sinal, grade) -> (tempo relativo, valores), validado pela identidade do DataFrame."""
+
+    def series(self, log_name: str, df: pd.DataFrame, signal: str, grid: TimeGrid) -> Tuple[np.ndarray, np.ndarray]:
+        """Sinal do log alinhado à grade, interpolando só na primeira vez."""
+        key = (log_name, signal, grid)
+        cached = self.get(df, key)
+        if cached is not None:
+            return cached
+        if signal not in df.columns:
+            aligned = (np.empty(0), np.empty(0))
+        else:
+            values = pd.to_numeric(df[signal], errors='coerce').to_numpy(dtype=float)
+            aligned = align_to_grid(relative_seconds(df, grid.reference, grid.event), values, grid.step)
+        self.put(key, aligned)
+        return aligned
@@ -0,0 +1,206 @@
+"""Pacote de dados da trajetória enviado às páginas web (mapa 2D, Cesium e timeline).
+
+As páginas são carregadas uma única vez; a cada troca de log o Python só
+publica este pacote (JSON colunar) no ``MapServer`` e chama
+``loadTrack(url)`` em cada página.
+"""
+from __future__ import annotations
+
+import json
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.utils.mode_utils import compute_mode_segments, epoch_seconds_array
+
+# (coluna, está em radianos?) — mesma ordem de preferência usada na GUI
+HEADING_CANDIDATES: Sequence[tuple] = (
+    ('Yaw', False),
+    ('Yaw_deg', False),
+    ('yaw', False),
+    ('Heading', False),
+    ('AHRS_yaw', True),
+    ('EKF_yaw', True),
+    ('DCM_yaw', True),
+    ('heading', False),
+)
+
+
+def epoch_ms_array(series: pd.Series) -> np.ndarray:
+    """Converte uma série de timestamps para ms desde a época (NaN onde inválido)."""
+
+    return epoch_seconds_array(series) * 1000.0
+
+
+def _numeric(df: pd.DataFrame, col: str) -> Optional[np.ndarray]:
+    if col not in df.columns:
+        return None
+    return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+
+
+def extract_heading_deg(df: pd.DataFrame) -> np.ndarray:
+    """Rumo em graus [-180, 180) usando a primeira coluna candidata válida por amostra."""
+
+    heading = np.full(len(df), np.nan)
+    for col, is_radians in HEADING_CANDIDATES:
+        values = _numeric(df, col)
+        if values is None:
+            continue
+        if is_radians:
+            values = np.degrees(values)
+        missing = np.isnan(heading)
+        if not missing.any():
+            break
+        heading[missing] = values[missing]
+    heading = ((heading + 180.0) % 360.0) - 180.0
+    return np.nan_to_num(heading, nan=0.0)
+
+
+def altitude_reference(df: pd.DataFrame) -> float:
+    alt = _numeric(df, 'AltitudeAbs')
+    if alt is None:
+        return 0.0
+    valid = alt[np.isfinite(alt)]
+    return float(valid[0]) if valid.size else 0.0
+
+
+def relative_altitude(df: pd.DataFrame, reference: Optional[float] = None) -> np.ndarray:
+    alt = _numeric(df, 'AltitudeAbs')
+    if alt is None:
+        return np.zeros(len(df))
+    ref = altitude_reference(df) if reference is None else float(reference)
+    rel = np.maximum(0.0, alt - ref)
+    return np.nan_to_num(rel, nan=0.0)
+
+
+def _json_list(values: np.ndarray, decimals: Optional[int] = None) -> List:
+    arr = np.asarray(values, dtype=float)
+    if decimals is not None:
+        arr = np.round(arr, decimals)
+    out = arr.tolist()
+    for idx in np.flatnonzero(~np.isfinite(arr)):
+        out[idx] = None
+    return out
+
+
+def _mode_index_ranges(time_s: np.ndarray, segments) -> List[Dict]:
+    """Converte segmentos de modo (em tempo) para intervalos de índice [start, end]."""
+
+    if not segments or time_s.size == 0:
+        return []
+    filled = pd.Series(time_s).ffill().bfill().to_numpy()
+    monotonic = bool(np.all(np.diff(filled) >= 0)) if filled.size > 1 else True
+    ranges = []
+    for seg in segments:
+        if monotonic:
+            start = int(np.searchsorted(filled, seg.start, side='left'))
+            end = int(np.searchsorted(filled, seg.end, side='right')) - 1
+        else:
+            idx = np.flatnonzero((filled >= seg.start) & (filled <= seg.end))
+            if idx.size == 0:
+                continue
+            start, end = int(idx[0]), int(idx[-1])
+        if end <= start:
+            continue
+        ranges.append({
+            'mode': int(seg.mode_value),
+            'label': seg.label,
+            'color': list(seg.color),
+            'start': start,
+            'end': end,
+        })
+    return ranges
+
+
+def build_track_payload(df: pd.DataFrame, *, altitude_ref: Optional[float] = None, segments=None) -> Dict:
+    """Monta o pacote colunar com todas as amostras do log (índice = linha do DataFrame)."""
+
+    empty = {
+        'version': 1,
+        'count': 0,
+        'hasGps': False,
+        'timeMs': [], 'lat': [], 'lon': [], 'alt': [],
+        'heading': [], 'pitch': [], 'roll': [], 'mode': [],
+        'windDir': [], 'windSpeed': [],
+        'modePaths': [], 'modeBlocks': [],
+        'bounds': None, 'startMs': None, 'endMs': None,
+    }
+    if df is None or df.empty:
+        return empty
+
+    n = len(df)
+    time_ms = epoch_ms_array(df['Timestamp']) if 'Timestamp' in df.columns else np.full(n, np.nan)
+    lat = _numeric(df, 'Latitude')
+    lon = _numeric(df, 'Longitude')
+    if lat is None or lon is None:
+        lat = np.full(n, np.nan)
+        lon = np.full(n, np.nan)
+    gps_valid = np.isfinite(lat) & np.isfinite(lon)
+    lat = np.where(gps_valid, lat, np.nan)
+    lon = np.where(gps_valid, lon, np.nan)
+
+    pitch = _numeric(df, 'Pitch')
+    roll = _numeric(df, 'Roll')
+    mode = _numeric(df, 'ModoVoo')
+    wind_dir = _numeric(df, 'WindDirection')
+    wind_speed = _numeric(df, 'WSI')
+
+    if segments is None:
+        segments = compute_mode_segments(df)
+    mode_paths = _mode_index_ranges(time_ms / 1000.0, segments) if gps_valid.any() else []
+    mode_blocks = [
+        {'startMs': int(seg.start * 1000), 'endMs': int(seg.end * 1000), 'color': list(seg.color), 'label': seg.label}
+        for seg in segments if seg.end > seg.start
+    ]
+
+    bounds = None
+    if gps_valid.any():
+        bounds = [
+            [float(np.min(lat[gps_valid])), float(np.min(lon[gps_valid]))],
+            [float(np.max(lat[gps_valid])), float(np.max(lon[gps_valid]))],
+        ]
+    finite_times = time_ms[np.isfinite(time_ms)]
+
+    return {
+        'version': 1,
+        'count': n,
+        'hasGps': bool(gps_valid.sum() >= 2),
+        'timeMs': _json_list(time_ms, 0),
+        'lat': _json_list(lat),
+        'lon': _json_list(lon),
+        'alt': _json_list(relative_altitude(df, altitude_ref), 2),
+        'heading': _json_list(extract_heading_deg(df), 2),
+        'pitch': _json_list(np.nan_to_num(pitch, nan=0.0) if pitch is not None else np.zeros(n), 2),
+        'roll': _json_list(np.nan_to_num(roll, nan=0.0) if roll is not None else np.zeros(n), 2),
+        'mode': _json_list(mode, 0) if mode is not None else [None] * n,
+        'windDir': _json_list(np.nan_to_num(wind_dir, nan=0.0) if wind_dir is not None else np.zeros(n), 1),
+        'windSpeed': _json_list(np.nan_to_num(wind_speed, nan=0.0) if wind_speed is not None else np.zeros(n), 1),
+        'modePaths': mode_paths,
+        'modeBlocks': mode_blocks,
+        'bounds': bounds,
+        'startMs': float(finite_times.min()) if finite_times.size else None,
+        'endMs': float(finite_times.max()) if finite_times.size else None,
+    }
+
+
+def encode_payload(payload: Dict) -> bytes:
+    return json.dumps(payload, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+
+def summarize_payload(payload: Dict) -> Optional[Dict]:
+    """Resumo usado pela GUI para habilitar a visualização 3D."""
+
+    if not payload or not payload.get('hasGps'):
+        return None
+    lat = payload.get('lat') or []
+    count = sum(1 for v in lat if v is not None and not (isinstance(v, float) and math.isnan(v)))
+    if count < 2:
+        return None
+    return {
+        'count': count,
+        'startMs': payload.get('startMs'),
+        'endMs': payload.get('endMs'),
+        'hasModes': any(m is not None for m in (payload.get('mode') or [])),
+    }
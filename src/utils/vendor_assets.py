@@ -0,0 +1,198 @@
+"""Runtimes web (Cesium, Leaflet/folium) empacotados em ``assets/vendor``.
+
+O ``MapServer`` publica essa pasta em ``/vendor/`` com cache HTTP longo,
+então as páginas 2D/3D não dependem de CDN nem revalidam megabytes a cada
+troca de log. Quando os arquivos ainda não foram baixados, as funções deste
+módulo devolvem as URLs originais do CDN para manter o app funcionando.
+
+Para popular a pasta (antes de gerar o executável com o PyInstaller)::
+
+    python -m src.utils.vendor_assets
+"""
+from __future__ import annotations
+
+import io
+import posixpath
+import re
+import shutil
+import sys
+import tarfile
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from src.utils.resource_paths import resource_path
+
+CESIUM_VERSION = "1.121.0"
+CESIUM_CDN_BASE = f"https://cdn.jsdelivr.net/npm/cesium@{CESIUM_VERSION}/Build/Cesium/"
+CESIUM_NPM_TARBALL = f"https://registry.npmjs.org/cesium/-/cesium-{CESIUM_VERSION}.tgz"
+LEAFLET_CDN_JS = "https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"
+LEAFLET_CDN_CSS = "https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css"
+
+VENDOR_ROUTE = "/vendor/"
+USER_AGENT = "XmobotsLogViewer/0.3 (vendor fetch)"
+
+_CSS_URL_RE = re.compile(r"url\(\s*['\"]?([^'\")]+)['\"]?\s*\)")
+
+
+def vendor_root() -> Path:
+    return resource_path("assets", "vendor")
+
+
+def _cesium_dir() -> Path:
+    return vendor_root() / "cesium"
+
+
+def has_local_cesium() -> bool:
+    return (_cesium_dir() / "Cesium.js").exists()
+
+
+def cesium_base_url(port: int) -> str:
+    """Base do runtime do Cesium (termina com ``/``): local se disponível, senão CDN."""
+
+    if has_local_cesium():
+        return f"http://127.0.0.1:{port}{VENDOR_ROUTE}cesium/"
+    return CESIUM_CDN_BASE
+
+
+def _mirror_relpath(url: str) -> str:
+    """Caminho local espelhando host + path da URL (``web/<host>/<path>``)."""
+
+    parsed = urllib.parse.urlsplit(url)
+    path = posixpath.normpath(parsed.path).lstrip("/")
+    return posixpath.join("web", parsed.netloc, path)
+
+
+def local_url_for(url: str, port: int) -> str:
+    """Troca uma URL de CDN pela cópia espelhada em ``/vendor/web`` se existir."""
+
+    relpath = _mirror_relpath(url)
+    if (vendor_root() / Path(*relpath.split("/"))).exists():
+        return f"http://127.0.0.1:{port}{VENDOR_ROUTE}{relpath}"
+    return url
+
+
+def localize_folium_resources(folium_map, port: int) -> None:
+    """Aponta JS/CSS padrão do folium (Leaflet, jQuery, Bootstrap...) para o espelho local."""
+
+    folium_map.default_js = [(name, local_url_for(url, port)) for name, url in folium_map.default_js]
+    folium_map.default_css = [(name, local_url_for(url, port)) for name, url in folium_map.default_css]
+
+
+def folium_resource_urls() -> List[Tuple[str, str]]:
+    import folium
+
+    urls: List[Tuple[str, str]] = []
+    urls.extend(getattr(folium.Map, "default_js", []))
+    urls.extend(getattr(folium.Map, "default_css", []))
+    return urls
+
+
+def leaflet_resource_urls(port: int) -> Tuple[str, str]:
+    """(JS, CSS) do Leaflet na mesma versão usada pelo folium, preferindo o espelho local."""
+
+    js_url, css_url = LEAFLET_CDN_JS, LEAFLET_CDN_CSS
+    try:
+        for name, url in folium_resource_urls():
+            if name == "leaflet":
+                js_url = url
+            elif name == "leaflet_css":
+                css_url = url
+    except Exception as exc:
+        print(f"AVISO: Recursos do folium indisponíveis, usando Leaflet do CDN: {exc}")
+    return local_url_for(js_url, port), local_url_for(css_url, port)
+
+
+def warmup_resource_urls(port: int) -> List[str]:
+    """URLs que a página de pré-aquecimento carrega para popular o cache HTTP."""
+
+    base = cesium_base_url(port)
+    urls = [base + "Cesium.js", base + "Widgets/widgets.css"]
+    for _name, url in folium_resource_urls():
+        urls.append(local_url_for(url, port))
+    return urls
+
+
+# ----------------------------------------------------------------- download
+def _download(url: str) -> bytes:
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=60) as resp:
+        return resp.read()
+
+
+def _mirror_url(url: str, root: Path, seen: set) -> None:
+    if url in seen or not url.lower().startswith(("http://", "https://")):
+        return
+    seen.add(url)
+    target = root / Path(*_mirror_relpath(url).split("/"))
+    if not target.exists():
+        print(f"INFO: Baixando {url}")
+        data = _download(url)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+    else:
+        data = target.read_bytes()
+
+    if target.suffix.lower() == ".css":
+        # Fontes e imagens referenciadas pelo CSS (ex.: ../webfonts/fa-solid-900.woff2)
+        text = data.decode("utf-8", errors="ignore")
+        for ref in _CSS_URL_RE.findall(text):
+            if ref.startswith("data:"):
+                continue
+            absolute = urllib.parse.urljoin(url, ref.split("#", 1)[0].split("?", 1)[0])
+            try:
+                _mirror_url(absolute, root, seen)
+            except Exception as exc:
+                print(f"AVISO: Recurso '{absolute}' não baixado: {exc}")
+
+
+def fetch_cesium(root: Optional[Path] = None, *, force: bool = False) -> Path:
+    """Extrai ``Build/Cesium`` do pacote npm do Cesium para ``assets/vendor/cesium``."""
+
+    root = Path(root) if root else vendor_root()
+    dest = root / "cesium"
+    if (dest / "Cesium.js").exists() and not force:
+        print(f"INFO: Cesium {CESIUM_VERSION} já presente em {dest}")
+        return dest
+    print(f"INFO: Baixando Cesium {CESIUM_VERSION} ({CESIUM_NPM_TARBALL})...")
+    payload = _download(CESIUM_NPM_TARBALL)
+    prefix = "package/Build/Cesium/"
+    if dest.exists():
+        shutil.rmtree(dest)
+    with tarfile.open(fileobj=io.BytesIO(payload), mode="r:gz") as tar:
+        for member in tar.getmembers():
+            if not member.isfile() or not member.name.startswith(prefix):
+                continue
+            rel = member.name[len(prefix):]
+            if not rel or ".." in Path(rel).parts:
+                continue
+            out_path = dest / rel
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            with tar.extractfile(member) as src, open(out_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+    print(f"INFO: Cesium extraído em {dest}")
+    return dest
+
+
+def fetch_folium_resources(root: Optional[Path] = None) -> None:
+    root = Path(root) if root else vendor_root()
+    seen: set = set()
+    for _name, url in folium_resource_urls():
+        try:
+            _mirror_url(url, root, seen)
+        except Exception as exc:
+            print(f"ERRO: Falha ao baixar '{url}': {exc}")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = list(argv if argv is not None else sys.argv[1:])
+    force = "--force" in args
+    fetch_cesium(force=force)
+    fetch_folium_resources()
+    print(f"INFO: Runtimes web prontos em {vendor_root()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
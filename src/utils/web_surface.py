@@ -0,0 +1,598 @@
+"""Página web única com mapa 2D, globo 3D e timeline (modo "superfície única").
+
+Em vez de três ``QWebEngineView`` (três renderers, três heaps JS e três
+canais de ``runJavaScript``), esta página hospeda os três painéis num único
+documento:
+
+* um único ``loadTrack(url)`` baixa o pacote colunar de ``track_payload`` e
+  os painéis leem os mesmos arrays;
+* um único ``Cesium.Clock`` alimenta a timeline e o globo; o mapa 2D é
+  atualizado pelo mesmo ``setTimelineIndex``;
+* o ``Cesium.Viewer`` (contexto WebGL) só é criado na primeira vez que o
+  painel 3D é exibido e para de renderizar quando o 2D volta à frente.
+
+A API exposta ao Qt é a mesma das páginas separadas (``loadTrack``,
+``setTimelineIndex``, ``updateMarkers``, ``setImageryLayer``,
+``centerCameraOnAircraft``, ``setFollowMode``) mais ``setActivePane``.
+"""
+from __future__ import annotations
+
+import json
+from string import Template
+from typing import Dict, List, Optional
+
+SURFACE_MAP_JS_NAME = "surfaceMap"
+
+_SURFACE_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang='pt-BR'>
+<head>
+    <meta charset='utf-8'>
+    <title>Mapa / 3D / Timeline</title>
+    <link rel='stylesheet' href='${LEAFLET_CSS}'>
+    <link rel='stylesheet' href='${CESIUM_BASE}Widgets/widgets.css'>
+    <style>
+        html, body {
+            width: 100%;
+            height: 100%;
+            margin: 0;
+            padding: 0;
+            overflow: hidden;
+            background: #01030a;
+        }
+        body {
+            display: flex;
+            flex-direction: column;
+        }
+        #panes {
+            position: relative;
+            flex: 1 1 auto;
+            min-height: 0;
+        }
+        #mapPane, #globePane {
+            position: absolute;
+            top: 0; left: 0; right: 0; bottom: 0;
+        }
+        #globePane {
+            display: none;
+        }
+        #timelinePane {
+            position: relative;
+            flex: 0 0 45px;
+            height: 45px;
+        }
+        #no-gps-overlay {
+            display: none;
+            position: absolute;
+            z-index: 1000;
+            top: 40%;
+            width: 100%;
+            text-align: center;
+            font: bold 22px sans-serif;
+            color: #333;
+            pointer-events: none;
+        }
+        #hud {
+            display: none;
+            position: absolute;
+            z-index: 10;
+            top: 12px;
+            left: 12px;
+            background: rgba(0, 0, 0, 0.55);
+            border-radius: 10px;
+            padding: 10px 14px;
+            font-family: 'Segoe UI', Arial, sans-serif;
+            color: #f8f9fa;
+            font-size: 13px;
+            line-height: 1.4;
+            min-width: 160px;
+        }
+        #hud strong {
+            color: #4dabf7;
+        }
+    </style>
+</head>
+<body>
+    <div id='panes'>
+        <div id='mapPane'></div>
+        <div id='globePane'></div>
+        <div id='no-gps-overlay'>Mas num tem dado GPS meu filho!!</div>
+        <div id='hud'>
+            <div><strong>Lat:</strong> <span id='hud-lat'>--</span></div>
+            <div><strong>Lon:</strong> <span id='hud-lon'>--</span></div>
+            <div><strong>Alt:</strong> <span id='hud-alt'>--</span> m</div>
+            <div><strong>Pitch:</strong> <span id='hud-pitch'>--</span>°</div>
+            <div><strong>Roll:</strong> <span id='hud-roll'>--</span>°</div>
+        </div>
+    </div>
+    <div id='timelinePane'></div>
+    <script>window.CESIUM_BASE_URL = '${CESIUM_BASE}';</script>
+    <script src='${LEAFLET_JS}'></script>
+    <script src='${CESIUM_BASE}Cesium.js'></script>
+    <script>
+        (function () {
+            const imageryConfigsArray = $IMAGERY_CONFIG_JSON;
+            const imageryConfigs = imageryConfigsArray.reduce(function (acc, cfg) {
+                acc[cfg.key] = cfg;
+                return acc;
+            }, {});
+            const mapImageryKey = $MAP_IMAGERY_KEY;
+            const planeUrl = $PLANE_LITERAL;
+            const aircraftIconUrl = $AIRCRAFT_ICON_LITERAL;
+            const windIconUrl = $WIND_ICON_LITERAL;
+            let imageryKey = $DEFAULT_IMAGERY_KEY;
+            let followEnabled = true;
+            let activePane = '2d';
+
+            // --- Buffer e relógio compartilhados pelos três painéis ---
+            let track = null;
+            let timeIndex = new Float64Array(0);
+            let currentIndex = -1;
+            let pendingIndex = 0;
+            const clock = new Cesium.Clock({
+                clockRange: Cesium.ClockRange.CLAMPED,
+                shouldAnimate: false
+            });
+            window.__currentTimelineIndex = 0;
+
+            function julianFromMs(ms) { return Cesium.JulianDate.fromDate(new Date(ms)); }
+            function msFromJulian(jd) { return Cesium.JulianDate.toDate(jd).getTime(); }
+            function sampleValid(i) {
+                return !!track && track.lat[i] !== null && track.lon[i] !== null;
+            }
+            function numberOr(value, fallback) {
+                return Number.isFinite(value) ? value : fallback;
+            }
+            function rgbToHex(rgb) {
+                if (!Array.isArray(rgb) || rgb.length < 3) return '#2196f3';
+                return '#' + rgb.slice(0, 3).map(function (v) {
+                    const h = Math.max(0, Math.min(255, Math.round(v))).toString(16);
+                    return h.length === 1 ? '0' + h : h;
+                }).join('');
+            }
+            function buildTimeIndex(times) {
+                // Preenche lacunas (null) para permitir busca binária monotônica
+                const arr = new Float64Array(times.length);
+                let last = NaN;
+                for (let i = 0; i < times.length; i++) {
+                    const t = times[i];
+                    if (t !== null && Number.isFinite(t)) last = t;
+                    arr[i] = last;
+                }
+                let next = NaN;
+                for (let i = arr.length - 1; i >= 0; i--) {
+                    if (Number.isFinite(arr[i])) { next = arr[i]; break; }
+                }
+                for (let i = 0; i < arr.length && !Number.isFinite(arr[i]); i++) arr[i] = next;
+                return arr;
+            }
+            function findIndexForMs(ms) {
+                let lo = 0;
+                let hi = timeIndex.length - 1;
+                if (hi < 0) return 0;
+                if (ms <= timeIndex[0]) return 0;
+                if (ms >= timeIndex[hi]) return hi;
+                while (lo < hi) {
+                    const mid = (lo + hi + 1) >> 1;
+                    if (timeIndex[mid] <= ms) lo = mid; else hi = mid - 1;
+                }
+                return lo;
+            }
+
+            // --- Painel 2D (Leaflet) ---
+            const map = L.map('mapPane', { preferCanvas: true }).setView([-15.7, -47.9], 4);
+            window[$MAP_JS_NAME] = map;
+            const mapTiles = imageryConfigs[mapImageryKey] || imageryConfigsArray[0];
+            if (mapTiles) {
+                L.tileLayer(mapTiles.url, {
+                    maxZoom: numberOr(mapTiles.maximumLevel, 19),
+                    subdomains: (mapTiles.subdomains && mapTiles.subdomains.length) ? mapTiles.subdomains : 'abc',
+                    attribution: mapTiles.credit || ''
+                }).addTo(map);
+            }
+            let aircraftMarker;
+            if (aircraftIconUrl) {
+                aircraftMarker = L.marker([-15.7, -47.9], {
+                    icon: L.divIcon({
+                        className: '',
+                        html: "<img id='aircraft-img' src='" + aircraftIconUrl + "' style='width:60px;height:60px;transform-origin:center center;'>",
+                        iconSize: [60, 60],
+                        iconAnchor: [30, 30]
+                    })
+                }).bindPopup('Aeronave').addTo(map);
+            } else {
+                aircraftMarker = L.circleMarker([-15.7, -47.9], { radius: 6, color: 'red', fill: true }).bindPopup('Aeronave (Fallback)').addTo(map);
+            }
+            let windMarker = null;
+            if (windIconUrl) {
+                windMarker = L.marker([-15.7, -47.9], {
+                    icon: L.divIcon({
+                        className: '',
+                        html: "<img id='wind-arrow-img' src='" + windIconUrl + "' style='width:120px;height:120px;transform-origin:center center;'>",
+                        iconSize: [120, 120],
+                        iconAnchor: [60, 60]
+                    }),
+                    interactive: false,
+                    keyboard: false
+                }).addTo(map);
+            }
+            let trackLayer = null;
+
+            window.updateMarkers = function (lat, lon, aircraftYaw, windDir, windSpeed) {
+                const latlng = L.latLng(lat, lon);
+                aircraftMarker.setLatLng(latlng);
+                const aircraftImg = document.getElementById('aircraft-img');
+                if (aircraftImg) {
+                    // Assumindo SVG do avião aponta para CIMA
+                    aircraftImg.style.transform = 'rotate(' + aircraftYaw + 'deg)';
+                }
+                if (windMarker) {
+                    windMarker.setLatLng(latlng);
+                    const windImg = document.getElementById('wind-arrow-img');
+                    if (windImg) {
+                        const opacity = 0.8 + (Math.min(windSpeed, 20) / 20) * 0.7;
+                        const scale = 0.7 + (Math.min(windSpeed, 15) / 15);
+                        windImg.style.opacity = opacity.toFixed(2);
+                        windImg.style.transform = 'rotate(' + windDir + 'deg) scale(' + scale.toFixed(2) + ')';
+                    }
+                }
+            };
+
+            function applyTrackToMap() {
+                if (trackLayer) {
+                    trackLayer.remove();
+                    trackLayer = null;
+                }
+                const hasGps = !!(track && track.hasGps);
+                document.getElementById('no-gps-overlay').style.display = (track && track.count && !hasGps) ? 'block' : 'none';
+                if (!hasGps) return;
+                trackLayer = L.layerGroup().addTo(map);
+                function pointsBetween(a, b) {
+                    const pts = [];
+                    for (let i = Math.max(0, a); i <= Math.min(track.count - 1, b); i++) {
+                        if (sampleValid(i)) pts.push([track.lat[i], track.lon[i]]);
+                    }
+                    return pts;
+                }
+                const paths = track.modePaths || [];
+                if (paths.length) {
+                    paths.forEach(function (seg) {
+                        const pts = pointsBetween(seg.start, seg.end);
+                        if (pts.length < 2) return;
+                        L.polyline(pts, { color: rgbToHex(seg.color), weight: 3, opacity: 0.9 })
+                            .bindTooltip(seg.label || '')
+                            .addTo(trackLayer);
+                    });
+                } else {
+                    L.polyline(pointsBetween(0, track.count - 1), { color: 'blue', weight: 3, opacity: 0.8 }).addTo(trackLayer);
+                }
+                let first = -1, last = -1;
+                for (let i = 0; i < track.count; i++) { if (sampleValid(i)) { first = i; break; } }
+                for (let j = track.count - 1; j >= 0; j--) { if (sampleValid(j)) { last = j; break; } }
+                if (first >= 0) {
+                    L.circleMarker([track.lat[first], track.lon[first]], { radius: 7, color: 'green', fill: true }).bindPopup('Início').addTo(trackLayer);
+                    L.circleMarker([track.lat[last], track.lon[last]], { radius: 7, color: 'red', fill: true }).bindPopup('Fim').addTo(trackLayer);
+                }
+                if (track.bounds) {
+                    map.fitBounds(track.bounds, { padding: [20, 20], maxZoom: 17 });
+                }
+            }
+
+            // --- Timeline (widget do Cesium ligado ao relógio compartilhado) ---
+            const timeline = new Cesium.Timeline(document.getElementById('timelinePane'), clock);
+            timeline.addEventListener('settime', function (e) {
+                clock.shouldAnimate = false;
+                clock.currentTime = e.timeJulian;
+                setIndex(findIndexForMs(msFromJulian(e.timeJulian)), false);
+            }, false);
+
+            // --- Painel 3D (criado sob demanda) ---
+            let globe = null;
+            const scratchHPR = new Cesium.HeadingPitchRoll();
+            const headingOffset = Cesium.Math.toRadians(-90.0);
+
+            function radiansOrZero(valueDeg) {
+                return Cesium.Math.toRadians(numberOr(valueDeg, 0.0));
+            }
+            function colorFromRgb(rgb, alpha) {
+                const c = Array.isArray(rgb) ? rgb : [];
+                return Cesium.Color.fromBytes(numberOr(c[0], 33), numberOr(c[1], 150), numberOr(c[2], 243), alpha);
+            }
+            function applyImagery(key) {
+                const cfg = imageryConfigs[key] || imageryConfigsArray[0];
+                if (!globe || !cfg) return cfg;
+                const viewer = globe.viewer;
+                if (globe.baseLayer) {
+                    viewer.imageryLayers.remove(globe.baseLayer, true);
+                }
+                globe.baseLayer = viewer.imageryLayers.addImageryProvider(
+                    new Cesium.UrlTemplateImageryProvider({
+                        url: cfg.url,
+                        credit: cfg.credit || '',
+                        tilingScheme: cfg.tilingScheme === 'geographic'
+                            ? new Cesium.GeographicTilingScheme()
+                            : new Cesium.WebMercatorTilingScheme(),
+                        maximumLevel: Number.isFinite(cfg.maximumLevel) ? cfg.maximumLevel : undefined,
+                        subdomains: Array.isArray(cfg.subdomains) && cfg.subdomains.length ? cfg.subdomains : undefined
+                    }),
+                    0
+                );
+                viewer.scene.requestRender();
+                return cfg;
+            }
+            function ensureGlobe() {
+                if (globe) return globe;
+                const viewer = new Cesium.Viewer('globePane', {
+                    clockViewModel: new Cesium.ClockViewModel(clock),
+                    animation: false,
+                    timeline: false,
+                    shouldAnimate: false,
+                    terrainProvider: new Cesium.EllipsoidTerrainProvider(),
+                    baseLayer: false,
+                    baseLayerPicker: false,
+                    sceneModePicker: false,
+                    navigationHelpButton: false,
+                    geocoder: false,
+                    fullscreenButton: false,
+                    homeButton: false,
+                    infoBox: false,
+                    selectionIndicator: false,
+                    requestRenderMode: true,
+                    maximumRenderTimeChange: Infinity
+                });
+                viewer.scene.globe.enableLighting = true;
+                const defaultPosition = Cesium.Cartesian3.fromDegrees(-47.9, -15.7, 1000.0);
+                const aircraftEntity = viewer.entities.add({
+                    id: 'aircraft-model',
+                    name: 'Aeronave',
+                    position: defaultPosition,
+                    model: {
+                        uri: planeUrl,
+                        minimumPixelSize: 80,
+                        maximumScale: 200,
+                        runAnimations: true
+                    },
+                    orientation: Cesium.Transforms.headingPitchRollQuaternion(defaultPosition, new Cesium.HeadingPitchRoll())
+                });
+                const completedPath = viewer.entities.add({
+                    polyline: {
+                        positions: [],
+                        width: 4,
+                        material: new Cesium.PolylineGlowMaterialProperty({
+                            glowPower: 0.12,
+                            color: Cesium.Color.WHITE.withAlpha(0.95)
+                        })
+                    }
+                });
+                const upcomingPath = viewer.entities.add({
+                    polyline: {
+                        positions: [],
+                        width: 3,
+                        material: Cesium.Color.WHITE.withAlpha(0.25)
+                    }
+                });
+                globe = {
+                    viewer: viewer,
+                    aircraftEntity: aircraftEntity,
+                    completedPath: completedPath,
+                    upcomingPath: upcomingPath,
+                    modePolylines: viewer.scene.primitives.add(new Cesium.PolylineCollection()),
+                    routeCartesians: [],
+                    validPrefix: new Int32Array(0),
+                    trackRef: undefined,
+                    baseLayer: null
+                };
+                applyImagery(imageryKey);
+                viewer.trackedEntity = followEnabled ? aircraftEntity : undefined;
+                return globe;
+            }
+            function syncGlobeTrack() {
+                if (!globe || globe.trackRef === track) return;
+                globe.trackRef = track;
+                globe.modePolylines.removeAll();
+                globe.completedPath.polyline.positions = [];
+                globe.upcomingPath.polyline.positions = [];
+                globe.routeCartesians = [];
+                globe.validPrefix = new Int32Array(0);
+                if (!track || !track.count) return;
+                const flat = [];
+                const prefix = new Int32Array(track.count);
+                let valid = 0;
+                for (let i = 0; i < track.count; i++) {
+                    if (sampleValid(i)) {
+                        flat.push(track.lon[i], track.lat[i], numberOr(track.alt[i], 0.0));
+                        valid++;
+                    }
+                    prefix[i] = valid;
+                }
+                globe.validPrefix = prefix;
+                globe.routeCartesians = flat.length ? Cesium.Cartesian3.fromDegreesArrayHeights(flat) : [];
+                (track.modePaths || []).forEach(function (seg) {
+                    const a = Math.max(0, seg.start);
+                    const b = Math.min(track.count - 1, seg.end);
+                    const from = a > 0 ? prefix[a - 1] : 0;
+                    const positions = globe.routeCartesians.slice(from, prefix[b]);
+                    if (positions.length >= 2) {
+                        globe.modePolylines.add({
+                            positions: positions,
+                            width: 3,
+                            material: Cesium.Material.fromType('Color', { color: colorFromRgb(seg.color, 235) })
+                        });
+                    }
+                });
+            }
+            const hud = {
+                box: document.getElementById('hud'),
+                lat: document.getElementById('hud-lat'),
+                lon: document.getElementById('hud-lon'),
+                alt: document.getElementById('hud-alt'),
+                pitch: document.getElementById('hud-pitch'),
+                roll: document.getElementById('hud-roll')
+            };
+            function fmt(value, digits) {
+                return Number.isFinite(value) ? value.toFixed(digits) : '--';
+            }
+            function updateGlobe(i) {
+                if (!globe || !sampleValid(i)) return;
+                const lat = track.lat[i];
+                const lon = track.lon[i];
+                const alt = numberOr(track.alt[i], 0.0);
+                const position = Cesium.Cartesian3.fromDegrees(lon, lat, alt);
+                globe.aircraftEntity.position = position;
+                scratchHPR.heading = radiansOrZero(track.heading[i]) + headingOffset;
+                scratchHPR.pitch = radiansOrZero(track.pitch[i]);
+                scratchHPR.roll = radiansOrZero(track.roll[i]);
+                globe.aircraftEntity.orientation = Cesium.Transforms.headingPitchRollQuaternion(position, scratchHPR);
+                const done = globe.validPrefix[i];
+                globe.completedPath.polyline.positions = globe.routeCartesians.slice(0, done);
+                globe.upcomingPath.polyline.positions = globe.routeCartesians.slice(Math.max(0, done - 1));
+                hud.lat.textContent = fmt(lat, 6);
+                hud.lon.textContent = fmt(lon, 6);
+                hud.alt.textContent = fmt(alt, 1);
+                hud.pitch.textContent = fmt(track.pitch[i], 1);
+                hud.roll.textContent = fmt(track.roll[i], 1);
+                globe.viewer.scene.requestRender();
+            }
+
+            // --- Índice atual: um único ponto de atualização para os três painéis ---
+            function setIndex(idx, moveClock) {
+                if (!track || !track.count) {
+                    pendingIndex = Number(idx) || 0;
+                    return;
+                }
+                const clamped = Math.max(0, Math.min(track.count - 1, Number(idx) || 0));
+                if (moveClock && Number.isFinite(timeIndex[clamped])) {
+                    clock.shouldAnimate = false;
+                    clock.currentTime = julianFromMs(timeIndex[clamped]);
+                }
+                timeline.updateFromClock();
+                if (clamped === currentIndex) return;
+                currentIndex = clamped;
+                window.__currentTimelineIndex = clamped;
+                if (sampleValid(clamped)) {
+                    window.updateMarkers(
+                        track.lat[clamped],
+                        track.lon[clamped],
+                        numberOr(track.heading[clamped], 0),
+                        numberOr(track.windDir && track.windDir[clamped], 0),
+                        numberOr(track.windSpeed && track.windSpeed[clamped], 0)
+                    );
+                }
+                if (activePane === '3d') {
+                    updateGlobe(clamped);
+                }
+            }
+            window.setTimelineIndex = function (index) {
+                setIndex(index, true);
+            };
+
+            function applyTrack(payload) {
+                track = (payload && payload.count) ? payload : null;
+                currentIndex = -1;
+                window.__currentTimelineIndex = 0;
+                timeIndex = track ? buildTimeIndex(track.timeMs || []) : new Float64Array(0);
+                if (track && Number.isFinite(track.startMs) && Number.isFinite(track.endMs)) {
+                    clock.startTime = julianFromMs(track.startMs);
+                    clock.stopTime = julianFromMs(track.endMs);
+                    clock.currentTime = julianFromMs(track.startMs);
+                    clock.shouldAnimate = false;
+                    timeline.zoomTo(clock.startTime, clock.stopTime);
+                }
+                applyTrackToMap();
+                if (activePane === '3d') {
+                    syncGlobeTrack();
+                }
+                const start = pendingIndex;
+                pendingIndex = 0;
+                setIndex(start, true);
+                window.__trackLoaded = true;
+            }
+            window.loadTrack = function (source) {
+                window.__trackLoaded = false;
+                if (typeof source === 'string') {
+                    return fetch(source)
+                        .then(function (resp) { return resp.json(); })
+                        .then(applyTrack)
+                        .catch(function (err) { console.error('loadTrack falhou', err); });
+                }
+                applyTrack(source);
+                return Promise.resolve();
+            };
+
+            // --- Controle dos painéis a partir do Qt ---
+            window.setActivePane = function (name) {
+                activePane = (name === '3d') ? '3d' : '2d';
+                const show3d = activePane === '3d';
+                document.getElementById('mapPane').style.display = show3d ? 'none' : 'block';
+                document.getElementById('globePane').style.display = show3d ? 'block' : 'none';
+                hud.box.style.display = show3d ? 'block' : 'none';
+                if (show3d) {
+                    ensureGlobe();
+                    globe.viewer.useDefaultRenderLoop = true;
+                    globe.viewer.resize();
+                    syncGlobeTrack();
+                    if (track && currentIndex >= 0) updateGlobe(currentIndex);
+                    if (followEnabled) globe.viewer.trackedEntity = globe.aircraftEntity;
+                    globe.viewer.scene.requestRender();
+                } else {
+                    if (globe) globe.viewer.useDefaultRenderLoop = false;
+                    map.invalidateSize();
+                }
+                return activePane;
+            };
+            window.setImageryLayer = function (key) {
+                imageryKey = key;
+                return applyImagery(key);
+            };
+            window.centerCameraOnAircraft = function () {
+                if (!globe) return;
+                if (followEnabled) globe.viewer.trackedEntity = globe.aircraftEntity;
+                globe.viewer.flyTo(globe.aircraftEntity, {
+                    duration: 0.6,
+                    offset: new Cesium.HeadingPitchRange(0.0, -0.5, 150.0)
+                });
+            };
+            window.setFollowMode = function (enabled) {
+                followEnabled = !!enabled;
+                if (globe) globe.viewer.trackedEntity = followEnabled ? globe.aircraftEntity : undefined;
+            };
+            window.addEventListener('resize', function () {
+                timeline.resize();
+                map.invalidateSize();
+                if (globe && activePane === '3d') globe.viewer.resize();
+            });
+
+            applyTrack(null);
+            window.__surfaceReady = true;
+        })();
+    </script>
+</body>
+</html>
+""")
+
+
+def render_web_surface_html(
+    *,
+    cesium_base: str,
+    leaflet_js: str,
+    leaflet_css: str,
+    plane_url: str,
+    imagery_presets: List[Dict],
+    default_imagery_key: str,
+    map_imagery_key: str = "osm",
+    aircraft_icon_url: Optional[str] = None,
+    wind_icon_url: Optional[str] = None,
+) -> str:
+    """Monta o HTML da superfície única a partir das URLs já resolvidas pelo app."""
+
+    return _SURFACE_TEMPLATE.substitute(
+        CESIUM_BASE=cesium_base,
+        LEAFLET_JS=leaflet_js,
+        LEAFLET_CSS=leaflet_css,
+        IMAGERY_CONFIG_JSON=json.dumps(imagery_presets),
+        MAP_IMAGERY_KEY=json.dumps(map_imagery_key),
+        DEFAULT_IMAGERY_KEY=json.dumps(default_imagery_key),
+        PLANE_LITERAL=json.dumps(plane_url),
+        AIRCRAFT_ICON_LITERAL=json.dumps(aircraft_icon_url or ""),
+        WIND_ICON_LITERAL=json.dumps(wind_icon_url or ""),
+        MAP_JS_NAME=json.dumps(SURFACE_MAP_JS_NAME),
+    )
@@ -13,8 +13,12 @@ from datetime import datetime
 import pyqtgraph as pg
 from pyqtgraph.exporters import ImageExporter
 
+from src.utils.chunked_store import chunked_log_for, chunked_settings
 from src.utils.config_manager import load_config, update_config_section
+from src.utils.event_index import SEVERITY_COLORS, SEVERITY_INFO, FlightEvent, build_event_index, marker_events
+from src.utils.log_artifacts import LogArtifacts, build_plot_index
 from src.utils.mode_utils import ModeSegment, compute_mode_segments
+from src.utils.track_payload import epoch_ms_array
 
 # ---- Compat/performance + TEMA BRANCO
 pg.setConfigOptions(
@@ -92,7 +96,19 @@ class AllPlotsWidget(QWidget):
         self._available_graph_titles: list[str] = []
         self._pending_df = pd.DataFrame()
         self._pending_log_name = ""
+        self._pending_artifacts: LogArtifacts | None = None
         self._plots_dirty = False
+        # Dados prontos para plotar (vindos dos artefatos do log ou calculados aqui)
+        self._artifacts: LogArtifacts | None = None
+        self._epoch_s = np.empty(0, dtype=float)
+        self._numeric_columns: list[str] = []
+        self._plot_index: dict = {}
+        self._events: list[FlightEvent] = []
+        # Log lido em blocos (df é só o resumo): séries que recebem a janela em resolução total
+        self._chunk_log = None
+        self._chunk_settings = None
+        self._chunked_items: list[tuple] = []
+        self._refined_range: tuple[float, float] | None = None
 
         # Timer de debounce para sincronizar X
         self._sync_timer = QTimer(self)
@@ -127,9 +143,11 @@ class AllPlotsWidget(QWidget):
         scroll_area.setWidget(scroll_content)
 
     # ========== API pública ==========
-    def load_dataframe(self, df: pd.DataFrame, log_name: str = ""):
+    def load_dataframe(self, df: pd.DataFrame, log_name: str = "", artifacts: LogArtifacts | None = None):
+        """Agenda o redesenho; ``artifacts`` (se houver) evita recalcular no thread da GUI."""
         self._pending_df = df
         self._pending_log_name = log_name or ""
+        self._pending_artifacts = artifacts
         self._plots_dirty = True
         if self.isVisible():
             self._apply_pending_update()
@@ -168,6 +186,7 @@ class AllPlotsWidget(QWidget):
             self._syncing = False
         # reinicia o debounce para futuras interações do usuário
         self._sync_timer.start()
+        self._refine_window(start_val, end_val)
 
     def get_plot_images(self):
         images = []
@@ -225,6 +244,8 @@ class AllPlotsWidget(QWidget):
         self.vlines.clear()
         self._plot_widgets.clear()
         self._mode_segments = []
+        self._chunked_items = []
+        self._refined_range = None
         self._clear_legend()
 
     def _update_plots(self):
@@ -238,11 +259,7 @@ class AllPlotsWidget(QWidget):
             self._create_info_label("Coluna 'Timestamp' não encontrada no DataFrame.")
             return
 
-        ts_epoch = self.df['Timestamp'].map(self._to_epoch_seconds)
-        df_plot = self.df.copy()
-        df_plot['_ts_'] = ts_epoch
-
-        self._mode_segments = compute_mode_segments(df_plot)
+        self._prepare_plot_data()
         self._add_mode_legend()
 
         plotting_config = [
@@ -276,30 +293,69 @@ class AllPlotsWidget(QWidget):
             if 'secondary_y' in config:
                 config_cols.extend(config['secondary_y']['cols'])
 
-            plotted = self._create_plot_from_config(config, df_plot)
+            plotted = self._create_plot_from_config(config)
             if plotted:
                 plotted_cols.update(plotted)
                 graphs_added = True
 
-        remaining_cols = [c for c in df_plot.select_dtypes(include=np.number).columns
-                          if c not in plotted_cols and c not in ('_ts_',) and 'Timestamp' not in c]
+        remaining_cols = [c for c in self._numeric_columns if c not in plotted_cols]
 
-        grouped_configs = self._build_remaining_configs(remaining_cols, df_plot)
+        grouped_configs = self._build_remaining_configs(remaining_cols)
         self._register_graph_titles([c['title'] for c in grouped_configs])
         for config in grouped_configs:
             if not self._is_graph_enabled(config['title']):
                 continue
-            plotted = self._create_plot_from_config(config, df_plot)
+            plotted = self._create_plot_from_config(config)
             if plotted:
                 graphs_added = True
 
         if graphs_added:
             self.plots_layout.addStretch(1)
             self._sync_x_axes()
-            self._add_vlines(df_plot)
+            self._add_vlines()
+            self._add_event_markers()
         else:
             self._create_info_label("Nenhum dado numérico disponível para plotar.")
 
+    def _prepare_plot_data(self):
+        """Usa os artefatos do log quando batem com o DataFrame; senão calcula (vetorizado)."""
+        self._chunk_log = chunked_log_for(self.df)
+        if self._chunk_log is not None and self._chunk_settings is None:
+            self._chunk_settings = chunked_settings()
+        artifacts = self._artifacts
+        if artifacts is not None and artifacts.matches(self.df):
+            self._epoch_s = artifacts.epoch_s
+            self._mode_segments = list(artifacts.mode_segments)
+            self._numeric_columns = list(artifacts.numeric_columns)
+            self._plot_index = artifacts.plot_index
+            self._events = marker_events(artifacts.events)
+            return
+        self._artifacts = None
+        # Sem artefatos: só flags/modos (o EmbeddedError.log vem com os artefatos)
+        self._events = marker_events(build_event_index(self.df))
+        self._epoch_s = epoch_ms_array(self.df['Timestamp']) / 1000.0
+        self._mode_segments = compute_mode_segments(self.df)
+        self._numeric_columns = [c for c in self.df.select_dtypes(include=np.number).columns
+                                 if 'Timestamp' not in str(c)]
+        self._plot_index = build_plot_index(self.df, self._epoch_s, self._numeric_columns)
+
+    def _column_series(self, col):
+        """(x, y) válidos de uma coluna, ou None se não houver dados."""
+        if col not in self.df.columns:
+            return None
+        if col not in self._plot_index:
+            if col in self._numeric_columns:
+                return None
+            # Coluna não numérica (ex.: flags como texto): índice calculado sob demanda
+            self._plot_index.update(build_plot_index(self.df, self._epoch_s, [col]))
+            if col not in self._plot_index:
+                return None
+        values = pd.to_numeric(self.df[col], errors='coerce').to_numpy(dtype=float)
+        idx = self._plot_index[col]
+        if idx is None:
+            return self._epoch_s, values
+        return self._epoch_s[idx], values[idx]
+
     def _create_info_label(self, text):
         label = QLabel(text)
         label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -358,10 +414,11 @@ class AllPlotsWidget(QWidget):
             return
         self.df = self._pending_df
         self.current_log_name = self._pending_log_name
+        self._artifacts = self._pending_artifacts
         self._plots_dirty = False
         self._update_plots()
 
-    def _build_remaining_configs(self, columns, df_plot):
+    def _build_remaining_configs(self, columns):
         grouped = {}
         friendly_titles = {}
 
@@ -372,7 +429,7 @@ class AllPlotsWidget(QWidget):
 
         configs = []
         for key, cols in grouped.items():
-            valid_cols = [c for c in cols if c in df_plot.columns and not df_plot[c].isnull().all()]
+            valid_cols = [c for c in cols if c in self._plot_index]
             if not valid_cols:
                 continue
 
@@ -418,7 +475,7 @@ class AllPlotsWidget(QWidget):
 
         return normalized, friendly
 
-    def _create_plot_from_config(self, config, df_plot):
+    def _create_plot_from_config(self, config):
         primary_series = []
         secondary_series = []
         plotted_cols = set()
@@ -427,21 +484,19 @@ class AllPlotsWidget(QWidget):
             pconf = config['primary_y']
             step_mode_flag = True if pconf.get('style', '') == 'steps-post' else False
             for col in pconf['cols']:
-                if col in df_plot.columns and not df_plot[col].isnull().all():
-                    valid = df_plot[['_ts_', col]].dropna()
-                    if not valid.empty:
-                        primary_series.append((col, valid, step_mode_flag))
-                        plotted_cols.add(col)
+                xy = self._column_series(col)
+                if xy is not None:
+                    primary_series.append((col, xy, step_mode_flag))
+                    plotted_cols.add(col)
 
         if 'secondary_y' in config:
             sconf = config['secondary_y']
             step_mode_sec_flag = True if sconf.get('style', '') == 'steps-post' else False
             for col in sconf['cols']:
-                if col in df_plot.columns and not df_plot[col].isnull().all():
-                    valid = df_plot[['_ts_', col]].dropna()
-                    if not valid.empty:
-                        secondary_series.append((col, valid, step_mode_sec_flag))
-                        plotted_cols.add(col)
+                xy = self._column_series(col)
+                if xy is not None:
+                    secondary_series.append((col, xy, step_mode_sec_flag))
+                    plotted_cols.add(col)
 
         if not primary_series and not secondary_series:
             return set()
@@ -478,17 +533,19 @@ class AllPlotsWidget(QWidget):
 
         if primary_series:
             pconf = config['primary_y']
-            for col, valid, step_flag in primary_series:
+            for col, (xs, ys), step_flag in primary_series:
                 pen = pg.mkPen(color=next(colors), width=1.8)
                 item = self._plot_series(
                     plot_item,
-                    valid['_ts_'].to_numpy(),
-                    valid[col].to_numpy(),
+                    xs,
+                    ys,
                     name=col,
                     pen=pen,
                     step_mode_flag=step_flag
                 )
                 legend_items.append((item, col))
+                if self._chunk_log is not None:
+                    self._chunked_items.append((item, col, step_flag, xs, ys))
             if pconf.get('label'):
                 plot_item.getAxis('left').setLabel(pconf['label'])
 
@@ -507,17 +564,19 @@ class AllPlotsWidget(QWidget):
             plot_item.vb.sigResized.connect(update_right_vb)
             update_right_vb()
 
-            for col, valid, step_flag in secondary_series:
+            for col, (xs, ys), step_flag in secondary_series:
                 pen = pg.mkPen(color=next(colors), width=1.8)
                 c = self._plot_series(
                     right_vb,
-                    valid['_ts_'].to_numpy(),
-                    valid[col].to_numpy(),
+                    xs,
+                    ys,
                     name=col,
                     pen=pen,
                     step_mode_flag=step_flag
                 )
                 legend_items.append((c, col))
+                if self._chunk_log is not None:
+                    self._chunked_items.append((c, col, step_flag, xs, ys))
 
             sconf = config['secondary_y']
             if sconf.get('label'):
@@ -623,11 +682,57 @@ class AllPlotsWidget(QWidget):
                     other.setXRange(xmin, xmax, padding=0)
         finally:
             self._syncing = False
+        self._refine_window(xmin, xmax)
 
-    def _add_vlines(self, df_plot):
-        if df_plot.empty:
+    # ---------- Logs lidos em blocos ----------
+    def _refine_window(self, xmin, xmax):
+        """Troca o resumo pela janela visível em resolução total, se ela couber no teto de memória."""
+        store = self._chunk_log
+        if store is None or not self._chunked_items:
+            return
+        span = max(float(xmax) - float(xmin), 1e-3)
+        # Margem de meia janela para arrastos curtos não pedirem outra leitura
+        t0, t1 = float(xmin) - span / 2, float(xmax) + span / 2
+        refined = self._refined_range
+        if refined is not None and refined[0] <= xmin and xmax <= refined[1]:
             return
-        initial_ts = float(df_plot['_ts_'].iloc[0])
+        columns = sorted({entry[1] for entry in self._chunked_items})
+        if store.rows_between(t0, t1) * (len(columns) + 1) * 8 > self._chunk_settings.window_bytes:
+            # Janela grande demais: o resumo (picos preservados) já é o melhor que cabe
+            if refined is not None:
+                self._restore_summary()
+            return
+        try:
+            x_win, values = store.window_arrays(t0, t1, columns)
+        except (OSError, ValueError) as exc:
+            print(f"AVISO: Falha ao ler janela em resolução total: {exc}")
+            return
+        for item, col, step_flag, xs, ys in self._chunked_items:
+            y_win = values[col]
+            valid = np.isfinite(x_win) & np.isfinite(y_win)
+            outside = (xs < t0) | (xs > t1)
+            x = np.concatenate([xs[outside], x_win[valid]])
+            y = np.concatenate([ys[outside], y_win[valid]])
+            order = np.argsort(x, kind='stable')
+            self._set_series_data(item, x[order], y[order], step_flag)
+        self._refined_range = (t0, t1)
+
+    def _restore_summary(self):
+        for item, _col, step_flag, xs, ys in self._chunked_items:
+            self._set_series_data(item, xs, ys, step_flag)
+        self._refined_range = None
+
+    def _set_series_data(self, item, x, y, step_flag):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if step_flag:
+            x, y = self._as_step_post_arrays(x, y)
+        item.setData(x=x, y=y)
+
+    def _add_vlines(self):
+        if self._epoch_s.size == 0:
+            return
+        initial_ts = float(self._epoch_s[0])
         for plotw in self._plot_widgets:
             line = pg.InfiniteLine(pos=initial_ts, angle=90, movable=False,
                                    pen=pg.mkPen((255, 0, 0), width=1))
@@ -635,6 +740,22 @@ class AllPlotsWidget(QWidget):
             plotw.addItem(line)
             self.vlines.append(line)
 
+    def _add_event_markers(self):
+        """Linha tracejada em cada evento (flags, failsafes, EmbeddedError) em todos os gráficos."""
+        if not self._events:
+            return
+        pens = {
+            severity: pg.mkPen(color, width=1, style=Qt.PenStyle.DashLine)
+            for severity, color in SEVERITY_COLORS.items()
+        }
+        for plotw in self._plot_widgets:
+            for event in self._events:
+                line = pg.InfiniteLine(pos=event.time, angle=90, movable=False,
+                                       pen=pens.get(event.severity, pens[SEVERITY_INFO]))
+                line.setZValue(-5)
+                line.setToolTip(event.label)
+                plotw.addItem(line)
+
     # ---------- Faixas de modo de voo ----------
     def _add_mode_legend(self):
         if not self._mode_segments:
@@ -0,0 +1,459 @@
+"""Renderizadores do Gráfico de Comparação (``CustomPlotWidget``).
+
+O widget cuida dos controles e do modelo (séries, eixos, cache de dados);
+o desenho fica a cargo de um renderizador com a mesma interface:
+
+* :class:`MatplotlibComparisonRenderer` — figura matplotlib (padrão,
+  boa para exportar/imprimir);
+* :class:`PyqtgraphComparisonRenderer` — pyqtgraph com downsampling por
+  pico e clip-to-view, para sobrepor sinais em taxa cheia de vários logs.
+
+Ambos mantêm um artista por série (chave ``(log, coluna, X)``), um cursor
+vertical que segue a timeline e marcas verticais nos eventos do log ativo.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+
+import pyqtgraph as pg
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+BACKEND_MATPLOTLIB = "matplotlib"
+BACKEND_PYQTGRAPH = "pyqtgraph"
+BACKENDS = (
+    (BACKEND_MATPLOTLIB, "Matplotlib"),
+    (BACKEND_PYQTGRAPH, "PyQtGraph (alto volume)"),
+)
+
+SeriesKey = Tuple[str, str, str]
+# (x, cor RGB 0-255, rótulo) de um evento marcado no gráfico
+EventMarker = Tuple[float, Tuple[int, int, int], str]
+RightAxisOffsetPx = 60
+
+
+def _is_monotonic(x: np.ndarray) -> bool:
+    return x.size < 2 or bool(np.all(np.diff(x) >= 0))
+
+
+class MatplotlibComparisonRenderer:
+    """Figura matplotlib com twinx por eixo Y e cursor desenhado por blit."""
+
+    backend = BACKEND_MATPLOTLIB
+
+    def __init__(self, parent=None):
+        self.container = QWidget(parent)
+        layout = QVBoxLayout(self.container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.figure = Figure(figsize=(6, 4))
+        self.canvas = FigureCanvas(self.figure)
+        self.toolbar = NavigationToolbar(self.canvas, self.container)
+        layout.addWidget(self.toolbar)
+        layout.addWidget(self.canvas)
+
+        self.host = None
+        self.axes: Dict[int, object] = {}
+        self.lines: Dict[SeriesKey, object] = {}
+        self._title = None
+        self._empty_text = None
+        self._cursor = None
+        self._event_artist = None
+        self._background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.mpl_connect("resize_event", lambda _event: self._invalidate_background())
+
+    # --- estrutura ---
+    def rebuild(self, title: str, placeholder: Optional[str] = None) -> None:
+        self.figure.clear()
+        self.host = None
+        self.axes = {}
+        self.lines = {}
+        self._empty_text = None
+        self._cursor = None
+        self._event_artist = None
+        self._invalidate_background()
+        self._title = self.figure.suptitle(title, fontsize=14)
+        if placeholder is not None:
+            ax = self.figure.add_subplot(111)
+            ax.text(0.5, 0.5, placeholder, ha="center", va="center", transform=ax.transAxes)
+            return
+        self.host = self.figure.add_subplot(111)
+        self.host.grid(True, linestyle='--', alpha=0.6)
+        self.axes = {0: self.host}
+        self._cursor = self.host.axvline(0, color='r', linestyle='--', lw=1, visible=False, animated=True)
+
+    def ensure_axis(self, axis_idx: int) -> bool:
+        if axis_idx in self.axes:
+            return False
+        ax = self.host.twinx()
+        ax.spines['right'].set_position(('outward', RightAxisOffsetPx * (len(self.axes) - 1)))
+        self.axes[axis_idx] = ax
+        return True
+
+    def axis_list(self) -> List[object]:
+        return list(self.axes.values())
+
+    # --- séries ---
+    def add_series(self, key: SeriesKey, axis_idx: int, axis_label: str, x, y, label: str, interpolate: bool) -> None:
+        ax = self.axes[axis_idx]
+        line, = ax.plot(x, y, label=label,
+                        linestyle='-' if interpolate else 'None',
+                        marker=None if interpolate else 'o')
+        self.lines[key] = line
+        ax.set_ylabel(axis_label)
+
+    def remove_series(self, key: SeriesKey) -> None:
+        line = self.lines.pop(key, None)
+        if line is None:
+            return
+        ax = line.axes
+        line.remove()
+        if ax is not None:
+            ax.relim()
+            ax.autoscale_view()
+
+    def set_colors(self, colors: Dict[SeriesKey, Tuple[float, float, float, float]]) -> None:
+        for key, color in colors.items():
+            line = self.lines.get(key)
+            if line is not None:
+                line.set_color(color)
+
+    def set_interpolation(self, interpolate: bool) -> None:
+        for line in self.lines.values():
+            line.set_linestyle('-' if interpolate else 'None')
+            line.set_marker('None' if interpolate else 'o')
+
+    def set_decorations(self, xlabel: str, ordered_keys: Sequence[SeriesKey]) -> None:
+        if self.host is None:
+            return
+        self.host.set_xlabel(xlabel)
+        handles = [self.lines[k] for k in ordered_keys if k in self.lines]
+        legend = self.host.get_legend()
+        if legend is not None:
+            legend.remove()
+        if self._empty_text is not None:
+            self._empty_text.remove()
+            self._empty_text = None
+        if handles:
+            self.host.legend(handles, [h.get_label() for h in handles], loc='best')
+        else:
+            self._empty_text = self.host.text(0.5, 0.5, 'Nenhum dado válido para plotar.',
+                                              transform=self.host.transAxes, ha='center', va='center',
+                                              color='gray', fontsize=10)
+
+    def set_title(self, title: str) -> None:
+        if self._title is not None:
+            self._title.set_text(title)
+
+    def relayout(self) -> None:
+        self.figure.tight_layout(rect=[0, 0.03, 1, 0.95])
+
+    def draw(self) -> None:
+        self._invalidate_background()
+        self.canvas.draw_idle()
+
+    def set_x_range(self, start, end) -> None:
+        for ax in self.axes.values():
+            try:
+                ax.set_xlim(start, end)
+            except Exception:
+                pass
+        self.draw()
+
+    def set_event_markers(self, markers: Sequence[EventMarker]) -> None:
+        if self._event_artist is not None:
+            try:
+                self._event_artist.remove()
+            except ValueError:
+                pass
+            self._event_artist = None
+        if self.host is None or not markers:
+            return
+        # autolim=False: eventos fora das séries não alargam o eixo X
+        self._event_artist = LineCollection(
+            [((x, 0.0), (x, 1.0)) for x, _color, _label in markers],
+            transform=self.host.get_xaxis_transform(),
+            colors=[tuple(c / 255.0 for c in color) for _x, color, _label in markers],
+            linestyles=':', linewidths=0.9, zorder=0.5,
+        )
+        self.host.add_collection(self._event_artist, autolim=False)
+        self._invalidate_background()
+
+    # --- cursor (blit) ---
+    def set_cursor(self, x: Optional[float]) -> None:
+        if self._cursor is None:
+            return
+        visible = x is not None
+        if not visible and not self._cursor.get_visible():
+            return
+        if visible:
+            self._cursor.set_xdata([x])
+        self._cursor.set_visible(visible)
+        if self._background is None:
+            self.canvas.draw_idle()
+            return
+        try:
+            self.canvas.restore_region(self._background)
+            self._draw_cursor()
+            self.canvas.blit(self.figure.bbox)
+        except Exception:
+            self._background = None
+            self.canvas.draw_idle()
+
+    def _on_draw(self, _event):
+        try:
+            self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        except Exception:
+            self._background = None
+            return
+        self._draw_cursor()
+
+    def _draw_cursor(self):
+        if self._cursor is not None and self._cursor.get_visible() and self._cursor.axes is not None:
+            self._cursor.axes.draw_artist(self._cursor)
+
+    def _invalidate_background(self):
+        self._background = None
+
+
+class PyqtgraphComparisonRenderer:
+    """PlotWidget do pyqtgraph com ViewBoxes extras à direita (um por eixo Y)."""
+
+    backend = BACKEND_PYQTGRAPH
+
+    def __init__(self, parent=None):
+        self.container = QWidget(parent)
+        layout = QVBoxLayout(self.container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.plot_widget = pg.PlotWidget()
+        layout.addWidget(self.plot_widget)
+        self.plot_item = self.plot_widget.getPlotItem()
+        self._event_lines = []
+        self.plot_item.vb.sigResized.connect(self._update_views)
+
+        self.title = ""
+        self.host = None
+        self.axes: Dict[int, pg.ViewBox] = {}
+        self._axis_items: Dict[int, pg.AxisItem] = {}
+        self.lines: Dict[SeriesKey, pg.PlotDataItem] = {}
+        self._legend = None
+        self._cursor = None
+        self._interpolate = True
+
+    # --- estrutura ---
+    def _remove_extra_axes(self):
+        for axis_idx, vb in list(self.axes.items()):
+            if axis_idx == 0:
+                continue
+            for item in list(vb.addedItems):
+                vb.removeItem(item)
+            scene = vb.scene()
+            if scene is not None:
+                scene.removeItem(vb)
+        for axis_idx, axis in list(self._axis_items.items()):
+            if axis_idx >= 2:
+                self.plot_item.layout.removeItem(axis)
+                scene = axis.scene()
+                if scene is not None:
+                    scene.removeItem(axis)
+        self._axis_items = {}
+
+    def rebuild(self, title: str, placeholder: Optional[str] = None) -> None:
+        self._remove_extra_axes()
+        self.plot_item.clear()
+        self.plot_item.hideAxis('right')
+        self.plot_item.setLabel('left', '')
+        self.plot_item.setLabel('bottom', '')
+        if self._legend is not None:
+            self._legend.clear()
+        self.lines = {}
+        self.axes = {}
+        self._cursor = None
+        self._event_lines = []
+        self.title = title
+        if placeholder is not None:
+            self.host = None
+            self.plot_item.setTitle(f"{title}<br><span style='font-size:9pt;color:gray'>{placeholder}</span>")
+            return
+        self.plot_item.setTitle(title)
+        self.host = self.plot_item
+        self.plot_item.showGrid(x=True, y=True, alpha=0.3)
+        self.plot_item.enableAutoRange(x=True, y=True)
+        if self._legend is None:
+            self._legend = self.plot_item.addLegend()
+        self.axes = {0: self.plot_item.vb}
+        self._axis_items = {0: self.plot_item.getAxis('left')}
+        self._cursor = pg.InfiniteLine(pos=0, angle=90, movable=False, pen=pg.mkPen((255, 0, 0), width=1))
+        self._cursor.hide()
+        self.plot_item.addItem(self._cursor, ignoreBounds=True)
+
+    def ensure_axis(self, axis_idx: int) -> bool:
+        if axis_idx in self.axes:
+            return False
+        order = len(self.axes)
+        vb = pg.ViewBox()
+        if order == 1:
+            self.plot_item.showAxis('right')
+            axis = self.plot_item.getAxis('right')
+        else:
+            axis = pg.AxisItem('right')
+            # Layout do PlotItem: coluna 1 = ViewBox, 2 = eixo direito padrão; extras vêm depois
+            self.plot_item.layout.addItem(axis, 2, 1 + order)
+        self.plot_item.scene().addItem(vb)
+        axis.linkToView(vb)
+        vb.setXLink(self.plot_item.vb)
+        vb.enableAutoRange(y=True)
+        self.axes[axis_idx] = vb
+        self._axis_items[axis_idx] = axis
+        self._update_views()
+        return True
+
+    def _update_views(self):
+        main_vb = self.plot_item.vb
+        for axis_idx, vb in self.axes.items():
+            if vb is main_vb:
+                continue
+            vb.setGeometry(main_vb.sceneBoundingRect())
+            vb.linkedViewChanged(main_vb, vb.XAxis)
+
+    def axis_list(self) -> List[pg.ViewBox]:
+        return list(self.axes.values())
+
+    # --- séries ---
+    def add_series(self, key: SeriesKey, axis_idx: int, axis_label: str, x, y, label: str, interpolate: bool) -> None:
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        # clipToView e downsampling por pico assumem X ordenado
+        ordered = _is_monotonic(x)
+        item = pg.PlotDataItem()
+        vb = self.axes[axis_idx]
+        if axis_idx == 0:
+            self.plot_item.addItem(item)
+        else:
+            vb.addItem(item)
+        item.setData(
+            x=x, y=y,
+            name=label,
+            connect='all',
+            clipToView=ordered,
+            autoDownsample=ordered,
+            downsampleMethod='peak',
+            antialias=False,
+        )
+        self.lines[key] = item
+        self._interpolate = interpolate
+        self._apply_style(item, interpolate)
+        axis = self._axis_items.get(axis_idx)
+        if axis is not None:
+            axis.setLabel(axis_label)
+        vb.enableAutoRange(y=True)
+
+    def remove_series(self, key: SeriesKey) -> None:
+        item = self.lines.pop(key, None)
+        if item is None:
+            return
+        vb = item.getViewBox()
+        if vb is self.plot_item.vb:
+            self.plot_item.removeItem(item)
+        elif vb is not None:
+            vb.removeItem(item)
+        if self._legend is not None:
+            self._legend.removeItem(item)
+        if vb is not None:
+            vb.enableAutoRange(y=True)
+
+    def _apply_style(self, item, interpolate: bool, color=None):
+        if color is None:
+            color = getattr(item, '_comparison_color', (33, 150, 243, 255))
+        item._comparison_color = color
+        if interpolate:
+            item.setPen(pg.mkPen(color=color, width=1.5))
+            item.setSymbol(None)
+        else:
+            item.setPen(None)
+            item.setSymbol('o')
+            item.setSymbolSize(4)
+            item.setSymbolPen(None)
+            item.setSymbolBrush(pg.mkBrush(color))
+
+    def set_colors(self, colors: Dict[SeriesKey, Tuple[float, float, float, float]]) -> None:
+        for key, rgba in colors.items():
+            item = self.lines.get(key)
+            if item is None:
+                continue
+            color = tuple(int(round(c * 255)) for c in rgba)
+            self._apply_style(item, self._interpolate, color)
+
+    def set_interpolation(self, interpolate: bool) -> None:
+        self._interpolate = interpolate
+        for item in self.lines.values():
+            self._apply_style(item, interpolate)
+
+    def set_decorations(self, xlabel: str, ordered_keys: Sequence[SeriesKey]) -> None:
+        if self.host is None:
+            return
+        self.plot_item.setLabel('bottom', xlabel)
+        if self._legend is not None:
+            self._legend.clear()
+            for key in ordered_keys:
+                item = self.lines.get(key)
+                if item is not None:
+                    self._legend.addItem(item, item.name())
+        if self.lines:
+            self.plot_item.setTitle(self.title)
+        else:
+            self.plot_item.setTitle(
+                f"{self.title}<br><span style='font-size:9pt;color:gray'>Nenhum dado válido para plotar.</span>"
+            )
+
+    def set_title(self, title: str) -> None:
+        self.title = title
+        self.plot_item.setTitle(title)
+
+    def relayout(self) -> None:
+        self._update_views()
+
+    def draw(self) -> None:
+        # pyqtgraph redesenha sozinho; nada a fazer
+        return
+
+    def set_x_range(self, start, end) -> None:
+        try:
+            self.plot_item.vb.setXRange(float(start), float(end), padding=0)
+        except Exception:
+            pass
+
+    def set_event_markers(self, markers: Sequence[EventMarker]) -> None:
+        for line in self._event_lines:
+            self.plot_item.removeItem(line)
+        self._event_lines = []
+        if self.host is None:
+            return
+        for x, color, label in markers:
+            line = pg.InfiniteLine(pos=float(x), angle=90, movable=False,
+                                   pen=pg.mkPen(color, width=1, style=Qt.PenStyle.DashLine))
+            line.setZValue(-5)
+            line.setToolTip(label)
+            self.plot_item.addItem(line, ignoreBounds=True)
+            self._event_lines.append(line)
+
+    def set_cursor(self, x: Optional[float]) -> None:
+        if self._cursor is None:
+            return
+        if x is None:
+            self._cursor.hide()
+            return
+        self._cursor.setValue(float(x))
+        self._cursor.show()
+
+
+def create_renderer(backend: str, parent=None):
+    if backend == BACKEND_PYQTGRAPH:
+        return PyqtgraphComparisonRenderer(parent)
+    return MatplotlibComparisonRenderer(parent)
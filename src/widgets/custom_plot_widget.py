@@ -1,39 +1,84 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QGroupBox,
-    QComboBox, QInputDialog, QLabel, QListWidget, QSizePolicy, QCheckBox
+    QComboBox, QInputDialog, QLabel, QListWidget, QSizePolicy, QCheckBox,
+    QDoubleSpinBox
 )
+from PyQt6.QtCore import Qt
 import pandas as pd
 import numpy as np
-from itertools import cycle
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
-from matplotlib.figure import Figure
+
+from src.utils.config_manager import load_config, update_config_section
+from src.utils.event_index import KIND_ERROR, SEVERITY_COLORS, SEVERITY_INFO, reference_label
+from src.utils.signal_index import SignalIndex
+from src.utils.mode_utils import epoch_seconds_array
+from src.utils.time_alignment import (
+    AlignedSeriesCache, REFERENCE_EVENT, REFERENCE_START, REFERENCE_TAKEOFF, TimeGrid, reference_time
+)
+from src.widgets.comparison_renderers import BACKENDS, BACKEND_MATPLOTLIB, create_renderer
+from src.widgets.signal_search_widget import SignalSearchWidget
 
 class CustomPlotWidget(QWidget):
     NEW_AXIS_OPTION = "<Novo Eixo>"
     INDEX_X_OPTION = "<Índice da amostra>"
-
-    def __init__(self, parent=None):
+    TIME_SINCE_START_OPTION = "<Tempo desde o início (s)>"
+    TIME_SINCE_TAKEOFF_OPTION = "<Tempo desde a decolagem (s)>"
+    TIME_SINCE_EVENT_OPTION = "<Tempo desde o evento (s)>"
+    # Eixos X em tempo relativo -> referência usada no alinhamento entre logs
+    RELATIVE_X_OPTIONS = {
+        TIME_SINCE_START_OPTION: REFERENCE_START,
+        TIME_SINCE_TAKEOFF_OPTION: REFERENCE_TAKEOFF,
+        TIME_SINCE_EVENT_OPTION: REFERENCE_EVENT,
+    }
+
+    def __init__(self, parent=None, signal_index=None):
         super().__init__(parent)
         self.log_data = {}
-        
+        # Índice de sinais compartilhado com a janela principal (alimentado no carregamento)
+        self.signal_index = signal_index if signal_index is not None else SignalIndex()
+        self._chosen_signal = ""
+
         self.plotted_data = []
         self.axis_names = []
-        self.axes = []
         self.chart_title = "Gráfico de Comparação"
-        self.vlines = []
+        # Cache (log, coluna, X, evento) -> (x, y) válidos e timestamps (s) por log para o cursor
+        self._series_cache = {}
+        self._log_epochs = {}
+        # (log, X, evento) -> zero do tempo relativo ou X de cada linha: o cursor e as marcas
+        # de evento não consultam o log_data (que pode recarregar um log do disco)
+        self._x_lookup = {}
+        self._last_cursor_ts = None
+        # Eventos do log ativo (``FlightEvent``), marcados nas séries desse log
+        self._event_log = ""
+        self._events = []
+        comparison_cfg = load_config().get("comparison", {})
+        self.backend = comparison_cfg.get("backend", BACKEND_MATPLOTLIB)
+        # Séries em tempo relativo interpoladas uma vez por (log, sinal, grade)
+        self._aligned_cache = AlignedSeriesCache()
+        self.grid_step = float(comparison_cfg.get("grid_step_s", 0.1))
 
         layout = QVBoxLayout(self)
 
         controls_group = QGroupBox("Controles do Gráfico de Comparação")
         controls_group.setSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Fixed)
         controls_layout = QVBoxLayout()
+
+        search_layout = QHBoxLayout()
+        self.signal_search = SignalSearchWidget(self.signal_index, self)
+        self.signal_search.signal_chosen.connect(self._on_signal_chosen)
+        search_layout.addWidget(self.signal_search, 1)
+        self.btn_add_all_logs = QPushButton("Adicionar de todos os logs")
+        self.btn_add_all_logs.setToolTip("Adiciona o sinal buscado de cada log que o possui")
+        self.btn_add_all_logs.setEnabled(False)
+        self.btn_add_all_logs.clicked.connect(self._add_signal_from_all_logs)
+        search_layout.addWidget(self.btn_add_all_logs, 0, Qt.AlignmentFlag.AlignTop)
+        controls_layout.addLayout(search_layout)
+
         add_data_layout = QHBoxLayout()
-        
+
         self.log_source_combo = QComboBox()
         self.log_source_combo.currentTextChanged.connect(self._on_log_source_changed)
-        
+
         self.column_combo = QComboBox()
         self.x_column_combo = QComboBox()
         self.axis_combo = QComboBox()
@@ -55,9 +100,33 @@ class CustomPlotWidget(QWidget):
         interpolation_layout = QHBoxLayout()
         self.interpolation_checkbox = QCheckBox("Interpolar (ligar os pontos)")
         self.interpolation_checkbox.setChecked(True)
-        self.interpolation_checkbox.stateChanged.connect(self.update_plot)
+        self.interpolation_checkbox.stateChanged.connect(self._on_interpolation_changed)
         interpolation_layout.addWidget(self.interpolation_checkbox)
+        interpolation_layout.addWidget(QLabel("Passo da grade de tempo (s):"))
+        self.grid_step_spin = QDoubleSpinBox()
+        self.grid_step_spin.setDecimals(2)
+        self.grid_step_spin.setRange(0.01, 60.0)
+        self.grid_step_spin.setSingleStep(0.05)
+        self.grid_step_spin.setValue(self.grid_step)
+        self.grid_step_spin.setToolTip("Resolução usada para alinhar logs no eixo X de tempo relativo")
+        self.grid_step_spin.editingFinished.connect(self._on_grid_step_changed)
+        interpolation_layout.addWidget(self.grid_step_spin)
+        interpolation_layout.addWidget(QLabel("Evento de referência:"))
+        # Rótulos dos eventos do log ativo; cada log é alinhado na 1ª ocorrência do escolhido
+        self.event_combo = QComboBox()
+        self.event_combo.setToolTip(f"Zero do eixo X '{self.TIME_SINCE_EVENT_OPTION.strip('<>')}'")
+        self.event_combo.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToContents)
+        interpolation_layout.addWidget(self.event_combo)
         interpolation_layout.addStretch(1)
+        interpolation_layout.addWidget(QLabel("Renderizador:"))
+        self.backend_combo = QComboBox()
+        for key, label in BACKENDS:
+            self.backend_combo.addItem(label, key)
+        backend_idx = max(0, self.backend_combo.findData(self.backend))
+        self.backend_combo.setCurrentIndex(backend_idx)
+        self.backend = self.backend_combo.itemData(backend_idx) or BACKEND_MATPLOTLIB
+        self.backend_combo.currentIndexChanged.connect(self._on_backend_changed)
+        interpolation_layout.addWidget(self.backend_combo)
         controls_layout.addLayout(interpolation_layout)
 
         manage_layout = QHBoxLayout()
@@ -71,146 +140,278 @@ class CustomPlotWidget(QWidget):
         controls_layout.addLayout(manage_layout)
         controls_group.setLayout(controls_layout)
         layout.addWidget(controls_group)
-        
+
         self.list_widget = QListWidget()
         self.list_widget.setMaximumHeight(120)
         self.list_widget.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
         layout.addWidget(self.list_widget)
 
-        self.figure = Figure(figsize=(6, 4))
-        self.canvas = FigureCanvas(self.figure)
-        self.toolbar = NavigationToolbar(self.canvas, self)
-        layout.addWidget(self.toolbar)
-        layout.addWidget(self.canvas)
-        
+        # Área de desenho: matplotlib ou pyqtgraph (ver comparison_renderers)
+        self._plot_layout = layout
+        self.renderer = create_renderer(self.backend, self)
+        layout.addWidget(self.renderer.container, stretch=1)
+
         self._reset_axes()
         self.update_plot()
 
-    def update_cursor(self, timestamp):
-        pass
-
-    def set_time_window(self, start_ts, end_ts):
-        if not self.axes:
+    def _on_backend_changed(self, index):
+        backend = self.backend_combo.itemData(index) or BACKEND_MATPLOTLIB
+        if backend == self.backend:
             return
-        try:
-            for ax in self.axes:
-                try:
-                    ax.set_xlim(start_ts, end_ts)
-                except Exception:
-                    pass
-            self.canvas.draw_idle()
-        except Exception:
-            return
-
-    def update_plot(self):
-        self.figure.clear()
-        self.axes.clear()
-        self.figure.suptitle(self.chart_title, fontsize=14)
+        self.backend = backend
+        update_config_section("comparison", {"backend": backend})
+        old = self.renderer
+        self.renderer = create_renderer(backend, self)
+        self._plot_layout.replaceWidget(old.container, self.renderer.container)
+        old.container.setParent(None)
+        old.container.deleteLater()
+        self.update_plot()
+        if self._last_cursor_ts is not None:
+            self.update_cursor(self._last_cursor_ts)
 
-        if not self.log_data or not self.plotted_data:
-            ax = self.figure.add_subplot(111)
-            text = "Carregue diretórios e adicione variáveis para comparar"
-            ax.text(0.5, 0.5, text, ha="center", va="center", transform=ax.transAxes)
-            self.canvas.draw_idle()
+    def _on_grid_step_changed(self):
+        step = round(float(self.grid_step_spin.value()), 4)
+        if step <= 0 or step == self.grid_step:
             return
+        self.grid_step = step
+        update_config_section("comparison", {"grid_step_s": step})
+        relative = [k for k in self._series_cache if k[2] in self.RELATIVE_X_OPTIONS]
+        for key in relative:
+            del self._series_cache[key]
+        if relative:
+            self.update_plot()
 
-        host_ax = self.figure.add_subplot(111)
-        self.axes = [host_ax] 
+    # --- Cursor da timeline ---
 
-        axis_map = {0: host_ax}
-        
-        # --- ALTERAÇÃO CORRIGIDA E ROBUSTA ---
-        # Usa np.linspace para pegar N cores perfeitamente espaçadas do colormap 'hsv'.
-        # 'endpoint=False' é crucial para que a última cor não seja igual à primeira (vermelho).
-        num_plots = len(self.plotted_data)
-        if num_plots > 0:
-            colors_list = [plt.cm.hsv(i) for i in np.linspace(0, 1, num_plots, endpoint=False)]
-            colors = cycle(colors_list)
+    def _remember_x_lookup(self, log_name, df, x_col, event):
+        """Guarda timestamps e o X por linha do log enquanto o DataFrame está em mãos."""
+        if log_name not in self._log_epochs:
+            if 'Timestamp' in df.columns:
+                self._log_epochs[log_name] = epoch_seconds_array(df['Timestamp'])
+            else:
+                self._log_epochs[log_name] = np.empty(0, dtype=float)
+        key = (log_name, x_col, event)
+        if key in self._x_lookup:
+            return
+        if x_col in self.RELATIVE_X_OPTIONS:
+            lookup = reference_time(df, self.RELATIVE_X_OPTIONS[x_col], event)
+        elif x_col == self.INDEX_X_OPTION:
+            lookup = np.asarray(df.index, dtype=float)
+        elif x_col in df.columns:
+            lookup = pd.to_numeric(df[x_col], errors='coerce').to_numpy(dtype=float)
         else:
-            colors = cycle(['blue'])
-        
-        handles, labels = [], []
-
-        use_lines = self.interpolation_checkbox.isChecked()
-
+            lookup = None
+        self._x_lookup[key] = lookup
+
+    def _x_lookup_for(self, plot_info):
+        key = (plot_info['log'], plot_info.get('x_col', self.INDEX_X_OPTION), plot_info.get('event', ""))
+        return self._x_lookup.get(key)
+
+    def _x_at_timestamp(self, plot_info, ts):
+        """Valor de X da série no instante ``ts`` (None se fora do log ou X indefinido)."""
+        epochs = self._log_epochs.get(plot_info['log'])
+        lookup = self._x_lookup_for(plot_info)
+        if epochs is None or lookup is None:
+            return None
+        finite = epochs[np.isfinite(epochs)]
+        if finite.size == 0 or ts < finite[0] or ts > finite[-1]:
+            return None
+        if plot_info.get('x_col', self.INDEX_X_OPTION) in self.RELATIVE_X_OPTIONS:
+            return float(ts - lookup)
+        pos = int(np.clip(np.searchsorted(epochs, ts, side='left'), 0, epochs.size - 1))
+        value = lookup[pos]
+        return float(value) if np.isfinite(value) else None
+
+    def _cursor_x(self, ts):
+        """X do cursor: primeira série (na ordem da lista) cujo log contém o instante."""
         for plot_info in self.plotted_data:
-            log_name = plot_info['log']
-            col = plot_info['col']
-            axis_idx = plot_info['axis_idx']
-            x_col = plot_info.get('x_col', self.INDEX_X_OPTION)
-
-            if axis_idx not in axis_map:
-                new_ax = host_ax.twinx()
-                new_ax.spines['right'].set_position(('outward', 60 * (len(axis_map) - 1)))
-                axis_map[axis_idx] = new_ax
-                self.axes.append(new_ax)
-
-            ax = axis_map[axis_idx]
-            df_to_plot = self.log_data[log_name]
-            color = next(colors)
+            x = self._x_at_timestamp(plot_info, ts)
+            if x is not None:
+                return x
+        return None
 
-            line_label = f"{col} ({log_name})"
+    @staticmethod
+    def _to_epoch_seconds(ts):
+        values = epoch_seconds_array(pd.Series([ts]))
+        return float(values[0]) if values.size and np.isfinite(values[0]) else None
 
-            if col not in df_to_plot.columns:
-                continue
+    def update_cursor(self, timestamp):
+        if not self.plotted_data or timestamp is None:
+            return
+        ts = self._to_epoch_seconds(timestamp)
+        if ts is None:
+            return
+        self._last_cursor_ts = timestamp
+        self.renderer.set_cursor(self._cursor_x(ts))
+
+    def set_events(self, log_name, events):
+        self._event_log = log_name or ""
+        self._events = list(events or [])
+        self._update_event_choices()
+        if self.renderer.host is not None:
+            self.renderer.set_event_markers(self._event_markers())
+            self.renderer.draw()
+
+    def _update_event_choices(self):
+        """Eventos do log ativo que servem de referência (os do EmbeddedError.log dependem do arquivo de origem)."""
+        labels = sorted({reference_label(event) for event in self._events if event.kind != KIND_ERROR})
+        current = self.event_combo.currentText()
+        self.event_combo.blockSignals(True)
+        self.event_combo.clear()
+        self.event_combo.addItems(labels)
+        if current in labels:
+            self.event_combo.setCurrentText(current)
+        self.event_combo.blockSignals(False)
+
+    def _event_markers(self):
+        """Eventos convertidos para o X da primeira série do log ativo (vetorizado)."""
+        plot_info = next((p for p in self.plotted_data if p['log'] == self._event_log), None)
+        if plot_info is None or not self._events:
+            return []
+        epochs = self._log_epochs.get(plot_info['log'])
+        lookup = self._x_lookup_for(plot_info)
+        if epochs is None or lookup is None:
+            return []
+        finite = epochs[np.isfinite(epochs)]
+        if finite.size == 0:
+            return []
+        times = np.array([event.time for event in self._events], dtype=float)
+        inside = (times >= finite[0]) & (times <= finite[-1])
+        if plot_info.get('x_col', self.INDEX_X_OPTION) in self.RELATIVE_X_OPTIONS:
+            xs = times - lookup
+        else:
+            xs = lookup[np.clip(np.searchsorted(epochs, times, side='left'), 0, epochs.size - 1)]
+        return [
+            (float(x), SEVERITY_COLORS.get(event.severity, SEVERITY_COLORS[SEVERITY_INFO]), event.label)
+            for event, x, ok in zip(self._events, xs, inside)
+            if ok and np.isfinite(x)
+        ]
 
+    def set_time_window(self, start_ts, end_ts):
+        if not self.plotted_data:
+            return
+        start, end = self._to_epoch_seconds(start_ts), self._to_epoch_seconds(end_ts)
+        if start is None or end is None:
+            return
+        start_x, end_x = self._cursor_x(start), self._cursor_x(end)
+        if start_x is None or end_x is None or start_x == end_x:
+            return
+        self.renderer.set_x_range(min(start_x, end_x), max(start_x, end_x))
+
+    # --- Renderização incremental: um artista persistente por série ---
+
+    def _series_key(self, plot_info):
+        return (plot_info['log'], plot_info['col'], plot_info.get('x_col', self.INDEX_X_OPTION),
+                plot_info.get('event', ""))
+
+    def _series_xy(self, plot_info):
+        """(x, y) válidos da série, calculados uma vez e reaproveitados nos redesenhos."""
+        key = self._series_key(plot_info)
+        if key in self._series_cache:
+            return self._series_cache[key]
+        log_name, col, x_col, event = key
+        df_to_plot = self.log_data.get(log_name)
+        data = None
+        if df_to_plot is not None:
+            self._remember_x_lookup(log_name, df_to_plot, x_col, event)
+        if df_to_plot is not None and col in df_to_plot.columns:
+            if x_col in self.RELATIVE_X_OPTIONS:
+                grid = TimeGrid(self.RELATIVE_X_OPTIONS[x_col], self.grid_step, event)
+                x_data, y_data = self._aligned_cache.series(log_name, df_to_plot, col, grid)
+                if not x_data.size and event:
+                    print(f"AVISO: '{log_name}' não tem o evento '{event}'; série '{col}' não plotada.")
+                self._series_cache[key] = (x_data, y_data) if x_data.size else None
+                return self._series_cache[key]
             if x_col == self.INDEX_X_OPTION:
                 valid = df_to_plot[[col]].dropna()
                 x_data = valid.index.to_numpy()
             elif x_col in df_to_plot.columns:
                 valid = df_to_plot[[x_col, col]].dropna()
-                if valid.empty:
-                    continue
-                x_data = valid[x_col].to_numpy()
+                x_data = valid[x_col].to_numpy() if not valid.empty else None
             else:
-                continue
-
-            if valid.empty:
-                continue
-
-            y_data = valid[col].to_numpy()
-
-            linestyle = '-' if use_lines else 'None'
-            marker = None if use_lines else 'o'
-
-            line, = ax.plot(x_data, y_data,
-                            label=line_label, color=color, linestyle=linestyle, marker=marker)
+                valid = None
+            if valid is not None and not valid.empty:
+                data = (x_data, valid[col].to_numpy())
+        self._series_cache[key] = data
+        return data
+
+    def _add_series_artist(self, plot_info):
+        """Plota uma série no seu eixo; devolve True se um eixo novo foi criado."""
+        axis_idx = plot_info['axis_idx']
+        created = self.renderer.ensure_axis(axis_idx)
+        data = self._series_xy(plot_info)
+        if data is None:
+            return created
+        self.renderer.add_series(
+            self._series_key(plot_info), axis_idx, self.axis_names[axis_idx],
+            data[0], data[1], f"{plot_info['col']} ({plot_info['log']})",
+            self.interpolation_checkbox.isChecked(),
+        )
+        return created
+
+    def _series_colors(self):
+        # Usa np.linspace para pegar N cores perfeitamente espaçadas do colormap 'hsv'.
+        # 'endpoint=False' é crucial para que a última cor não seja igual à primeira (vermelho).
+        num_plots = len(self.plotted_data)
+        if num_plots == 0:
+            return {}
+        colors_list = [plt.cm.hsv(i) for i in np.linspace(0, 1, num_plots, endpoint=False)]
+        return {self._series_key(p): colors_list[idx] for idx, p in enumerate(self.plotted_data)}
+
+    def _x_label(self):
+        unique_x = {(p.get('x_col', self.INDEX_X_OPTION), p.get('event', "")) for p in self.plotted_data}
+        if len(unique_x) == 1:
+            only_x, event = unique_x.pop()
+            if only_x == self.INDEX_X_OPTION:
+                return "Índice da Amostra"
+            if event:
+                return f"Tempo desde '{event}' (s)"
+            if only_x in self.RELATIVE_X_OPTIONS:
+                return only_x.strip("<>")
+            return only_x
+        if unique_x:
+            return "Variável X (individual por série)"
+        return ""
+
+    def _refresh(self, relayout=False):
+        self.renderer.set_colors(self._series_colors())
+        self.renderer.set_decorations(self._x_label(), [self._series_key(p) for p in self.plotted_data])
+        self.renderer.set_event_markers(self._event_markers())
+        if relayout:
+            self.renderer.relayout()
+        self.renderer.draw()
 
-            handles.append(line)
-            labels.append(line_label)
-            ax.set_ylabel(self.axis_names[axis_idx])
+    def update_plot(self):
+        """Reconstrói a figura inteira (troca de logs ou mudança no conjunto de eixos)."""
+        if not self.log_data or not self.plotted_data:
+            self.renderer.rebuild(self.chart_title, "Carregue diretórios e adicione variáveis para comparar")
+            self.renderer.draw()
+            return
 
-        # Define o label do eixo X de acordo com as séries ativas
-        if self.plotted_data:
-            unique_x = {p.get('x_col', self.INDEX_X_OPTION) for p in self.plotted_data}
-            if len(unique_x) == 1:
-                only_x = unique_x.pop()
-                if only_x == self.INDEX_X_OPTION:
-                    host_ax.set_xlabel("Índice da Amostra")
-                else:
-                    host_ax.set_xlabel(only_x)
-            else:
-                host_ax.set_xlabel("Variável X (individual por série)")
-        else:
-            host_ax.set_xlabel("")
-        if handles:
-            host_ax.legend(handles, labels, loc='best')
-        else:
-            host_ax.text(0.5, 0.5, 'Nenhum dado válido para plotar.',
-                         transform=host_ax.transAxes, ha='center', va='center',
-                         color='gray', fontsize=10)
-        host_ax.grid(True, linestyle='--', alpha=0.6)
+        self.renderer.rebuild(self.chart_title)
+        for plot_info in self.plotted_data:
+            self._add_series_artist(plot_info)
+        self._refresh(relayout=True)
 
-        self.figure.tight_layout(rect=[0, 0.03, 1, 0.95])
-        self.canvas.draw_idle()
+    def _on_interpolation_changed(self, _state=None):
+        self.renderer.set_interpolation(self.interpolation_checkbox.isChecked())
+        self._refresh()
 
     def reload_data(self, all_log_data):
         self.log_data = all_log_data
-        
+        self.signal_index.sync_logs(self.log_data)
+        self._chosen_signal = ""
+        self.btn_add_all_logs.setEnabled(False)
+        self.signal_search.refresh_if_stale()
+
         self.list_widget.clear()
         self.plotted_data = []
+        self._series_cache = {}
+        self._log_epochs = {}
+        self._x_lookup = {}
+        self._aligned_cache.clear()
         self._reset_axes()
-        
+
         self.log_source_combo.blockSignals(True)
         self.log_source_combo.clear()
         if self.log_data:
@@ -218,21 +419,43 @@ class CustomPlotWidget(QWidget):
             self.log_source_combo.addItems(log_names)
         self.log_source_combo.blockSignals(False)
         self._on_log_source_changed(self.log_source_combo.currentText())
-        
+
         self.update_plot()
-        
+
     def _on_log_source_changed(self, log_name):
         self.column_combo.clear()
         self.x_column_combo.clear()
         self.x_column_combo.addItem(self.INDEX_X_OPTION)
         if log_name and log_name in self.log_data:
-            df = self.log_data[log_name]
-            cols = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c]) and "Timestamp" not in c]
-            self.column_combo.addItems(sorted(cols))
-
-            x_cols = {c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])}
-            for col in sorted(x_cols):
-                self.x_column_combo.addItem(col)
+            if log_name not in self.signal_index.log_names():
+                # Ainda não indexado: só se estiver na RAM (trocar o combo não recarrega do disco)
+                peek = getattr(self.log_data, 'peek', self.log_data.get)
+                self.signal_index.add_log(log_name, peek(log_name))
+            if self.signal_index.has_timestamps(log_name):
+                self.x_column_combo.addItems(list(self.RELATIVE_X_OPTIONS))
+            # Colunas numéricas já separadas pelo índice de sinais (sem varrer o DataFrame)
+            x_cols = sorted(self.signal_index.columns_for(log_name))
+            self.column_combo.addItems([c for c in x_cols if "Timestamp" not in c])
+            self.x_column_combo.addItems(x_cols)
+
+    def release_log(self, log_name):
+        """Log saiu da RAM: solta os caches dele que não estão na tela.
+
+        As séries plotadas (e o que o cursor usa delas) ficam; o resto seria
+        memória fora da conta do ``LogStore``.
+        """
+        self._aligned_cache.discard(log_name)
+        plotted = {self._series_key(p) for p in self.plotted_data}
+        for key in [k for k in self._series_cache if k[0] == log_name and k not in plotted]:
+            del self._series_cache[key]
+        if any(p['log'] == log_name for p in self.plotted_data):
+            used = {(p['log'], p.get('x_col', self.INDEX_X_OPTION), p.get('event', "")) for p in self.plotted_data}
+            for key in [k for k in self._x_lookup if k[0] == log_name and k not in used]:
+                del self._x_lookup[key]
+            return
+        self._log_epochs.pop(log_name, None)
+        for key in [k for k in self._x_lookup if k[0] == log_name]:
+            del self._x_lookup[key]
 
     def _reset_axes(self):
         self.axis_combo.clear()
@@ -243,26 +466,68 @@ class CustomPlotWidget(QWidget):
         new_title, ok = QInputDialog.getText(self, 'Título do Gráfico', 'Digite o título:', text=self.chart_title)
         if ok and new_title:
             self.chart_title = new_title
-            self.update_plot()
-    
-    def add_plot(self):
-        log_name = self.log_source_combo.currentText()
-        col = self.column_combo.currentText()
+            self.renderer.set_title(new_title)
+            self.renderer.draw()
+
+    # --- Busca de sinais ---
+
+    def _on_signal_chosen(self, name):
+        """Seleciona o sinal nos combos (no log atual, se ele tiver o sinal)."""
+        entry = self.signal_index.entry(name)
+        logs = [log for log in (entry.logs if entry else ()) if log in self.log_data]
+        if not logs:
+            return
+        current = self.log_source_combo.currentText()
+        target = current if current in logs else sorted(logs)[0]
+        if target != current:
+            self.log_source_combo.setCurrentText(target)
+        self.column_combo.setCurrentText(name)
+        self._chosen_signal = name
+        self.btn_add_all_logs.setEnabled(len(logs) > 0)
+        self.btn_add_all_logs.setText(f"Adicionar de todos os logs ({len(logs)})")
+
+    def _add_signal_from_all_logs(self):
+        entry = self.signal_index.entry(self._chosen_signal)
+        if entry is None:
+            return
         x_col = self.x_column_combo.currentText()
         target_axis_name = self.axis_combo.currentText()
+        for log_name in sorted(log for log in entry.logs if log in self.log_data):
+            special_x = x_col == self.INDEX_X_OPTION or x_col in self.RELATIVE_X_OPTIONS
+            if not special_x and x_col not in self.signal_index.columns_for(log_name):
+                print(f"AVISO: '{log_name}' não tem a coluna '{x_col}' para o eixo X; sinal não adicionado.")
+                continue
+            # Com "<Novo Eixo>" o primeiro cria o eixo do sinal e os demais o reutilizam
+            self._add_plot(log_name, entry.name, x_col, target_axis_name)
 
+    def add_plot(self):
+        self._add_plot(
+            self.log_source_combo.currentText(),
+            self.column_combo.currentText(),
+            self.x_column_combo.currentText(),
+            self.axis_combo.currentText(),
+        )
+
+    def _add_plot(self, log_name, col, x_col, target_axis_name):
         if not log_name or not col: return
+        event = ""
+        if x_col == self.TIME_SINCE_EVENT_OPTION:
+            event = self.event_combo.currentText()
+            if not event:
+                print("AVISO: Nenhum evento de referência disponível no log ativo para o eixo X.")
+                return
         if any(
             p['log'] == log_name and
             p['col'] == col and
-            p.get('x_col', self.INDEX_X_OPTION) == x_col
+            p.get('x_col', self.INDEX_X_OPTION) == x_col and
+            p.get('event', "") == event
             for p in self.plotted_data
         ):
             return
 
         axis_idx = -1
         if target_axis_name == self.NEW_AXIS_OPTION:
-            axis_name = col 
+            axis_name = col
             if axis_name in self.axis_names:
                 axis_idx = self.axis_names.index(axis_name)
             else:
@@ -273,31 +538,44 @@ class CustomPlotWidget(QWidget):
             axis_name = target_axis_name
             axis_idx = self.axis_names.index(axis_name)
 
-        plot_info = {'log': log_name, 'col': col, 'axis_idx': axis_idx, 'x_col': x_col}
+        plot_info = {'log': log_name, 'col': col, 'axis_idx': axis_idx, 'x_col': x_col, 'event': event}
         self.plotted_data.append(plot_info)
 
         if x_col == self.INDEX_X_OPTION:
             x_desc = "índice"
+        elif event:
+            x_desc = f"tempo desde '{event}' (s)"
+        elif x_col in self.RELATIVE_X_OPTIONS:
+            x_desc = x_col.strip("<>").lower()
         else:
             x_desc = x_col
         item_text = f"'{col}' x '{x_desc}' (de {log_name}) no eixo '{self.axis_names[axis_idx]}'"
         self.list_widget.addItem(item_text)
-        
-        self.update_plot()
+
+        if self.renderer.host is None:
+            self.update_plot()
+            return
+        created = self._add_series_artist(plot_info)
+        # Eixo novo muda a margem direita: só então refaz o layout
+        self._refresh(relayout=created)
 
     def remove_selected(self):
         selected_items = self.list_widget.selectedItems()
         if not selected_items: return
 
         indices_to_remove = sorted([self.list_widget.row(item) for item in selected_items], reverse=True)
-        
+        axes_before = {p['axis_idx'] for p in self.plotted_data}
+
         for index in indices_to_remove:
             self.list_widget.takeItem(index)
-            del self.plotted_data[index]
-            
+            plot_info = self.plotted_data.pop(index)
+            key = self._series_key(plot_info)
+            self._series_cache.pop(key, None)
+            self.renderer.remove_series(key)
+
         if self.plotted_data:
             active_axis_indices = {p['axis_idx'] for p in self.plotted_data}
-            
+
             new_axis_names = []
             old_to_new_idx_map = {}
             current_new_idx = 0
@@ -306,10 +584,10 @@ class CustomPlotWidget(QWidget):
                     new_axis_names.append(name)
                     old_to_new_idx_map[i] = current_new_idx
                     current_new_idx += 1
-            
+
             for p in self.plotted_data:
                 p['axis_idx'] = old_to_new_idx_map[p['axis_idx']]
-            
+
             self.axis_names = new_axis_names
             self.axis_combo.clear()
             self.axis_combo.addItem(self.NEW_AXIS_OPTION)
@@ -317,4 +595,8 @@ class CustomPlotWidget(QWidget):
         else:
             self._reset_axes()
 
-        self.update_plot()
\ No newline at end of file
+        if not self.plotted_data or active_axis_indices != axes_before or self.renderer.host is None:
+            # Conjunto de eixos mudou (índices compactados): reconstrói a figura
+            self.update_plot()
+            return
+        self._refresh()
@@ -0,0 +1,190 @@
+# src/widgets/event_list_widget.py — Aba de eventos: flags, failsafes, modos e EmbeddedError do log ativo
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtGui import QColor
+import math
+
+import pandas as pd
+
+from src.utils.event_index import (
+    KIND_COUNTER, KIND_ERROR, KIND_FLAG, KIND_MODE, SEVERITY_COLORS, SEVERITY_RANK, EventIndex
+)
+
+COLUMNS = ["Horário", "Severidade", "Tipo", "Evento", "Repetições"]
+KIND_FILTERS = [
+    ("Todos os tipos", None),
+    ("Flags / failsafes", KIND_FLAG),
+    ("Contadores de falha", KIND_COUNTER),
+    ("Modos de voo", KIND_MODE),
+    ("EmbeddedError.log", KIND_ERROR),
+]
+SEVERITY_FILTERS = [("Todas as severidades", 0), ("Aviso ou pior", 1), ("Só críticos", 2)]
+
+
+def _fmt_time(epoch):
+    if epoch is None or not math.isfinite(epoch):
+        return "-"
+    # Timestamps do log são "ingênuos": o epoch é lido como UTC para não deslocar o horário
+    return pd.Timestamp(epoch, unit='s').strftime('%H:%M:%S.%f')[:-3]
+
+
+class EventListWidget(QWidget):
+    """Lista dos eventos do log ativo; clicar num evento leva a timeline até ele.
+
+    A lista filtrada é um :class:`EventIndex` próprio, então "anterior" e
+    "próximo" a partir da posição atual da timeline são buscas binárias.
+    """
+
+    # FlightEvent escolhido pelo usuário
+    event_activated = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.log_name = ""
+        self.index = EventIndex()
+        self.visible = EventIndex()
+        self._current_time = math.nan
+        # (linha, horário da timeline) do último salto feito por esta lista
+        self._anchor = None
+
+        layout = QVBoxLayout(self)
+        self.status_label = QLabel("Carregue logs para ver os eventos.")
+        layout.addWidget(self.status_label)
+
+        controls = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filtrar eventos (ex.: failsafe, GNSS, XGCSU)...")
+        self.filter_edit.textChanged.connect(self._apply_filters)
+        controls.addWidget(self.filter_edit, 1)
+        self.kind_combo = QComboBox()
+        for label, _kind in KIND_FILTERS:
+            self.kind_combo.addItem(label)
+        self.kind_combo.currentIndexChanged.connect(self._apply_filters)
+        controls.addWidget(self.kind_combo)
+        self.severity_combo = QComboBox()
+        for label, _rank in SEVERITY_FILTERS:
+            self.severity_combo.addItem(label)
+        self.severity_combo.currentIndexChanged.connect(self._apply_filters)
+        controls.addWidget(self.severity_combo)
+        self.btn_previous = QPushButton("◀ Anterior")
+        self.btn_previous.setToolTip("Evento anterior à posição atual da timeline")
+        self.btn_previous.clicked.connect(lambda: self._step(-1))
+        controls.addWidget(self.btn_previous)
+        self.btn_next = QPushButton("Próximo ▶")
+        self.btn_next.setToolTip("Próximo evento depois da posição atual da timeline")
+        self.btn_next.clicked.connect(lambda: self._step(1))
+        controls.addWidget(self.btn_next)
+        layout.addLayout(controls)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(False)
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.table.cellClicked.connect(lambda row, _col: self._activate_row(row))
+        self.table.cellActivated.connect(lambda row, _col: self._activate_row(row))
+        layout.addWidget(self.table, 1)
+        self._update_buttons()
+
+    # --- Dados ---
+
+    def set_events(self, log_name, index):
+        self.log_name = log_name or ""
+        self.index = index if index is not None else EventIndex()
+        self._apply_filters()
+
+    def set_current_time(self, timestamp):
+        """Posição atual da timeline (base para anterior/próximo)."""
+        try:
+            self._current_time = pd.Timestamp(timestamp).value / 1e9
+        except (TypeError, ValueError):
+            self._current_time = math.nan
+
+    def _apply_filters(self, *_args):
+        kind = KIND_FILTERS[max(self.kind_combo.currentIndex(), 0)][1]
+        min_rank = SEVERITY_FILTERS[max(self.severity_combo.currentIndex(), 0)][1]
+        text = self.filter_edit.text().strip().lower()
+        events = [
+            event for event in self.index
+            if (kind is None or event.kind == kind)
+            and SEVERITY_RANK.get(event.severity, 0) >= min_rank
+            and (not text or text in event.label.lower() or text in event.source.lower())
+        ]
+        self.visible = EventIndex(events)
+        self._populate()
+
+    def _populate(self):
+        self._anchor = None
+        self.table.setUpdatesEnabled(False)
+        try:
+            self.table.setRowCount(0)
+            self.table.setRowCount(len(self.visible))
+            for row, event in enumerate(self.visible):
+                color = QColor(*SEVERITY_COLORS.get(event.severity, (0, 0, 0)))
+                repeats = f"{event.count}x" if event.count > 1 else ""
+                if event.count > 1 and math.isfinite(event.end):
+                    repeats += f" até {_fmt_time(event.end)}"
+                values = [_fmt_time(event.time), event.severity, event.kind, event.label, repeats]
+                for col, text in enumerate(values):
+                    item = QTableWidgetItem(text)
+                    if col == 1:
+                        item.setForeground(color)
+                    if col == 3:
+                        item.setToolTip(f"{event.source}: {event.label}")
+                    self.table.setItem(row, col, item)
+        finally:
+            self.table.setUpdatesEnabled(True)
+
+        if not self.log_name:
+            self.status_label.setText("Carregue logs para ver os eventos.")
+        elif not len(self.index):
+            self.status_label.setText(f"Eventos — {self.log_name}: nenhum evento encontrado.")
+        else:
+            counts = self.index.counts_by_severity()
+            summary = ", ".join(f"{n} {severity}" for severity, n in counts.items() if n)
+            self.status_label.setText(
+                f"Eventos — {self.log_name}: {len(self.visible)} de {len(self.index)} exibidos ({summary})"
+            )
+        self._update_buttons()
+
+    def _update_buttons(self):
+        has_events = len(self.visible) > 0
+        self.btn_previous.setEnabled(has_events)
+        self.btn_next.setEnabled(has_events)
+
+    # --- Navegação ---
+
+    def _activate_row(self, row):
+        if 0 <= row < len(self.visible):
+            self.event_activated.emit(self.visible[row])
+            # A janela principal já atualizou o horário atual (conexão direta)
+            self._anchor = (row, self._current_time)
+
+    def _step(self, direction):
+        if not len(self.visible):
+            return
+        current = self._current_time
+        if self._anchor is not None and self._anchor[1] == current:
+            # Timeline parada no último evento: a amostra mais próxima pode ficar
+            # antes do evento, então anda pela lista em vez de buscar pelo horário
+            position = self._anchor[0] + direction
+            if not 0 <= position < len(self.visible):
+                return
+        elif not math.isfinite(current):
+            position = 0 if direction > 0 else len(self.visible) - 1
+        elif direction > 0:
+            position = self.visible.next_after(current)
+        else:
+            position = self.visible.previous_before(current)
+        if position is None:
+            return
+        self.table.selectRow(position)
+        self.table.scrollToItem(self.table.item(position, 0))
+        self._activate_row(position)
@@ -0,0 +1,370 @@
+"""Diálogo de estatísticas de frota: um sinal agregado sobre todos os voos de uma raiz."""
+from __future__ import annotations
+
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QDate, QThread, Qt
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QCheckBox,
+    QComboBox,
+    QDateEdit,
+    QDialog,
+    QFileDialog,
+    QFormLayout,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QSpinBox,
+    QSplitter,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.figure import Figure
+
+from src.utils.config_manager import load_config
+from src.utils.fleet_stats import (
+    AGG_HISTOGRAM,
+    AGG_MODE_MEANS,
+    AGG_PERCENTILES,
+    DEFAULT_BINS,
+    DEFAULT_PERCENTILES,
+    FleetAggregate,
+    FleetQuery,
+    FleetStatsWorker,
+)
+from src.utils.mode_utils import FW_MODE_PALETTE, RW_MODE_PALETTE
+
+AGGREGATION_CHOICES = [
+    ("Histograma", AGG_HISTOGRAM),
+    ("Percentis", AGG_PERCENTILES),
+    ("Média por modo de voo", AGG_MODE_MEANS),
+]
+
+
+def _fmt(value, digits=2):
+    if value is None or not math.isfinite(value):
+        return "-"
+    return f"{value:.{digits}f}"
+
+
+def _date_epoch(date: QDate) -> float:
+    # Mesmo referencial dos logs: horário "ingênuo" lido como UTC
+    return pd.Timestamp(date.year(), date.month(), date.day()).value / 1e9
+
+
+class FleetStatsDialog(QDialog):
+    """Escolhe sinal, agregação e filtros; o gráfico é atualizado conforme os voos terminam.
+
+    Trocar a agregação depois do cálculo só redesenha: cada voo já devolve
+    tudo o que o histograma, os percentis e as médias por modo precisam.
+    """
+
+    def __init__(self, root: str = "", signal_names: Iterable[str] = (), parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Estatísticas da Frota")
+        self.resize(1100, 760)
+        self.aggregate: Optional[FleetAggregate] = None
+        self._jobs = []
+
+        fleet_cfg = load_config().get("fleet", {})
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+
+        root_row = QHBoxLayout()
+        self.root_edit = QLineEdit(str(root or ""))
+        self.root_edit.setPlaceholderText("Pasta com os voos (todas as subpastas com logs entram)")
+        root_row.addWidget(self.root_edit, 1)
+        btn_root = QPushButton("...")
+        btn_root.clicked.connect(self._choose_root)
+        root_row.addWidget(btn_root)
+        form.addRow("Raiz dos voos", root_row)
+
+        self.signal_combo = QComboBox()
+        self.signal_combo.setEditable(True)
+        self.signal_combo.addItems(sorted(set(signal_names), key=str.lower))
+        self.signal_combo.setCurrentText("CHT")
+        self.signal_combo.completer().setFilterMode(Qt.MatchFlag.MatchContains)
+        self.signal_combo.completer().setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        form.addRow("Sinal", self.signal_combo)
+
+        agg_row = QHBoxLayout()
+        self.aggregation_combo = QComboBox()
+        for label, _key in AGGREGATION_CHOICES:
+            self.aggregation_combo.addItem(label)
+        self.aggregation_combo.currentIndexChanged.connect(lambda _i: self._render())
+        agg_row.addWidget(self.aggregation_combo)
+        agg_row.addWidget(QLabel("Faixas:"))
+        self.bins_spin = QSpinBox()
+        self.bins_spin.setRange(5, 500)
+        self.bins_spin.setValue(int(fleet_cfg.get("bins", DEFAULT_BINS)))
+        self.bins_spin.valueChanged.connect(lambda _v: self._render())
+        agg_row.addWidget(self.bins_spin)
+        agg_row.addStretch(1)
+        form.addRow("Agregação", agg_row)
+
+        self.modes_list = QListWidget()
+        self.modes_list.setMaximumHeight(90)
+        self.modes_list.setFlow(QListWidget.Flow.LeftToRight)
+        self.modes_list.setWrapping(True)
+        labels = [label for label, _color in FW_MODE_PALETTE.values()]
+        labels += [label for label, _color in RW_MODE_PALETTE.values() if label not in labels]
+        for label in labels:
+            item = QListWidgetItem(label)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Unchecked)
+            self.modes_list.addItem(item)
+        self.modes_list.setToolTip("Nenhum marcado = todos os modos")
+        form.addRow("Só nos modos", self.modes_list)
+
+        filters_row = QHBoxLayout()
+        self.only_flying_check = QCheckBox("Só em voo (IsFlying)")
+        filters_row.addWidget(self.only_flying_check)
+        self.folder_filter_edit = QLineEdit()
+        self.folder_filter_edit.setPlaceholderText("Pasta contém (ex.: FW150)")
+        filters_row.addWidget(self.folder_filter_edit, 1)
+        self.log_type_edit = QLineEdit()
+        self.log_type_edit.setPlaceholderText("Tipo de log contém (ex.: Xcockpit)")
+        filters_row.addWidget(self.log_type_edit, 1)
+        form.addRow("Filtros", filters_row)
+
+        date_row = QHBoxLayout()
+        self.date_check = QCheckBox("Voos entre")
+        date_row.addWidget(self.date_check)
+        today = QDate.currentDate()
+        self.start_date = QDateEdit(today.addMonths(-3))
+        self.start_date.setCalendarPopup(True)
+        self.end_date = QDateEdit(today)
+        self.end_date.setCalendarPopup(True)
+        date_row.addWidget(self.start_date)
+        date_row.addWidget(QLabel("e"))
+        date_row.addWidget(self.end_date)
+        date_row.addSpacing(20)
+        date_row.addWidget(QLabel("Processos:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(0, 64)
+        self.workers_spin.setSpecialValueText("automático")
+        self.workers_spin.setValue(int(fleet_cfg.get("max_workers", 0)))
+        date_row.addWidget(self.workers_spin)
+        date_row.addStretch(1)
+        form.addRow("Período", date_row)
+        layout.addLayout(form)
+
+        run_row = QHBoxLayout()
+        self.btn_run = QPushButton("Calcular")
+        self.btn_run.clicked.connect(self.start)
+        run_row.addWidget(self.btn_run)
+        self.btn_cancel = QPushButton("Cancelar")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.clicked.connect(self.cancel)
+        run_row.addWidget(self.btn_cancel)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFormat("%v/%m pastas")
+        run_row.addWidget(self.progress_bar, 1)
+        layout.addLayout(run_row)
+        self.status_label = QLabel("Escolha a raiz e o sinal e clique em Calcular.")
+        layout.addWidget(self.status_label)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        chart = QWidget()
+        chart_layout = QVBoxLayout(chart)
+        chart_layout.setContentsMargins(0, 0, 0, 0)
+        self.figure = Figure(figsize=(6, 4))
+        self.canvas = FigureCanvas(self.figure)
+        chart_layout.addWidget(NavigationToolbar(self.canvas, chart))
+        chart_layout.addWidget(self.canvas, 1)
+        splitter.addWidget(chart)
+        self.table = QTableWidget(0, 2)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        splitter.addWidget(self.table)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 2)
+        layout.addWidget(splitter, 1)
+
+    # --- Execução ---
+
+    def _choose_root(self):
+        path = QFileDialog.getExistingDirectory(self, "Raiz dos voos", self.root_edit.text())
+        if path:
+            self.root_edit.setText(path)
+
+    def _query(self) -> FleetQuery:
+        modes = tuple(
+            self.modes_list.item(i).text() for i in range(self.modes_list.count())
+            if self.modes_list.item(i).checkState() == Qt.CheckState.Checked
+        )
+        start = end = math.nan
+        if self.date_check.isChecked():
+            start = _date_epoch(self.start_date.date())
+            end = _date_epoch(self.end_date.date().addDays(1))
+        return FleetQuery(
+            signal=self.signal_combo.currentText().strip(),
+            aggregation=AGGREGATION_CHOICES[self.aggregation_combo.currentIndex()][1],
+            bins=self.bins_spin.value(),
+            modes=modes,
+            only_flying=self.only_flying_check.isChecked(),
+            folder_filter=self.folder_filter_edit.text().strip(),
+            log_type_filter=self.log_type_edit.text().strip(),
+            start=start,
+            end=end,
+        )
+
+    def start(self):
+        if self._jobs:
+            return
+        root = self.root_edit.text().strip()
+        query = self._query()
+        if not root or not query.signal:
+            QMessageBox.warning(self, "Estatísticas da Frota", "Informe a raiz dos voos e o sinal.")
+            return
+
+        self.aggregate = None
+        self._render()
+        self.btn_run.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.progress_bar.setRange(0, 0)
+        self.status_label.setText(f"Procurando voos em {root}...")
+
+        thread = QThread()
+        worker = FleetStatsWorker(root, query, max_workers=self.workers_spin.value())
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self._on_progress)
+        worker.partial.connect(self._on_partial)
+        worker.finished.connect(self._on_finished)
+        worker.error.connect(self._on_error)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        worker.finished.connect(worker.deleteLater)
+        worker.error.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        job = (thread, worker)
+        thread.finished.connect(lambda job=job: self._on_thread_finished(job))
+        self._jobs.append(job)
+        thread.start()
+
+    def cancel(self):
+        for _thread, worker in list(self._jobs):
+            try:
+                worker.cancel()
+            except RuntimeError:
+                pass
+        self.btn_cancel.setEnabled(False)
+        self.status_label.setText("Cancelando (aguardando os voos em andamento)...")
+
+    def _on_thread_finished(self, job):
+        if job in self._jobs:
+            self._jobs.remove(job)
+        self.btn_run.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+
+    def _on_progress(self, done, total):
+        self.progress_bar.setRange(0, max(total, 1))
+        self.progress_bar.setValue(done)
+
+    def _on_partial(self, aggregate):
+        self.aggregate = aggregate
+        self._render()
+
+    def _on_finished(self, aggregate):
+        self.aggregate = aggregate
+        self._render()
+
+    def _on_error(self, error_msg):
+        self.status_label.setText("Erro nas estatísticas da frota.")
+        QMessageBox.critical(self, "Erro", error_msg)
+
+    def closeEvent(self, event):
+        self.cancel()
+        super().closeEvent(event)
+
+    # --- Exibição ---
+
+    def _render(self):
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+        agg = self.aggregate
+        key = AGGREGATION_CHOICES[self.aggregation_combo.currentIndex()][1]
+        if agg is None or not agg.count:
+            ax.text(0.5, 0.5, "Sem dados ainda" if agg is None else "Nenhuma amostra nos voos processados",
+                    ha="center", va="center", transform=ax.transAxes)
+            ax.set_axis_off()
+            self.table.setRowCount(0)
+            self.canvas.draw_idle()
+            if agg is not None:
+                self._update_status(agg)
+            return
+
+        signal = agg.query.signal
+        if key == AGG_HISTOGRAM:
+            counts, edges = agg.histogram(self.bins_spin.value())
+            ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color='#2196f3', edgecolor='white')
+            ax.set_xlabel(signal)
+            ax.set_ylabel("Amostras (estimadas)")
+            rows = self._percentile_rows(agg)
+        elif key == AGG_PERCENTILES:
+            percents = np.arange(1, 100)
+            ax.plot(percents, agg.percentiles(percents), color='#2196f3')
+            ax.set_xlabel("Percentil")
+            ax.set_ylabel(signal)
+            rows = self._percentile_rows(agg)
+        else:
+            table = agg.mode_table()
+            labels = [row.label for row in table]
+            ax.bar(labels, [row.mean for row in table],
+                   yerr=[0.0 if not math.isfinite(row.std) else row.std for row in table],
+                   color='#4caf50', capsize=4)
+            ax.set_ylabel(f"{signal} (média ± desvio)")
+            ax.tick_params(axis='x', labelrotation=30)
+            rows = [("Modo", "Média ± desvio (amostras, voos)")]
+            rows += [(row.label, f"{_fmt(row.mean)} ± {_fmt(row.std)} ({row.count}, {row.flights})") for row in table]
+        ax.grid(True, linestyle='--', alpha=0.6)
+        partial = agg.folders_done < agg.folders_total
+        ax.set_title(f"{signal} — {len(agg.flights)} log(s)" + (" (parcial)" if partial else ""))
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+        self._fill_table(rows)
+        self._update_status(agg)
+
+    def _percentile_rows(self, agg: FleetAggregate):
+        rows = [("Estatística", "Valor"), ("Amostras", str(agg.count)), ("Média", _fmt(agg.mean)),
+                ("Desvio padrão", _fmt(agg.std)), ("Mínimo", _fmt(agg.minimum)), ("Máximo", _fmt(agg.maximum))]
+        for percent, value in zip(DEFAULT_PERCENTILES, agg.percentiles(DEFAULT_PERCENTILES)):
+            rows.append((f"P{percent}", _fmt(value)))
+        return rows
+
+    def _fill_table(self, rows):
+        header, *body = rows
+        self.table.setHorizontalHeaderLabels(list(header))
+        self.table.setRowCount(len(body))
+        for row, values in enumerate(body):
+            for col, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                if col:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, col, item)
+
+    def _update_status(self, agg: FleetAggregate):
+        cached = sum(1 for f in agg.flights if f.from_cache)
+        text = (f"{agg.folders_done}/{agg.folders_total} pastas — {len(agg.flights)} log(s) com o sinal "
+                f"({cached} do cache), {len(agg.skipped)} sem dados, {len(agg.errors)} com erro.")
+        if any(f.flying_filter_skipped for f in agg.flights):
+            text += " Alguns logs não têm IsFlying e entraram inteiros."
+        self.status_label.setText(text)
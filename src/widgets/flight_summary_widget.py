@@ -0,0 +1,256 @@
+# src/widgets/flight_summary_widget.py — Aba de resumo: estatísticas de todos os logs carregados
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView,
+    QAbstractItemView, QSplitter
+)
+from PyQt6.QtCore import Qt, QThread
+from datetime import datetime
+from functools import partial
+import math
+
+from src.utils.config_manager import load_config
+from src.utils.flight_stats import DEFAULT_STATS_WORKERS, FlightStats, FlightStatsWorker, format_duration
+from src.utils.log_store import LogStore
+
+
+def _fmt(value, scale=1.0, digits=1):
+    if value is None or not math.isfinite(value):
+        return "-"
+    return f"{value / scale:.{digits}f}"
+
+
+def _fmt_start(epoch):
+    if epoch is None or not math.isfinite(epoch):
+        return "-"
+    return datetime.fromtimestamp(epoch).strftime('%d/%m/%Y %H:%M:%S')
+
+
+# (título, função que formata a coluna a partir do FlightStats)
+LOG_COLUMNS = [
+    ("Log", None),
+    ("Início", lambda s: _fmt_start(s.start)),
+    ("Duração", lambda s: format_duration(s.duration_s)),
+    ("Tempo de voo", lambda s: format_duration(s.flight_time_s)),
+    ("Alt. máx rel. (m)", lambda s: _fmt(s.max_altitude_m, digits=0)),
+    ("Distância (km)", lambda s: _fmt(s.total_distance_m, 1000.0, 2)),
+    ("Afast. máx (km)", lambda s: _fmt(s.max_distance_m, 1000.0, 2)),
+    ("Vel. solo máx (m/s)", lambda s: _fmt(s.max_ground_speed_ms)),
+    ("Tensão mín (V)", lambda s: _fmt(s.min_voltage_v, digits=2)),
+    ("Bateria mín (%)", lambda s: _fmt(s.min_battery_pct, digits=0)),
+    ("Combustível usado", lambda s: _fmt(s.fuel_used)),
+]
+
+MODE_COLUMNS = ["Modo", "Tempo", "% do tempo", "Trechos", "Distância (km)", "Alt. máx rel. (m)"]
+
+
+class FlightSummaryWidget(QWidget):
+    """Tabela de estatísticas por log + detalhamento por modo do log selecionado.
+
+    As estatísticas chegam prontas nos artefatos de cada log; os que ainda
+    faltam são calculados num pool de threads quando a aba é aberta.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.log_data = {}
+        self.stats = {}
+        self.current_log_name = ""
+        self._row_of = {}
+        self._jobs = []
+        self._inflight = set()
+        # Descarta resultados de um conjunto de logs anterior
+        self._generation = 0
+
+        layout = QVBoxLayout(self)
+        self.status_label = QLabel("Carregue logs para ver o resumo dos voos.")
+        layout.addWidget(self.status_label)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self.table = QTableWidget(0, len(LOG_COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in LOG_COLUMNS])
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.itemSelectionChanged.connect(self._on_selection_changed)
+        splitter.addWidget(self.table)
+
+        mode_panel = QWidget()
+        mode_layout = QVBoxLayout(mode_panel)
+        mode_layout.setContentsMargins(0, 0, 0, 0)
+        self.mode_label = QLabel("Tempo por modo de voo")
+        mode_layout.addWidget(self.mode_label)
+        self.mode_table = QTableWidget(0, len(MODE_COLUMNS))
+        self.mode_table.setHorizontalHeaderLabels(MODE_COLUMNS)
+        self.mode_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.mode_table.verticalHeader().setVisible(False)
+        self.mode_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.mode_table.horizontalHeader().setStretchLastSection(True)
+        mode_layout.addWidget(self.mode_table)
+        splitter.addWidget(mode_panel)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 2)
+        layout.addWidget(splitter, 1)
+
+    # --- Dados ---
+
+    def set_logs(self, log_data):
+        """Novo conjunto de logs: limpa a tabela (as estatísticas chegam depois)."""
+        self.cancel_jobs()
+        self._generation += 1
+        # Logs em disco (LogStore) são lidos só quando o cálculo deles roda
+        self.log_data = log_data.transient_view() if isinstance(log_data, LogStore) else dict(log_data)
+        self.stats = {}
+        self._inflight.clear()
+        self._row_of = {}
+        self.table.setRowCount(0)
+        self.mode_table.setRowCount(0)
+        for row, name in enumerate(sorted(self.log_data)):
+            self.table.insertRow(row)
+            self._row_of[name] = row
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            for col in range(1, len(LOG_COLUMNS)):
+                self.table.setItem(row, col, QTableWidgetItem("..."))
+        self._update_status()
+        if self.isVisible():
+            self.ensure_ready()
+
+    def set_stats(self, log_name, stats: FlightStats):
+        if log_name not in self.log_data or stats is None:
+            return
+        self.stats[log_name] = stats
+        self._inflight.discard(log_name)
+        row = self._row_of.get(log_name)
+        if row is not None:
+            for col, (_title, fmt) in enumerate(LOG_COLUMNS[1:], start=1):
+                item = QTableWidgetItem(fmt(stats))
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                if col == len(LOG_COLUMNS) - 1 and stats.fuel_column:
+                    item.setToolTip(
+                        f"{stats.fuel_column}: {_fmt(stats.fuel_start)} → {_fmt(stats.fuel_end)} (mediana das pontas do log)"
+                    )
+                if stats.error:
+                    item.setToolTip(stats.error)
+                self.table.setItem(row, col, item)
+            flight_item = self.table.item(row, 3)
+            if flight_item is not None and stats.flight_time_source == 'log':
+                flight_item.setToolTip("Sem coluna IsFlying: tempo de log sem lacunas")
+        if log_name == self.current_log_name:
+            self._show_modes(log_name)
+        self._update_status()
+
+    def set_active_log(self, log_name):
+        self.current_log_name = log_name
+        row = self._row_of.get(log_name)
+        if row is None:
+            return
+        self.table.blockSignals(True)
+        self.table.selectRow(row)
+        self.table.blockSignals(False)
+        self._show_modes(log_name)
+
+    def ensure_ready(self):
+        """Calcula (em segundo plano) as estatísticas que ainda faltam."""
+        missing = [
+            name for name in sorted(self.log_data)
+            if name not in self.stats and name not in self._inflight
+        ]
+        if not missing:
+            return
+        # Log ativo primeiro
+        if self.current_log_name in missing:
+            missing.remove(self.current_log_name)
+            missing.insert(0, self.current_log_name)
+        try:
+            max_workers = int(load_config().get("stats", {}).get("max_workers", DEFAULT_STATS_WORKERS))
+        except Exception:
+            max_workers = DEFAULT_STATS_WORKERS
+
+        thread = QThread()
+        worker = FlightStatsWorker(
+            [(name, partial(self.log_data.__getitem__, name)) for name in missing], max_workers=max_workers
+        )
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.computed.connect(
+            lambda name, stats, generation=self._generation: self._on_stats_computed(generation, name, stats)
+        )
+        worker.finished.connect(thread.quit)
+        worker.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        job = (thread, worker, tuple(missing))
+        thread.finished.connect(lambda job=job: self._on_job_finished(job))
+        self._inflight.update(missing)
+        self._jobs.append(job)
+        thread.start()
+        self._update_status()
+
+    def cancel_jobs(self):
+        for _thread, worker, _names in list(self._jobs):
+            try:
+                worker.cancel()
+            except RuntimeError:
+                pass
+
+    def _on_stats_computed(self, generation, log_name, stats):
+        if generation != self._generation:
+            return  # Resultado de um carregamento anterior
+        self.set_stats(log_name, stats)
+
+    def _on_job_finished(self, job):
+        if job in self._jobs:
+            self._jobs.remove(job)
+        for name in job[2]:
+            self._inflight.discard(name)
+        self._update_status()
+
+    # --- Exibição ---
+
+    def _on_selection_changed(self):
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return
+        item = self.table.item(rows[0].row(), 0)
+        if item is not None:
+            self._show_modes(item.text())
+
+    def _show_modes(self, log_name):
+        self.mode_table.setRowCount(0)
+        stats = self.stats.get(log_name)
+        if stats is None:
+            self.mode_label.setText(f"Tempo por modo de voo — {log_name} (calculando...)")
+            return
+        if not stats.modes:
+            self.mode_label.setText(f"Tempo por modo de voo — {log_name} (sem coluna ModoVoo)")
+            return
+        self.mode_label.setText(f"Tempo por modo de voo — {log_name}")
+        total = sum(mode.time_s for mode in stats.modes)
+        for row, mode in enumerate(stats.modes):
+            share = 100.0 * mode.time_s / total if total > 0 else math.nan
+            values = [
+                mode.label,
+                format_duration(mode.time_s),
+                _fmt(share),
+                str(mode.segments),
+                _fmt(mode.distance_m, 1000.0, 2),
+                _fmt(mode.max_altitude_m, digits=0),
+            ]
+            self.mode_table.insertRow(row)
+            for col, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                if col:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.mode_table.setItem(row, col, item)
+
+    def _update_status(self):
+        total = len(self.log_data)
+        if not total:
+            self.status_label.setText("Carregue logs para ver o resumo dos voos.")
+            return
+        done = len(self.stats)
+        if done < total:
+            self.status_label.setText(f"Resumo dos voos: {done}/{total} logs calculados...")
+        else:
+            self.status_label.setText(f"Resumo dos voos: {total} log(s).")
@@ -4,10 +4,13 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List
 
-from PyQt6.QtCore import QDate, QSize, QThread, Qt, pyqtSignal, QObject
+import math
+
+from PyQt6.QtCore import QDate, QSize, QThread, QTimer, Qt, pyqtSignal, QObject
 from PyQt6.QtGui import QIcon, QPixmap
 from PyQt6.QtWidgets import (
     QAbstractItemView,
+    QComboBox,
     QDateEdit,
     QDialog,
     QFileDialog,
@@ -21,15 +24,21 @@ from PyQt6.QtWidgets import (
     QMessageBox,
     QPushButton,
     QProgressBar,
+    QSpinBox,
     QStackedWidget,
     QStyle,
     QVBoxLayout,
     QWidget,
 )
 
+from src.utils.config_manager import load_config
+from src.utils.flight_catalog import CatalogIndexWorker, FlightCatalog, FlightMetadata, flight_source_path
 from src.utils.resource_paths import get_appdata_logs_dir, resource_path
 from src.utils.sharepoint_downloader import (
+    DEFAULT_COPY_WORKERS,
+    CopyProgress,
     SharePointClient,
+    SharePointCredentialError,
     SharePointFlight,
     SharePointProgram,
     available_programs,
@@ -39,6 +48,8 @@ from src.utils.sharepoint_downloader import (
 class SharePointListWorker(QObject):
     finished = pyqtSignal(list)
     error = pyqtSignal(str)
+    # Voos de um serial/agenda, emitidos assim que a subárvore termina de ser lida
+    flights_found = pyqtSignal(list)
 
     def __init__(self, client: SharePointClient, program: SharePointProgram):
         super().__init__()
@@ -47,7 +58,7 @@ class SharePointListWorker(QObject):
 
     def run(self):
         try:
-            flights = self.client.list_flights(self.program)
+            flights = self.client.list_flights(self.program, on_flights=self.flights_found.emit)
             self.finished.emit(flights)
         except Exception as exc:  # pragma: no cover - depende da API
             self.error.emit(str(exc))
@@ -58,34 +69,73 @@ class SharePointDownloadWorker(QObject):
     error = pyqtSignal(str)
     progress = pyqtSignal(int, str)
 
-    def __init__(self, client: SharePointClient, flights: List[SharePointFlight], destination: Path):
+    def __init__(
+        self,
+        client: SharePointClient,
+        flights: List[SharePointFlight],
+        destination: Path,
+        max_workers: int = DEFAULT_COPY_WORKERS,
+        verify_hash: bool = False,
+        compression: str | None = None,
+    ):
         super().__init__()
         self.client = client
         self.flights = flights
         self.destination = destination
+        self.max_workers = max_workers
+        self.verify_hash = verify_hash
+        self.compression = compression
 
     def run(self):
         try:
-            total = len(self.flights)
-            downloaded_paths: List[Path] = []
-            errors: List[str] = []
-            if total == 0:
-                self.finished.emit(downloaded_paths, errors)
+            if not self.flights:
+                self.finished.emit([], [])
                 return
-            for idx, flight in enumerate(self.flights, start=1):
-                percent = int((idx - 1) / total * 100)
-                self.progress.emit(percent, f"Copiando {flight.name} ({idx}/{total})")
-                try:
-                    local_path = self.client.download_flight(flight, self.destination)
-                    downloaded_paths.append(local_path)
-                except Exception as exc:  # pragma: no cover - depende do SO
-                    errors.append(f"{flight.name}: {exc}")
-                    continue
+            downloaded_paths, errors = self.client.copy_flights(
+                self.flights,
+                self.destination,
+                on_progress=self._emit_progress,
+                max_workers=self.max_workers,
+                verify_hash=self.verify_hash,
+                compression=self.compression,
+            )
             self.progress.emit(100, "Cópia concluída")
             self.finished.emit(downloaded_paths, errors)
         except Exception as exc:  # pragma: no cover - depende da API
             self.error.emit(str(exc))
 
+    def _emit_progress(self, progress: CopyProgress):
+        parts = [
+            f"Copiando {len(self.flights)} voos: arquivo {progress.files_done}/{progress.files_total}",
+            f"{_format_bytes(progress.done_bytes)} de {_format_bytes(progress.total_bytes)}",
+            f"{_format_bytes(progress.bytes_per_s)}/s",
+        ]
+        if progress.eta_s is not None and progress.done_bytes < progress.total_bytes:
+            minutes, seconds = divmod(int(progress.eta_s), 60)
+            parts.append(f"restante ~{minutes:02d}:{seconds:02d}")
+        if progress.skipped:
+            parts.append(f"{progress.skipped} já atualizados")
+        self.progress.emit(progress.percent, " — ".join(parts))
+
+
+# (rótulo, atributo de FlightMetadata ou None para a data da pasta, decrescente)
+SORT_OPTIONS = (
+    ("Data (mais recentes)", None, True),
+    ("Duração", "duration_s", True),
+    ("Altitude máxima (rel. decolagem)", "max_altitude_m", True),
+    ("Distância percorrida", "distance_m", True),
+    ("Bateria mínima", "battery_min_v", False),
+)
+ANY_MODE = "Qualquer modo"
+
+
+def _format_bytes(value: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
 
 class LogDownloadDialog(QDialog):
     """Interface guiada para copiar logs da pasta sincronizada com poucos cliques."""
@@ -111,6 +161,17 @@ class LogDownloadDialog(QDialog):
         self.origin_path_label: QLabel | None = None
         self.btn_change_origin: QPushButton | None = None
 
+        # Catálogo de metadados (duração, altitude, modos...) indexado em segundo plano
+        self.catalog: FlightCatalog | None = None
+        self._metadata: dict[str, FlightMetadata] = {}
+        self._index_thread: QThread | None = None
+        self._index_worker: CatalogIndexWorker | None = None
+        self._index_pending = False
+        self._refilter_timer = QTimer(self)
+        self._refilter_timer.setSingleShot(True)
+        self._refilter_timer.setInterval(300)
+        self._refilter_timer.timeout.connect(self._apply_filters)
+
         self._build_ui()
         self._refresh_origin_path_label()
 
@@ -225,6 +286,34 @@ class LogDownloadDialog(QDialog):
         self.end_date_edit.dateChanged.connect(self._apply_filters)
         filters_row.addWidget(self.end_date_edit, 1, 3)
 
+        filters_row.addWidget(QLabel("Duração mín. (min)"), 2, 0)
+        self.min_duration_spin = QSpinBox()
+        self.min_duration_spin.setRange(0, 24 * 60)
+        self.min_duration_spin.setSpecialValueText("Qualquer")
+        self.min_duration_spin.valueChanged.connect(self._apply_filters)
+        filters_row.addWidget(self.min_duration_spin, 2, 1)
+
+        filters_row.addWidget(QLabel("Altitude máx. rel. ≥ (m)"), 2, 2)
+        self.min_altitude_spin = QSpinBox()
+        self.min_altitude_spin.setRange(0, 20000)
+        self.min_altitude_spin.setSingleStep(50)
+        self.min_altitude_spin.setSpecialValueText("Qualquer")
+        self.min_altitude_spin.valueChanged.connect(self._apply_filters)
+        filters_row.addWidget(self.min_altitude_spin, 2, 3)
+
+        filters_row.addWidget(QLabel("Modo de voo"), 3, 0)
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem(ANY_MODE)
+        self.mode_combo.currentIndexChanged.connect(self._apply_filters)
+        filters_row.addWidget(self.mode_combo, 3, 1)
+
+        filters_row.addWidget(QLabel("Ordenar por"), 3, 2)
+        self.sort_combo = QComboBox()
+        for label, _attr, _desc in SORT_OPTIONS:
+            self.sort_combo.addItem(label)
+        self.sort_combo.currentIndexChanged.connect(self._apply_filters)
+        filters_row.addWidget(self.sort_combo, 3, 3)
+
         action_layout = QHBoxLayout()
         self.btn_select_all = QPushButton("Selecionar tudo")
         self.btn_select_all.clicked.connect(self._select_all)
@@ -233,7 +322,15 @@ class LogDownloadDialog(QDialog):
         action_layout.addWidget(self.btn_select_all)
         action_layout.addWidget(self.btn_clear_selection)
         action_layout.addStretch(1)
-        filters_row.addLayout(action_layout, 2, 0, 1, 4)
+        self.index_status_label = QLabel()
+        action_layout.addWidget(self.index_status_label)
+        self.btn_index = QPushButton("Indexar metadados")
+        self.btn_index.setToolTip(
+            "Lê cada voo uma vez (sem copiar) para permitir filtrar por duração, altitude e modos."
+        )
+        self.btn_index.clicked.connect(self._start_indexing)
+        action_layout.addWidget(self.btn_index)
+        filters_row.addLayout(action_layout, 4, 0, 1, 4)
 
         right_panel.addLayout(filters_row)
 
@@ -369,6 +466,7 @@ class LogDownloadDialog(QDialog):
             return
         self.flight_list.clear()
         self.all_flights = []
+        self._cancel_indexing()
         self._set_busy_state(True)
         self.progress_bar.show()
         self.progress_bar.setRange(0, 0)
@@ -379,6 +477,7 @@ class LogDownloadDialog(QDialog):
         self._list_thread = QThread()
         self.list_worker.moveToThread(self._list_thread)
         self._list_thread.started.connect(self.list_worker.run)
+        self.list_worker.flights_found.connect(self._on_flights_found)
         self.list_worker.finished.connect(self._on_flights_loaded)
         self.list_worker.error.connect(self._on_worker_error)
         self.list_worker.error.connect(self._list_thread.quit)
@@ -387,18 +486,30 @@ class LogDownloadDialog(QDialog):
         self.list_worker.finished.connect(self.list_worker.deleteLater)
         self._list_thread.finished.connect(self._list_thread.deleteLater)
         self._list_thread.start()
+        # A lista de seriais é preenchida aos poucos; já pode ser navegada durante a varredura.
+        self.serial_list.setEnabled(True)
+
+    def _on_flights_found(self, flights: List[SharePointFlight]):
+        self.all_flights.extend(flights)
+        self._load_cached_metadata(flights)
+        self._populate_serials(self.all_flights)
+        self._configure_date_filters(self.all_flights)
+        self.status_label.setText(f"Lendo a pasta local... {len(self.all_flights)} voos encontrados até agora.")
 
     def _on_flights_loaded(self, flights: List[SharePointFlight]):
         self.all_flights = flights
-        if not flights:
-            self.status_label.setText("Nenhum voo encontrado nesse programa.")
-        else:
-            self.status_label.setText(f"{len(flights)} voos encontrados. Selecione um intervalo ou use a busca.")
         self.progress_bar.hide()
         self._set_busy_state(False)
         self._populate_serials(flights)
         self._configure_date_filters(flights)
+        self._load_cached_metadata(flights)
         self._apply_filters()
+        if not flights:
+            self.status_label.setText("Nenhum voo encontrado nesse programa.")
+        else:
+            self.status_label.setText(f"{len(flights)} voos encontrados. Selecione um intervalo ou use a busca.")
+            if bool(load_config().get("catalog", {}).get("auto_index", True)):
+                self._start_indexing()
 
     def _configure_date_filters(self, flights: List[SharePointFlight]):
         valid_dates = [flight.date for flight in flights if flight.date]
@@ -417,7 +528,10 @@ class LogDownloadDialog(QDialog):
         self.end_date_edit.setDate(QDate(max_date.year, max_date.month, max_date.day))
 
     def _populate_serials(self, flights: List[SharePointFlight]):
+        previous_serial = self.selected_serial
+        self.serial_list.blockSignals(True)
         self.serial_list.clear()
+        self.serial_list.blockSignals(False)
         self._flights_by_serial.clear()
         self.selected_serial = None
         for flight in flights:
@@ -447,8 +561,11 @@ class LogDownloadDialog(QDialog):
         self.serial_status_label.setText(
             f"Selecione um serial para visualizar os {len(flights)} voos encontrados."
         )
-        # Seleciona o primeiro serial por padrão para agilizar a navegação.
-        if self.serial_list.count() > 0:
+        # Mantém o serial escolhido entre atualizações; senão seleciona o primeiro.
+        keys = sorted(self._flights_by_serial)
+        if previous_serial in self._flights_by_serial:
+            self.serial_list.setCurrentRow(keys.index(previous_serial))
+        elif self.serial_list.count() > 0:
             self.serial_list.setCurrentRow(0)
 
     def _set_busy_state(self, busy: bool):
@@ -487,7 +604,12 @@ class LogDownloadDialog(QDialog):
             return
 
         serial_flights = self._flights_by_serial.get(self.selected_serial, [])
+        min_duration_s = self.min_duration_spin.value() * 60
+        min_altitude_m = self.min_altitude_spin.value()
+        mode = self.mode_combo.currentText()
+        needs_metadata = bool(min_duration_s or min_altitude_m or mode != ANY_MODE)
 
+        visible: List[tuple[SharePointFlight, FlightMetadata | None]] = []
         for flight in serial_flights:
             if flight.date:
                 flight_qdate = QDate(flight.date.year, flight.date.month, flight.date.day)
@@ -497,7 +619,32 @@ class LogDownloadDialog(QDialog):
                 normalized = f"{flight.name} {flight.serial_folder or ''}".lower()
                 if text_filter not in normalized:
                     continue
-            item = QListWidgetItem(flight.human_label())
+            meta = self._flight_metadata(flight)
+            if needs_metadata:
+                # Sem metadados ainda não dá para afirmar que o voo passa no filtro
+                if meta is None or not meta.has_data:
+                    continue
+                if min_duration_s and not meta.duration_s >= min_duration_s:
+                    continue
+                if min_altitude_m and not meta.max_altitude_m >= min_altitude_m:
+                    continue
+                if mode != ANY_MODE and mode not in meta.modes:
+                    continue
+            visible.append((flight, meta))
+
+        _label, attr, descending = SORT_OPTIONS[max(0, self.sort_combo.currentIndex())]
+        if attr is not None:
+            # Voos sem o valor vão para o fim, em qualquer direção
+            def sort_key(pair):
+                value = getattr(pair[1], attr, math.nan) if pair[1] is not None else math.nan
+                if not math.isfinite(value):
+                    return (1, 0.0)
+                return (0, -value if descending else value)
+
+            visible.sort(key=sort_key)
+
+        for flight, meta in visible:
+            item = QListWidgetItem(self._flight_label(flight, meta))
             item.setData(Qt.ItemDataRole.UserRole, flight)
             tooltip_lines = [
                 f"Nome: {flight.name}",
@@ -506,12 +653,169 @@ class LogDownloadDialog(QDialog):
                 f"Tipos de log: {', '.join(flight.log_types) if flight.log_types else 'nenhum detectado'}",
                 f"Caminho relativo: {flight.relative_path}",
             ]
+            tooltip_lines.extend(self._metadata_tooltip(meta))
             item.setToolTip("\n".join(tooltip_lines))
             self.flight_list.addItem(item)
 
         self.status_label.setText(f"Mostrando {self.flight_list.count()} voos dentro do filtro.")
         self._update_selection_label()
 
+    # ------------------------------ Catálogo ------------------------------
+    def _ensure_catalog(self) -> FlightCatalog | None:
+        if self.catalog is None:
+            try:
+                self.catalog = FlightCatalog()
+            except Exception as exc:
+                print(f"AVISO: Catálogo de voos indisponível: {exc}")
+                return None
+        return self.catalog
+
+    def _flight_key(self, flight: SharePointFlight) -> str | None:
+        try:
+            return flight_source_path(self.client, flight)
+        except SharePointCredentialError:
+            return None
+
+    def _flight_metadata(self, flight: SharePointFlight) -> FlightMetadata | None:
+        key = self._flight_key(flight)
+        return self._metadata.get(key) if key else None
+
+    def _load_cached_metadata(self, flights: List[SharePointFlight]):
+        catalog = self._ensure_catalog()
+        if catalog is None:
+            return
+        keys = [key for key in (self._flight_key(flight) for flight in flights) if key]
+        self._metadata.update(catalog.lookup(keys))
+        self._refresh_mode_options()
+        self._update_index_status()
+
+    def _refresh_mode_options(self):
+        modes = sorted({mode for meta in self._metadata.values() for mode in meta.modes})
+        existing = [self.mode_combo.itemText(i) for i in range(1, self.mode_combo.count())]
+        if modes == existing:
+            return
+        current = self.mode_combo.currentText()
+        self.mode_combo.blockSignals(True)
+        self.mode_combo.clear()
+        self.mode_combo.addItem(ANY_MODE)
+        self.mode_combo.addItems(modes)
+        index = self.mode_combo.findText(current)
+        self.mode_combo.setCurrentIndex(index if index >= 0 else 0)
+        self.mode_combo.blockSignals(False)
+
+    def _update_index_status(self, done: int | None = None, total: int | None = None):
+        if total:
+            self.index_status_label.setText(f"Indexando metadados: {done}/{total}")
+            return
+        indexed = sum(1 for flight in self.all_flights if self._flight_metadata(flight) is not None)
+        self.index_status_label.setText(
+            f"Metadados: {indexed}/{len(self.all_flights)} voos" if self.all_flights else ""
+        )
+
+    def _start_indexing(self):
+        if self._index_thread is not None:
+            # Nova listagem durante uma indexação: recomeça quando a atual terminar
+            self._index_pending = True
+            return
+        if not self.all_flights:
+            return
+        catalog = self._ensure_catalog()
+        if catalog is None:
+            return
+        max_workers = int(load_config().get("catalog", {}).get("max_workers", 2))
+        worker = CatalogIndexWorker(self.client, list(self.all_flights), catalog, max_workers=max_workers)
+        thread = QThread()
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self._update_index_status)
+        worker.flight_indexed.connect(self._on_flight_indexed)
+        worker.finished.connect(self._on_indexing_finished)
+        worker.error.connect(self._on_indexing_error)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        worker.finished.connect(worker.deleteLater)
+        worker.error.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(self._on_index_thread_finished)
+        self._index_worker = worker
+        self._index_thread = thread
+        self.btn_index.setEnabled(False)
+        thread.start()
+
+    def _on_flight_indexed(self, metadata: FlightMetadata):
+        self._metadata[metadata.source_path] = metadata
+        self._refresh_mode_options()
+        self._refilter_timer.start()
+
+    def _on_indexing_finished(self, count: int):
+        if count:
+            print(f"INFO: {count} voos adicionados ao catálogo de metadados.")
+        self._update_index_status()
+        self._refilter_timer.start()
+
+    def _on_indexing_error(self, message: str):
+        print(f"ERRO: Falha ao indexar metadados dos voos: {message}")
+        self.index_status_label.setText("Falha ao indexar metadados")
+
+    def _on_index_thread_finished(self):
+        self._index_thread = None
+        self._index_worker = None
+        self.btn_index.setEnabled(True)
+        if self._index_pending and not self._is_busy:
+            self._index_pending = False
+            self._start_indexing()
+
+    def _cancel_indexing(self):
+        if self._index_worker is not None:
+            try:
+                self._index_worker.cancel()
+            except RuntimeError:
+                pass
+
+    def shutdown_background_jobs(self):
+        """Interrompe a indexação (chamado ao fechar a aplicação)."""
+        self._index_pending = False
+        self._cancel_indexing()
+        if self._index_thread is not None:
+            self._index_thread.quit()
+            self._index_thread.wait(5000)
+        if self.catalog is not None:
+            self.catalog.close()
+            self.catalog = None
+
+    @staticmethod
+    def _flight_label(flight: SharePointFlight, meta: FlightMetadata | None) -> str:
+        label = flight.human_label()
+        if meta is None or not meta.has_data:
+            return label
+        extras = []
+        if math.isfinite(meta.duration_s):
+            extras.append(f"{meta.duration_s / 60:.0f} min")
+        if math.isfinite(meta.max_altitude_m):
+            extras.append(f"alt. máx. {meta.max_altitude_m:.0f} m (rel.)")
+        if math.isfinite(meta.distance_m):
+            extras.append(f"{meta.distance_m / 1000:.1f} km")
+        return f"{label} — {', '.join(extras)}" if extras else label
+
+    @staticmethod
+    def _metadata_tooltip(meta: FlightMetadata | None) -> List[str]:
+        if meta is None:
+            return ["Metadados: ainda não indexado"]
+        if not meta.has_data:
+            return [f"Metadados: {meta.error or 'sem dados'}"]
+        lines = [f"Log principal: {meta.log_type} ({meta.samples} amostras)"]
+        if meta.modes:
+            lines.append(f"Modos: {', '.join(meta.modes)}")
+        if math.isfinite(meta.battery_min_v):
+            lines.append(f"Tensão mínima: {meta.battery_min_v:.2f} V")
+        if math.isfinite(meta.battery_min_pct):
+            lines.append(f"Bateria mínima: {meta.battery_min_pct:.0f}%")
+        if math.isfinite(meta.lat_min):
+            lines.append(
+                f"Área: lat {meta.lat_min:.5f} a {meta.lat_max:.5f}, lon {meta.lon_min:.5f} a {meta.lon_max:.5f}"
+            )
+        return lines
+
     def _on_serial_selected(self):
         items = self.serial_list.selectedItems()
         if not items:
@@ -567,7 +871,15 @@ class LogDownloadDialog(QDialog):
         self.status_label.setText(f"Preparando cópia de {len(flights)} voos...")
         self._set_busy_state(True)
 
-        self.download_worker = SharePointDownloadWorker(self.client, flights, destination)
+        download_cfg = load_config().get("download", {})
+        self.download_worker = SharePointDownloadWorker(
+            self.client,
+            flights,
+            destination,
+            max_workers=int(download_cfg.get("max_workers", DEFAULT_COPY_WORKERS)),
+            verify_hash=bool(download_cfg.get("verify_hash", False)),
+            compression=download_cfg.get("compression") if download_cfg.get("compression") in ("gzip", "xz") else None,
+        )
         self._download_thread = QThread()
         self.download_worker.moveToThread(self._download_thread)
         self._download_thread.started.connect(self.download_worker.run)
@@ -5,6 +5,7 @@ from PyQt6.QtWidgets import (
     QFormLayout,
     QDialogButtonBox,
     QSpinBox,
+    QCheckBox,
     QPushButton,
     QMessageBox,
 )
@@ -31,10 +32,22 @@ class OptionsDialog(QDialog):
         self.sync_spin.setSuffix(" ms")
         self.sync_spin.setSingleStep(10)
 
+        self.offline_tiles_checkbox = QCheckBox("Mapas offline (usar só tiles em cache)", self)
+        self.offline_tiles_checkbox.setToolTip(
+            "Não acessa a internet para buscar tiles do mapa 2D/3D; usa apenas o cache local."
+        )
+
+        self.single_surface_checkbox = QCheckBox("Mapa, 3D e timeline numa única página web", self)
+        self.single_surface_checkbox.setToolTip(
+            "Usa um só renderer para os três painéis (menos memória). Vale após reiniciar o programa."
+        )
+
         self._load_values()
 
         form = QFormLayout(self)
         form.addRow("Frequência de sincronização (2D/3D ↔ gráficos)", self.sync_spin)
+        form.addRow(self.offline_tiles_checkbox)
+        form.addRow(self.single_surface_checkbox)
 
         self.graphs_btn = QPushButton("Configurar gráficos visíveis", self)
         self.graphs_btn.setEnabled(bool(self._graph_titles))
@@ -51,6 +64,10 @@ class OptionsDialog(QDialog):
         sync_cfg = cfg.get("sync", {}) if isinstance(cfg, dict) else {}
         value = sync_cfg.get("timeline_frequency_ms", 120) if isinstance(sync_cfg, dict) else 120
         self.sync_spin.setValue(int(value))
+        tiles_cfg = cfg.get("tiles", {}) if isinstance(cfg, dict) else {}
+        self.offline_tiles_checkbox.setChecked(bool(tiles_cfg.get("offline", False)))
+        web_cfg = cfg.get("web", {}) if isinstance(cfg, dict) else {}
+        self.single_surface_checkbox.setChecked(bool(web_cfg.get("single_surface", False)))
 
     def _open_graph_menu(self):
         if not self._graph_titles:
@@ -65,4 +82,6 @@ class OptionsDialog(QDialog):
 
     def accept(self):
         update_config_section("sync", {"timeline_frequency_ms": int(self.sync_spin.value())})
+        update_config_section("tiles", {"offline": self.offline_tiles_checkbox.isChecked()})
+        update_config_section("web", {"single_surface": self.single_surface_checkbox.isChecked()})
         super().accept()
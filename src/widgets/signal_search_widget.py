@@ -0,0 +1,100 @@
+# src/widgets/signal_search_widget.py — Busca "type-ahead" de sinais em todos os logs carregados
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QLabel
+)
+from PyQt6.QtCore import Qt, QEvent, pyqtSignal
+import time
+
+from src.utils.signal_index import DEFAULT_RESULT_LIMIT, SignalIndex
+
+
+class SignalSearchWidget(QWidget):
+    """Campo de busca + lista de resultados sobre um :class:`SignalIndex`.
+
+    A busca roda a cada tecla (o índice responde em poucos ms); setas
+    navegam na lista e Enter escolhe o sinal.
+    """
+
+    # Nome do sinal escolhido
+    signal_chosen = pyqtSignal(str)
+
+    def __init__(self, signal_index: SignalIndex, parent=None):
+        super().__init__(parent)
+        self.signal_index = signal_index
+        self._generation = -1
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        row = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Buscar sinal em todos os logs (nome, alias Monit_*, unidade)...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.refresh)
+        self.search_edit.installEventFilter(self)
+        row.addWidget(self.search_edit, 1)
+        self.info_label = QLabel("")
+        self.info_label.setStyleSheet("color: gray;")
+        row.addWidget(self.info_label)
+        layout.addLayout(row)
+
+        self.results = QListWidget()
+        self.results.setMaximumHeight(160)
+        self.results.itemActivated.connect(self._choose_item)
+        self.results.itemClicked.connect(self._choose_item)
+        self.results.hide()
+        layout.addWidget(self.results)
+
+    def refresh(self, *_args):
+        query = self.search_edit.text()
+        self.results.clear()
+        if not query.strip():
+            self.results.hide()
+            self.info_label.setText("")
+            return
+        started = time.perf_counter()
+        matches = self.signal_index.search(query, limit=DEFAULT_RESULT_LIMIT)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self._generation = self.signal_index.generation
+        total_logs = len(self.signal_index.log_names())
+        for match in matches:
+            entry = match.entry
+            text = entry.name
+            if entry.unit:
+                text += f" [{entry.unit}]"
+            if entry.aliases:
+                text += f"  ({', '.join(entry.aliases)})"
+            text += f"  — {len(entry.logs)}/{total_logs} log(s)"
+            item = QListWidgetItem(text)
+            item.setData(Qt.ItemDataRole.UserRole, entry.name)
+            item.setToolTip("Disponível em:\n" + "\n".join(entry.logs))
+            self.results.addItem(item)
+        self.results.setVisible(bool(matches))
+        if matches:
+            self.results.setCurrentRow(0)
+        self.info_label.setText(f"{len(matches)} resultado(s) em {elapsed_ms:.1f} ms")
+
+    def refresh_if_stale(self):
+        """Refaz a busca se o índice mudou (logs carregados depois da digitação)."""
+        if self._generation != self.signal_index.generation and self.search_edit.text().strip():
+            self.refresh()
+
+    def _choose_item(self, item):
+        name = item.data(Qt.ItemDataRole.UserRole) if item is not None else None
+        if name:
+            self.signal_chosen.emit(name)
+
+    def eventFilter(self, obj, event):
+        if obj is self.search_edit and event.type() == QEvent.Type.KeyPress:
+            key = event.key()
+            if key in (Qt.Key.Key_Down, Qt.Key.Key_Up) and self.results.count():
+                step = 1 if key == Qt.Key.Key_Down else -1
+                row = min(max(self.results.currentRow() + step, 0), self.results.count() - 1)
+                self.results.setCurrentRow(row)
+                return True
+            if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+                self._choose_item(self.results.currentItem())
+                return True
+            if key == Qt.Key.Key_Escape:
+                self.search_edit.clear()
+                return True
+        return super().eventFilter(obj, event)
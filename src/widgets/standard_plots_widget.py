@@ -10,20 +10,31 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QLabel,
     QGridLayout,
+    QSpinBox,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, QTimer
 import pandas as pd
 import numpy as np
-from geopy.distance import geodesic
 import matplotlib.dates
 
 # Importações do Matplotlib
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
 
+from src.utils.event_index import SEVERITY_COLORS, SEVERITY_INFO
+from src.utils.geodesy import geo_series
+from src.utils.derived_series import (
+    ATTITUDE_VARIANCE_SERIES,
+    DEFAULT_DERIVED_WINDOWS,
+    WIND_VARIABILITY_SERIES,
+    DerivedSeriesCache,
+    DerivedSeriesWorker,
+)
+
 class StandardPlotWindow(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, derived_cache=None):
         super().__init__(parent)
         self.df = pd.DataFrame() # DataFrame ativo
         self.current_log_name = ""
@@ -31,6 +42,16 @@ class StandardPlotWindow(QWidget):
         self._sync_axes = []
         self._syncing = False
         self.vlines = []
+        # Eventos do log (flags, failsafes, EmbeddedError) marcados em todos os eixos
+        self.events = []
+        self._event_artists = []
+        # Fundo da figura (sem os cursores) para o blit do cursor de tempo
+        self._background = None
+        # Séries derivadas (variâncias móveis) compartilhadas entre janelas
+        self.derived_cache = derived_cache if derived_cache is not None else DerivedSeriesCache()
+        self.derived_windows = dict(DEFAULT_DERIVED_WINDOWS)
+        self._derived_jobs = []
+        self._derived_pending = set()
 
         layout = QVBoxLayout(self)
         
@@ -52,7 +73,22 @@ class StandardPlotWindow(QWidget):
         
         for r in self.radios:
             r.toggled.connect(self.update_plot) # Conecta ao método local
+            r.toggled.connect(self._sync_window_spin)
             plot_selector_layout.addWidget(r)
+
+        plot_selector_layout.addStretch(1)
+        self.window_label = QLabel("Janela (amostras):")
+        self.window_spin = QSpinBox()
+        self.window_spin.setRange(2, 100000)
+        self.window_spin.setKeyboardTracking(False)
+        self.window_spin.valueChanged.connect(self._on_window_changed)
+        plot_selector_layout.addWidget(self.window_label)
+        plot_selector_layout.addWidget(self.window_spin)
+        # Debounce: só recalcula quando o usuário para de mexer na janela
+        self._window_timer = QTimer(self)
+        self._window_timer.setSingleShot(True)
+        self._window_timer.setInterval(250)
+        self._window_timer.timeout.connect(self.update_plot)
         
         self.plot_selector_group.setLayout(plot_selector_layout)
         layout.addWidget(self.plot_selector_group)
@@ -61,9 +97,12 @@ class StandardPlotWindow(QWidget):
         self.figure = Figure(figsize=(5, 4), dpi=100)
         self.canvas = FigureCanvas(self.figure)
         self.figure.canvas.mpl_connect("pick_event", self.on_pick) # Conecta ao método local
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.mpl_connect("resize_event", lambda _event: self._invalidate_background())
         self.toolbar = NavigationToolbar(self.canvas, self) # Toolbar como filho deste widget
         layout.addWidget(self.toolbar)
         layout.addWidget(self.canvas, stretch=1)
+        self._sync_window_spin()
 
     def load_dataframe(self, df, log_name = "", autoplot=True):
         """Recebe o DataFrame da janela principal."""
@@ -107,11 +146,114 @@ class StandardPlotWindow(QWidget):
     def show_position_plot(self):
         self.show_rpy_plot()
 
+    # --- Séries derivadas (janela ajustável, cálculo fora da GUI) ---
+
+    def _derived_plot_key(self):
+        if self.radio_wind_variability.isChecked():
+            return "wind"
+        if self.radio_variance.isChecked():
+            return "variance"
+        return None
+
+    def _sync_window_spin(self, *_args):
+        key = self._derived_plot_key()
+        enabled = key is not None
+        self.window_label.setEnabled(enabled)
+        self.window_spin.setEnabled(enabled)
+        if enabled:
+            self.window_spin.blockSignals(True)
+            self.window_spin.setValue(self.derived_windows[key])
+            self.window_spin.blockSignals(False)
+
+    def _on_window_changed(self, value):
+        key = self._derived_plot_key()
+        if key is None or self.derived_windows.get(key) == value:
+            return
+        self.derived_windows[key] = int(value)
+        self._window_timer.start()
+
+    def _derived_bundle(self, specs, window):
+        """Séries em cache ou None (neste caso o cálculo é disparado em segundo plano)."""
+        bundle = self.derived_cache.lookup_bundle(self.current_log_name, self.df, specs, window)
+        if bundle is not None:
+            return bundle
+        self._start_derived_job(specs, window)
+        return None
+
+    def _start_derived_job(self, specs, window):
+        token = (self.current_log_name, id(self.df), tuple(specs), int(window))
+        if token in self._derived_pending:
+            return
+        self._derived_pending.add(token)
+
+        thread = QThread()
+        worker = DerivedSeriesWorker(self.derived_cache, self.current_log_name, self.df, specs, window, token)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_derived_ready)
+        worker.error.connect(lambda msg, token=token: self._on_derived_error(token, msg))
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        worker.finished.connect(worker.deleteLater)
+        worker.error.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        job = (thread, worker)
+        thread.finished.connect(lambda job=job: self._derived_jobs.remove(job) if job in self._derived_jobs else None)
+        self._derived_jobs.append(job)
+        thread.start()
+
+    def _is_current_derived(self, token):
+        """Se o job ainda corresponde ao gráfico exibido (mesmo log, DataFrame e janela)."""
+        log_name, df_id, _specs, window = token
+        key = self._derived_plot_key()
+        if key is None or log_name != self.current_log_name or df_id != id(self.df):
+            return False
+        return window == self.derived_windows[key]
+
+    def _on_derived_ready(self, token):
+        self._derived_pending.discard(token)
+        # Resultado antigo (outro log/janela): fica só no cache
+        if self._is_current_derived(token):
+            self.update_plot()
+
+    def _on_derived_error(self, token, message):
+        self._derived_pending.discard(token)
+        print(f"ERRO: Falha ao calcular séries derivadas: {message}")
+        # Troca o "Calculando..." pelo erro (mudar a janela ou o log tenta de novo)
+        if self._is_current_derived(token):
+            self._show_plot_message(f"Falha ao calcular séries derivadas:\n{message}", color="tab:red")
+
+    def _show_plot_message(self, text, color="black"):
+        self.figure.clear()
+        self.vlines.clear()
+        self._background = None
+        ax = self.figure.add_subplot(111)
+        ax.text(0.5, 0.5, text, ha="center", va="center", color=color, transform=ax.transAxes)
+        ax.set_axis_off()
+        self.canvas.draw()
+
+    def _show_computing_message(self):
+        self._show_plot_message("Calculando séries derivadas...")
+
+    def closeEvent(self, event):
+        # As threads são curtas; espera terminarem antes de destruir a janela
+        for thread, _worker in list(self._derived_jobs):
+            try:
+                thread.quit()
+                thread.wait(2000)
+            except RuntimeError:
+                pass
+        super().closeEvent(event)
+
     def update_cursor(self, timestamp):
-        """Atualiza a linha vertical (cursor) no gráfico."""
+        """Atualiza a linha vertical (cursor) no gráfico.
+
+        Só os cursores são redesenhados: o fundo da figura fica em cache
+        (capturado a cada desenho completo) e é restaurado via blit.
+        """
         if self.df.empty or not self.vlines:
             return
-        for vline in self.vlines:
+        for vline in list(self.vlines):
             try:
                 # Verifica se o vline e seus eixos ainda são válidos
                 if vline and vline.axes and vline.figure:
@@ -128,8 +270,39 @@ class StandardPlotWindow(QWidget):
                 except ValueError:
                     pass # Já pode ter sido removido
 
-        # Tenta redesenhar apenas se houver vlines válidas
-        if self.vlines:
+        if not self.vlines:
+            return
+        if self._background is None:
+            # Sem fundo válido: o próximo desenho completo recaptura e desenha os cursores
+            self.canvas.draw_idle()
+            return
+        self._blit_cursors()
+
+    def _on_draw(self, _event):
+        """Após cada desenho completo, guarda o fundo e desenha os cursores por cima."""
+        try:
+            self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        except Exception:
+            self._background = None
+            return
+        self._draw_cursor_artists()
+
+    def _invalidate_background(self):
+        self._background = None
+
+    def _draw_cursor_artists(self):
+        for vline in self.vlines:
+            if vline.axes is not None and vline.get_visible():
+                vline.axes.draw_artist(vline)
+
+    def _blit_cursors(self):
+        try:
+            self.canvas.restore_region(self._background)
+            self._draw_cursor_artists()
+            self.canvas.blit(self.figure.bbox)
+        except Exception as e:
+            print(f"AVISO: Blit do cursor falhou, redesenhando a figura: {e}")
+            self._background = None
             self.canvas.draw_idle()
 
     def set_time_window(self, start_ts, end_ts):
@@ -144,6 +317,7 @@ class StandardPlotWindow(QWidget):
                     pass
         finally:
             self._syncing = False
+        self._invalidate_background()
         self.canvas.draw_idle()
 
 
@@ -272,6 +446,13 @@ class StandardPlotWindow(QWidget):
              QMessageBox.warning(self, "Erro", "Colunas 'WSI'/'WindDirection' ou 'Path_angle' não encontradas ou vazias.")
              return
         
+        wind_bundle = None
+        if has_wind_data:
+            wind_bundle = self._derived_bundle(WIND_VARIABILITY_SERIES, self.derived_windows["wind"])
+            if wind_bundle is None:
+                self._show_computing_message()
+                return
+
         self.figure.clear()
         nrows = sum([1 if has_wind_data else 0, 1 if has_wind_data else 0, 1 if has_path_angle else 0])
         if nrows == 0: return 
@@ -290,42 +471,22 @@ class StandardPlotWindow(QWidget):
 
         # --- Plot Variabilidade Vento (se houver dados) ---
         if has_wind_data:
-            d_wind = self.df.dropna(subset=required_wind)
-            window = 30 
-            
-            # --- Cálculo de Velocidade (WSI) - Inalterado ---
-            wsi_var = d_wind["WSI"].rolling(window).var()
-            wsi_std = d_wind["WSI"].rolling(window).std()
-            
-            # --- Cálculo de Direção (Circular) - CORRIGIDO ---
-            wind_rad = np.deg2rad(d_wind["WindDirection"]) # Converte para radianos
-            wind_cos = np.cos(wind_rad)
-            wind_sin = np.sin(wind_rad)
-            mean_cos = wind_cos.rolling(window).mean() # Média dos componentes X
-            mean_sin = wind_sin.rolling(window).mean() # Média dos componentes Y
-            
-            # R (Comprimento do Vetor Médio)
-            # np.clip para evitar R > 1 por erros de ponto flutuante
-            r_squared = np.clip(np.sqrt(mean_cos**2 + mean_sin**2), 0, 1) 
-            r = np.sqrt(np.clip(r_squared, 0, 1)) # Clip o valor *antes* do sqrt para garantir
-            
-            # V (Variância Circular) = 1 - R. (Varia de 0 a 1)
-            winddir_var_circular = 1 - r 
-            
-            # S (Desvio Padrão Circular) = sqrt(-2 * ln(R))
-            # Adiciona 'epsilon' (valor muito pequeno) para evitar log(0)
-            epsilon = 1e-15
-            winddir_std_rad = np.sqrt(-2 * np.log(r + epsilon))
-            winddir_std_deg = np.rad2deg(winddir_std_rad) # Converte para graus
+            window = self.derived_windows["wind"]
+            _idx, wind_ts = self.derived_cache.frame(self.current_log_name, self.df, "wind")
+            wsi_var = wind_bundle[("wind:WSI", "var")]
+            wsi_std = wind_bundle[("wind:WSI", "std")]
+            # Direção: variância circular (1-R, de 0 a 1) e desvio circular em graus
+            winddir_var_circular = wind_bundle[("wind:WindDirection", "circ_var")]
+            winddir_std_deg = wind_bundle[("wind:WindDirection", "circ_std")]
 
             # -- Subplot Velocidade --
             ax1 = self.figure.add_subplot(gs[plot_idx, 0]); plot_idx += 1
             color_var = 'tab:blue'; color_std = 'tab:cyan'
             ax1.set_ylabel('Var WSI (m²/s²)', color=color_var, fontsize=9)
-            ln1 = ax1.plot(d_wind['Timestamp'].to_numpy(), wsi_var.to_numpy(), color=color_var, label=f'Var WSI (J={window})')
+            ln1 = ax1.plot(wind_ts, wsi_var, color=color_var, label=f'Var WSI (J={window})')
             ax1.tick_params(axis='y', labelcolor=color_var, labelsize=8); ax1.grid(True, linestyle=':', alpha=0.6)
             ax1b = ax1.twinx(); ax1b.set_ylabel('Std Dev WSI (m/s)', color=color_std, fontsize=9)
-            ln2 = ax1b.plot(d_wind['Timestamp'].to_numpy(), wsi_std.to_numpy(), color=color_std, label=f'Std Dev WSI (J={window})', linestyle='--')
+            ln2 = ax1b.plot(wind_ts, wsi_std, color=color_std, label=f'Std Dev WSI (J={window})', linestyle='--')
             ax1b.tick_params(axis='y', labelcolor=color_std, labelsize=8)
             ax1.set_title(f"Variabilidade Velocidade Vento ({self.current_log_name})", fontsize=11)
             lns1 = ln1 + ln2; labs1 = [l.get_label() for l in lns1]; leg1 = ax1.legend(lns1, labs1, loc='best', fontsize=7)
@@ -338,13 +499,13 @@ class StandardPlotWindow(QWidget):
             # ### ALTERADO ### Label do eixo Y para refletir 0-1
             ax2.set_ylabel('Var Circular Dir (0-1)', color=color_var_dir, fontsize=9) 
             # ### ALTERADO ### Plota a variância circular (1-R)
-            ln3 = ax2.plot(d_wind['Timestamp'].to_numpy(), winddir_var_circular.to_numpy(), color=color_var_dir, label=f'Var Dir (Circular, J={window})')
+            ln3 = ax2.plot(wind_ts, winddir_var_circular, color=color_var_dir, label=f'Var Dir (Circular, J={window})')
             ax2.tick_params(axis='y', labelcolor=color_var_dir, labelsize=8); ax2.grid(True, linestyle=':', alpha=0.6)
             #ax2.set_ylim(-0.05, 1.05) # Força o eixo da variância circular a ficar entre 0 e 1
             
             ax2b = ax2.twinx(); ax2b.set_ylabel('Std Dev Circular (°)', color=color_std_dir, fontsize=9) # Label atualizado
             # ### ALTERADO ### Plota o desvio padrão circular em graus
-            ln4 = ax2b.plot(d_wind['Timestamp'].to_numpy(), winddir_std_deg.to_numpy(), color=color_std_dir, label=f'Std Dev Dir (Circular, J={window})', linestyle='--')
+            ln4 = ax2b.plot(wind_ts, winddir_std_deg, color=color_std_dir, label=f'Std Dev Dir (Circular, J={window})', linestyle='--')
             ax2b.tick_params(axis='y', labelcolor=color_std_dir, labelsize=8)
             ax2.set_title(f"Variabilidade Direção Vento ({self.current_log_name})", fontsize=11)
             lns2 = ln3 + ln4; labs2 = [l.get_label() for l in lns2]; leg2 = ax2.legend(lns2, labs2, loc='best', fontsize=7)
@@ -377,26 +538,29 @@ class StandardPlotWindow(QWidget):
         required = ["Roll","Pitch","Yaw","AltitudeAbs"]; 
         if not all(c in self.df.columns for c in required): 
              QMessageBox.warning(self, "Erro", "Colunas de Atitude ou Altitude não encontradas."); return
-        d = self.df.dropna(subset=required); window = 50
-        if d.empty: 
+        _idx, ts = self.derived_cache.frame(self.current_log_name, self.df, "attitude")
+        if len(ts) == 0: 
              QMessageBox.information(self, "Info", "Nenhum dado de RPY/Altitude válido."); return
+        series = self._derived_bundle(ATTITUDE_VARIANCE_SERIES, self.derived_windows["variance"])
+        if series is None:
+            self._show_computing_message(); return
 
-        roll_var=d["Roll"].rolling(window).var(); pitch_var=d["Pitch"].rolling(window).var(); yaw_var=d["Yaw"].rolling(window).var(); alt_var=d["AltitudeAbs"].rolling(window).var()
+        roll_var=series[("attitude:Roll","var")]; pitch_var=series[("attitude:Pitch","var")]; yaw_var=series[("attitude:Yaw","var")]; alt_var=series[("attitude:AltitudeAbs","var")]
         
         self.figure.clear(); gs=self.figure.add_gridspec(2, 3, height_ratios=[1.0, 1.4]); ax_roll=self.figure.add_subplot(gs[0,0]); ax_pitch=self.figure.add_subplot(gs[0,1]); ax_yaw=self.figure.add_subplot(gs[0,2]); ax_all=self.figure.add_subplot(gs[1,:])
         
         # ### CORRIGIDO ###
-        ax_roll.plot(d['Timestamp'].to_numpy(), roll_var.to_numpy(), color='#1f77b4'); 
-        ax_pitch.plot(d['Timestamp'].to_numpy(), pitch_var.to_numpy(), color='#2ca02c'); 
-        ax_yaw.plot(d['Timestamp'].to_numpy(), yaw_var.to_numpy(), color='#d62728')
+        ax_roll.plot(ts, roll_var, color='#1f77b4'); 
+        ax_pitch.plot(ts, pitch_var, color='#2ca02c'); 
+        ax_yaw.plot(ts, yaw_var, color='#d62728')
         
         for ax, t in [(ax_roll,"Var Roll"), (ax_pitch,"Var Pitch"), (ax_yaw,"Var Yaw")]: ax.set_title(t, fontsize=11); ax.set_ylabel("Var"); ax.grid(True, linestyle='--')
         
         # ### CORRIGIDO ###
-        ax_all.plot(d['Timestamp'].to_numpy(), roll_var.to_numpy(), label='Var Roll', color='#1f77b4'); 
-        ax_all.plot(d['Timestamp'].to_numpy(), pitch_var.to_numpy(), label='Var Pitch', color='#2ca02c'); 
-        ax_all.plot(d['Timestamp'].to_numpy(), yaw_var.to_numpy(), label='Var Yaw', color='#d62728'); 
-        ax_all.plot(d['Timestamp'].to_numpy(), alt_var.to_numpy(), label='Var Alt', color='#9467bd', linestyle='--')
+        ax_all.plot(ts, roll_var, label='Var Roll', color='#1f77b4'); 
+        ax_all.plot(ts, pitch_var, label='Var Pitch', color='#2ca02c'); 
+        ax_all.plot(ts, yaw_var, label='Var Yaw', color='#d62728'); 
+        ax_all.plot(ts, alt_var, label='Var Alt', color='#9467bd', linestyle='--')
         
         ax_all.set_title(f"Variância RPY e Alt ({self.current_log_name})", fontsize=12); # Título atualizado
         ax_all.set_xlabel("Timestamp"); ax_all.set_ylabel("Variância"); ax_all.grid(True, linestyle='--')
@@ -453,10 +617,14 @@ class StandardPlotWindow(QWidget):
         req = ["Latitude","Longitude","AltitudeAbs"]; 
         if not all(c in self.df.columns for c in req): 
              QMessageBox.warning(self, "Erro", "Dados de posição/altitude não encontrados."); return
-        d = self.df.dropna(subset=req)
-        if d.empty: return
-
-        lat0,lon0,alt0=d.iloc[0][req]; dists=np.array([geodesic((lat0,lon0),(lat,lon)).meters for lat,lon in zip(d["Latitude"],d["Longitude"])]); alt_rel=(d["AltitudeAbs"]-alt0).to_numpy()
+        rows = np.flatnonzero(self.df[req].notna().all(axis=1).to_numpy())
+        if rows.size == 0: return
+        d = self.df.iloc[rows]
+
+        # Distâncias vetorizadas (WGS-84), memorizadas por log e compartilhadas com mapa/estatísticas
+        geo = geo_series(self.df)
+        dists = geo.distance_from_origin[rows] if geo is not None else np.zeros(rows.size)
+        alt0 = d["AltitudeAbs"].iloc[0]; alt_rel=(d["AltitudeAbs"]-alt0).to_numpy()
         
         self.figure.clear(); ax1=self.figure.add_subplot(211); ax2=self.figure.add_subplot(212)
         
@@ -516,20 +684,56 @@ class StandardPlotWindow(QWidget):
             if other is not ax and other.get_xlim() != (xmin, xmax): 
                 other.set_xlim(xmin, xmax)
         self._syncing = False
+        self._invalidate_background()
         self.canvas.draw_idle()
 
     def add_vlines(self):
         """Adiciona ou atualiza as linhas verticais (cursores)."""
         self.vlines.clear() # Limpa as referências antigas
+        self._invalidate_background()
         if self.df.empty: return
         try:
             initial_ts = self.df['Timestamp'].iloc[0]
-            # Adiciona vlines a todos os eixos da figura atual
+            # Adiciona vlines a todos os eixos da figura atual; animated=True deixa
+            # os cursores fora do desenho completo (são desenhados por blit)
             for ax in self.figure.get_axes():
-                vline = ax.axvline(initial_ts, color='r', linestyle='--', lw=1, visible=False)
+                vline = ax.axvline(initial_ts, color='r', linestyle='--', lw=1, visible=False, animated=True)
                 self.vlines.append(vline)
         except IndexError:
              print("Aviso: DataFrame vazio ou sem timestamps ao adicionar vlines.")
+        self._draw_event_markers()
+
+    def set_events(self, events):
+        """Eventos (``FlightEvent``) a marcar; redesenha só as marcas se já houver gráfico."""
+        self.events = list(events or [])
+        if self.figure.get_axes():
+            self._draw_event_markers()
+            self._invalidate_background()
+            self.canvas.draw_idle()
+
+    def _draw_event_markers(self):
+        for artist in self._event_artists:
+            try:
+                artist.remove()
+            except (ValueError, AttributeError):
+                pass  # Já saiu junto com a figura (figure.clear)
+        self._event_artists = []
+        if not self.events or self.df.empty:
+            return
+        times = np.array([event.time for event in self.events], dtype=float)
+        # Mesma base dos timestamps do DataFrame (datetime sem fuso -> números do matplotlib)
+        x = matplotlib.dates.date2num((times * 1e9).astype('datetime64[ns]'))
+        colors = [
+            tuple(c / 255.0 for c in SEVERITY_COLORS.get(event.severity, SEVERITY_COLORS[SEVERITY_INFO]))
+            for event in self.events
+        ]
+        segments = [((xi, 0.0), (xi, 1.0)) for xi in x]
+        for ax in self.figure.get_axes():
+            artist = LineCollection(segments, transform=ax.get_xaxis_transform(), colors=colors,
+                                    linestyles=':', linewidths=0.9, zorder=0.5)
+            # autolim=False: eventos fora da janela do gráfico não alargam o eixo X
+            ax.add_collection(artist, autolim=False)
+            self._event_artists.append(artist)
 
 
     def update_plot(self):
@@ -556,6 +760,8 @@ class StandardPlotsWidget(QWidget):
         self.df = pd.DataFrame()
         self.current_log_name = ""
         self._open_windows = []
+        self.events = []
+        self.derived_cache = DerivedSeriesCache()
 
         layout = QVBoxLayout(self)
         header = QLabel(
@@ -593,6 +799,14 @@ class StandardPlotsWidget(QWidget):
             else:
                 self._open_windows.remove(window)
 
+    def set_events(self, events):
+        self.events = list(events or [])
+        for window in list(self._open_windows):
+            if window.isVisible():
+                window.set_events(self.events)
+            else:
+                self._open_windows.remove(window)
+
     def show_position_plot(self):
         # Mantém compatibilidade com chamadas antigas sem abrir gráficos automaticamente.
         return
@@ -601,9 +815,10 @@ class StandardPlotsWidget(QWidget):
         if self.df.empty:
             QMessageBox.information(self, "Informação", "Carregue um log antes de gerar gráficos.")
             return
-        window = StandardPlotWindow(self)
+        window = StandardPlotWindow(self, derived_cache=self.derived_cache)
         window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose, True)
         window.load_dataframe(self.df, self.current_log_name, autoplot=False)
+        window.events = list(self.events)
         window.show_plot_by_key(key)
         window.show()
         window.destroyed.connect(lambda _=None, w=window: self._open_windows.remove(w) if w in self._open_windows else None)